@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Amplification d'écriture de la sauvegarde automatique
+
+Simule la saisie d'un tour complet (scores au clic sur les compteurs, terrain,
+validation) à raison d'une modification toutes les 0,4 s, et compare :
+- la sauvegarde complète du tournoi à chaque modification ;
+- l'écriture incrémentale immédiate de l'objet modifié ;
+- la sauvegarde automatique différée (regroupement des modifications).
+
+Usage : python benchmarks/bench_autosave.py [nombre_d_equipes]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'project', 'petanque_manager'))
+from autosave import AutoSaver
+from store import DatabaseManager
+from tournament import Tournament
+
+EDIT_INTERVAL = 0.4
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def edits(tournament, rng):
+    """Suite de modifications : 1 à 13 clics par score, terrain parfois, validation"""
+    operations = []
+    for match in tournament.matches:
+        if match.is_bye:
+            continue
+        winner_first = rng.random() < 0.5
+        loser_score = rng.randint(0, 12)
+        final = (13, loser_score) if winner_first else (loser_score, 13)
+        steps = [("score", match.id, (s, 0)) for s in range(1, final[0] + 1)]
+        steps += [("score", match.id, (final[0], s)) for s in range(1, final[1] + 1)]
+        if rng.random() < 0.2:
+            steps.append(("terrain", match.id, rng.randint(1, tournament.terrain_count)))
+        steps.append(("validate", match.id, final))
+        operations.append(steps)
+    # Plusieurs marqueurs saisissent en parallèle : les séquences sont entrelacées
+    sequence = []
+    while operations:
+        steps = rng.choice(operations)
+        sequence.append(steps.pop(0))
+        if not steps:
+            operations.remove(steps)
+    return sequence
+
+
+def apply(tournament, operation):
+    kind, match_id, value = operation
+    if kind == "score":
+        tournament.set_match_score(match_id, *value)
+    elif kind == "terrain":
+        tournament.set_match_terrain(match_id, value)
+    else:
+        tournament.update_match_score(match_id, *value)
+
+
+def full_changes(tournament):
+    """Tout le tournoi, comme une sauvegarde complète"""
+    saver = AutoSaver(tournament, lambda changes: None)
+    for team in tournament.teams:
+        saver.dirty_teams[team.id] = team
+    for match in tournament.matches:
+        saver.dirty_matches[match.id] = match
+    saver.round_dirty = True
+    saver.first_change = saver.last_change = 0.0
+    changes = saver.take()
+    saver.close()
+    return changes
+
+
+def run(label, team_count, strategy):
+    rng = random.Random(7)
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    db = DatabaseManager(path)
+    tournament = Tournament(name="Bench", tournament_type="doublette", terrain_count=team_count // 2)
+    tournament.id = db.create_tournament("Bench", "doublette", team_count // 2)
+    tournament.add_teams([[f"Joueur {i}a", f"Joueur {i}b"] for i in range(team_count)])
+    tournament.generate_first_round_matches()
+    db.save_changes(full_changes(tournament))
+    sequence = edits(tournament, rng)
+
+    clock = FakeClock()
+    written = []
+    saver = AutoSaver(tournament, written.append, clock=clock)
+    saver.take()
+
+    rows = transactions = 0
+    start = time.perf_counter()
+    for operation in sequence:
+        clock.now += EDIT_INTERVAL
+        apply(tournament, operation)
+        if strategy == "complète":
+            saver.take()
+            rows += db.save_changes(full_changes(tournament))
+            transactions += 1
+        elif strategy == "immédiate":
+            saver.save()
+        else:
+            saver.poll()
+        for changes in written:
+            rows += db.save_changes(changes)
+            transactions += 1
+        written.clear()
+    saver.close()
+    for changes in written:
+        rows += db.save_changes(changes)
+        transactions += 1
+    elapsed = time.perf_counter() - start
+
+    wal = path + "-wal"
+    size = os.path.getsize(path) + (os.path.getsize(wal) if os.path.exists(wal) else 0)
+    print(f"{label:<22} {len(sequence):6d} modifs  {transactions:6d} transactions  "
+          f"{rows:8d} lignes  {rows / len(sequence):8.2f} lignes/modif  "
+          f"{elapsed:6.2f} s  fichier {size / 1024:8.0f} Kio")
+    db.close()
+
+
+def main():
+    team_count = int(sys.argv[1]) if len(sys.argv) > 1 else 128
+    print(f"{team_count} équipes, une modification toutes les {EDIT_INTERVAL} s")
+    run("sauvegarde complète", team_count, "complète")
+    run("incrémentale immédiate", team_count, "immédiate")
+    run("automatique différée", team_count, "différée")
+
+
+if __name__ == "__main__":
+    main()
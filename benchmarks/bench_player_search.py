@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Mesure de l'autocomplétion et de la détection de doublons sur 50 000 noms
+
+Usage : python benchmarks/bench_player_search.py [nombre_de_noms]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'project', 'petanque_manager'))
+from store import DatabaseManager
+
+FIRST_NAMES = ["Jean", "Marie", "Pierre", "Michel", "André", "Philippe", "Nathalie", "Isabelle",
+               "Alain", "Jacques", "Sylvie", "Christine", "Bernard", "Éric", "Françoise", "Daniel",
+               "Claude", "Patrick", "Monique", "Nicole", "Gérard", "Catherine", "Robert", "Anne"]
+SYLLABLES = ["ma", "ri", "bo", "du", "le", "fè", "vre", "ro", "ché", "lan", "gui", "bert", "mon",
+             "ta", "gne", "vil", "lard", "cou", "tu", "rier", "pa", "sca", "bé", "ran", "gé", "net"]
+
+
+def make_names(count: int, rng: random.Random):
+    """Noms réalistes : prénoms courants, noms de famille variés"""
+    names = set()
+    while len(names) < count:
+        last = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+        names.add(f"{rng.choice(FIRST_NAMES)} {last}")
+    return list(names)
+
+
+def timed(label: str, func, queries):
+    start = time.perf_counter()
+    worst = 0.0
+    for query in queries:
+        t0 = time.perf_counter()
+        func(query)
+        worst = max(worst, time.perf_counter() - t0)
+    mean = (time.perf_counter() - start) / len(queries)
+    print(f"{label:<28} moyenne {mean * 1000:6.2f} ms   pire {worst * 1000:6.2f} ms")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    rng = random.Random(42)
+    db = DatabaseManager(":memory:")
+    names = make_names(count, rng)
+
+    start = time.perf_counter()
+    db.register_player_names(names)
+    print(f"{count} noms indexés en {time.perf_counter() - start:.2f} s")
+
+    samples = rng.sample(names, 200)
+    timed("préfixe (2 caractères)", db.search_player_names, [n[:2] for n in samples])
+    timed("préfixe (5 caractères)", db.search_player_names, [n[:5] for n in samples])
+    timed("sous-chaîne", db.search_player_names, [n.split()[-1][:6] for n in samples])
+    typos = [n[:3] + n[4:] for n in samples]
+    timed("doublons (faute de frappe)", db.find_similar_player_names, typos)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Requêtes de matchs : composition dénormalisée (teams.roster) contre jointure des joueurs
+
+Construit une base de saison (tournois en triplette, plusieurs tours), puis
+compare, cache de requêtes vidé à chaque appel :
+- get_matches_by_round : ancienne double jointure sur players regroupée par
+  match (9 lignes intermédiaires par match en triplette) contre une lecture de
+  teams.roster ;
+- get_matches_by_tournament : anciennes sous-requêtes corrélées par équipe
+  contre teams.roster ;
+et le coût, à l'inscription, des déclencheurs qui tiennent roster à jour.
+
+Usage : python benchmarks/bench_roster.py [tournois] [equipes_par_tournoi] [tours]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'project', 'petanque_manager'))
+from store import DatabaseManager
+
+REPEAT = 5
+
+# Requêtes avant la composition dénormalisée
+JOINED_BY_ROUND = """
+    SELECT m.*,
+           t1.number as team1_number, t2.number as team2_number,
+           GROUP_CONCAT(DISTINCT p1.name) as team1_players,
+           GROUP_CONCAT(DISTINCT p2.name) as team2_players
+    FROM matches m
+    JOIN teams t1 ON m.team1_id = t1.id
+    JOIN teams t2 ON m.team2_id = t2.id
+    LEFT JOIN players p1 ON t1.id = p1.team_id
+    LEFT JOIN players p2 ON t2.id = p2.team_id
+    WHERE m.tournament_id = ? AND m.round_number = ?
+    GROUP BY m.id
+    ORDER BY m.id
+"""
+CORRELATED_BY_TOURNAMENT = """
+    SELECT m.*,
+           t1.number as team1_number, t2.number as team2_number,
+           (SELECT GROUP_CONCAT(name) FROM (
+               SELECT name FROM players WHERE team_id = m.team1_id ORDER BY position
+           )) as team1_players,
+           (SELECT GROUP_CONCAT(name) FROM (
+               SELECT name FROM players WHERE team_id = m.team2_id ORDER BY position
+           )) as team2_players
+    FROM matches m
+    JOIN teams t1 ON m.team1_id = t1.id
+    LEFT JOIN teams t2 ON m.team2_id = t2.id
+    WHERE m.tournament_id = ?
+    ORDER BY m.tournament_id, m.round_number, m.id
+"""
+
+
+def build(db, tournaments, team_count, rounds):
+    rng = random.Random(5)
+    ids = []
+    for number in range(tournaments):
+        tournament_id = db.create_tournament(f"Concours {number}", "triplette", team_count // 2)
+        teams = [db.create_team(tournament_id, i, [f"Joueur {number}-{i}{p}" for p in "abc"])
+                 for i in range(1, team_count + 1)]
+        for round_number in range(1, rounds + 1):
+            rng.shuffle(teams)
+            for i in range(0, team_count - 1, 2):
+                db.create_match(tournament_id, round_number, teams[i], teams[i + 1])
+        ids.append(tournament_id)
+    return ids
+
+
+def best_of(function):
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    tournaments = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    team_count = int(sys.argv[2]) if len(sys.argv) > 2 else 128
+    rounds = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+    path = os.path.join(tempfile.mkdtemp(), "saison.db")
+    db = DatabaseManager(path)
+
+    start = time.perf_counter()
+    ids = build(db, tournaments, team_count, rounds)
+    print(f"{tournaments} tournois, {tournaments * team_count} équipes, "
+          f"{tournaments * rounds * (team_count // 2)} matchs "
+          f"créés en {time.perf_counter() - start:.2f} s")
+
+    cursor = db.connection.cursor()
+
+    def uncached(method, *args):
+        db.query_cache.clear()
+        return method(*args)
+
+    def legacy(query, *args):
+        cursor.execute(query, args)
+        return [dict(row) for row in cursor.fetchall()]
+
+    middle = ids[len(ids) // 2]
+    joined_round, old = best_of(lambda: [legacy(JOINED_BY_ROUND, middle, r)
+                                         for r in range(1, rounds + 1)])
+    roster_round, new = best_of(lambda: [uncached(db.get_matches_by_round, middle, r)
+                                         for r in range(1, rounds + 1)])
+    assert [len(rows) for rows in old] == [len(rows) for rows in new]
+    correlated, old = best_of(lambda: legacy(CORRELATED_BY_TOURNAMENT, middle))
+    roster_tournament, new = best_of(lambda: uncached(db.get_matches_by_tournament, middle))
+    assert old == new, "compositions différentes"
+    season_old, _ = best_of(lambda: sum(len(legacy(CORRELATED_BY_TOURNAMENT, i)) for i in ids))
+    season_new, _ = best_of(lambda: sum(len(uncached(db.get_matches_by_tournament, i))
+                                        for i in ids))
+
+    # Écriture d'un tournoi supplémentaire avec puis sans les déclencheurs
+    def register(label):
+        tournament_id = db.create_tournament(label, "triplette", team_count // 2)
+        start = time.perf_counter()
+        for i in range(1, team_count + 1):
+            db.create_team(tournament_id, i, [f"{label} {i}{p}" for p in "abc"])
+        return time.perf_counter() - start
+
+    roster_write = min(register(f"Avec {i}") for i in range(REPEAT))
+    for trigger in ("players_roster_ai", "players_roster_ad", "players_roster_au"):
+        cursor.execute(f"DROP TRIGGER {trigger}")
+    plain_write = min(register(f"Sans {i}") for i in range(REPEAT))
+    db.close()
+
+    print(f"{'':<34} {'jointure':>10} {'roster':>10} {'gain':>7}")
+    for label, before, after in (
+        (f"matchs par tour ({rounds} tours, ms)", joined_round, roster_round),
+        ("matchs d'un tournoi (ms)", correlated, roster_tournament),
+        ("matchs de la saison (ms)", season_old, season_new),
+    ):
+        print(f"{label:<34} {before * 1000:10.2f} {after * 1000:10.2f} {before / after:6.1f}x")
+    label = "inscription d'un tournoi (ms)"
+    print(f"{label:<34} {plain_write * 1000:10.2f} {roster_write * 1000:10.2f}"
+          f"   (coût des déclencheurs)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Instantané binaire contre base SQLite
+
+Construit un tournoi suisse complet, l'enregistre en base (sauvegarde
+incrémentale) et en instantané, vérifie que les deux relectures donnent le
+même tournoi, puis compare :
+- la taille des fichiers ;
+- l'écriture (save_changes d'un tournoi complet contre snapshot.save) ;
+- le rechargement complet (workspace.load_tournament contre snapshot.load) ;
+- l'ouverture seule (en-tête) et le parcours d'une colonne de scores.
+
+Usage : python benchmarks/bench_snapshot.py [nombre_d_equipes] [nombre_de_tours]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'project', 'petanque_manager'))
+import snapshot
+from autosave import AutoSaver
+from snapshot import Snapshot
+from store import DatabaseManager
+from tournament import Tournament
+from workspace import load_tournament
+
+REPEAT = 5
+
+
+def build(team_count, rounds):
+    rng = random.Random(3)
+    t = Tournament(name="Bench", tournament_type="doublette", terrain_count=team_count // 2,
+                   seed=1)
+    t.add_teams([[f"Joueur {i}a", f"Joueur {i}b"] for i in range(team_count)])
+    t.generate_first_round_matches()
+    for _ in range(rounds - 1):
+        for match in t.get_matches_by_round(t.current_round):
+            if not match.is_bye:
+                t.update_match_score(match.id, 13, rng.randint(0, 12))
+        t.generate_next_round_matches()
+    return t
+
+
+def save_to_database(tournament, path):
+    db = DatabaseManager(path)
+    tournament.id = db.create_tournament(tournament.name, tournament.tournament_type,
+                                         tournament.terrain_count, tournament.format,
+                                         tournament.seed)
+    saver = AutoSaver(tournament, db.save_changes)
+    for team in tournament.teams:
+        saver.dirty_teams[team.id] = team
+    for match in tournament.matches:
+        saver.dirty_matches[match.id] = match
+    saver.round_dirty = True
+    saver.first_change = saver.last_change = 0.0
+    saver.close()
+    return db
+
+
+def best_of(function):
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def state(t):
+    return ([(team.id, team.number, team.get_players_names()) for team in t.teams],
+            [(m.id, m.team1.id, m.team2.id if not m.is_bye else None, m.score1, m.score2,
+              m.completed) for m in t.matches])
+
+
+def main():
+    team_count = int(sys.argv[1]) if len(sys.argv) > 1 else 512
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    tournament = build(team_count, rounds)
+    directory = tempfile.mkdtemp()
+    db_path = os.path.join(directory, "bench.db")
+    snapshot_path = os.path.join(directory, "bench.ptq")
+    print(f"{team_count} équipes, {len(tournament.matches)} matchs ({rounds} tours)")
+
+    start = time.perf_counter()
+    db = save_to_database(tournament, db_path)
+    db_write = time.perf_counter() - start
+    snapshot_write, _ = best_of(lambda: snapshot.save(tournament, snapshot_path))
+
+    db_load, from_db = best_of(lambda: load_tournament(DatabaseManager(db_path), tournament.id))
+    snapshot_load, from_snapshot = best_of(lambda: snapshot.load(snapshot_path))
+    assert state(from_db) == state(tournament) == state(from_snapshot), "relecture différente"
+
+    def open_only():
+        with Snapshot.open(snapshot_path) as s:
+            return s.match_count
+
+    def scan_scores():
+        with Snapshot.open(snapshot_path) as s:
+            return sum(score for score in s.column("match_score1") if score > 0)
+
+    open_time, _ = best_of(open_only)
+    scan_time, _ = best_of(scan_scores)
+    db.close()
+
+    wal = db_path + "-wal"
+    db_size = os.path.getsize(db_path) + (os.path.getsize(wal) if os.path.exists(wal) else 0)
+    print(f"{'':<28} {'SQLite':>12} {'instantané':>12}")
+    print(f"{'taille (Kio)':<28} {db_size / 1024:12.0f} "
+          f"{os.path.getsize(snapshot_path) / 1024:12.0f}")
+    print(f"{'écriture (ms)':<28} {db_write * 1000:12.2f} {snapshot_write * 1000:12.2f}")
+    print(f"{'rechargement complet (ms)':<28} {db_load * 1000:12.2f} {snapshot_load * 1000:12.2f}")
+    print(f"{'ouverture (en-tête, ms)':<28} {'':>12} {open_time * 1000:12.3f}")
+    print(f"{'parcours des scores (ms)':<28} {'':>12} {scan_time * 1000:12.3f}")
+
+
+if __name__ == "__main__":
+    main()
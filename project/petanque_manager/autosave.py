@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sauvegarde automatique incrémentale
+
+Un AutoSaver suit les événements du tournoi et note les équipes et matchs
+modifiés. Dès que les saisies se calment (`delay` secondes sans modification),
+et au plus tard `max_delay` secondes après la première modification non
+sauvegardée, il prélève l'état des seuls objets modifiés et le confie à un
+AutosaveWriter. Celui-ci écrit depuis son propre fil, avec sa propre connexion
+SQLite, en une transaction par lot : l'interface n'attend jamais le disque.
+Un lot dont l'écriture échoue n'est pas perdu : il est fusionné au lot suivant
+et réécrit avec lui, ou réessayé une dernière fois à l'arrêt de l'écrivain.
+"""
+
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional, Set
+
+from events import (TournamentEvent, TeamAdded, TeamRemoved, RoundGenerated, ScoreUpdated,
+                    MatchValidated)
+
+# Délais par défaut (secondes)
+AUTOSAVE_DELAY = 2.0
+AUTOSAVE_MAX_DELAY = 10.0
+
+def team_row(team) -> tuple:
+    """État d'une équipe : (numéro, [noms des joueurs], club, ligue, tête de série)"""
+    return (team.number, [p.name for p in team.players], team.club, team.league, team.seeded)
+
+def composite_row(team) -> tuple:
+    """Équipe composée pour un match (quadrette) : (numéro, [noms], [équipes inscrites])"""
+    return (team.number, [p.name for p in team.players], list(team.members))
+
+def match_row(m) -> tuple:
+    """État d'un match, dans l'ordre des colonnes de Changes.matches"""
+    return (
+        m.round_number, m.team1.id, None if m.is_bye else m.team2.id,
+        m.score1, m.score2, m.terrain, m.completed, m.is_bye,
+        m.bracket, m.bracket_node, m.pool,
+    )
+
+@dataclass
+class Changes:
+    """Lignes à écrire pour un tournoi, indexées par identifiant en mémoire"""
+    tournament_id: int
+    current_round: Optional[int] = None
+    # État du générateur aléatoire après le dernier tirage (Tournament.rng_state)
+    rng_state: Optional[list] = None
+    # local_id -> (numéro, [noms des joueurs], club, ligue, tête de série)
+    teams: Dict[int, tuple] = field(default_factory=dict)
+    removed_teams: Set[int] = field(default_factory=set)
+    # local_id -> (numéro, [noms des joueurs], [local_id des équipes inscrites]) des
+    # équipes composées pour un match, écrites avec les matchs qui les opposent
+    composites: Dict[int, tuple] = field(default_factory=dict)
+    # local_id -> (tour, équipe1, équipe2 ou None, score1, score2, terrain, terminé,
+    #              exempt, tableau, nœud, poule)
+    matches: Dict[int, tuple] = field(default_factory=dict)
+    # (local_id de l'équipe, position) -> (nom, joués, victoires, défaites, pour, contre)
+    players: Dict[tuple, tuple] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return bool(self.current_round is not None or self.rng_state is not None
+                    or self.teams or self.removed_teams or self.composites
+                    or self.matches or self.players)
+
+    @property
+    def row_count(self) -> int:
+        return (len(self.teams) + len(self.removed_teams) + len(self.composites)
+                + len(self.matches) + len(self.players))
+
+    def merge(self, newer: "Changes"):
+        """Fusionner un lot plus récent (le dernier état l'emporte)"""
+        if newer.current_round is not None:
+            self.current_round = newer.current_round
+        if newer.rng_state is not None:
+            self.rng_state = newer.rng_state
+        for local_id in newer.removed_teams:
+            self.teams.pop(local_id, None)
+        self.removed_teams |= newer.removed_teams
+        for local_id, row in newer.teams.items():
+            self.removed_teams.discard(local_id)
+            self.teams[local_id] = row
+        self.composites.update(newer.composites)
+        self.matches.update(newer.matches)
+        self.players.update(newer.players)
+
+class AutoSaver:
+    """Suivi des modifications d'un tournoi et déclenchement différé des écritures"""
+
+    def __init__(self, tournament, submit: Callable[[Changes], None],
+                 delay: float = AUTOSAVE_DELAY, max_delay: float = AUTOSAVE_MAX_DELAY,
+                 clock: Callable[[], float] = time.monotonic):
+        self.tournament = tournament
+        self.submit = submit
+        self.delay = delay
+        self.max_delay = max_delay
+        self.clock = clock
+        self.dirty_teams: Dict[int, object] = {}
+        self.removed_teams: Set[int] = set()
+        self.dirty_matches: Dict[int, object] = {}
+        self.round_dirty = False
+        # Lot prélevé dont l'envoi a échoué, renvoyé avec le suivant
+        self.unsent: Optional[Changes] = None
+        # Instant de la première modification non sauvegardée et de la dernière
+        self.first_change: Optional[float] = None
+        self.last_change: Optional[float] = None
+        tournament.events.subscribe(TournamentEvent, self.on_event)
+
+    @property
+    def dirty(self) -> bool:
+        return self.first_change is not None
+
+    def on_event(self, event: TournamentEvent):
+        """Noter ce qui a changé ; aucun accès disque ici"""
+        if isinstance(event, TeamAdded):
+            self.dirty_teams[event.team.id] = event.team
+            self.removed_teams.discard(event.team.id)
+        elif isinstance(event, TeamRemoved):
+            self.dirty_teams.pop(event.team_id, None)
+            self.removed_teams.add(event.team_id)
+            # Les équipes suivantes sont renumérotées
+            for team in self.tournament.teams:
+                self.dirty_teams[team.id] = team
+        elif isinstance(event, RoundGenerated):
+            self.round_dirty = True
+            for match in event.matches:
+                self.dirty_matches[match.id] = match
+        elif isinstance(event, (ScoreUpdated, MatchValidated)):
+            self.dirty_matches[event.match.id] = event.match
+        else:
+            return
+        now = self.clock()
+        if self.first_change is None:
+            self.first_change = now
+        self.last_change = now
+
+    def due(self) -> bool:
+        """Vrai si les saisies se sont calmées ou si la fenêtre de perte maximale est atteinte"""
+        if self.first_change is None:
+            return False
+        now = self.clock()
+        return now - self.last_change >= self.delay or now - self.first_change >= self.max_delay
+
+    def poll(self) -> bool:
+        """À appeler périodiquement : sauvegarder si c'est le moment"""
+        if self.due():
+            self.save()
+            return True
+        return False
+
+    def take(self) -> Changes:
+        """Prélever l'état actuel des seuls objets modifiés et repartir de zéro"""
+        changes = Changes(self.tournament.id)
+        if self.round_dirty:
+            changes.current_round = self.tournament.current_round
+            changes.rng_state = self.tournament.rng_state()
+        for team_id, team in self.dirty_teams.items():
+            changes.teams[team_id] = team_row(team)
+        changes.removed_teams = set(self.removed_teams)
+        for match_id, m in self.dirty_matches.items():
+            changes.matches[match_id] = match_row(m)
+            for team in (m.team1, None if m.is_bye else m.team2):
+                if team is not None and team.members:
+                    changes.composites[team.id] = composite_row(team)
+        # Totaux des joueurs modifiés par les résultats comptés depuis le dernier prélèvement
+        changes.players = self.tournament.player_results.take_rows()
+        self.dirty_teams = {}
+        self.removed_teams = set()
+        self.dirty_matches = {}
+        self.round_dirty = False
+        self.first_change = self.last_change = None
+        return changes
+
+    def save(self):
+        """Confier immédiatement les modifications en attente à l'écrivain"""
+        if (self.dirty or self.unsent) and self.tournament.id is not None:
+            changes = self.take()
+            if self.unsent is not None:
+                self.unsent.merge(changes)
+                changes, self.unsent = self.unsent, None
+            try:
+                self.submit(changes)
+            except Exception:
+                # Rien n'est perdu : le lot repartira avec la prochaine sauvegarde
+                self.unsent = changes
+                raise
+
+    def close(self):
+        """Sauvegarder ce qui reste et cesser le suivi"""
+        self.save()
+        self.tournament.events.unsubscribe(TournamentEvent, self.on_event)
+
+class AutosaveWriter:
+    """Fil d'écriture dédié : les lots en file sont fusionnés puis écrits en une transaction"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.queue: "queue.Queue[Optional[Changes]]" = queue.Queue()
+        self.thread: Optional[threading.Thread] = None
+        self.saves = 0
+        self.rows_written = 0
+        self.last_error: Optional[Exception] = None
+        # Lots non écrits par tournoi, fusionnés aux lots suivants pour être réessayés
+        self.failed: Dict[int, Changes] = {}
+
+    def submit(self, changes: Changes):
+        """Mettre un lot en file (appelé depuis le fil de l'interface)"""
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+            self.thread.start()
+        self.queue.put(changes)
+
+    def _run(self):
+        from store import DatabaseManager
+
+        db = DatabaseManager(self.db_path)
+        try:
+            while True:
+                changes = self.queue.get()
+                # Regrouper les lots en échec et ceux arrivés pendant l'écriture précédente ;
+                # à l'arrêt, les lots en échec sont réessayés une dernière fois
+                batches, self.failed = self.failed, {}
+                taken = 1
+                stop = changes is None
+                if not stop:
+                    self._collect(batches, changes)
+                while not stop:
+                    try:
+                        newer = self.queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    taken += 1
+                    if newer is None:
+                        stop = True
+                    else:
+                        self._collect(batches, newer)
+                for batch in batches.values():
+                    try:
+                        self.rows_written += db.save_changes(batch)
+                        self.saves += 1
+                    except Exception as e:  # Conserver l'erreur pour l'interface
+                        self.last_error = e
+                        self.failed[batch.tournament_id] = batch
+                for _ in range(taken):
+                    self.queue.task_done()
+                if stop:
+                    return
+        finally:
+            db.close()
+
+    @staticmethod
+    def _collect(batches: Dict[int, Changes], changes: Changes):
+        if changes.tournament_id in batches:
+            batches[changes.tournament_id].merge(changes)
+        else:
+            batches[changes.tournament_id] = changes
+
+    def flush(self):
+        """Attendre que tous les lots en file soient écrits"""
+        if self.thread is not None:
+            self.queue.join()
+
+    def close(self):
+        """Écrire les lots restants et arrêter le fil
+
+        Lève la dernière erreur d'écriture si des lots n'ont toujours pas pu être
+        écrits : ils restent dans `failed`.
+        """
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+        if self.failed:
+            raise self.last_error
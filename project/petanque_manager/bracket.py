@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tableaux à élimination directe (concours A, B, C)
+
+Chaque tableau est un arbre binaire implicite stocké dans une liste :
+le nœud i a pour enfants 2i+1 et 2i+2, les feuilles (les équipes placées)
+occupent les indices size-1 à 2*size-2. La case d'un nœud interne reçoit
+l'identifiant du vainqueur du match correspondant, ce qui permet de faire
+avancer une équipe en O(1) lorsqu'un résultat est saisi.
+"""
+
+from typing import Callable, Dict, List, Optional
+
+from tournament import Match, Team
+
+# Valeurs spéciales des cases (les identifiants d'équipe sont >= 1)
+EMPTY = -1
+BYE = 0
+
+# Noms des tableaux successifs : les perdants du 1er tour de A vont en B, etc.
+BRACKET_NAMES = ["A", "B", "C"]
+
+def seeding_order(size: int) -> List[int]:
+    """Ordre des têtes de série sur les feuilles (1 et 2 ne se croisent qu'en finale)"""
+    order = [1]
+    while len(order) < size:
+        total = len(order) * 2 + 1
+        order = [seed for s in order for seed in (s, total - s)]
+    return order
+
+def bracket_size(team_count: int) -> int:
+    """Plus petite puissance de deux pouvant accueillir toutes les équipes"""
+    size = 1
+    while size < team_count:
+        size *= 2
+    return size
+
+class Bracket:
+    """Tableau à élimination directe sous forme d'arbre implicite"""
+
+    def __init__(self, name: str, size: int):
+        self.name = name
+        self.size = max(2, size)
+        self.slots: List[int] = [EMPTY] * (2 * self.size - 1)
+        # Appelé avec (tableau, nœud, perdant) quand un match du 1er tour est joué
+        self.on_first_round_loser: Optional[Callable[["Bracket", int, int], None]] = None
+
+    @property
+    def first_leaf(self) -> int:
+        return self.size - 1
+
+    def is_leaf(self, node: int) -> bool:
+        return node >= self.first_leaf
+
+    def children(self, node: int):
+        return 2 * node + 1, 2 * node + 2
+
+    def is_first_round(self, node: int) -> bool:
+        return 2 * node + 1 >= self.first_leaf
+
+    def depth(self, node: int) -> int:
+        return (node + 1).bit_length() - 1
+
+    def round_label(self, node: int) -> str:
+        """Nom du tour d'un nœud : Finale, 1/2, 1/4..."""
+        depth = self.depth(node)
+        if depth == 0:
+            return "Finale"
+        return f"1/{2 ** depth}"
+
+    def place(self, seeded_team_ids: List[int]):
+        """Placer les équipes par ordre de tête de série ; les places restantes sont des BYE"""
+        for leaf, seed in enumerate(seeding_order(self.size)):
+            team_id = seeded_team_ids[seed - 1] if seed <= len(seeded_team_ids) else BYE
+            self.set_leaf(leaf, team_id)
+
+    def set_leaf(self, leaf: int, team_id: int):
+        """Remplir une feuille (équipe ou BYE) et résoudre le match parent si possible"""
+        node = self.first_leaf + leaf
+        self.slots[node] = team_id
+        self._resolve((node - 1) // 2)
+
+    def _resolve(self, node: int):
+        """Faire avancer automatiquement une équipe opposée à un BYE"""
+        while node >= 0 and self.slots[node] == EMPTY:
+            left, right = (self.slots[c] for c in self.children(node))
+            if left == EMPTY or right == EMPTY:
+                return
+            if left != BYE and right != BYE:
+                return
+            winner = left if right == BYE else right
+            self.slots[node] = winner
+            if self.is_first_round(node) and self.on_first_round_loser:
+                self.on_first_round_loser(self, node, BYE)
+            node = (node - 1) // 2
+
+    def playable_nodes(self) -> List[int]:
+        """Matchs dont les deux adversaires sont connus et pas encore joués"""
+        nodes = []
+        for node in range(self.first_leaf):
+            if self.slots[node] != EMPTY:
+                continue
+            left, right = (self.slots[c] for c in self.children(node))
+            if left > BYE and right > BYE:
+                nodes.append(node)
+        return nodes
+
+    def record_result(self, node: int, winner_id: int):
+        """Enregistrer le vainqueur d'un match : O(1) hors cascade de BYE"""
+        left, right = (self.slots[c] for c in self.children(node))
+        if winner_id not in (left, right):
+            raise ValueError("Le vainqueur ne fait pas partie de ce match")
+        self.slots[node] = winner_id
+        if self.is_first_round(node) and self.on_first_round_loser:
+            loser = right if winner_id == left else left
+            self.on_first_round_loser(self, node, loser)
+        if node > 0:
+            self._resolve((node - 1) // 2)
+
+    def advanced_to(self, node: int, team_id: int) -> List[int]:
+        """Cases occupées par une équipe depuis `node` en remontant (BYE franchis compris)"""
+        path = []
+        while node >= 0 and self.slots[node] == team_id:
+            path.append(node)
+            node = (node - 1) // 2 if node > 0 else -1
+        return path
+
+    def winner(self) -> Optional[int]:
+        """Vainqueur du tableau, ou None s'il n'est pas terminé"""
+        return self.slots[0] if self.slots[0] > BYE else None
+
+class Concours:
+    """Concours principal A et consolantes B/C menés côte à côte"""
+
+    def __init__(self, teams: List[Team], levels: int = 2):
+        self.teams: Dict[int, Team] = {team.id: team for team in teams}
+        self.brackets: Dict[str, Bracket] = {}
+        size = bracket_size(len(teams))
+        # Une consolante n'a de sens qu'avec au moins deux perdants à accueillir
+        names = [
+            name for i, name in enumerate(BRACKET_NAMES[:max(1, levels)])
+            if i == 0 or size // (2 ** i) >= 2
+        ]
+        for i, name in enumerate(names):
+            bracket = Bracket(name, size // (2 ** i))
+            self.brackets[name] = bracket
+            if i + 1 < len(names):
+                bracket.on_first_round_loser = self._send_to_consolante
+        self.next_bracket = {names[i]: names[i + 1] for i in range(len(names) - 1)}
+        # Match en cours par (tableau, nœud)
+        self.matches: Dict[tuple, Match] = {}
+
+    def place_teams(self, seeded_team_ids: List[int]):
+        """Placer les équipes du concours A par ordre de tête de série"""
+        self.brackets[BRACKET_NAMES[0]].place(seeded_team_ids)
+
+    def _send_to_consolante(self, bracket: Bracket, node: int, loser: int):
+        """Le perdant du nœud de 1er tour k occupe la feuille k du tableau suivant"""
+        target = self.brackets[self.next_bracket[bracket.name]]
+        target.set_leaf(node - (bracket.size // 2 - 1), loser)
+
+    def create_matches(self, round_number: int, next_match_id: int) -> List[Match]:
+        """Créer les matchs devenus jouables dans tous les tableaux"""
+        matches = []
+        for name, bracket in self.brackets.items():
+            for node in bracket.playable_nodes():
+                if (name, node) in self.matches:
+                    continue
+                left, right = (bracket.slots[c] for c in bracket.children(node))
+                match = Match(
+                    id=next_match_id,
+                    round_number=round_number,
+                    team1=self.teams[left],
+                    team2=self.teams[right],
+                    bracket=name,
+                    bracket_node=node
+                )
+                self.matches[(name, node)] = match
+                matches.append(match)
+                next_match_id += 1
+        return matches
+
+    def _paths(self, bracket: Bracket, node: int, winner_id: int):
+        """Cases à vider pour changer le vainqueur d'un nœud : [(tableau, cases)]
+
+        Le vainqueur actuel a pu avancer par des BYE, et le perdant d'un match du
+        1er tour occupe une feuille du tableau suivant. Lève ValueError si l'une
+        de ces équipes a déjà un match tiré plus loin.
+        """
+        left, right = (bracket.slots[c] for c in bracket.children(node))
+        paths = [(bracket, bracket.advanced_to(node, winner_id))]
+        if bracket.is_first_round(node) and bracket.name in self.next_bracket:
+            target = self.brackets[self.next_bracket[bracket.name]]
+            leaf = target.first_leaf + node - (bracket.size // 2 - 1)
+            paths.append((target, target.advanced_to(leaf, right if winner_id == left else left)))
+        for target, path in paths:
+            top = path[-1]
+            if top > 0 and (target.name, (top - 1) // 2) in self.matches:
+                raise ValueError("Le match suivant est déjà tiré : le vainqueur ne peut plus changer")
+        return paths
+
+    def check_correction(self, match: Match, score1: int, score2: int):
+        """Lever ValueError si un score corrigé change un vainqueur déjà engagé plus loin"""
+        if match.bracket not in self.brackets or match.bracket_node is None:
+            return
+        bracket = self.brackets[match.bracket]
+        current = bracket.slots[match.bracket_node]
+        winner = match.team1 if score1 > score2 else match.team2
+        if current > BYE and current != winner.id:
+            self._paths(bracket, match.bracket_node, current)
+
+    def apply_result(self, match: Match):
+        """Faire avancer le vainqueur d'un match terminé (ou corrigé)"""
+        if match.bracket not in self.brackets or match.bracket_node is None:
+            return
+        bracket = self.brackets[match.bracket]
+        winner = match.get_winner()
+        current = bracket.slots[match.bracket_node]
+        if winner is None or current == winner.id:
+            return
+        if current != EMPTY:
+            # Vainqueur corrigé : retirer l'ancien vainqueur et l'ancien perdant
+            # des cases où ils avaient avancé, puis propager le nouveau résultat
+            for target, path in self._paths(bracket, match.bracket_node, current):
+                for node in path:
+                    target.slots[node] = EMPTY
+        bracket.record_result(match.bracket_node, winner.id)
+
+    def round_label(self, match: Match) -> str:
+        """Libellé d'un match de tableau, par ex. « B 1/4 »"""
+        bracket = self.brackets[match.bracket]
+        return f"{match.bracket} {bracket.round_label(match.bracket_node)}"
+
+    def is_finished(self) -> bool:
+        return all(bracket.slots[0] != EMPTY for bracket in self.brackets.values())
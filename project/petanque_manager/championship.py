@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Calendrier de championnat (toutes rondes) par la méthode du cercle
+
+Les rondes sont produites à la demande par un générateur : seule la ronde
+en cours existe en mémoire, jamais les N(N-1)/2 matchs du championnat.
+"""
+
+from typing import Iterator, List, Optional, Tuple
+
+Pairing = Tuple[Optional[int], Optional[int]]
+
+def round_robin_schedule(count: int) -> Iterator[List[Pairing]]:
+    """Produire les rondes d'un championnat entre `count` équipes (indices 0..count-1)
+
+    Avec un nombre impair d'équipes, une équipe est exempte à chaque ronde
+    (paire contenant None). Le premier élément de chaque paire reçoit : les
+    réceptions alternent d'une ronde à l'autre, l'écart entre réceptions et
+    déplacements d'une équipe n'excède pas un.
+    """
+    slots: List[Optional[int]] = list(range(count))
+    if count % 2:
+        # L'exempt occupe la case fixe : toutes les équipes tournent et alternent
+        slots.insert(0, None)
+    size = len(slots)
+    half = size // 2
+
+    for round_index in range(size - 1):
+        pairs = []
+        for i in range(half):
+            home, away = slots[i], slots[size - 1 - i]
+            # L'équipe fixe alterne ; les autres paires alternent selon leur position
+            if (i == 0 and round_index % 2) or (i > 0 and i % 2):
+                home, away = away, home
+            pairs.append((home, away))
+        yield pairs
+        # Rotation : la première case reste fixe, les autres tournent d'un cran
+        slots = [slots[0], slots[-1]] + slots[1:-1]
+
+def round_count(count: int) -> int:
+    """Nombre de rondes d'un championnat à `count` équipes"""
+    return count - 1 if count % 2 == 0 else count
+
+def assign_terrains(pair_count: int, round_index: int, terrain_count: int) -> List[Optional[int]]:
+    """Terrains des matchs d'une ronde, décalés d'une ronde à l'autre pour varier les terrains
+
+    Au-delà de `terrain_count` matchs, les suivants n'ont pas de terrain (None) :
+    ils attendent qu'un terrain se libère, comme dans pairing_search.
+    """
+    if terrain_count <= 0:
+        return [None] * pair_count
+    return [(i + round_index) % terrain_count + 1 if i < terrain_count else None
+            for i in range(pair_count)]
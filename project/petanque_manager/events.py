@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Événements émis par un Tournament à chaque modification
+
+Chaque événement porte exactement ce qui a changé. Les abonnés (widgets,
+sauvegarde, exports) se limitent ainsi aux lignes concernées ; un
+EventBatcher regroupe une rafale d'événements pour ne redessiner qu'une fois.
+"""
+
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Type
+
+@dataclass
+class TournamentEvent:
+    """Classe de base des événements"""
+
+@dataclass
+class TeamAdded(TournamentEvent):
+    team: object
+
+@dataclass
+class TeamRemoved(TournamentEvent):
+    team_id: int
+
+@dataclass
+class RoundGenerated(TournamentEvent):
+    round_number: int
+    matches: list
+
+@dataclass
+class ScoreUpdated(TournamentEvent):
+    """Saisie en cours (score ou terrain) sur un match pas encore validé"""
+    match: object
+
+@dataclass
+class MatchValidated(TournamentEvent):
+    """Match terminé ; corrected indique la correction d'un score déjà validé"""
+    match: object
+    corrected: bool = False
+
+Handler = Callable[[TournamentEvent], None]
+
+class EventBus:
+    """Abonnements par type d'événement et diffusion synchrone"""
+
+    def __init__(self):
+        self.handlers: Dict[type, List[Handler]] = defaultdict(list)
+        # Événements retenus pendant un bloc held(), None hors d'un tel bloc
+        self.held: Optional[List[TournamentEvent]] = None
+
+    def subscribe(self, event_type: Type[TournamentEvent], handler: Handler):
+        """S'abonner à un type d'événement (TournamentEvent pour tous)"""
+        self.handlers[event_type].append(handler)
+
+    def unsubscribe(self, event_type: Type[TournamentEvent], handler: Handler):
+        if handler in self.handlers.get(event_type, []):
+            self.handlers[event_type].remove(handler)
+
+    def emit(self, event: TournamentEvent):
+        """Diffuser un événement aux abonnés de son type puis aux abonnés de tous les types"""
+        if self.held is not None:
+            self.held.append(event)
+            return
+        for handler in list(self.handlers.get(type(event), ())):
+            handler(event)
+        if type(event) is not TournamentEvent:
+            for handler in list(self.handlers.get(TournamentEvent, ())):
+                handler(event)
+
+    @contextmanager
+    def hold(self):
+        """Retenir les événements pendant une opération, puis les diffuser dans l'ordre"""
+        if self.held is not None:
+            yield
+            return
+        self.held = []
+        try:
+            yield
+        finally:
+            events, self.held = self.held, None
+            for event in events:
+                self.emit(event)
+
+class EventBatcher:
+    """Regrouper les événements d'une rafale et les traiter en un seul appel
+
+    `schedule` programme l'appel différé de flush (par ex. QTimer.singleShot(0, ...)
+    dans l'interface) ; il n'est appelé qu'une fois par rafale.
+    """
+
+    def __init__(self, bus: EventBus, handler: Callable[[List[TournamentEvent]], None],
+                 schedule: Callable[[Callable[[], None]], None]):
+        self.handler = handler
+        self.schedule = schedule
+        self.pending: List[TournamentEvent] = []
+        self.bus = bus
+        bus.subscribe(TournamentEvent, self.on_event)
+
+    def on_event(self, event: TournamentEvent):
+        if not self.pending:
+            self.schedule(self.flush)
+        self.pending.append(event)
+
+    def flush(self):
+        """Traiter les événements en attente"""
+        events, self.pending = self.pending, []
+        if events:
+            self.handler(events)
+
+    def close(self):
+        """Se désabonner du bus"""
+        self.bus.unsubscribe(TournamentEvent, self.on_event)
+        self.pending = []
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Export des classements et de l'historique des matchs (CSV, JSON Lines, HTML)
+
+Les exporteurs consomment un itérable de dictionnaires et écrivent chaque
+ligne dès qu'elle est lue : un curseur SQLite (DatabaseManager.iter_matches,
+iter_team_stats) ou un générateur sur un Tournament en mémoire. La mémoire
+utilisée reste constante quel que soit le volume exporté.
+"""
+
+import csv
+import html
+import json
+import os
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from tournament import Tournament
+
+# Colonnes exportées, dans l'ordre
+MATCH_COLUMNS = [
+    "tournament_id", "round_number", "id", "terrain",
+    "team1_number", "team1_players", "score1",
+    "score2", "team2_number", "team2_players",
+    "completed", "is_bye", "bracket", "pool",
+]
+STANDINGS_COLUMNS = [
+    "tournament_id", "position", "number", "players",
+    "wins", "losses", "points_for", "points_against",
+]
+
+# En-têtes lisibles pour le HTML
+COLUMN_LABELS = {
+    "tournament_id": "Tournoi",
+    "round_number": "Tour",
+    "id": "Match",
+    "terrain": "Terrain",
+    "team1_number": "Équipe 1",
+    "team1_players": "Joueurs 1",
+    "score1": "Score 1",
+    "score2": "Score 2",
+    "team2_number": "Équipe 2",
+    "team2_players": "Joueurs 2",
+    "completed": "Terminé",
+    "is_bye": "Exempt",
+    "bracket": "Tableau",
+    "pool": "Poule",
+    "position": "Position",
+    "number": "Équipe",
+    "players": "Joueurs",
+    "wins": "Victoires",
+    "losses": "Défaites",
+    "points_for": "Points pour",
+    "points_against": "Points contre",
+}
+
+FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".html": "html", ".htm": "html"}
+
+def tournament_match_rows(tournament: Tournament) -> Iterator[Dict]:
+    """Matchs d'un tournoi en mémoire, au format des lignes de la base"""
+    for match in tournament.matches:
+        yield {
+            "tournament_id": tournament.id,
+            "round_number": match.round_number,
+            "id": match.id,
+            "terrain": match.terrain,
+            "team1_number": match.team1.number,
+            "team1_players": ",".join(p.name for p in match.team1.players),
+            "score1": match.score1,
+            "score2": match.score2,
+            "team2_number": None if match.is_bye else match.team2.number,
+            "team2_players": None if match.is_bye else ",".join(p.name for p in match.team2.players),
+            "completed": match.completed,
+            "is_bye": match.is_bye,
+            "bracket": match.bracket,
+            "pool": match.pool,
+        }
+
+def tournament_standings_rows(tournament: Tournament) -> Iterator[Dict]:
+    """Classement d'un tournoi en mémoire, au format des lignes de la base"""
+    for position, stats in enumerate(tournament.get_all_stats(), 1):
+        yield {
+            "tournament_id": tournament.id,
+            "position": position,
+            "number": stats.team.number,
+            "players": stats.team.get_players_names(),
+            "wins": stats.wins,
+            "losses": stats.losses,
+            "points_for": stats.points_for,
+            "points_against": stats.points_against,
+        }
+
+def ranked(rows: Iterable[Dict]) -> Iterator[Dict]:
+    """Ajouter la position aux lignes de classement (triées par tournoi puis rang)"""
+    current, position = object(), 0
+    for row in rows:
+        if row.get("tournament_id") != current:
+            current, position = row.get("tournament_id"), 0
+        position += 1
+        row["position"] = position
+        yield row
+
+def write_csv(rows: Iterable[Dict], path: str, columns: List[str]) -> int:
+    """Écrire les lignes en CSV, retourne le nombre de lignes"""
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=columns, extrasaction="ignore")
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+def write_jsonl(rows: Iterable[Dict], path: str, columns: List[str]) -> int:
+    """Écrire une ligne JSON par enregistrement, retourne le nombre de lignes"""
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps({c: row.get(c) for c in columns}, ensure_ascii=False))
+            f.write("\n")
+            count += 1
+    return count
+
+def write_html(rows: Iterable[Dict], path: str, columns: List[str],
+               title: str = "Résultats") -> int:
+    """Écrire une page HTML statique avec un tableau, retourne le nombre de lignes"""
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("<!DOCTYPE html>\n<html lang=\"fr\">\n<head>\n<meta charset=\"utf-8\">\n")
+        f.write(f"<title>{html.escape(title)}</title>\n")
+        f.write("<style>table{border-collapse:collapse}"
+                "th,td{border:1px solid #999;padding:2px 6px}"
+                "th{background:#ddd}</style>\n</head>\n<body>\n")
+        f.write(f"<h1>{html.escape(title)}</h1>\n<table>\n<thead><tr>")
+        f.write("".join(f"<th>{html.escape(COLUMN_LABELS.get(c, c))}</th>" for c in columns))
+        f.write("</tr></thead>\n<tbody>\n")
+        for row in rows:
+            cells = ("" if row.get(c) is None else html.escape(str(row.get(c))) for c in columns)
+            f.write("<tr>" + "".join(f"<td>{cell}</td>" for cell in cells) + "</tr>\n")
+            count += 1
+        f.write("</tbody>\n</table>\n</body>\n</html>\n")
+    return count
+
+def export_rows(rows: Iterable[Dict], path: str, columns: List[str],
+                title: str = "Résultats", export_format: Optional[str] = None) -> int:
+    """Exporter des lignes dans le format déduit de l'extension du fichier"""
+    if export_format is None:
+        export_format = FORMATS.get(os.path.splitext(path)[1].lower())
+    if export_format == "csv":
+        return write_csv(rows, path, columns)
+    if export_format == "jsonl":
+        return write_jsonl(rows, path, columns)
+    if export_format == "html":
+        return write_html(rows, path, columns, title)
+    raise ValueError(f"Format d'export inconnu : {path}")
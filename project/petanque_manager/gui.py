@@ -4,19 +4,36 @@
 Interface graphique principale de Pétanque Manager
 """
 
-from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
+import os
+import socket
+
+from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                              QTabWidget, QMenuBar, QAction, QStatusBar, 
                              QMessageBox, QDialog, QFormLayout, QLineEdit, 
                              QComboBox, QSpinBox, QPushButton, QDialogButtonBox,
-                             QLabel, QFrame)
-from PyQt5.QtCore import Qt, pyqtSignal
-from PyQt5.QtGui import QFont, QIcon
+                             QLabel, QFrame, QShortcut, QFileDialog, QInputDialog,
+                             QTabBar, QStackedWidget)
+from PyQt5.QtCore import Qt, pyqtSignal, QTimer
+from PyQt5.QtGui import QFont, QIcon, QKeySequence
 
-from tournament import Tournament
+from tournament import (Tournament, FORMAT_SWISS, FORMAT_CONCOURS, FORMAT_POOLS,
+                        FORMAT_CHAMPIONSHIP)
+from pools import POOL_ROUND_ROBIN, POOL_GSL
 from store import DatabaseManager
+from rating import RatingBook
+from export import export_rows, ranked, MATCH_COLUMNS, STANDINGS_COLUMNS
+from profiling import profiler, instrumented
+from events import EventBatcher, TeamAdded, TeamRemoved, MatchValidated
+from autosave import AutoSaver, AutosaveWriter, AUTOSAVE_DELAY, AUTOSAVE_MAX_DELAY
+from replication import ReplicationHub, ReplicaSeat, DEFAULT_PORT
+from pairing_search import PairingSearch, PAIRING_BUDGET
+from replay import Recorder
+import snapshot
+from workspace import Workspace, WORKSPACE_BUDGET, load_tournament
 from widgets.team_widget import TeamWidget
-from widgets.match_widget import MatchWidget
+from widgets.match_widget import MatchWidget, schedule_once
 from widgets.standings_widget import StandingsWidget
+from widgets.debug_widget import DebugWidget
 
 class NewTournamentDialog(QDialog):
     """Dialog pour créer un nouveau tournoi"""
@@ -25,7 +42,7 @@ class NewTournamentDialog(QDialog):
         super().__init__(parent)
         self.setWindowTitle("Nouveau Tournoi")
         self.setModal(True)
-        self.setFixedSize(400, 200)
+        self.setFixedSize(400, 240)
         
         self.setup_ui()
         
@@ -49,6 +66,20 @@ class NewTournamentDialog(QDialog):
         ])
         layout.addRow("Type de tournoi:", self.type_combo)
         
+        # Format de compétition
+        self.format_combo = QComboBox()
+        for label, data in [
+            ("Parties en suisse", (FORMAT_SWISS, 1, POOL_ROUND_ROBIN)),
+            ("Concours A", (FORMAT_CONCOURS, 1, POOL_ROUND_ROBIN)),
+            ("Concours A + consolante B", (FORMAT_CONCOURS, 2, POOL_ROUND_ROBIN)),
+            ("Concours A, B et C", (FORMAT_CONCOURS, 3, POOL_ROUND_ROBIN)),
+            ("Championnat (toutes rondes)", (FORMAT_CHAMPIONSHIP, 1, POOL_ROUND_ROBIN)),
+            ("Poules de 4 (toutes rondes) + tableau final", (FORMAT_POOLS, 1, POOL_ROUND_ROBIN)),
+            ("Poules de 4 (GSL) + tableau final", (FORMAT_POOLS, 1, POOL_GSL)),
+        ]:
+            self.format_combo.addItem(label, data)
+        layout.addRow("Format:", self.format_combo)
+        
         # Nombre de terrains
         self.terrain_spin = QSpinBox()
         self.terrain_spin.setMinimum(1)
@@ -69,12 +100,45 @@ class NewTournamentDialog(QDialog):
         
     def get_tournament_data(self):
         """Retourne les données du tournoi"""
+        tournament_format, concours_levels, pool_format = self.format_combo.currentData()
         return {
             'name': self.name_edit.text().strip(),
             'type': self.type_combo.currentText(),
-            'terrain_count': self.terrain_spin.value()
+            'terrain_count': self.terrain_spin.value(),
+            'format': tournament_format,
+            'concours_levels': concours_levels,
+            'pool_format': pool_format
         }
 
+class TournamentView(QTabWidget):
+    """Onglets Équipes/Joueurs, Matchs et Classement d'un tournoi"""
+    
+    def __init__(self, db_manager):
+        super().__init__()
+        self.tournament = None
+        
+        self.team_widget = TeamWidget()
+        self.team_widget.set_database(db_manager)
+        self.addTab(self.team_widget, "Équipes/Joueurs")
+        
+        self.match_widget = MatchWidget()
+        self.addTab(self.match_widget, "Matchs")
+        
+        self.standings_widget = StandingsWidget()
+        self.addTab(self.standings_widget, "Classement")
+        
+    def set_tournament(self, tournament: Tournament):
+        self.tournament = tournament
+        self.team_widget.set_tournament(tournament)
+        self.match_widget.set_tournament(tournament)
+        self.standings_widget.set_tournament(tournament)
+        
+    def shutdown(self):
+        """Arrêter les fils des widgets (recherche de joueurs, impressions)"""
+        if self.team_widget.player_search:
+            self.team_widget.player_search.stop()
+        self.match_widget.print_queue.shutdown()
+        
 class MainWindow(QMainWindow):
     """Fenêtre principale de l'application"""
     
@@ -82,8 +146,39 @@ class MainWindow(QMainWindow):
         super().__init__()
         self.tournament = None
         self.db_manager = DatabaseManager()
+        self.rating_book = RatingBook(self.db_manager)
         self.dark_theme = False
         
+        # Sauvegarde automatique : suivi sur ce fil, écriture sur un fil dédié
+        self.autosave_writer = AutosaveWriter(self.db_manager.db_path)
+        self.autosave_max_delay = AUTOSAVE_MAX_DELAY
+        self.autosave_timer = QTimer(self)
+        self.autosave_timer.setInterval(500)
+        self.autosave_timer.timeout.connect(self.poll_autosave)
+        self.autosave_timer.start()
+        
+        # Tournois ouverts : seuls les plus récemment consultés restent en mémoire,
+        # chacun avec ses onglets, sa sauvegarde automatique et son regroupement d'événements
+        self.workspace = Workspace(self.load_tournament, self.unload_tournament,
+                                   WORKSPACE_BUDGET, self.is_pinned)
+        self.views = {}
+        self.autosavers = {}
+        self.event_batchers = {}
+        
+        # Tirages : meilleur candidat trouvé dans le temps fixé par l'organisateur
+        self.pairing_search = PairingSearch(PAIRING_BUDGET)
+        
+        # Journal des opérations pour rejouer la séance (replay.py)
+        self.recorder = None
+        self.record_file = None
+        
+        # Réplication entre postes : hub (poste hôte) et poste local
+        self.replication_hub = None
+        self.replica = None
+        self.replication_timer = QTimer(self)
+        self.replication_timer.setInterval(20)
+        self.replication_timer.timeout.connect(self.poll_replication)
+        
         self.setup_ui()
         self.setup_menu()
         self.setup_status_bar()
@@ -113,6 +208,14 @@ class MainWindow(QMainWindow):
         self.tournament_label.setStyleSheet("font-weight: bold; color: #666;")
         toolbar_layout.addWidget(self.tournament_label)
         
+        # Un onglet par tournoi ouvert
+        self.workspace_tabs = QTabBar()
+        self.workspace_tabs.setTabsClosable(True)
+        self.workspace_tabs.setExpanding(False)
+        self.workspace_tabs.currentChanged.connect(self.switch_tournament)
+        self.workspace_tabs.tabCloseRequested.connect(self.close_tournament_tab)
+        toolbar_layout.addWidget(self.workspace_tabs)
+        
         toolbar_layout.addStretch()
         main_layout.addLayout(toolbar_layout)
         
@@ -122,30 +225,83 @@ class MainWindow(QMainWindow):
         separator.setFrameShadow(QFrame.Sunken)
         main_layout.addWidget(separator)
         
-        # Onglets
-        self.tab_widget = QTabWidget()
-        main_layout.addWidget(self.tab_widget)
+        self.debug_widget = DebugWidget(self.db_manager)
         
-        # Onglet Équipes/Joueurs
-        self.team_widget = TeamWidget()
-        self.tab_widget.addTab(self.team_widget, "Équipes/Joueurs")
+        # Onglets du tournoi affiché ; passer d'un tournoi à l'autre ne fait que
+        # changer la page affichée
+        self.view_stack = QStackedWidget()
+        main_layout.addWidget(self.view_stack)
+        self.empty_view = TournamentView(self.db_manager)
+        self.view_stack.addWidget(self.empty_view)
+        self.tab_widget = self.empty_view
+        self.show_view(self.empty_view)
         
-        # Onglet Matchs
-        self.match_widget = MatchWidget()
-        self.tab_widget.addTab(self.match_widget, "Matchs")
-        
-        # Onglet Classement
-        self.standings_widget = StandingsWidget()
-        self.tab_widget.addTab(self.standings_widget, "Classement")
-        
-        # Connexions des signaux
-        self.team_widget.teams_changed.connect(self.on_teams_changed)
-        self.match_widget.match_completed.connect(self.on_match_completed)
+        # Onglet de débogage caché (Ctrl+Maj+D), visible d'emblée si le profilage est actif
+        if profiler.enabled:
+            self.toggle_debug_tab()
+        debug_shortcut = QShortcut(QKeySequence("Ctrl+Shift+D"), self)
+        debug_shortcut.activated.connect(self.toggle_debug_tab)
         
     def setup_menu(self):
         """Configuration du menu"""
         menubar = self.menuBar()
         
+        # Menu Fichier
+        file_menu = menubar.addMenu("Fichier")
+        
+        export_matches_action = QAction("Exporter l'historique des matchs...", self)
+        export_matches_action.triggered.connect(lambda: self.export_season("matches"))
+        file_menu.addAction(export_matches_action)
+        
+        export_standings_action = QAction("Exporter les classements...", self)
+        export_standings_action.triggered.connect(lambda: self.export_season("standings"))
+        file_menu.addAction(export_standings_action)
+        
+        snapshot_action = QAction("Exporter un instantané du tournoi...", self)
+        snapshot_action.triggered.connect(self.export_snapshot)
+        file_menu.addAction(snapshot_action)
+        
+        file_menu.addSeparator()
+        
+        autosave_action = QAction("Sauvegarde automatique...", self)
+        autosave_action.triggered.connect(self.configure_autosave)
+        file_menu.addAction(autosave_action)
+        
+        pairing_action = QAction("Temps de recherche des tirages...", self)
+        pairing_action.triggered.connect(self.configure_pairing_search)
+        file_menu.addAction(pairing_action)
+        
+        workspace_action = QAction("Tournois gardés en mémoire...", self)
+        workspace_action.triggered.connect(self.configure_workspace)
+        file_menu.addAction(workspace_action)
+        
+        record_action = QAction("Enregistrer la séance pour la rejouer...", self)
+        record_action.triggered.connect(self.start_recording)
+        file_menu.addAction(record_action)
+        
+        finish_action = QAction("Terminer le tournoi", self)
+        finish_action.triggered.connect(self.finish_tournament)
+        file_menu.addAction(finish_action)
+        
+        archive_action = QAction("Archiver les tournois terminés", self)
+        archive_action.triggered.connect(self.archive_tournaments)
+        file_menu.addAction(archive_action)
+        
+        # Menu Réseau
+        network_menu = menubar.addMenu("Réseau")
+        
+        host_action = QAction("Partager ce tournoi sur le réseau", self)
+        host_action.triggered.connect(self.host_tournament)
+        network_menu.addAction(host_action)
+        
+        join_action = QAction("Rejoindre un tournoi...", self)
+        join_action.triggered.connect(self.join_tournament)
+        network_menu.addAction(join_action)
+        
+        lock_action = QAction("Verrouiller / déverrouiller un match (arbitre)...", self)
+        lock_action.triggered.connect(self.toggle_match_lock)
+        network_menu.addAction(lock_action)
+        
         # Menu Affichage
         view_menu = menubar.addMenu("Affichage")
         
@@ -162,6 +318,146 @@ class MainWindow(QMainWindow):
         about_action.triggered.connect(self.show_about)
         help_menu.addAction(about_action)
         
+    def export_season(self, kind: str):
+        """Exporter tous les tournois de la base, lus au fil du curseur"""
+        file_name, _ = QFileDialog.getSaveFileName(
+            self, "Exporter la saison", "", "CSV (*.csv);;JSON Lines (*.jsonl);;HTML (*.html)"
+        )
+        if not file_name:
+            return
+        if kind == "matches":
+            rows, columns, title = self.db_manager.iter_matches(), MATCH_COLUMNS, "Matchs"
+        else:
+            rows = ranked(self.db_manager.iter_team_stats())
+            columns, title = STANDINGS_COLUMNS, "Classements"
+        try:
+            count = export_rows(rows, file_name, columns, title)
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Erreur", f"Erreur lors de l'export : {e}")
+            return
+        self.status_bar.showMessage(f"{count} ligne(s) exportée(s) dans {file_name}")
+        
+    def export_snapshot(self):
+        """Écrire l'instantané binaire du tournoi courant (partage, archivage)"""
+        if not self.tournament:
+            QMessageBox.warning(self, "Erreur", "Aucun tournoi en cours")
+            return
+        file_name, _ = QFileDialog.getSaveFileName(
+            self, "Exporter un instantané", f"{self.tournament.name}.ptq",
+            "Instantané de tournoi (*.ptq)"
+        )
+        if not file_name:
+            return
+        try:
+            snapshot.save(self.tournament, file_name)
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Erreur", f"Erreur lors de l'export : {e}")
+            return
+        self.status_bar.showMessage(f"Instantané enregistré dans {file_name}")
+        
+    def poll_autosave(self):
+        """Déclencher la sauvegarde automatique quand elle est due"""
+        for autosaver in self.autosavers.values():
+            autosaver.poll()
+        if self.autosave_writer.last_error:
+            error, self.autosave_writer.last_error = self.autosave_writer.last_error, None
+            self.status_bar.showMessage(f"Échec de la sauvegarde automatique : {error}")
+            
+    def configure_autosave(self):
+        """Choisir la durée maximale de saisie non sauvegardée"""
+        seconds, ok = QInputDialog.getInt(
+            self, "Sauvegarde automatique",
+            "Perte de données maximale (secondes) :",
+            int(self.autosave_max_delay), 1, 600
+        )
+        if not ok:
+            return
+        self.autosave_max_delay = float(seconds)
+        for autosaver in self.autosavers.values():
+            autosaver.max_delay = self.autosave_max_delay
+            autosaver.delay = min(AUTOSAVE_DELAY, self.autosave_max_delay)
+            
+    def configure_pairing_search(self):
+        """Choisir le temps consacré à la recherche du meilleur tirage (0 = premier tirage)"""
+        milliseconds, ok = QInputDialog.getInt(
+            self, "Tirages",
+            "Temps de recherche du meilleur tirage (ms, 0 pour accepter le premier tirage) :",
+            int(self.pairing_search.budget * 1000), 0, 60000, 100
+        )
+        if not ok:
+            return
+        self.pairing_search.budget = milliseconds / 1000
+        for tournament in self.workspace.resident.values():
+            tournament.pairing_search = self.pairing_search if milliseconds else None
+            
+    def configure_workspace(self):
+        """Choisir le nombre de tournois gardés en mémoire (les autres sont rechargés à la demande)"""
+        count, ok = QInputDialog.getInt(
+            self, "Tournois ouverts",
+            "Nombre de tournois gardés en mémoire :",
+            self.workspace.budget, 1, 50
+        )
+        if ok:
+            self.workspace.set_budget(count)
+            
+    def start_recording(self):
+        """Journaliser les opérations du tournoi courant (à lancer avant le premier tour)"""
+        if not self.tournament:
+            QMessageBox.warning(self, "Erreur", "Aucun tournoi en cours")
+            return
+        if self.tournament.matches:
+            QMessageBox.warning(self, "Erreur",
+                                "L'enregistrement doit commencer avant le premier tirage")
+            return
+        file_name, _ = QFileDialog.getSaveFileName(
+            self, "Enregistrer la séance", "seance.jsonl", "JSON Lines (*.jsonl)"
+        )
+        if not file_name:
+            return
+        self.stop_recording()
+        self.record_file = open(file_name, "w", encoding="utf-8")
+        self.recorder = Recorder(self.tournament, self.record_file)
+        self.status_bar.showMessage(f"Enregistrement de la séance dans {file_name}")
+        
+    def stop_recording(self):
+        if self.recorder:
+            self.recorder.close()
+            self.record_file.close()
+            self.recorder = self.record_file = None
+            
+    def finish_tournament(self):
+        """Marquer le tournoi courant comme terminé (il pourra être archivé) et le fermer"""
+        if not self.tournament:
+            QMessageBox.warning(self, "Erreur", "Aucun tournoi en cours")
+            return
+        if not self.tournament.is_finished():
+            QMessageBox.warning(self, "Erreur", "Tous les matchs doivent être validés")
+            return
+        if self.is_pinned(self.tournament):
+            QMessageBox.warning(self, "Erreur",
+                                "Ce tournoi est partagé ou enregistré : il ne peut pas être terminé")
+            return
+        # Les derniers scores doivent être en base avant de marquer le tournoi terminé
+        self.autosavers[self.tournament.id].save()
+        self.autosave_writer.flush()
+        if self.autosave_writer.last_error:
+            QMessageBox.critical(self, "Erreur",
+                                 f"Échec de la sauvegarde : {self.autosave_writer.last_error}")
+            return
+        self.db_manager.complete_tournament(self.tournament.id)
+        name = self.tournament.name
+        self.close_tournament_tab(self.workspace_tabs.currentIndex())
+        self.status_bar.showMessage(f"Tournoi terminé : {name}")
+        
+    def archive_tournaments(self):
+        """Déplacer les tournois terminés dans les archives de saison"""
+        try:
+            count = self.db_manager.archive_completed_tournaments()
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Erreur", f"Erreur lors de l'archivage : {e}")
+            return
+        self.status_bar.showMessage(f"{count} tournoi(s) archivé(s)")
+        
     def setup_status_bar(self):
         """Configuration de la barre de statut"""
         self.status_bar = QStatusBar()
@@ -179,36 +475,228 @@ class MainWindow(QMainWindow):
                 return
                 
             # Créer le tournoi
-            self.tournament = Tournament(
+            self.open_tournament(Tournament(
                 name=data['name'],
                 tournament_type=data['type'],
-                terrain_count=data['terrain_count']
-            )
+                terrain_count=data['terrain_count'],
+                tournament_format=data['format'],
+                concours_levels=data['concours_levels'],
+                pool_format=data['pool_format']
+            ))
+            self.status_bar.showMessage(f"Nouveau tournoi créé: {data['name']}")
             
-            # Sauvegarder en base
-            tournament_id = self.db_manager.create_tournament(
-                data['name'], data['type'], data['terrain_count']
-            )
-            self.tournament.id = tournament_id
+    def open_tournament(self, tournament: Tournament):
+        """Enregistrer un tournoi en base et l'ouvrir dans un nouvel onglet"""
+        tournament.id = self.db_manager.create_tournament(
+            tournament.name, tournament.tournament_type, tournament.terrain_count,
+            tournament.format, tournament.seed
+        )
+        self.attach_tournament(tournament)
+        self.workspace.add(tournament)
+        index = self.workspace_tabs.addTab(tournament.name)
+        self.workspace_tabs.setTabData(index, tournament.id)
+        self.workspace_tabs.setCurrentIndex(index)
+        self.switch_tournament(index)
+        
+    def attach_tournament(self, tournament: Tournament):
+        """Créer les onglets, la sauvegarde automatique et le regroupement d'événements d'un tournoi"""
+        if self.pairing_search.budget > 0:
+            tournament.pairing_search = self.pairing_search
+        
+        # Sauvegarde automatique des modifications du tournoi
+        self.autosavers[tournament.id] = AutoSaver(
+            tournament, self.autosave_writer.submit,
+            min(AUTOSAVE_DELAY, self.autosave_max_delay), self.autosave_max_delay
+        )
+        
+        # Un seul traitement par rafale d'événements du tournoi
+        self.event_batchers[tournament.id] = EventBatcher(
+            tournament.events, lambda events: self.on_tournament_events(tournament, events),
+            schedule_once
+        )
+        
+        view = TournamentView(self.db_manager)
+        view.set_tournament(tournament)
+        self.view_stack.addWidget(view)
+        self.views[tournament.id] = view
+        
+    def load_tournament(self, tournament_id: int) -> Tournament:
+        """Recharger depuis la base un tournoi déchargé de la mémoire"""
+        # Les dernières modifications du tournoi doivent être écrites avant la lecture
+        self.autosave_writer.flush()
+        tournament = load_tournament(self.db_manager, tournament_id)
+        tournament.set_team_ratings(self.rating_book.team_ratings(tournament))
+        self.attach_tournament(tournament)
+        return tournament
+        
+    def unload_tournament(self, tournament: Tournament):
+        """Libérer un tournoi : sauvegarder ce qui reste et détruire ses onglets"""
+        self.autosavers.pop(tournament.id).close()
+        self.event_batchers.pop(tournament.id).close()
+        view = self.views.pop(tournament.id)
+        view.shutdown()
+        self.view_stack.removeWidget(view)
+        view.deleteLater()
+        
+    def is_pinned(self, tournament: Tournament) -> bool:
+        """Tournoi à garder en mémoire : séance enregistrée ou tournoi partagé"""
+        return ((self.recorder is not None and self.recorder.tournament is tournament)
+                or (self.replica is not None and self.replica.tournament is tournament))
+        
+    @instrumented("gui.switch_tournament")
+    def switch_tournament(self, index: int):
+        """Afficher le tournoi d'un onglet (rechargé depuis la base s'il a été déchargé)"""
+        tournament_id = self.workspace_tabs.tabData(index)
+        if tournament_id is None:
+            self.tournament = None
+            self.show_view(self.empty_view)
+            self.tournament_label.setText("Aucun tournoi actif")
+            return
+        if self.tournament is not None and self.tournament.id == tournament_id:
+            return
+        self.tournament = self.workspace.focus(tournament_id)
+        self.show_view(self.views[tournament_id])
+        self.tournament_label.setText(
+            f"Tournoi: {self.tournament.name} ({self.tournament.tournament_type})"
+        )
+        
+    def show_view(self, view: TournamentView):
+        """Afficher les onglets d'un tournoi (l'onglet de débogage les suit)"""
+        debug_visible = self.tab_widget.indexOf(self.debug_widget) >= 0
+        if debug_visible:
+            self.toggle_debug_tab()
+        self.tab_widget = view
+        self.team_widget = view.team_widget
+        self.match_widget = view.match_widget
+        self.standings_widget = view.standings_widget
+        self.view_stack.setCurrentWidget(view)
+        if debug_visible:
+            self.toggle_debug_tab()
+            
+    def close_tournament_tab(self, index: int):
+        """Fermer l'onglet d'un tournoi (le tournoi reste en base)"""
+        tournament_id = self.workspace_tabs.tabData(index)
+        tournament = self.workspace.resident.get(tournament_id)
+        if tournament is not None and self.is_pinned(tournament):
+            QMessageBox.warning(self, "Erreur",
+                                "Ce tournoi est partagé ou enregistré : il reste ouvert")
+            return
+        if self.tournament is not None and self.tournament.id == tournament_id:
+            self.tournament = None
+            self.show_view(self.empty_view)
+        self.workspace.close(tournament_id)
+        self.workspace_tabs.removeTab(index)
+        
+    def host_tournament(self):
+        """Héberger le tournoi courant : les autres postes s'y connectent"""
+        if not self.tournament:
+            QMessageBox.warning(self, "Erreur", "Aucun tournoi à partager")
+            return
+        if self.replica:
+            QMessageBox.warning(self, "Erreur", "Ce poste est déjà relié à un tournoi partagé")
+            return
+        try:
+            self.replication_hub = ReplicationHub(port=DEFAULT_PORT)
+        except OSError as e:
+            QMessageBox.critical(self, "Erreur", f"Impossible d'ouvrir le port {DEFAULT_PORT} : {e}")
+            return
+        self.replication_hub.start()
+        self.replica = ReplicaSeat(socket.gethostname(), self.tournament)
+        self.replica.connect("127.0.0.1", DEFAULT_PORT)
+        self.replica.share()
+        self.match_widget.replica = self.replica
+        self.replication_timer.start()
+        self.status_bar.showMessage(
+            f"Tournoi partagé : {socket.gethostname()} port {DEFAULT_PORT}"
+        )
+        
+    def join_tournament(self):
+        """Rejoindre le tournoi hébergé par un autre poste"""
+        if self.replica:
+            QMessageBox.warning(self, "Erreur", "Ce poste est déjà relié à un tournoi partagé")
+            return
+        address, ok = QInputDialog.getText(
+            self, "Rejoindre un tournoi", "Adresse du poste hôte (nom ou IP[:port]) :"
+        )
+        if not ok or not address.strip():
+            return
+        host, _, port = address.strip().partition(":")
+        replica = ReplicaSeat(socket.gethostname())
+        # Le tournoi est créé par la première modification reçue
+        replica.on_tournament = self.open_tournament
+        try:
+            replica.connect(host, int(port) if port else DEFAULT_PORT)
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Erreur", f"Connexion impossible : {e}")
+            return
+        self.replica = replica
+        self.match_widget.replica = replica
+        self.replication_timer.start()
+        self.status_bar.showMessage(f"Connecté au tournoi de {host}")
+        
+    def poll_replication(self):
+        """Appliquer les modifications des autres postes"""
+        if not self.replica:
+            return
+        self.replica.poll()
+        if self.replica.rejections:
+            reason = self.replica.rejections[-1]
+            self.replica.rejections = []
+            self.status_bar.showMessage(f"Modification refusée : {reason}", 5000)
             
-            # Mettre à jour l'interface
-            self.tournament_label.setText(f"Tournoi: {data['name']} ({data['type']})")
-            self.team_widget.set_tournament(self.tournament)
-            self.match_widget.set_tournament(self.tournament)
-            self.standings_widget.set_tournament(self.tournament)
+    def toggle_match_lock(self):
+        """Verrouiller un match pour l'arbitre, ou le déverrouiller"""
+        if not self.replica:
+            QMessageBox.warning(self, "Erreur", "Ce poste n'est relié à aucun tournoi partagé")
+            return
+        match_id, ok = QInputDialog.getInt(self, "Arbitrage", "Numéro du match :", 1, 1, 100000)
+        if not ok:
+            return
+        if self.replica.locks.get(match_id) == self.replica.seat:
+            self.replica.unlock(match_id)
+        else:
+            self.replica.lock(match_id)
             
-            self.status_bar.showMessage(f"Nouveau tournoi créé: {data['name']}")
+    def on_tournament_events(self, tournament: Tournament, events):
+        """Traiter une rafale d'événements : cotes, clichés et un seul rafraîchissement"""
+        view = self.views.get(tournament.id)
+        if view is None:
+            return
+        teams_changed = any(isinstance(e, (TeamAdded, TeamRemoved)) for e in events)
+        validated = [e.match for e in events if isinstance(e, MatchValidated) and not e.corrected]
+        
+        for match in validated:
+            self.rating_book.record_match(match)
+        # Écriture groupée des cotes à la fin de chaque tour
+        completed_rounds = sorted({m.round_number for m in validated
+                                   if tournament.is_round_complete(m.round_number)})
+        if completed_rounds:
+            self.rating_book.flush()
+        if teams_changed or completed_rounds:
+            # Cotes des équipes pour le tirage avec têtes de série
+            tournament.set_team_ratings(self.rating_book.team_ratings(tournament))
+        # Clichés des tours terminés, et des tours suivants un score corrigé
+        for round_number in tournament.snapshot_rounds(events):
+            self.save_standings_snapshot(tournament, round_number)
             
-    def on_teams_changed(self):
-        """Appelé quand les équipes changent"""
-        if self.tournament:
-            self.match_widget.refresh_teams()
-            self.standings_widget.refresh_standings()
+        if teams_changed or any(isinstance(e, MatchValidated) for e in events):
+            view.standings_widget.refresh_standings()
             
-    def on_match_completed(self):
-        """Appelé quand un match est terminé"""
-        if self.tournament:
-            self.standings_widget.refresh_standings()
+    def save_standings_snapshot(self, tournament: Tournament, round_number: int):
+        """Enregistrer le classement cumulé à la fin d'un tour"""
+        if tournament.id is None:
+            return
+        self.db_manager.save_standings_snapshot(tournament.id, round_number,
+                                                tournament.snapshot_rows(round_number))
+        
+    def toggle_debug_tab(self):
+        """Afficher ou masquer l'onglet d'instrumentation"""
+        index = self.tab_widget.indexOf(self.debug_widget)
+        if index >= 0:
+            self.tab_widget.removeTab(index)
+        else:
+            self.tab_widget.addTab(self.debug_widget, "Débogage")
+            self.tab_widget.setCurrentWidget(self.debug_widget)
             
     def toggle_theme(self, checked):
         """Basculer entre thème clair et sombre"""
@@ -235,5 +723,22 @@ class MainWindow(QMainWindow):
         
     def closeEvent(self, event):
         """Événement de fermeture de l'application"""
+        self.rating_book.flush()
+        self.empty_view.shutdown()
+        for view in self.views.values():
+            view.shutdown()
+        self.stop_recording()
+        self.pairing_search.shutdown()
+        if self.replica:
+            self.replica.close()
+        if self.replication_hub:
+            self.replication_hub.close()
+        for autosaver in self.autosavers.values():
+            autosaver.close()
+        try:
+            self.autosave_writer.close()
+        except Exception as e:
+            QMessageBox.critical(self, "Erreur",
+                                 f"Des modifications n'ont pas pu être enregistrées : {e}")
         self.db_manager.close()
         event.accept()
\ No newline at end of file
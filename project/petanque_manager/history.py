@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Historique du classement tour par tour
+
+Chaque tour conserve la contribution de ses matchs (victoires, défaites,
+points) par équipe. Le classement cumulé après le tour r est obtenu en
+ajoutant cette contribution au cliché du tour r-1 : O(équipes) par tour,
+sans reparcourir les matchs. Les clichés sont mis en cache et invalidés à
+partir du tour d'un score corrigé.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+# Totaux d'une équipe : (victoires, défaites, points pour, points contre)
+Totals = Tuple[int, int, int, int]
+
+ZERO: Totals = (0, 0, 0, 0)
+
+def ranking_key(totals: Totals) -> tuple:
+    """Ordre du classement : victoires, différence de points, points marqués"""
+    wins, _, points_for, points_against = totals
+    return (-wins, -(points_for - points_against), -points_for)
+
+class StandingsHistory:
+    """Contributions par tour et clichés cumulés du classement"""
+
+    def __init__(self):
+        # deltas[r - 1][team_id] = contribution du tour r
+        self.deltas: List[Dict[int, list]] = []
+        # Résultat déjà compté pour chaque match : (tour, équipe1, équipe2, score1, score2)
+        self.recorded: Dict[int, tuple] = {}
+        # Clichés valides : snapshots[r - 1] = {team_id: Totals}, ranks[r - 1] = [team_id...]
+        self.snapshots: List[Dict[int, Totals]] = []
+        self.ranks: List[List[int]] = []
+
+    @property
+    def round_count(self) -> int:
+        return len(self.deltas)
+
+    def _add(self, round_number: int, team1: Union[int, tuple], team2: Union[int, tuple, None],
+             score1: int, score2: int, sign: int):
+        while len(self.deltas) < round_number:
+            self.deltas.append({})
+        delta = self.deltas[round_number - 1]
+        # Comme Tournament.get_team_stats, un match non gagné compte comme une défaite
+        for side, scored, conceded in ((team1, score1, score2), (team2, score2, score1)):
+            if side is None:
+                continue
+            # Équipe composée (quadrette) : chaque équipe inscrite qui la forme est créditée
+            for team in side if isinstance(side, tuple) else (side,):
+                totals = delta.setdefault(team, [0, 0, 0, 0])
+                totals[0] += sign * (scored > conceded)
+                totals[1] += sign * (scored <= conceded)
+                totals[2] += sign * scored
+                totals[3] += sign * conceded
+
+    def record(self, match_id: int, round_number: int, team1: Union[int, tuple],
+               team2: Union[int, tuple, None], score1: int, score2: int):
+        """Compter (ou recompter après correction) le résultat d'un match
+
+        team2 vaut None pour une exemption : seule l'équipe exemptée est créditée.
+        Une équipe composée est donnée par le tuple des équipes inscrites qui la forment.
+        """
+        previous = self.recorded.get(match_id)
+        if previous is not None:
+            self._add(*previous, sign=-1)
+        entry = (round_number, team1, team2, score1, score2)
+        self._add(*entry, sign=1)
+        self.recorded[match_id] = entry
+        first_changed = min(round_number, previous[0] if previous else round_number)
+        self.invalidate(first_changed)
+
+    def forget(self, match_id: int):
+        """Retirer le résultat d'un match qui n'est plus validé"""
+        previous = self.recorded.pop(match_id, None)
+        if previous is not None:
+            self._add(*previous, sign=-1)
+            self.invalidate(previous[0])
+
+    def invalidate(self, round_number: int = 1):
+        """Oublier les clichés à partir d'un tour"""
+        del self.snapshots[max(0, round_number - 1):]
+        del self.ranks[max(0, round_number - 1):]
+
+    def _build(self, round_number: int, team_ids: Sequence[int]):
+        """Compléter les clichés jusqu'au tour donné à partir du dernier valide"""
+        while len(self.snapshots) < round_number:
+            r = len(self.snapshots)
+            previous = self.snapshots[r - 1] if r else {}
+            delta = self.deltas[r] if r < len(self.deltas) else {}
+            snapshot = {}
+            for team in team_ids:
+                base = previous.get(team, ZERO)
+                change = delta.get(team)
+                if change is None:
+                    snapshot[team] = base
+                else:
+                    snapshot[team] = (base[0] + change[0], base[1] + change[1],
+                                      base[2] + change[2], base[3] + change[3])
+            self.snapshots.append(snapshot)
+            # Tri stable : à égalité, l'ordre d'inscription est conservé
+            self.ranks.append(sorted(team_ids, key=lambda t: ranking_key(snapshot[t])))
+
+    def standings_after(self, round_number: int, team_ids: Sequence[int]) -> List[Tuple[int, Totals]]:
+        """Classement cumulé après un tour : [(team_id, totaux)] du premier au dernier"""
+        if round_number <= 0:
+            return [(team, ZERO) for team in team_ids]
+        self._build(round_number, team_ids)
+        snapshot = self.snapshots[round_number - 1]
+        return [(team, snapshot[team]) for team in self.ranks[round_number - 1]]
+
+    def rank_series(self, team_id: int, team_ids: Sequence[int],
+                    last_round: Optional[int] = None) -> List[int]:
+        """Place (à partir de 1) d'une équipe après chaque tour"""
+        last_round = self.round_count if last_round is None else last_round
+        if last_round <= 0:
+            return []
+        self._build(last_round, team_ids)
+        return [self.ranks[r].index(team_id) + 1 for r in range(last_round)]
+
+    def rank_table(self, team_ids: Sequence[int],
+                   last_round: Optional[int] = None) -> Dict[int, List[int]]:
+        """Places de toutes les équipes après chaque tour, en O(équipes) par tour"""
+        last_round = self.round_count if last_round is None else last_round
+        series: Dict[int, List[int]] = {team: [] for team in team_ids}
+        if last_round <= 0:
+            return series
+        self._build(last_round, team_ids)
+        for r in range(last_round):
+            for position, team in enumerate(self.ranks[r], 1):
+                series[team].append(position)
+        return series
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Import en masse des inscriptions d'équipes depuis un fichier CSV ou ODS
+
+Les fichiers sont lus ligne par ligne ; chaque ligne décrit une équipe
+(un joueur par colonne). Une éventuelle ligne d'en-tête est détectée et
+sert à repérer les colonnes de joueurs et celle du club (tirage du premier
+tour, draw.py).
+"""
+
+import csv
+import os
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional
+
+from tournament import normalize_name, players_per_team
+
+ODS_TABLE = "{urn:oasis:names:tc:opendocument:xmlns:table:1.0}"
+ODS_TEXT = "{urn:oasis:names:tc:opendocument:xmlns:text:1.0}"
+
+# Mots repérant une ligne d'en-tête et les colonnes de joueurs
+HEADER_WORDS = ("joueur", "player", "nom", "equipe", "team", "club")
+PLAYER_COLUMN_WORDS = ("joueur", "player", "nom")
+CLUB_COLUMN_WORDS = ("club",)
+# Mots de liaison et numéros tolérés dans un titre de colonne ("Nom du club", "Joueur 1")
+HEADER_FILLERS = ("de", "du", "d", "des", "la", "le", "l", "of", "the", "n", "no")
+MAX_EMPTY_REPEAT = 64
+
+@dataclass
+class ImportResult:
+    """Résultat d'un import : équipes valides et erreurs par ligne"""
+    teams: List[List[str]] = field(default_factory=list)
+    # Club de chaque équipe valide (None sans colonne de club)
+    clubs: List[Optional[str]] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+
+def iter_csv_rows(path: str) -> Iterator[List[str]]:
+    """Lire un fichier CSV ligne par ligne (séparateur détecté automatiquement)"""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        sample = f.read(4096)
+        f.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=";,\t")
+        except csv.Error:
+            dialect = csv.excel
+        for row in csv.reader(f, dialect):
+            yield row
+
+def iter_ods_rows(path: str) -> Iterator[List[str]]:
+    """Lire la première feuille d'un classeur ODS ligne par ligne"""
+    with zipfile.ZipFile(path) as archive, archive.open("content.xml") as content:
+        depth = 0
+        for event, element in ET.iterparse(content, events=("start", "end")):
+            if element.tag == f"{ODS_TABLE}table":
+                if event == "start":
+                    depth += 1
+                elif depth == 1:
+                    # Seule la première feuille est importée
+                    return
+                continue
+            if event != "end" or element.tag != f"{ODS_TABLE}table-row":
+                continue
+
+            row = []
+            for cell in element:
+                if cell.tag not in (f"{ODS_TABLE}table-cell", f"{ODS_TABLE}covered-table-cell"):
+                    continue
+                text = " ".join(
+                    "".join(p.itertext()) for p in cell.iter(f"{ODS_TEXT}p")
+                )
+                repeat = int(cell.get(f"{ODS_TABLE}number-columns-repeated", "1"))
+                # Les cellules vides répétées (souvent des milliers en fin de ligne) sont plafonnées
+                row.extend([text] * (repeat if text else min(repeat, MAX_EMPTY_REPEAT)))
+            element.clear()
+            yield row
+
+def iter_rows(path: str) -> Iterator[List[str]]:
+    """Lire un fichier d'inscriptions selon son extension"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".ods":
+        return iter_ods_rows(path)
+    if extension in (".csv", ".txt"):
+        return iter_csv_rows(path)
+    raise ValueError(f"Format de fichier non pris en charge : {extension}")
+
+def _club_column(header: List[str]) -> Optional[int]:
+    """Colonne du club d'après l'en-tête, ou None"""
+    for i, title in enumerate(header):
+        if any(word in normalize_name(title) for word in CLUB_COLUMN_WORDS):
+            return i
+    return None
+
+def _player_columns(header: List[str]) -> Optional[List[int]]:
+    """Colonnes de joueurs d'après l'en-tête, ou None si l'en-tête n'en désigne aucune"""
+    club = _club_column(header)
+    columns = [
+        i for i, title in enumerate(header)
+        if i != club and any(word in normalize_name(title) for word in PLAYER_COLUMN_WORDS)
+    ]
+    return columns or None
+
+def _is_header_cell(cell: str) -> bool:
+    """La cellule n'est-elle faite que de mots d'en-tête (et de liaisons ou numéros) ?"""
+    words = [word for word in re.split(r"[^a-z0-9]+", normalize_name(cell))
+             if word and not word.isdigit() and word not in HEADER_FILLERS]
+    return bool(words) and all(word.rstrip("s") in HEADER_WORDS for word in words)
+
+def _is_header(row: List[str]) -> bool:
+    """La ligne ressemble-t-elle à une ligne d'en-tête ?
+
+    Une cellule entière doit être un titre ("Joueur 1", "Nom du club") : un nom
+    de joueur ou de club qui contient "nom" ou "club" ne suffit pas.
+    """
+    return any(_is_header_cell(cell) for cell in row)
+
+def import_teams(path: str, tournament_type: str) -> ImportResult:
+    """Lire un fichier d'inscriptions et valider chaque équipe
+
+    Chaque équipe doit compter exactement le nombre de joueurs du type de
+    tournoi (players_per_team) : un fichier préparé à l'avance n'a pas de
+    raison d'être incomplet, et une équipe incomplète fausserait les rotations
+    de la quadrette. Les lignes refusées sont signalées, à corriger à la main.
+    """
+    result = ImportResult()
+    expected = players_per_team(tournament_type)
+    columns = None
+    club_column = None
+    first_row = True
+
+    for line_number, row in enumerate(iter_rows(path), 1):
+        cells = [cell.strip() for cell in row]
+        if not any(cells):
+            continue
+        if first_row:
+            first_row = False
+            if _is_header(cells):
+                columns = _player_columns(cells)
+                club_column = _club_column(cells)
+                continue
+
+        club = None
+        if club_column is not None and club_column < len(cells):
+            club = cells[club_column] or None
+        if columns is not None:
+            cells = [cells[i] for i in columns if i < len(cells)]
+        players = [cell for cell in cells if cell]
+
+        if len(players) != expected:
+            result.errors.append(
+                f"Ligne {line_number} : {len(players)} joueur(s), {expected} attendu(s) "
+                f"en {tournament_type}"
+            )
+        else:
+            result.teams.append(players)
+            result.clubs.append(club)
+
+    return result
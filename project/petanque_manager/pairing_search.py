@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Recherche du meilleur tirage parmi de nombreux candidats
+
+Au lieu d'accepter le premier tirage aléatoire, on construit des tirages
+candidats dans plusieurs processus pendant un temps donné (par ex. 500 ms)
+et l'on retient celui de plus faible pénalité :
+- revanche (deux équipes qui se sont déjà rencontrées) ;
+- écart de victoires entre adversaires (système suisse) ;
+- exemption d'une équipe déjà exemptée ;
+- équipe replacée sur un terrain où elle a déjà joué.
+
+Le problème est décrit par des entiers uniquement (PairingProblem), ce qui le
+rend transmissible aux processus de calcul.
+"""
+
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+# Pénalités par défaut
+REMATCH_PENALTY = 1000
+REPEATED_BYE_PENALTY = 500
+FLOAT_PENALTY = 10
+TERRAIN_REPEAT_PENALTY = 1
+
+# Temps de recherche par défaut (secondes)
+PAIRING_BUDGET = 0.5
+
+@dataclass
+class PairingProblem:
+    """Données d'un tirage : équipes dans l'ordre du classement et historique"""
+    team_ids: List[int]
+    wins: Dict[int, int]
+    played: FrozenSet[Tuple[int, int]]
+    byes: Dict[int, int]
+    terrains_played: Dict[int, FrozenSet[int]]
+    terrain_count: int
+    # Système suisse (adversaires de même niveau) ou mêlée (tirage libre)
+    swiss: bool = True
+    # Ordre du classement imposé dans un groupe de victoires (cotes connues)
+    keep_order: bool = False
+
+    def has_played(self, team1: int, team2: int) -> bool:
+        return (min(team1, team2), max(team1, team2)) in self.played
+
+@dataclass
+class Candidate:
+    """Un tirage : paires d'équipes, terrain de chaque paire, équipe exemptée"""
+    pairs: List[Tuple[int, int]]
+    terrains: List[Optional[int]]
+    bye: Optional[int] = None
+
+@dataclass
+class PairingQuality:
+    """Détail de la pénalité d'un tirage"""
+    rematches: int = 0
+    float_distance: int = 0
+    repeated_byes: int = 0
+    terrain_repeats: int = 0
+
+    @property
+    def penalty(self) -> int:
+        return (self.rematches * REMATCH_PENALTY + self.repeated_byes * REPEATED_BYE_PENALTY
+                + self.float_distance * FLOAT_PENALTY
+                + self.terrain_repeats * TERRAIN_REPEAT_PENALTY)
+
+    def describe(self) -> str:
+        return (f"{self.rematches} revanche(s), écart de victoires {self.float_distance}, "
+                f"{self.repeated_byes} exemption(s) répétée(s), "
+                f"{self.terrain_repeats} terrain(s) déjà joué(s) — pénalité {self.penalty}")
+
+def evaluate(problem: PairingProblem, candidate: Candidate) -> PairingQuality:
+    """Pénalité détaillée d'un tirage"""
+    quality = PairingQuality()
+    for (team1, team2), terrain in zip(candidate.pairs, candidate.terrains):
+        if problem.has_played(team1, team2):
+            quality.rematches += 1
+        if problem.swiss:
+            quality.float_distance += abs(problem.wins.get(team1, 0) - problem.wins.get(team2, 0))
+        if terrain is not None:
+            for team in (team1, team2):
+                if terrain in problem.terrains_played.get(team, ()):
+                    quality.terrain_repeats += 1
+    if candidate.bye is not None and problem.byes.get(candidate.bye, 0):
+        quality.repeated_byes += 1
+    return quality
+
+def _ordered_teams(problem: PairingProblem, rng: random.Random) -> List[int]:
+    """Ordre de traitement : classement (mélangé par groupe de victoires) ou tirage libre"""
+    teams = list(problem.team_ids)
+    if not problem.swiss:
+        rng.shuffle(teams)
+        return teams
+    if problem.keep_order:
+        return teams
+    groups: Dict[int, List[int]] = {}
+    for team in teams:
+        groups.setdefault(problem.wins.get(team, 0), []).append(team)
+    ordered = []
+    for wins in sorted(groups, reverse=True):
+        rng.shuffle(groups[wins])
+        ordered.extend(groups[wins])
+    return ordered
+
+def _choose_bye(problem: PairingProblem, teams: List[int], rng: random.Random) -> int:
+    """Exempter une équipe parmi les moins exemptées (la moins bien classée en suisse)"""
+    fewest = min(problem.byes.get(team, 0) for team in teams)
+    eligible = [team for team in teams if problem.byes.get(team, 0) == fewest]
+    return eligible[-1] if problem.swiss else rng.choice(eligible)
+
+def _assign_terrains(problem: PairingProblem, pairs: List[Tuple[int, int]],
+                     rng: random.Random) -> List[Optional[int]]:
+    """Terrains libres attribués en évitant ceux où les deux équipes ont déjà joué"""
+    if problem.terrain_count <= 0:
+        return [None] * len(pairs)
+    terrains: List[Optional[int]] = [None] * len(pairs)
+    free = list(range(1, problem.terrain_count + 1))
+    order = list(range(len(pairs)))
+    rng.shuffle(order)
+    for index in order:
+        if not free:
+            # Plus de paires que de terrains : les suivantes attendent un terrain libre
+            break
+        team1, team2 = pairs[index]
+        played = problem.terrains_played
+        best = min(free, key=lambda t: ((t in played.get(team1, ())) + (t in played.get(team2, ())),
+                                        rng.random()))
+        free.remove(best)
+        terrains[index] = best
+    return terrains
+
+def draw_candidate(problem: PairingProblem, rng: random.Random) -> Candidate:
+    """Construire un tirage : chaque équipe prend l'un des premiers adversaires non rencontrés"""
+    teams = _ordered_teams(problem, rng)
+    bye = None
+    if len(teams) % 2:
+        bye = _choose_bye(problem, teams, rng)
+        teams.remove(bye)
+    pairs = []
+    while teams:
+        team = teams.pop(0)
+        fresh = [i for i, other in enumerate(teams[:6]) if not problem.has_played(team, other)]
+        if not fresh:
+            index = 0
+        elif len(fresh) > 1 and rng.random() < 0.3:
+            # Varier les candidats : parfois le deuxième ou troisième choix
+            index = rng.choice(fresh[:3])
+        else:
+            index = fresh[0]
+        pairs.append((team, teams.pop(index)))
+    return Candidate(pairs, _assign_terrains(problem, pairs, rng), bye)
+
+@dataclass
+class SearchResult:
+    """Meilleurs tirages trouvés par un processus"""
+    best: Candidate
+    best_quality: PairingQuality
+    runner_up: Optional[PairingQuality]
+    first_quality: PairingQuality
+    candidates: int
+
+def search_candidates(problem: PairingProblem, seed: int, deadline: float,
+                      max_candidates: Optional[int] = None) -> SearchResult:
+    """Tirer des candidats jusqu'à l'échéance (horloge murale, commune aux processus)"""
+    rng = random.Random(seed)
+    best = draw_candidate(problem, rng)
+    best_quality = first_quality = evaluate(problem, best)
+    runner_up = None
+    count = 1
+    while best_quality.penalty > 0 and time.time() < deadline:
+        if max_candidates is not None and count >= max_candidates:
+            break
+        candidate = draw_candidate(problem, rng)
+        quality = evaluate(problem, candidate)
+        count += 1
+        if quality.penalty < best_quality.penalty:
+            best, best_quality, runner_up = candidate, quality, best_quality
+        elif runner_up is None or quality.penalty < runner_up.penalty:
+            runner_up = quality
+    return SearchResult(best, best_quality, runner_up, first_quality, count)
+
+@dataclass
+class PairingReport:
+    """Pourquoi le tirage retenu l'a emporté"""
+    candidates: int
+    workers: int
+    elapsed: float
+    chosen: PairingQuality
+    first_draw: PairingQuality
+    runner_up: Optional[PairingQuality] = None
+
+    def lines(self) -> List[str]:
+        lines = [
+            f"{self.candidates} tirage(s) évalué(s) en {self.elapsed:.2f} s "
+            f"sur {self.workers} processus",
+            f"Tirage retenu : {self.chosen.describe()}",
+            f"Premier candidat (sans recherche) : {self.first_draw.describe()}",
+        ]
+        if self.runner_up is not None:
+            lines.append(f"Meilleur suivant : {self.runner_up.describe()}")
+        return lines
+
+class PairingSearch:
+    """Recherche parallèle du meilleur tirage dans un temps imparti"""
+
+    def __init__(self, budget: float = PAIRING_BUDGET, workers: Optional[int] = None,
+                 max_candidates: Optional[int] = None, seed: Optional[int] = None):
+        self.budget = budget
+        self.workers = workers or os.cpu_count() or 1
+        # Limite par processus (tests et mesures reproductibles)
+        self.max_candidates = max_candidates
+        self.rng = random.Random(seed)
+        self.executor: Optional[ProcessPoolExecutor] = None
+
+    def search(self, problem: PairingProblem,
+               seed: Optional[int] = None) -> Tuple[Candidate, PairingReport]:
+        """Meilleur tirage trouvé ; `seed` (générateur du tournoi) fixe les graines des processus"""
+        start = time.perf_counter()
+        deadline = time.time() + self.budget
+        rng = self.rng if seed is None else random.Random(seed)
+        seeds = [rng.getrandbits(32) for _ in range(self.workers)]
+        results = None
+        if self.workers > 1:
+            try:
+                if self.executor is None:
+                    self.executor = ProcessPoolExecutor(max_workers=self.workers)
+                futures = [self.executor.submit(search_candidates, problem, seed, deadline,
+                                                self.max_candidates) for seed in seeds]
+                results = [future.result() for future in futures]
+            except (OSError, RuntimeError):
+                # Processus indisponibles : recherche dans ce processus
+                self.shutdown()
+        if results is None:
+            results = [search_candidates(problem, seed, deadline, self.max_candidates)
+                       for seed in seeds[:1]]
+        winner = min(results, key=lambda r: r.best_quality.penalty)
+        # Meilleur suivant : toutes recherches confondues
+        others = [r.best_quality for r in results if r is not winner]
+        if winner.runner_up is not None:
+            others.append(winner.runner_up)
+        report = PairingReport(
+            candidates=sum(r.candidates for r in results),
+            workers=len(results),
+            elapsed=time.perf_counter() - start,
+            chosen=winner.best_quality,
+            # Ce qu'aurait donné un tirage unique
+            first_draw=results[0].first_quality,
+            runner_up=min(others, key=lambda q: q.penalty) if others else None,
+        )
+        return winner.best, report
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+
+def problem_from_tournament(tournament, swiss: bool) -> PairingProblem:
+    """Décrire le prochain tirage d'un tournoi (classement, rencontres, exemptions, terrains)"""
+    played = set()
+    byes: Dict[int, int] = {}
+    terrains: Dict[int, set] = {}
+    for match in tournament.matches:
+        if match.is_bye:
+            byes[match.team1.id] = byes.get(match.team1.id, 0) + 1
+            continue
+        team1, team2 = match.team1.id, match.team2.id
+        played.add((min(team1, team2), max(team1, team2)))
+        if match.terrain is not None:
+            terrains.setdefault(team1, set()).add(match.terrain)
+            terrains.setdefault(team2, set()).add(match.terrain)
+    stats = tournament.get_all_stats()
+    return PairingProblem(
+        team_ids=[s.team.id for s in stats],
+        wins={s.team.id: s.wins for s in stats},
+        played=frozenset(played),
+        byes=byes,
+        terrains_played={team: frozenset(t) for team, t in terrains.items()},
+        terrain_count=tournament.terrain_count,
+        swiss=swiss,
+        keep_order=bool(tournament.team_ratings),
+    )
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Résultats individuels des joueurs
+
+Chaque match crédite les joueurs de ses deux équipes. Les équipes composées à
+la volée (rotations de la quadrette) n'existent que le temps d'un match : leurs
+joueurs sont retrouvés par les équipes inscrites qui les fournissent
+(Team.members), et c'est à ces joueurs que le résultat est compté.
+
+Un joueur est identifié par (équipe inscrite, position dans l'équipe). Ses
+totaux sont tenus dans des tableaux compacts, une case par joueur, mis à jour
+à chaque résultat (et défaits à la correction) : le classement individuel de
+1 000 joueurs n'est qu'un tri, sans reparcourir les matchs.
+"""
+
+import array
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from history import ranking_key
+
+# Joueur : (identifiant de l'équipe inscrite, position dans l'équipe)
+PlayerKey = Tuple[int, int]
+
+@dataclass
+class PlayerStanding:
+    """Totaux d'un joueur"""
+    key: PlayerKey
+    name: str
+    played: int = 0
+    wins: int = 0
+    losses: int = 0
+    points_for: int = 0
+    points_against: int = 0
+
+    @property
+    def points_difference(self) -> int:
+        return self.points_for - self.points_against
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.played if self.played else 0.0
+
+class PlayerResults:
+    """Accumulateurs de résultats par joueur"""
+
+    def __init__(self):
+        self.slots: Dict[PlayerKey, int] = {}
+        self.keys: List[PlayerKey] = []
+        self.names: List[str] = []
+        self.played = array.array("i")
+        self.wins = array.array("i")
+        self.losses = array.array("i")
+        self.points_for = array.array("i")
+        self.points_against = array.array("i")
+        # Résultat déjà compté pour chaque match : (cases équipe 1, cases équipe 2, scores)
+        self.recorded: Dict[int, tuple] = {}
+        # Cases modifiées depuis le dernier prélèvement (sauvegarde automatique)
+        self.changed: Set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _slot(self, key: PlayerKey, name: str) -> int:
+        slot = self.slots.get(key)
+        if slot is None:
+            slot = self.slots[key] = len(self.keys)
+            self.keys.append(key)
+            self.names.append(name)
+            for column in (self.played, self.wins, self.losses, self.points_for,
+                           self.points_against):
+                column.append(0)
+        else:
+            self.names[slot] = name
+        return slot
+
+    def _add(self, slots1: tuple, slots2: tuple, score1: int, score2: int, sign: int):
+        # Comme Tournament.get_team_stats, un match non gagné compte comme une défaite
+        for slots, scored, conceded in ((slots1, score1, score2), (slots2, score2, score1)):
+            won = scored > conceded
+            for slot in slots:
+                self.played[slot] += sign
+                self.wins[slot] += sign * won
+                self.losses[slot] += sign * (not won)
+                self.points_for[slot] += sign * scored
+                self.points_against[slot] += sign * conceded
+                self.changed.add(slot)
+
+    def record(self, match_id: int, players1: Iterable[Tuple[PlayerKey, str]],
+               players2: Iterable[Tuple[PlayerKey, str]], score1: int, score2: int):
+        """Compter (ou recompter après correction) un match ; players2 vide pour une exemption"""
+        entry = (tuple(self._slot(key, name) for key, name in players1),
+                 tuple(self._slot(key, name) for key, name in players2), score1, score2)
+        previous = self.recorded.get(match_id)
+        if previous is not None:
+            self._add(*previous, sign=-1)
+        self._add(*entry, sign=1)
+        self.recorded[match_id] = entry
+
+    def forget(self, match_id: int):
+        """Retirer le résultat d'un match qui n'est plus validé"""
+        previous = self.recorded.pop(match_id, None)
+        if previous is not None:
+            self._add(*previous, sign=-1)
+
+    def get(self, key: PlayerKey, name: Optional[str] = None) -> PlayerStanding:
+        """Totaux d'un joueur (nuls s'il n'a pas encore joué)"""
+        slot = self.slots.get(key)
+        if slot is None:
+            return PlayerStanding(key, name or "")
+        return PlayerStanding(key, name or self.names[slot], self.played[slot],
+                              self.wins[slot], self.losses[slot], self.points_for[slot],
+                              self.points_against[slot])
+
+    def standings(self, players: Optional[Iterable[Tuple[PlayerKey, str]]] = None
+                  ) -> List[PlayerStanding]:
+        """Classement individuel (victoires, différence, points marqués)
+
+        `players` : joueurs à classer et leur nom actuel, à défaut tous ceux qui ont joué.
+        """
+        if players is None:
+            players = zip(self.keys, self.names)
+        rows = [self.get(key, name) for key, name in players]
+        # Tri stable : à égalité, l'ordre d'inscription est conservé
+        rows.sort(key=lambda s: ranking_key((s.wins, s.losses, s.points_for, s.points_against)))
+        return rows
+
+    def take_rows(self) -> Dict[PlayerKey, tuple]:
+        """Prélever les totaux modifiés : clé -> (nom, joués, victoires, défaites, pour, contre)"""
+        rows = {}
+        for slot in self.changed:
+            rows[self.keys[slot]] = (self.names[slot], self.played[slot], self.wins[slot],
+                                     self.losses[slot], self.points_for[slot],
+                                     self.points_against[slot])
+        self.changed = set()
+        return rows
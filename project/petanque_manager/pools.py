@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Phase de poules : répartition en serpentin, matchs et classements par poule
+
+Chaque poule est indépendante : ses matchs sont générés dès que son tour
+précédent est terminé et ses statistiques sont mises à jour uniquement
+quand un de ses propres matchs se termine.
+"""
+
+from typing import Dict, List, Tuple
+
+from tournament import Match, Team, TeamStats
+from championship import round_robin_schedule
+from bracket import bracket_size, seeding_order
+
+POOL_SIZE = 4
+QUALIFIED_PER_POOL = 2
+
+# Formats de poule
+POOL_ROUND_ROBIN = "round_robin"
+POOL_GSL = "gsl"
+
+def serpentine_pools(ranked_teams: List[Team], pool_size: int = POOL_SIZE) -> List[List[Team]]:
+    """Répartir les équipes en serpentin : 1..P, puis P..1, etc."""
+    pool_count = max(1, -(-len(ranked_teams) // pool_size))
+    pools: List[List[Team]] = [[] for _ in range(pool_count)]
+    for i, team in enumerate(ranked_teams):
+        lap, position = divmod(i, pool_count)
+        index = position if lap % 2 == 0 else pool_count - 1 - position
+        pools[index].append(team)
+    return pools
+
+class Pool:
+    """Une poule et ses matchs"""
+
+    def __init__(self, index: int, teams: List[Team], pool_format: str = POOL_ROUND_ROBIN):
+        self.index = index
+        self.teams = teams
+        # Le format GSL n'est défini que pour une poule de quatre
+        self.format = pool_format if len(teams) == POOL_SIZE else POOL_ROUND_ROBIN
+        self.stats: Dict[int, TeamStats] = {team.id: TeamStats(team) for team in teams}
+        self.recorded: set = set()
+        self.rounds: List[List[Match]] = []
+        self.schedule = None
+        if self.format == POOL_ROUND_ROBIN:
+            self.schedule = list(round_robin_schedule(len(teams)))
+
+    @property
+    def label(self) -> str:
+        return f"Poule {self.index + 1}"
+
+    def round_complete(self) -> bool:
+        return not self.rounds or all(m.completed for m in self.rounds[-1])
+
+    def is_finished(self) -> bool:
+        if not self.round_complete():
+            return False
+        if self.format == POOL_GSL:
+            return len(self.rounds) == 3
+        return len(self.rounds) == len(self.schedule)
+
+    def _next_pairings(self) -> List[Tuple[Team, Team]]:
+        """Paires du prochain tour de la poule"""
+        if self.format == POOL_ROUND_ROBIN:
+            pairs = self.schedule[len(self.rounds)]
+            return [(self.teams[a], self.teams[b]) for a, b in pairs
+                    if a is not None and b is not None]
+
+        # GSL : 1-4 et 2-3, puis match des vainqueurs et des perdants, puis barrage
+        if not self.rounds:
+            t = self.teams
+            return [(t[0], t[3]), (t[1], t[2])]
+        if len(self.rounds) == 1:
+            first, second = self.rounds[0]
+            return [(first.get_winner(), second.get_winner()),
+                    (first.get_loser(), second.get_loser())]
+        winners_match, losers_match = self.rounds[1]
+        return [(winners_match.get_loser(), losers_match.get_winner())]
+
+    def create_matches(self, round_number: int, next_match_id: int) -> List[Match]:
+        """Créer le prochain tour de la poule si le précédent est terminé"""
+        if self.is_finished() or not self.round_complete():
+            return []
+        matches = []
+        for team1, team2 in self._next_pairings():
+            matches.append(Match(
+                id=next_match_id,
+                round_number=round_number,
+                team1=team1,
+                team2=team2,
+                pool=self.index
+            ))
+            next_match_id += 1
+        self.rounds.append(matches)
+        return matches
+
+    def record(self, match: Match):
+        """Mettre à jour les statistiques de la poule pour un match terminé"""
+        if match.id in self.recorded:
+            # Score corrigé : recalcul complet de cette seule poule
+            self.stats = {team.id: TeamStats(team) for team in self.teams}
+            for played in (m for matches in self.rounds for m in matches):
+                if played.completed:
+                    self._add(played)
+            return
+        self.recorded.add(match.id)
+        self._add(match)
+
+    def _add(self, match: Match):
+        for team, scored, conceded in ((match.team1, match.score1, match.score2),
+                                       (match.team2, match.score2, match.score1)):
+            stats = self.stats[team.id]
+            stats.points_for += scored or 0
+            stats.points_against += conceded or 0
+            if (scored or 0) > (conceded or 0):
+                stats.wins += 1
+            else:
+                stats.losses += 1
+
+    def standings(self) -> List[TeamStats]:
+        """Classement de la poule"""
+        if self.format == POOL_GSL and self.is_finished():
+            winners_match = self.rounds[1][0]
+            decider = self.rounds[2][0]
+            losers_match = self.rounds[1][1]
+            order = [winners_match.get_winner(), decider.get_winner(),
+                     decider.get_loser(), losers_match.get_loser()]
+            return [self.stats[team.id] for team in order]
+        stats = list(self.stats.values())
+        stats.sort(key=lambda s: (-s.wins, -s.points_difference, -s.points_for))
+        return stats
+
+    def qualified(self) -> List[Team]:
+        """Équipes qualifiées pour la phase finale"""
+        return [s.team for s in self.standings()[:QUALIFIED_PER_POOL]]
+
+class PoolStage:
+    """Ensemble des poules d'un tournoi"""
+
+    def __init__(self, ranked_teams: List[Team], pool_format: str = POOL_ROUND_ROBIN,
+                 pool_size: int = POOL_SIZE):
+        self.pools = [
+            Pool(i, teams, pool_format)
+            for i, teams in enumerate(serpentine_pools(ranked_teams, pool_size))
+        ]
+
+    def create_matches(self, round_number: int, next_match_id: int) -> List[Match]:
+        """Créer les matchs de toutes les poules prêtes à jouer leur tour suivant"""
+        matches = []
+        for pool in self.pools:
+            pool_matches = pool.create_matches(round_number, next_match_id)
+            next_match_id += len(pool_matches)
+            matches.extend(pool_matches)
+        return matches
+
+    def apply_result(self, match: Match):
+        """Mettre à jour uniquement la poule du match terminé"""
+        if match.pool is not None and 0 <= match.pool < len(self.pools):
+            self.pools[match.pool].record(match)
+
+    def is_finished(self) -> bool:
+        return all(pool.is_finished() for pool in self.pools)
+
+    def qualified_seeds(self) -> List[Team]:
+        """Qualifiés dans l'ordre des têtes de série : les premiers, puis les deuxièmes
+
+        Les premiers sont classés dans l'ordre des poules. Chaque deuxième reçoit
+        une place dans la moitié du tableau opposée à celle du premier de sa poule
+        (croisement) : deux qualifiés d'une même poule ne se retrouvent qu'en finale.
+        """
+        by_place = [pool.qualified() for pool in self.pools]
+        winners = [(index, teams[0]) for index, teams in enumerate(by_place) if teams]
+        runners_up = [(index, teams[1]) for index, teams in enumerate(by_place)
+                      if len(teams) > 1]
+        order = seeding_order(bracket_size(len(winners) + len(runners_up)))
+        half = {seed: leaf < len(order) // 2 for leaf, seed in enumerate(order)}
+        winner_half = {index: half[seed] for seed, (index, _) in enumerate(winners, 1)}
+
+        seeds = [team for _, team in winners]
+        for seed in range(len(winners) + 1, len(winners) + len(runners_up) + 1):
+            # Premier deuxième (ordre des poules) dont le premier est dans l'autre moitié
+            choice = next((entry for entry in runners_up
+                           if winner_half.get(entry[0]) != half[seed]), runners_up[0])
+            runners_up.remove(choice)
+            seeds.append(choice[1])
+        return seeds
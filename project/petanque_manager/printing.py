@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Impression par lots : feuilles de match, liste des appariements et classement
+
+Les textes et leur position sont préparés une fois pour toutes dans un
+RoundSheets (données simples, transmissibles à un autre processus). Le rendu
+dessine ensuite directement sur un canevas reportlab, sans moteur de mise en
+page, ce qui permet de produire le PDF d'un tour de plusieurs centaines de
+matchs en quelques secondes dans un processus de travail.
+"""
+
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Tuple
+
+from tournament import Tournament
+from championship import assign_terrains
+
+# Format A4 en points (1/72 de pouce), identique à reportlab.lib.pagesizes.A4
+PAGE_WIDTH = 595.2755905511812
+PAGE_HEIGHT = 841.8897637795277
+MARGIN = 36
+
+# Feuilles de match : 2 colonnes x 3 lignes par page
+CARD_COLUMNS = 2
+CARD_ROWS = 3
+CARD_GAP = 12
+
+# Listes (appariements, classement) : hauteur fixe des lignes
+ROW_HEIGHT = 16
+HEADER_HEIGHT = 60
+
+# Nombre de mènes prévues sur une feuille de match
+ENDS_PER_CARD = 12
+
+# Terrain imprimé pour un match qui attend qu'un terrain se libère
+WAITING = "En attente"
+
+@dataclass
+class MatchCard:
+    """Textes d'une feuille de match"""
+    match_id: int
+    label: str
+    terrain: str
+    team1: str
+    players1: str
+    team2: str
+    players2: str
+
+@dataclass
+class RoundSheets:
+    """Contenu à imprimer pour un tour, préparé sur le fil de l'interface"""
+    title: str
+    round_number: int
+    cards: List[MatchCard] = field(default_factory=list)
+    pairings: List[Tuple[str, ...]] = field(default_factory=list)
+    standings: List[Tuple[str, ...]] = field(default_factory=list)
+
+PAIRING_COLUMNS = [("Terrain", 50), ("Équipe 1", 220), ("Équipe 2", 220), ("Tour", 33)]
+STANDINGS_COLUMNS = [("Pos.", 35), ("Équipe", 80), ("Joueurs", 243), ("V", 35),
+                     ("D", 35), ("+/-", 45), ("%", 50)]
+
+def fit(text: str, width: float, font_size: float) -> str:
+    """Tronquer un texte à la largeur donnée (largeur moyenne d'un caractère Helvetica)"""
+    max_chars = max(1, int(width / (font_size * 0.5)))
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars - 1] + "…"
+
+def planned_terrains(matches: Sequence, terrain_count: int) -> dict:
+    """Terrain de chaque match joué d'un tour : identifiant du match -> terrain ou None
+
+    Les matchs sans terrain reçoivent, dans l'ordre, les terrains restés libres
+    (assign_terrains) ; au-delà, ils attendent un terrain (None). Le tournoi
+    n'est pas modifié : seule la feuille imprimée porte ces terrains.
+    """
+    played = [match for match in matches if not match.is_bye]
+    terrains = {match.id: match.terrain for match in played if match.terrain}
+    free = [terrain for terrain in range(1, terrain_count + 1)
+            if terrain not in terrains.values()]
+    waiting = [match for match in played if not match.terrain]
+    for match, index in zip(waiting, assign_terrains(len(waiting), 0, len(free))):
+        terrains[match.id] = free[index - 1] if index else None
+    return terrains
+
+def build_round_sheets(tournament: Tournament, round_number: int,
+                       with_standings: bool = True) -> RoundSheets:
+    """Préparer les feuilles de match, les appariements et le classement d'un tour"""
+    sheets = RoundSheets(title=tournament.name, round_number=round_number)
+    round_matches = tournament.get_matches_by_round(round_number)
+    terrains = planned_terrains(round_matches, tournament.terrain_count)
+    matches = sorted(round_matches, key=lambda m: (terrains.get(m.id) is None,
+                                                   terrains.get(m.id) or 0, m.id))
+    for match in matches:
+        if match.bracket and tournament.concours:
+            label = tournament.concours.round_label(match)
+        elif match.pool is not None:
+            label = f"Poule {match.pool + 1}"
+        else:
+            label = f"Tour {match.round_number}"
+        if match.is_bye:
+            terrain = "-"
+        else:
+            terrain = str(terrains[match.id]) if terrains.get(match.id) else WAITING
+        if not match.is_bye:
+            sheets.cards.append(MatchCard(
+                match_id=match.id,
+                label=label,
+                terrain=terrain,
+                team1=match.team1.get_display_name(),
+                players1=match.team1.get_players_names(),
+                team2=match.team2.get_display_name(),
+                players2=match.team2.get_players_names(),
+            ))
+        team2 = "Exempt" if match.is_bye else match.team2.get_display_name()
+        sheets.pairings.append((terrain, match.team1.get_display_name(), team2, label))
+
+    if with_standings:
+        for i, stats in enumerate(tournament.get_all_stats(), 1):
+            diff = stats.points_difference
+            sheets.standings.append((
+                str(i),
+                stats.team.get_display_name(),
+                stats.team.get_players_names(),
+                str(stats.wins),
+                str(stats.losses),
+                f"+{diff}" if diff > 0 else str(diff),
+                f"{stats.win_rate:.0%}",
+            ))
+    return sheets
+
+def card_frames() -> List[Tuple[float, float, float, float]]:
+    """Cadres (x, y, largeur, hauteur) des feuilles de match sur une page"""
+    width = (PAGE_WIDTH - 2 * MARGIN - (CARD_COLUMNS - 1) * CARD_GAP) / CARD_COLUMNS
+    height = (PAGE_HEIGHT - 2 * MARGIN - (CARD_ROWS - 1) * CARD_GAP) / CARD_ROWS
+    frames = []
+    for row in range(CARD_ROWS):
+        for column in range(CARD_COLUMNS):
+            x = MARGIN + column * (width + CARD_GAP)
+            y = PAGE_HEIGHT - MARGIN - (row + 1) * height - row * CARD_GAP
+            frames.append((x, y, width, height))
+    return frames
+
+def rows_per_page() -> int:
+    """Nombre de lignes d'une liste par page"""
+    return int((PAGE_HEIGHT - 2 * MARGIN - HEADER_HEIGHT) // ROW_HEIGHT) - 1
+
+def paginate(items: Sequence, per_page: int) -> List[Sequence]:
+    """Découper une liste en pages"""
+    return [items[i:i + per_page] for i in range(0, len(items), per_page)]
+
+def page_count(sheets: RoundSheets) -> int:
+    """Nombre de pages du PDF d'un tour"""
+    per_list_page = rows_per_page()
+    return (len(paginate(sheets.pairings, per_list_page))
+            + len(paginate(sheets.cards, CARD_COLUMNS * CARD_ROWS))
+            + len(paginate(sheets.standings, per_list_page)))
+
+def _draw_header(canvas, title: str, subtitle: str):
+    canvas.setFont("Helvetica-Bold", 16)
+    canvas.drawString(MARGIN, PAGE_HEIGHT - MARGIN - 16, title)
+    canvas.setFont("Helvetica", 11)
+    canvas.drawString(MARGIN, PAGE_HEIGHT - MARGIN - 34, subtitle)
+
+def _draw_list(canvas, title: str, subtitle: str, columns, rows):
+    """Dessiner une page de liste à colonnes de largeur fixe"""
+    _draw_header(canvas, title, subtitle)
+    y = PAGE_HEIGHT - MARGIN - HEADER_HEIGHT
+    canvas.setFont("Helvetica-Bold", 9)
+    x = MARGIN
+    for name, width in columns:
+        canvas.drawString(x + 2, y, name)
+        x += width
+    canvas.line(MARGIN, y - 4, PAGE_WIDTH - MARGIN, y - 4)
+    canvas.setFont("Helvetica", 9)
+    for row in rows:
+        y -= ROW_HEIGHT
+        x = MARGIN
+        for (_, width), value in zip(columns, row):
+            canvas.drawString(x + 2, y, fit(value, width - 4, 9))
+            x += width
+    canvas.showPage()
+
+def _draw_card(canvas, frame, title: str, card: MatchCard):
+    """Dessiner une feuille de match : équipes, grille des mènes et score final"""
+    x, y, width, height = frame
+    canvas.rect(x, y, width, height)
+    top = y + height
+    canvas.setFont("Helvetica-Bold", 10)
+    canvas.drawString(x + 6, top - 14, fit(f"{title} - {card.label}", width - 70, 10))
+    canvas.drawRightString(x + width - 6, top - 14, f"Terrain {card.terrain}")
+    canvas.setFont("Helvetica", 8)
+    canvas.drawRightString(x + width - 6, top - 26, f"Match n° {card.match_id}")
+
+    half = width / 2
+    for i, (team, players) in enumerate(((card.team1, card.players1),
+                                         (card.team2, card.players2))):
+        left = x + i * half + 6
+        canvas.setFont("Helvetica-Bold", 10)
+        canvas.drawString(left, top - 44, team)
+        canvas.setFont("Helvetica", 8)
+        canvas.drawString(left, top - 56, fit(players, half - 12, 8))
+
+    # Grille des mènes : une ligne par mène, une colonne par équipe
+    grid_top = top - 66
+    line_height = (grid_top - y - 30) / (ENDS_PER_CARD + 1)
+    canvas.setFont("Helvetica", 7)
+    for end in range(ENDS_PER_CARD + 1):
+        line_y = grid_top - end * line_height
+        canvas.line(x + 6, line_y, x + width - 6, line_y)
+        if end < ENDS_PER_CARD:
+            canvas.drawString(x + 8, line_y - line_height + 3, str(end + 1))
+    canvas.line(x + half, grid_top, x + half, grid_top - ENDS_PER_CARD * line_height)
+
+    canvas.setFont("Helvetica-Bold", 9)
+    canvas.drawString(x + 6, y + 10, "Score final :")
+    canvas.rect(x + half - 40, y + 6, 30, 16)
+    canvas.rect(x + half + 10, y + 6, 30, 16)
+
+def render_round_pdf(sheets: RoundSheets, path: str) -> int:
+    """Écrire le PDF d'un tour, retourne le nombre de pages"""
+    from reportlab.pdfgen import canvas as pdf_canvas
+
+    canvas = pdf_canvas.Canvas(path, pagesize=(PAGE_WIDTH, PAGE_HEIGHT), pageCompression=1)
+    canvas.setTitle(f"{sheets.title} - Tour {sheets.round_number}")
+    subtitle = f"Tour {sheets.round_number}"
+    pages = 0
+
+    for rows in paginate(sheets.pairings, rows_per_page()):
+        _draw_list(canvas, sheets.title, f"{subtitle} - Appariements", PAIRING_COLUMNS, rows)
+        pages += 1
+
+    frames = card_frames()
+    for cards in paginate(sheets.cards, len(frames)):
+        for frame, card in zip(frames, cards):
+            _draw_card(canvas, frame, sheets.title, card)
+        canvas.showPage()
+        pages += 1
+
+    for rows in paginate(sheets.standings, rows_per_page()):
+        _draw_list(canvas, sheets.title, f"Classement après le tour {sheets.round_number}",
+                   STANDINGS_COLUMNS, rows)
+        pages += 1
+
+    canvas.save()
+    return pages
+
+class PrintQueue:
+    """Rendu des PDF dans un processus de travail, l'interface reste disponible"""
+
+    def __init__(self, workers: int = 1):
+        self.workers = workers
+        self.executor: Optional[ProcessPoolExecutor] = None
+
+    def submit(self, sheets: RoundSheets, path: str) -> Future:
+        """Lancer le rendu ; le Future renvoie le nombre de pages"""
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self.executor.submit(render_round_pdf, sheets, path)
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Instrumentation légère des chemins critiques
+
+Les fonctions décorées par @instrumented ne coûtent qu'un test de booléen
+tant que le profileur est désactivé. Une fois activé, il conserve pour
+chaque opération le nombre d'appels et les dernières durées, peut journaliser
+les requêtes lentes dans une base SQLite et exporter une trace au format
+Chrome Trace Event (chrome://tracing, Perfetto, speedscope).
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, List, Optional
+
+# Variable d'environnement activant l'instrumentation au démarrage
+PROFILE_ENV = "PETANQUE_PROFILE"
+
+class Profiler:
+    """Compteurs, latences glissantes et trace des opérations instrumentées"""
+
+    def __init__(self, window: int = 500, max_trace_events: int = 200000):
+        self.enabled = False
+        self.window = window
+        self.lock = threading.Lock()
+        self.calls: Dict[str, int] = defaultdict(int)
+        self.total_time: Dict[str, float] = defaultdict(float)
+        self.latencies: Dict[str, deque] = {}
+        self.trace_events: deque = deque(maxlen=max_trace_events)
+        self.origin = time.perf_counter()
+        self.slow_query_threshold: Optional[float] = None
+        self.slow_query_connection: Optional[sqlite3.Connection] = None
+
+    def enable(self):
+        """Activer l'instrumentation"""
+        self.enabled = True
+
+    def disable(self):
+        """Désactiver l'instrumentation"""
+        self.enabled = False
+
+    def reset(self):
+        """Effacer toutes les mesures"""
+        with self.lock:
+            self.calls.clear()
+            self.total_time.clear()
+            self.latencies.clear()
+            self.trace_events.clear()
+
+    def count(self, name: str, amount: int = 1):
+        """Incrémenter un compteur"""
+        if self.enabled:
+            with self.lock:
+                self.calls[name] += amount
+
+    def record(self, name: str, start: float, duration: float, detail: str = ""):
+        """Enregistrer la durée d'une opération (en secondes)"""
+        with self.lock:
+            self.calls[name] += 1
+            self.total_time[name] += duration
+            latencies = self.latencies.get(name)
+            if latencies is None:
+                latencies = self.latencies[name] = deque(maxlen=self.window)
+            latencies.append(duration)
+            self.trace_events.append((name, start, duration, threading.get_ident()))
+
+        if (self.slow_query_connection is not None and name.startswith("db.")
+                and duration >= self.slow_query_threshold):
+            self._log_slow_query(name, duration, detail)
+
+    @contextmanager
+    def timer(self, name: str):
+        """Mesurer un bloc de code"""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter() - start)
+
+    def snapshot(self) -> List[Dict]:
+        """Statistiques par opération, triées par temps total décroissant"""
+        rows = []
+        with self.lock:
+            for name, calls in self.calls.items():
+                recent = sorted(self.latencies.get(name, ()))
+                row = {
+                    "name": name,
+                    "calls": calls,
+                    "total_ms": self.total_time.get(name, 0.0) * 1000,
+                    "mean_ms": 0.0,
+                    "p95_ms": 0.0,
+                    "max_ms": 0.0,
+                }
+                if recent:
+                    row["mean_ms"] = sum(recent) / len(recent) * 1000
+                    row["p95_ms"] = recent[min(len(recent) - 1, int(len(recent) * 0.95))] * 1000
+                    row["max_ms"] = recent[-1] * 1000
+                rows.append(row)
+        rows.sort(key=lambda r: -r["total_ms"])
+        return rows
+
+    def dump_trace(self, path: str) -> int:
+        """Écrire la trace au format Chrome Trace Event, retourne le nombre d'événements"""
+        pid = os.getpid()
+        with self.lock:
+            events = list(self.trace_events)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write('{"displayTimeUnit": "ms", "traceEvents": [\n')
+            for i, (name, start, duration, tid) in enumerate(events):
+                event = {
+                    "name": name,
+                    "cat": name.split(".", 1)[0],
+                    "ph": "X",
+                    "ts": (start - self.origin) * 1e6,
+                    "dur": duration * 1e6,
+                    "pid": pid,
+                    "tid": tid,
+                }
+                f.write(("," if i else "") + json.dumps(event) + "\n")
+            f.write("]}\n")
+        return len(events)
+
+    def enable_slow_query_log(self, path: str, threshold_ms: float = 50.0):
+        """Journaliser dans une base SQLite les requêtes plus lentes que le seuil"""
+        connection = sqlite3.connect(path, check_same_thread=False)
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS slow_queries (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                logged_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                operation TEXT NOT NULL,
+                duration_ms REAL NOT NULL,
+                arguments TEXT
+            )
+        """)
+        connection.commit()
+        self.slow_query_threshold = threshold_ms / 1000
+        self.slow_query_connection = connection
+
+    def disable_slow_query_log(self):
+        """Arrêter le journal des requêtes lentes"""
+        if self.slow_query_connection is not None:
+            self.slow_query_connection.close()
+        self.slow_query_connection = None
+
+    def _log_slow_query(self, name: str, duration: float, detail: str):
+        with self.lock:
+            self.slow_query_connection.execute("""
+                INSERT INTO slow_queries (operation, duration_ms, arguments)
+                VALUES (?, ?, ?)
+            """, (name, duration * 1000, detail))
+            self.slow_query_connection.commit()
+
+# Profileur global de l'application
+profiler = Profiler()
+if os.environ.get(PROFILE_ENV):
+    profiler.enable()
+
+def instrumented(name: str):
+    """Décorateur : mesurer chaque appel de la fonction sous le nom donné"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                duration = time.perf_counter() - start
+                detail = ""
+                if profiler.slow_query_connection is not None:
+                    detail = repr(args[1:])[:200]
+                profiler.record(name, start, duration, detail)
+        return wrapper
+    return decorator
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Projection Monte Carlo des résultats d'un tournoi
+
+Simule les tours restants à partir de l'état actuel d'un tournoi en
+utilisant les mêmes règles d'appariement que generate_next_round_matches,
+puis agrège la distribution des places finales de chaque équipe.
+"""
+
+import abc
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from tournament import (Tournament, FORMAT_CONCOURS, FORMAT_POOLS, FORMAT_CHAMPIONSHIP,
+                        pair_randomly, pair_seeded, pair_by_win_groups)
+
+# Score attribué à l'équipe exemptée (BYE), identique à Tournament
+BYE_SCORE = (13, 7)
+
+
+class StrengthModel(abc.ABC):
+    """Modèle de force des équipes : produit le score d'un match simulé"""
+
+    def play(self, team1: int, team2: int, rng: random.Random) -> Tuple[int, int]:
+        """Retourne (score1, score2) pour deux indices d'équipe"""
+        if rng.random() < self.win_probability(team1, team2):
+            return 13, rng.randint(0, 12)
+        return rng.randint(0, 12), 13
+
+    @abc.abstractmethod
+    def win_probability(self, team1: int, team2: int) -> float:
+        """Probabilité que team1 batte team2"""
+
+
+class UniformStrengthModel(StrengthModel):
+    """Toutes les équipes ont la même force"""
+
+    def win_probability(self, team1: int, team2: int) -> float:
+        return 0.5
+
+
+class RatingStrengthModel(StrengthModel):
+    """Modèle logistique de type Elo à partir d'une cote par équipe"""
+
+    def __init__(self, ratings: Sequence[float], scale: float = 400.0):
+        self.ratings = list(ratings)
+        self.scale = scale
+
+    @classmethod
+    def from_tournament(cls, tournament: Tournament, ratings: Dict[int, float],
+                        default: float = 1500.0, scale: float = 400.0) -> "RatingStrengthModel":
+        """Construire le modèle à partir d'un dictionnaire {id équipe: cote}"""
+        return cls([ratings.get(team.id, default) for team in tournament.teams], scale)
+
+    def win_probability(self, team1: int, team2: int) -> float:
+        diff = self.ratings[team2] - self.ratings[team1]
+        return 1.0 / (1.0 + 10 ** (diff / self.scale))
+
+
+class CompactState:
+    """État compact d'un tournoi : tableaux d'entiers indexés par équipe
+
+    L'ordre des indices est celui de Tournament.teams, ce qui reproduit le
+    départage stable de Tournament.get_all_stats. `played` contient les paires
+    d'indices déjà opposées, pour éviter les revanches comme le tirage réel.
+    """
+
+    __slots__ = ("wins", "points_for", "points_against", "current_round", "played")
+
+    def __init__(self, wins: List[int], points_for: List[int],
+                 points_against: List[int], current_round: int,
+                 played: Optional[Set[frozenset]] = None):
+        self.wins = wins
+        self.points_for = points_for
+        self.points_against = points_against
+        self.current_round = current_round
+        self.played = played if played is not None else set()
+
+    @classmethod
+    def from_tournament(cls, tournament: Tournament) -> Tuple["CompactState", List[Tuple[int, int]]]:
+        """Extraire l'état compact et les matchs du tour en cours restant à jouer"""
+        index = {team.id: i for i, team in enumerate(tournament.teams)}
+        size = len(tournament.teams)
+        state = cls([0] * size, [0] * size, [0] * size, tournament.current_round)
+        pending = []
+
+        for match in tournament.matches:
+            i = index.get(match.team1.id)
+            j = index.get(match.team2.id)
+            if not match.is_bye and i is not None and j is not None:
+                state.played.add(frozenset((i, j)))
+            if not match.completed:
+                if i is not None and j is not None:
+                    pending.append((i, j))
+                continue
+            if i is not None:
+                state.record(i, match.score1 or 0, match.score2 or 0)
+            if j is not None:
+                state.record(j, match.score2 or 0, match.score1 or 0)
+
+        return state, pending
+
+    def copy(self) -> "CompactState":
+        """Copie peu coûteuse (trois listes d'entiers et les paires jouées)"""
+        return CompactState(self.wins[:], self.points_for[:],
+                            self.points_against[:], self.current_round, set(self.played))
+
+    def record(self, team: int, scored: int, conceded: int):
+        """Enregistrer le résultat d'un match pour une équipe"""
+        self.points_for[team] += scored
+        self.points_against[team] += conceded
+        if scored > conceded:
+            self.wins[team] += 1
+
+    def play(self, team1: int, team2: int, model: StrengthModel, rng: random.Random):
+        """Simuler un match et enregistrer le résultat"""
+        score1, score2 = model.play(team1, team2, rng)
+        self.record(team1, score1, score2)
+        self.record(team2, score2, score1)
+        self.played.add(frozenset((team1, team2)))
+
+    def ranking(self) -> List[int]:
+        """Indices des équipes dans l'ordre du classement"""
+        wins, pf, pa = self.wins, self.points_for, self.points_against
+        return sorted(range(len(wins)), key=lambda i: (-wins[i], -(pf[i] - pa[i]), -pf[i]))
+
+
+def simulate_round(state: CompactState, tournament_type: str, model: StrengthModel,
+                   rng: random.Random, ratings: Optional[List[float]] = None):
+    """Simuler un tour complet avec les règles d'appariement du tournoi"""
+    teams = range(len(state.wins))
+    rating = ratings.__getitem__ if ratings else None
+
+    if state.current_round == 0 and rating is not None:
+        pairs, bye = pair_seeded(teams, rating, rng)
+        for team in bye:
+            state.record(team, *BYE_SCORE)
+    elif state.current_round == 0 or tournament_type == "mêlée":
+        pairs, bye = pair_randomly(teams, rng)
+        for team in bye:
+            state.record(team, *BYE_SCORE)
+    else:
+        groups: Dict[int, List[int]] = {}
+        for team in state.ranking():
+            groups.setdefault(state.wins[team], []).append(team)
+        # Mêmes paires interdites que Tournament._generate_standard_matches
+        played = state.played
+        met = lambda team1, team2: frozenset((team1, team2)) in played
+        pairs = pair_by_win_groups(groups, rng, rating, met)
+
+    for team1, team2 in pairs:
+        state.play(team1, team2, model, rng)
+    state.current_round += 1
+
+
+@dataclass
+class Projection:
+    """Distribution des places finales issue de la simulation"""
+    team_ids: List[int]
+    position_counts: List[List[int]]
+    simulations: int
+
+    def _row(self, team_id: int) -> List[int]:
+        return self.position_counts[self.team_ids.index(team_id)]
+
+    def position_distribution(self, team_id: int) -> List[float]:
+        """Probabilité de chaque place finale (index 0 = 1re place)"""
+        return [count / self.simulations for count in self._row(team_id)]
+
+    def probability_top(self, team_id: int, places: int) -> float:
+        """Probabilité de terminer dans les `places` premiers"""
+        return sum(self._row(team_id)[:places]) / self.simulations
+
+    def expected_position(self, team_id: int) -> float:
+        """Place finale moyenne (1 = premier)"""
+        row = self._row(team_id)
+        return sum((pos + 1) * count for pos, count in enumerate(row)) / self.simulations
+
+
+def _simulate_chunk(args) -> List[List[int]]:
+    """Tâche d'un processus : simuler un lot de tournois avec un RNG dédié"""
+    state, pending, tournament_type, ratings, rounds, model, seed, count = args
+    rng = random.Random(seed)
+    size = len(state.wins)
+    counts = [[0] * size for _ in range(size)]
+
+    for _ in range(count):
+        sim = state.copy()
+        for team1, team2 in pending:
+            sim.play(team1, team2, model, rng)
+        for _ in range(rounds):
+            simulate_round(sim, tournament_type, model, rng, ratings)
+        for position, team in enumerate(sim.ranking()):
+            counts[team][position] += 1
+
+    return counts
+
+
+def project_outcomes(tournament: Tournament, total_rounds: int, simulations: int = 20000,
+                     model: Optional[StrengthModel] = None, seed: Optional[int] = None,
+                     workers: Optional[int] = None, chunk_size: int = 1000) -> Projection:
+    """Projeter les places finales en simulant les tours restants
+
+    Les tours restants sont ceux entre le tour actuel et `total_rounds` ; les
+    matchs non terminés du tour en cours sont simulés en premier. Chaque lot
+    de simulations reçoit sa propre graine dérivée de `seed`, ce qui rend le
+    résultat reproductible quel que soit le nombre de processus.
+    """
+    if tournament.format in (FORMAT_CONCOURS, FORMAT_POOLS, FORMAT_CHAMPIONSHIP):
+        raise ValueError("La projection ne s'applique qu'aux tournois en rondes suisses")
+    if tournament.tournament_type == "quadrette":
+        raise ValueError("La projection ne s'applique pas aux rotations de quadrette")
+    if len(tournament.teams) < 2:
+        raise ValueError("Il faut au moins 2 équipes pour projeter le tournoi")
+
+    model = model or UniformStrengthModel()
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+
+    state, pending = CompactState.from_tournament(tournament)
+    rounds = max(0, total_rounds - tournament.current_round)
+    ratings = None
+    if tournament.team_ratings:
+        ratings = [tournament.team_ratings.get(team.id, 0.0) for team in tournament.teams]
+
+    tasks = []
+    for chunk, start in enumerate(range(0, simulations, chunk_size)):
+        count = min(chunk_size, simulations - start)
+        tasks.append((state, pending, tournament.tournament_type, ratings, rounds,
+                      model, seed * 1000003 + chunk, count))
+
+    if workers == 1 or len(tasks) == 1:
+        results = map(_simulate_chunk, tasks)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_simulate_chunk, tasks))
+
+    size = len(tournament.teams)
+    totals = [[0] * size for _ in range(size)]
+    for counts in results:
+        for team in range(size):
+            row = totals[team]
+            for position, count in enumerate(counts[team]):
+                row[position] += count
+
+    return Projection([team.id for team in tournament.teams], totals, simulations)
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cache des lectures de DatabaseManager
+
+Les résultats des requêtes de lecture sont conservés dans un cache LRU de
+taille bornée, par tournoi et paramètres (tour, ...). Chaque tournoi a un
+numéro de version, incrémenté par toute écriture qui le concerne : la clé
+d'une entrée contient la version lue, une écriture rend donc immédiatement
+inaccessibles les seules entrées de ce tournoi, qui sortent ensuite du LRU.
+"""
+
+from collections import OrderedDict
+from functools import wraps
+from typing import Callable, Dict, Hashable, Optional
+
+# Nombre d'entrées conservées par défaut
+CACHE_SIZE = 256
+
+class QueryCache:
+    """Cache LRU à invalidation par version de tournoi"""
+
+    def __init__(self, max_entries: int = CACHE_SIZE):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[tuple, list]" = OrderedDict()
+        self.versions: Dict[Optional[int], int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, name: str, tournament_id: Optional[int], args: tuple,
+            load: Callable[[], list]) -> list:
+        """Résultat en cache, ou chargé par `load` puis mis en cache
+
+        Les lignes (dictionnaires) sont copiées : l'appelant peut les modifier.
+        """
+        key = (name, tournament_id, self.versions.get(tournament_id, 0)) + args
+        rows = self.entries.get(key)
+        if rows is None:
+            self.misses += 1
+            rows = load()
+            self.entries[key] = rows
+            if len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        return [dict(row) for row in rows]
+
+    def invalidate(self, tournament_id: Optional[int]):
+        """Périmer les entrées d'un tournoi (et celles portant sur tous les tournois)"""
+        self.versions[tournament_id] = self.versions.get(tournament_id, 0) + 1
+        if tournament_id is not None:
+            self.versions[None] = self.versions.get(None, 0) + 1
+        self.invalidations += 1
+
+    def clear(self):
+        """Tout oublier (écriture par une autre connexion sur la même base)"""
+        self.entries.clear()
+        self.invalidations += 1
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self.entries),
+            "invalidations": self.invalidations,
+        }
+
+    def reset_stats(self):
+        self.hits = self.misses = self.invalidations = 0
+
+def cached_read(func):
+    """Décorateur de méthode de lecture dont le premier argument est l'identifiant du tournoi"""
+    @wraps(func)
+    def wrapper(self, tournament_id: Optional[int] = None, *args: Hashable):
+        self.check_external_writes()
+        return self.query_cache.get(func.__name__, tournament_id, args,
+                                    lambda: func(self, tournament_id, *args))
+    return wrapper
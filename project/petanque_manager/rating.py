@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cotes des joueurs inter-tournois (système de type Elo)
+
+Les cotes sont mises à jour de façon incrémentale à chaque match terminé,
+conservées en mémoire, puis écrites en base par lots avec flush().
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List
+
+from tournament import Tournament, Team, Match, normalize_name
+
+DEFAULT_RATING = 1500.0
+# Coefficient K : plus élevé pendant la période provisoire d'un joueur
+K_PROVISIONAL = 40.0
+K_ESTABLISHED = 20.0
+PROVISIONAL_GAMES = 10
+
+
+@dataclass
+class PlayerRating:
+    """Cote d'un joueur"""
+    name: str
+    rating: float = DEFAULT_RATING
+    games: int = 0
+
+    @property
+    def k_factor(self) -> float:
+        return K_PROVISIONAL if self.games < PROVISIONAL_GAMES else K_ESTABLISHED
+
+
+def expected_score(rating1: float, rating2: float) -> float:
+    """Probabilité de victoire attendue de la cote 1 contre la cote 2"""
+    return 1.0 / (1.0 + 10 ** ((rating2 - rating1) / 400.0))
+
+
+class RatingBook:
+    """Cotes des joueurs en mémoire, synchronisées avec le registre en base"""
+
+    def __init__(self, db_manager=None):
+        self.db_manager = db_manager
+        self.players: Dict[str, PlayerRating] = {}
+        self.dirty: set = set()
+
+    def load(self, names: Iterable[str]):
+        """Charger en une requête les cotes des joueurs pas encore connus"""
+        missing = {}
+        for name in names:
+            key = normalize_name(name)
+            if key and key not in self.players:
+                missing.setdefault(key, name)
+        if not missing:
+            return
+
+        rows = self.db_manager.get_player_ratings(list(missing)) if self.db_manager else {}
+        for key, name in missing.items():
+            row = rows.get(key)
+            if row:
+                self.players[key] = PlayerRating(row["name"], row["rating"], row["games"])
+            else:
+                self.players[key] = PlayerRating(name)
+
+    def get(self, name: str) -> PlayerRating:
+        """Cote d'un joueur (chargée si nécessaire)"""
+        key = normalize_name(name)
+        if key not in self.players:
+            self.load([name])
+        return self.players[key]
+
+    def team_rating(self, team: Team) -> float:
+        """Cote d'une équipe : moyenne des cotes de ses joueurs"""
+        if not team.players:
+            return DEFAULT_RATING
+        return sum(self.get(p.name).rating for p in team.players) / len(team.players)
+
+    def team_ratings(self, tournament: Tournament) -> Dict[int, float]:
+        """Cotes de toutes les équipes d'un tournoi, pour Tournament.set_team_ratings"""
+        self.load(p.name for team in tournament.teams for p in team.players)
+        return {team.id: self.team_rating(team) for team in tournament.teams}
+
+    def record_match(self, match: Match):
+        """Mettre à jour les cotes des joueurs à partir d'un match terminé"""
+        if not match.completed or match.is_bye or match.score1 is None or match.score2 is None:
+            return
+        if match.score1 == match.score2:
+            return
+
+        rating1 = self.team_rating(match.team1)
+        rating2 = self.team_rating(match.team2)
+        result1 = 1.0 if match.score1 > match.score2 else 0.0
+        expected1 = expected_score(rating1, rating2)
+
+        for team, delta in ((match.team1, result1 - expected1),
+                            (match.team2, expected1 - result1)):
+            for player in team.players:
+                entry = self.get(player.name)
+                entry.rating += entry.k_factor * delta
+                entry.games += 1
+                self.dirty.add(normalize_name(player.name))
+
+    def record_matches(self, matches: Iterable[Match]):
+        """Mettre à jour les cotes pour une suite de matchs"""
+        for match in matches:
+            self.record_match(match)
+
+    def flush(self) -> int:
+        """Écrire en une transaction les cotes modifiées, retourne le nombre de joueurs"""
+        if not self.dirty or not self.db_manager:
+            return 0
+        batch: List = []
+        for key in self.dirty:
+            entry = self.players[key]
+            batch.append((key, entry.name, entry.rating, entry.games))
+        self.db_manager.save_player_ratings(batch)
+        self.dirty.clear()
+        return len(batch)
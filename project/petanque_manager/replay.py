@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Enregistrement et rejeu de la séquence d'opérations d'un tournoi
+
+Un Recorder écrit, au fil de l'eau, chaque opération d'un tournoi réel
+(inscriptions, tirages, saisies et validations de scores) avec son instant,
+une ligne JSON par opération. Le tournoi ayant sa propre graine, replay()
+reproduit exactement les mêmes tirages contre un Tournament et un
+DatabaseManager neufs, en temps réel (vitesse 1) ou aussi vite que possible,
+et mesure la latence de chaque opération (moteur et écriture en base). Un
+tirage rejoué différent de l'original (recherche du meilleur tirage limitée
+par le temps, par exemple) est signalé comme divergence.
+
+Usage : python replay.py journal.jsonl [--vitesse 1] [--base rejeu.db]
+"""
+
+import argparse
+import json
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, TextIO
+
+from tournament import Tournament
+from events import (TournamentEvent, TeamAdded, TeamRemoved, RoundGenerated, ScoreUpdated,
+                    MatchValidated)
+
+# Opérations enregistrées
+OP_ADD_TEAM = "add_team"
+OP_REMOVE_TEAM = "remove_team"
+OP_GENERATE = "generate_round"
+OP_SET_SCORE = "set_score"
+OP_VALIDATE = "validate"
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Percentile par rang le plus proche d'une liste triée"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+def pairings(matches) -> List[list]:
+    return [[m.id, m.team1.id, None if m.is_bye else m.team2.id, m.terrain] for m in matches]
+
+class Recorder:
+    """Journal des opérations d'un tournoi, écrit ligne par ligne"""
+
+    def __init__(self, tournament: Tournament, output: TextIO,
+                 clock=time.monotonic):
+        if tournament.matches:
+            raise ValueError("L'enregistrement doit commencer avant le premier tirage")
+        self.tournament = tournament
+        self.output = output
+        self.clock = clock
+        self.start = clock()
+        self.operations = 0
+        self._write({
+            "op": "tournament", "t": 0.0, "name": tournament.name,
+            "tournament_type": tournament.tournament_type,
+            "terrain_count": tournament.terrain_count,
+            "tournament_format": tournament.format,
+            "concours_levels": tournament.concours_levels,
+            "pool_format": tournament.pool_format, "seed": tournament.seed,
+        })
+        for team in tournament.teams:
+            self.on_event(TeamAdded(team))
+        tournament.events.subscribe(TournamentEvent, self.on_event)
+
+    def _write(self, record: dict):
+        self.output.write(json.dumps(record, ensure_ascii=False) + "\n")
+        # Écrit aussitôt : le journal reste exploitable après un plantage
+        self.output.flush()
+
+    def on_event(self, event: TournamentEvent):
+        record = {"t": round(self.clock() - self.start, 4)}
+        if isinstance(event, TeamAdded):
+            # Club, ligue et tête de série contraignent le tirage du premier tour
+            team = event.team
+            record.update(op=OP_ADD_TEAM, players=[p.name for p in team.players],
+                          club=team.club, league=team.league, seeded=team.seeded)
+        elif isinstance(event, TeamRemoved):
+            record.update(op=OP_REMOVE_TEAM, team_id=event.team_id)
+        elif isinstance(event, RoundGenerated):
+            # Les cotes orientent les tirages avec têtes de série
+            record.update(op=OP_GENERATE, round=event.round_number,
+                          matches=pairings(event.matches),
+                          ratings=self.tournament.team_ratings)
+        elif isinstance(event, (ScoreUpdated, MatchValidated)):
+            m = event.match
+            record.update(op=OP_VALIDATE if isinstance(event, MatchValidated) else OP_SET_SCORE,
+                          match_id=m.id, score1=m.score1, score2=m.score2, terrain=m.terrain)
+        else:
+            return
+        self.operations += 1
+        self._write(record)
+
+    def close(self):
+        self.tournament.events.unsubscribe(TournamentEvent, self.on_event)
+
+@dataclass
+class ReplayReport:
+    """Latences mesurées par opération et divergences constatées"""
+    operations: int = 0
+    elapsed: float = 0.0
+    latencies: Dict[str, List[float]] = field(default_factory=dict)
+    # Tirages différents de ceux enregistrés
+    divergences: List[str] = field(default_factory=list)
+
+    def add(self, name: str, seconds: float):
+        self.latencies.setdefault(name, []).append(seconds)
+
+    def percentiles(self) -> Dict[str, Dict[str, float]]:
+        """p50, p95, p99 et maximum (ms) par opération"""
+        summary = {}
+        for name, values in sorted(self.latencies.items()):
+            ordered = sorted(values)
+            summary[name] = {
+                "count": len(ordered),
+                "p50_ms": percentile(ordered, 0.50) * 1000,
+                "p95_ms": percentile(ordered, 0.95) * 1000,
+                "p99_ms": percentile(ordered, 0.99) * 1000,
+                "max_ms": ordered[-1] * 1000,
+            }
+        return summary
+
+    def lines(self) -> List[str]:
+        lines = [f"{self.operations} opération(s) rejouée(s) en {self.elapsed:.2f} s"]
+        lines.append(f"{'opération':<22} {'nombre':>7} {'p50 ms':>9} {'p95 ms':>9} "
+                     f"{'p99 ms':>9} {'max ms':>9}")
+        for name, stats in self.percentiles().items():
+            lines.append(f"{name:<22} {stats['count']:7d} {stats['p50_ms']:9.3f} "
+                         f"{stats['p95_ms']:9.3f} {stats['p99_ms']:9.3f} {stats['max_ms']:9.3f}")
+        if self.divergences:
+            lines.append(f"{len(self.divergences)} divergence(s) : " + "; ".join(self.divergences[:5]))
+        return lines
+
+def read_journal(lines: Iterable[str]) -> List[dict]:
+    return [json.loads(line) for line in lines if line.strip()]
+
+def replay(records: List[dict], db_path: str = ":memory:", speed: Optional[float] = None,
+           sleep=time.sleep) -> ReplayReport:
+    """Rejouer un journal contre un Tournament et un DatabaseManager neufs
+
+    `speed` : None pour enchaîner sans attendre, 1 pour le rythme réel, 10 pour
+    dix fois plus vite. Chaque opération est suivie de l'écriture de ses
+    modifications en base (sauvegarde incrémentale), mesurée à part (« db.* »).
+    """
+    from autosave import AutoSaver
+    from store import DatabaseManager
+
+    header, operations = records[0], records[1:]
+    if header.get("op") != "tournament":
+        raise ValueError("Le journal doit commencer par la description du tournoi")
+    params = {key: value for key, value in header.items() if key not in ("op", "t")}
+    tournament = Tournament(**params)
+    db = DatabaseManager(db_path)
+    tournament.id = db.create_tournament(tournament.name, tournament.tournament_type,
+                                         tournament.terrain_count, tournament.format,
+                                         tournament.seed)
+    pending = []
+    saver = AutoSaver(tournament, pending.append)
+    report = ReplayReport()
+    start = time.perf_counter()
+    try:
+        for record in operations:
+            if speed:
+                delay = record["t"] / speed - (time.perf_counter() - start)
+                if delay > 0:
+                    sleep(delay)
+            op = record["op"]
+            began = time.perf_counter()
+            _apply(tournament, record, report)
+            report.add(op, time.perf_counter() - began)
+            began = time.perf_counter()
+            saver.save()
+            for changes in pending:
+                db.save_changes(changes)
+            pending.clear()
+            report.add(f"db.{op}", time.perf_counter() - began)
+            report.operations += 1
+    finally:
+        saver.close()
+        db.close()
+    report.elapsed = time.perf_counter() - start
+    return report
+
+def _apply(tournament: Tournament, record: dict, report: ReplayReport):
+    op = record["op"]
+    if op == OP_ADD_TEAM:
+        tournament.add_team(record["players"], record.get("club"), record.get("league"),
+                            record.get("seeded", False))
+    elif op == OP_REMOVE_TEAM:
+        tournament.remove_team(record["team_id"])
+    elif op == OP_GENERATE:
+        tournament.set_team_ratings({int(team): rating
+                                     for team, rating in record.get("ratings", {}).items()})
+        if tournament.current_round == 0:
+            matches = tournament.generate_first_round_matches()
+        else:
+            matches = tournament.generate_next_round_matches()
+        if pairings(matches) != record["matches"]:
+            report.divergences.append(f"tour {record['round']}")
+    elif op == OP_SET_SCORE:
+        match_id = record["match_id"]
+        match = next((m for m in tournament.matches if m.id == match_id), None)
+        if match is None:
+            report.divergences.append(f"match {match_id} absent")
+            return
+        if (match.score1, match.score2) != (record["score1"], record["score2"]):
+            tournament.set_match_score(match_id, record["score1"], record["score2"])
+        if record["terrain"] is not None and match.terrain != record["terrain"]:
+            tournament.set_match_terrain(match_id, record["terrain"])
+    elif op == OP_VALIDATE:
+        tournament.update_match_score(record["match_id"], record["score1"], record["score2"],
+                                      record["terrain"])
+
+def main():
+    parser = argparse.ArgumentParser(description="Rejouer le journal d'un tournoi")
+    parser.add_argument("journal", help="fichier JSON Lines produit par Recorder")
+    parser.add_argument("--vitesse", type=float, default=None,
+                        help="1 = rythme réel, 10 = dix fois plus vite (défaut : sans attente)")
+    parser.add_argument("--base", default=":memory:", help="base SQLite de rejeu")
+    args = parser.parse_args()
+    with open(args.journal, encoding="utf-8") as f:
+        records = read_journal(f)
+    report = replay(records, args.base, args.vitesse)
+    print("\n".join(report.lines()))
+    return 1 if report.divergences else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
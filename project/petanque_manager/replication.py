@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Réplication d'un tournoi entre plusieurs postes sur le réseau local
+
+Un poste héberge un ReplicationHub : il numérote les modifications reçues et
+les conserve dans un journal ordonné. Chaque poste (y compris l'hôte) est un
+ReplicaSeat relié au hub en TCP : il envoie les modifications de son tournoi
+(une ligne JSON par modification, état complet de l'objet modifié) et applique
+celles des autres postes dans l'ordre du journal. Un poste qui se reconnecte
+indique le dernier numéro reçu et ne reçoit que la suite.
+
+Règles de conflit par match :
+- la dernière validation l'emporte (ordre du journal) ; une saisie en cours
+  sur un match déjà validé est refusée ;
+- un arbitre peut verrouiller un match : seules ses modifications sont
+  acceptées jusqu'au déverrouillage.
+
+Les tours sont tirés sur un seul poste puis répliqués tels quels ; pour un
+concours ou des poules, c'est l'hôte (qui détient les tableaux) qui tire les
+tours suivants.
+"""
+
+import json
+import queue
+import socket
+import socketserver
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from tournament import Tournament, Match, Player, Team
+from events import (TournamentEvent, TeamAdded, TeamRemoved, RoundGenerated, ScoreUpdated,
+                    MatchValidated)
+from autosave import composite_row, match_row, team_row
+
+DEFAULT_PORT = 5099
+
+# Types de modification du journal
+KIND_TOURNAMENT = "tournament"
+KIND_TEAM = "team"
+KIND_TEAM_REMOVED = "team_removed"
+KIND_ROUND = "round"
+KIND_MATCH = "match"
+KIND_LOCK = "lock"
+KIND_UNLOCK = "unlock"
+
+# Position du drapeau « terminé » dans match_row
+COMPLETED = 6
+
+@dataclass
+class Entry:
+    """Une modification du journal"""
+    seq: int
+    origin: str
+    kind: str
+    key: int
+    data: object
+
+    def message(self) -> dict:
+        return {"type": "entry", "seq": self.seq, "origin": self.origin,
+                "kind": self.kind, "key": self.key, "data": self.data}
+
+def send_message(sock: socket.socket, message: dict):
+    sock.sendall((json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8"))
+
+def tournament_data(tournament: Tournament) -> dict:
+    """Paramètres nécessaires pour recréer le tournoi sur un autre poste"""
+    return {
+        "name": tournament.name,
+        "tournament_type": tournament.tournament_type,
+        "terrain_count": tournament.terrain_count,
+        "tournament_format": tournament.format,
+        "concours_levels": tournament.concours_levels,
+        "pool_format": tournament.pool_format,
+        "seed": tournament.seed,
+    }
+
+def round_row(m: Match) -> list:
+    """Ligne d'un match dans un tour publié : identifiant, colonnes de match_row, puis
+    la composition de chaque équipe composée pour le match (quadrette), sinon None"""
+    return [m.id, *match_row(m),
+            *(composite_row(team) if team.members else None for team in (m.team1, m.team2))]
+
+class _HubClient:
+    """Connexion d'un poste au hub"""
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.seat = ""
+
+    def send(self, message: dict):
+        try:
+            send_message(self.sock, message)
+        except OSError:
+            pass  # Le fil de lecture de ce poste constatera la déconnexion
+
+class _HubHandler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        hub: ReplicationHub = self.server.hub
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        client = _HubClient(self.request)
+        try:
+            for line in self.rfile:
+                message = json.loads(line)
+                if message["type"] == "hello":
+                    hub.join(client, message["seat"], message.get("since", 0))
+                elif message["type"] == "propose":
+                    hub.propose(client, message)
+        except (OSError, ValueError):
+            pass
+        finally:
+            hub.leave(client)
+
+class _HubServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+class ReplicationHub:
+    """Journal ordonné des modifications et diffusion aux postes connectés"""
+
+    def __init__(self, host: str = "0.0.0.0", port: int = DEFAULT_PORT):
+        self.server = _HubServer((host, port), _HubHandler)
+        self.server.hub = self
+        self.lock = threading.Lock()
+        self.log: List[Entry] = []
+        self.clients: List[_HubClient] = []
+        # État courant des matchs et verrous d'arbitre, pour les règles de conflit
+        self.matches: Dict[int, list] = {}
+        self.locks: Dict[int, str] = {}
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self):
+        return self.server.server_address
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, name="replication-hub",
+                                       daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+        with self.lock:
+            for client in self.clients:
+                try:
+                    client.sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+            self.clients = []
+
+    def join(self, client: _HubClient, seat: str, since: int):
+        """Envoyer au poste les modifications postérieures à `since`, puis la suite en direct"""
+        with self.lock:
+            client.seat = seat
+            for entry in self.log[since:]:
+                client.send(entry.message())
+            self.clients.append(client)
+
+    def leave(self, client: _HubClient):
+        with self.lock:
+            if client in self.clients:
+                self.clients.remove(client)
+
+    def conflict(self, seat: str, kind: str, key: int, data) -> Optional[str]:
+        """Motif de refus d'une modification, ou None si elle est acceptée"""
+        if kind in (KIND_MATCH, KIND_LOCK, KIND_UNLOCK):
+            holder = self.locks.get(key)
+            if holder is not None and holder != seat:
+                return f"Match {key} verrouillé par {holder}"
+            if kind == KIND_UNLOCK and holder is None:
+                return f"Match {key} non verrouillé"
+        if kind == KIND_MATCH:
+            current = self.matches.get(key)
+            if current is not None and current[COMPLETED] and not data[COMPLETED]:
+                return f"Match {key} déjà validé"
+        return None
+
+    def propose(self, client: _HubClient, message: dict):
+        kind, key, data = message["kind"], message["key"], message["data"]
+        with self.lock:
+            reason = self.conflict(client.seat, kind, key, data)
+            if reason is not None:
+                client.send({"type": "rejected", "kind": kind, "key": key, "reason": reason,
+                             "current": self.matches.get(key) if kind == KIND_MATCH else None})
+                return
+            entry = Entry(len(self.log) + 1, client.seat, kind, key, data)
+            self.log.append(entry)
+            if kind == KIND_ROUND:
+                for row in data:
+                    self.matches[row[0]] = row[1:]
+            elif kind == KIND_MATCH:
+                self.matches[key] = data
+            elif kind == KIND_LOCK:
+                self.locks[key] = client.seat
+            elif kind == KIND_UNLOCK:
+                del self.locks[key]
+            message = entry.message()
+            for other in self.clients:
+                other.send(message)
+
+class ReplicaSeat:
+    """Un poste de saisie : envoie ses modifications au hub et applique celles des autres
+
+    Le réseau est lu sur un fil dédié ; les modifications reçues ne sont
+    appliquées au tournoi que dans poll(), à appeler depuis le fil de
+    l'interface (par ex. toutes les 20 ms).
+    """
+
+    def __init__(self, seat: str, tournament: Optional[Tournament] = None):
+        self.seat = seat
+        self.tournament: Optional[Tournament] = None
+        self.sock: Optional[socket.socket] = None
+        self.reader: Optional[threading.Thread] = None
+        self.send_lock = threading.Lock()
+        self.incoming: "queue.Queue[dict]" = queue.Queue()
+        # Dernier numéro du journal appliqué (reprise incrémentale)
+        self.last_seq = 0
+        # Modifications envoyées pas encore revenues du hub, par (type, clé)
+        self.pending: Dict[tuple, int] = {}
+        # Modifications faites hors connexion
+        self.outbox: List[dict] = []
+        self.locks: Dict[int, str] = {}
+        self.rejections: List[str] = []
+        self.applying = False
+        # Appelé à la création du tournoi reçu, avant l'application de ses modifications
+        self.on_tournament: Optional[Callable[[Tournament], None]] = None
+        if tournament is not None:
+            self.attach(tournament)
+
+    @property
+    def connected(self) -> bool:
+        return self.sock is not None
+
+    def attach(self, tournament: Tournament):
+        """Suivre les modifications d'un tournoi"""
+        self.tournament = tournament
+        tournament.events.subscribe(TournamentEvent, self.on_event)
+
+    def connect(self, host: str, port: int = DEFAULT_PORT, timeout: float = 5.0):
+        """Se connecter au hub et demander les modifications manquantes"""
+        sock = socket.create_connection((host, port), timeout=timeout)
+        sock.settimeout(None)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.sock = sock
+        self.reader = threading.Thread(target=self._read, args=(sock,), name="replica-reader",
+                                       daemon=True)
+        self.reader.start()
+        self._send({"type": "hello", "seat": self.seat, "since": self.last_seq})
+        outbox, self.outbox = self.outbox, []
+        for message in outbox:
+            key = (message["kind"], message["key"])
+            self.pending[key] = self.pending.get(key, 0) + 1
+            self._send(message)
+
+    def disconnect(self):
+        sock, self.sock = self.sock, None
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
+        if self.reader is not None:
+            self.reader.join()
+            self.reader = None
+        # Les réponses attendues ne viendront plus : la reprise les renverra
+        self.pending = {}
+
+    def close(self):
+        self.disconnect()
+        if self.tournament is not None:
+            self.tournament.events.unsubscribe(TournamentEvent, self.on_event)
+
+    def _read(self, sock: socket.socket):
+        try:
+            with sock.makefile("r", encoding="utf-8") as lines:
+                for line in lines:
+                    self.incoming.put(json.loads(line))
+        except (OSError, ValueError):
+            pass
+        self.incoming.put({"type": "disconnected", "sock": sock})
+
+    def _send(self, message: dict):
+        if self.sock is None:
+            self.outbox.append(message)
+            return
+        with self.send_lock:
+            try:
+                send_message(self.sock, message)
+            except OSError:
+                self.outbox.append(message)
+
+    def propose(self, kind: str, key: int, data=None):
+        """Envoyer une modification au hub"""
+        if self.sock is not None:
+            self.pending[(kind, key)] = self.pending.get((kind, key), 0) + 1
+        self._send({"type": "propose", "kind": kind, "key": key, "data": data})
+
+    def share(self):
+        """Publier tout le tournoi (poste hôte, journal vide)"""
+        t = self.tournament
+        self.propose(KIND_TOURNAMENT, 0, tournament_data(t))
+        for team in t.teams:
+            self.propose(KIND_TEAM, team.id, team_row(team))
+        for round_number in sorted({m.round_number for m in t.matches}):
+            matches = t.get_matches_by_round(round_number)
+            self.propose(KIND_ROUND, round_number, [round_row(m) for m in matches])
+
+    def lock(self, match_id: int):
+        """Verrouiller un match (arbitre) : les autres postes ne peuvent plus le modifier"""
+        self.propose(KIND_LOCK, match_id)
+
+    def unlock(self, match_id: int):
+        self.propose(KIND_UNLOCK, match_id)
+
+    def is_locked(self, match_id: int) -> bool:
+        """Vrai si le match est verrouillé par un autre poste"""
+        holder = self.locks.get(match_id)
+        return holder is not None and holder != self.seat
+
+    def on_event(self, event: TournamentEvent):
+        """Transmettre une modification locale (ignore celles appliquées depuis le réseau)"""
+        if self.applying:
+            return
+        if isinstance(event, TeamAdded):
+            self.propose(KIND_TEAM, event.team.id, team_row(event.team))
+        elif isinstance(event, TeamRemoved):
+            self.propose(KIND_TEAM_REMOVED, event.team_id)
+        elif isinstance(event, RoundGenerated):
+            self.propose(KIND_ROUND, event.round_number,
+                         [round_row(m) for m in event.matches])
+        elif isinstance(event, (ScoreUpdated, MatchValidated)):
+            self.propose(KIND_MATCH, event.match.id, match_row(event.match))
+
+    def poll(self) -> int:
+        """Appliquer les modifications reçues ; renvoie le nombre de modifications appliquées"""
+        applied = 0
+        while True:
+            try:
+                message = self.incoming.get_nowait()
+            except queue.Empty:
+                return applied
+            if message["type"] == "entry":
+                applied += self._receive(message)
+            elif message["type"] == "rejected":
+                self._rejected(message)
+            elif message["type"] == "disconnected" and message["sock"] is self.sock:
+                self.sock = None
+                self.pending = {}
+
+    def _receive(self, message: dict) -> int:
+        self.last_seq = message["seq"]
+        kind, key, data = message["kind"], message["key"], message["data"]
+        if kind == KIND_LOCK:
+            self.locks[key] = message["origin"]
+        elif kind == KIND_UNLOCK:
+            self.locks.pop(key, None)
+        count = self.pending.get((kind, key), 0)
+        if count:
+            # Notre propre modification, ou une plus ancienne que la nôtre encore en route
+            if message["origin"] == self.seat:
+                if count > 1:
+                    self.pending[(kind, key)] = count - 1
+                else:
+                    del self.pending[(kind, key)]
+            return 0
+        self.apply(kind, key, data)
+        return 1
+
+    def _rejected(self, message: dict):
+        kind, key = message["kind"], message["key"]
+        count = self.pending.get((kind, key), 0)
+        if count > 1:
+            self.pending[(kind, key)] = count - 1
+        else:
+            self.pending.pop((kind, key), None)
+        self.rejections.append(message["reason"])
+        if message["current"] is not None and not self.pending.get((kind, key)):
+            # Revenir à l'état accepté par le hub
+            self.apply(kind, key, message["current"])
+
+    def apply(self, kind: str, key: int, data):
+        """Appliquer une modification reçue, sans la renvoyer"""
+        if kind in (KIND_LOCK, KIND_UNLOCK):
+            return
+        self.applying = True
+        try:
+            if kind == KIND_TOURNAMENT:
+                if self.tournament is None:
+                    self.attach(Tournament(**data))
+                    if self.on_tournament is not None:
+                        self.on_tournament(self.tournament)
+            elif self.tournament is None:
+                return
+            elif kind == KIND_TEAM:
+                number, names, *tags = data
+                self.tournament.restore_team(key, number, names, *tags)
+            elif kind == KIND_TEAM_REMOVED:
+                if any(team.id == key for team in self.tournament.teams):
+                    self.tournament.remove_team(key)
+            elif kind == KIND_ROUND:
+                self._apply_round(key, data)
+            elif kind == KIND_MATCH:
+                self._apply_match(key, data)
+        finally:
+            self.applying = False
+
+    def _apply_round(self, round_number: int, rows: list):
+        t = self.tournament
+        teams = {team.id: team for team in t.teams}
+        known = {m.id for m in t.matches}
+
+        def side(team_id: int, composite: Optional[list]) -> Team:
+            if composite:
+                # Équipe composée (quadrette) : reconstruite à partir des équipes inscrites
+                number, _, members = composite
+                return Team(team_id, number, [player for member in members if member in teams
+                                              for player in teams[member].players],
+                            members=list(members))
+            return teams[team_id]
+
+        matches = []
+        for match_id, number, team1, team2, score1, score2, terrain, completed, is_bye, \
+                bracket, node, pool, *composites in rows:
+            if match_id in known:
+                continue
+            composites += [None] * (2 - len(composites))
+            try:
+                matches.append(Match(
+                    id=match_id, round_number=number, team1=side(team1, composites[0]),
+                    team2=Team(0, 0, [Player(0, "BYE")]) if is_bye else side(team2, composites[1]),
+                    score1=score1, score2=score2, terrain=terrain, completed=completed,
+                    is_bye=is_bye, bracket=bracket, bracket_node=node, pool=pool,
+                ))
+            except KeyError as e:
+                # Équipe inconnue de ce poste : le tour est refusé, sans interrompre poll()
+                self.rejections.append(f"Tour {round_number} refusé : équipe {e.args[0]} inconnue")
+                return
+        if matches:
+            t.restore_round(round_number, matches)
+
+    def _apply_match(self, match_id: int, row: list):
+        t = self.tournament
+        match = next((m for m in t.matches if m.id == match_id), None)
+        if match is None:
+            return
+        score1, score2, terrain, completed = row[3], row[4], row[5], row[COMPLETED]
+        if completed:
+            if not match.completed or (match.score1, match.score2, match.terrain) != \
+                    (score1, score2, terrain):
+                try:
+                    t.update_match_score(match_id, score1, score2, terrain)
+                except ValueError as e:
+                    self.rejections.append(f"M{match_id} refusé : {e}")
+            return
+        if match.completed:
+            t.reopen_match(match_id)
+        if (match.score1, match.score2) != (score1, score2):
+            t.set_match_score(match_id, score1, score2)
+        if terrain is not None and match.terrain != terrain:
+            t.set_match_terrain(match_id, terrain)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Saisie rapide des scores au clavier
+
+Une ligne « terrain score score » (ou « m<numéro de match> score score »)
+désigne un match et son résultat. Les erreurs sont renvoyées sous forme de
+message, sans boîte de dialogue ; la recherche du match se fait en O(1)
+grâce à un index construit une fois par tour.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+from tournament import Match
+
+# Score gagnant d'une partie de pétanque
+WINNING_SCORE = 13
+
+ENTRY_PATTERN = re.compile(
+    r"^\s*(?P<prefix>[tTmM#]?)\s*(?P<number>\d+)\s*[\s,;:]\s*"
+    r"(?P<score1>\d+)\s*[\s\-/,;:]\s*(?P<score2>\d+)\s*(?P<force>!?)\s*$"
+)
+
+class ScoreEntryError(ValueError):
+    """Saisie invalide ; le message est destiné à l'opérateur"""
+
+@dataclass
+class ScoreEntry:
+    """Une ligne de saisie analysée"""
+    by_match: bool
+    number: int
+    score1: int
+    score2: int
+    forced: bool = False
+
+    @property
+    def target(self) -> str:
+        return f"Match {self.number}" if self.by_match else f"Terrain {self.number}"
+
+def parse_entry(text: str) -> ScoreEntry:
+    """Analyser « 12 13 7 », « t12 13-7 », « m45 7/13 » ; un « ! » final force un score inhabituel"""
+    found = ENTRY_PATTERN.match(text)
+    if not found:
+        raise ScoreEntryError("Format attendu : terrain score score (ou m<n° de match> score score)")
+    return ScoreEntry(
+        by_match=found.group("prefix") in ("m", "M", "#"),
+        number=int(found.group("number")),
+        score1=int(found.group("score1")),
+        score2=int(found.group("score2")),
+        forced=bool(found.group("force")),
+    )
+
+def check_scores(score1: int, score2: int, forced: bool = False):
+    """Vérifier un score ; lève ScoreEntryError avec un message lisible"""
+    if score1 == score2:
+        raise ScoreEntryError("Il ne peut pas y avoir d'égalité en pétanque")
+    if max(score1, score2) > WINNING_SCORE and not forced:
+        raise ScoreEntryError(f"Score supérieur à {WINNING_SCORE} (ajouter « ! » pour forcer)")
+    if max(score1, score2) != WINNING_SCORE and not forced:
+        raise ScoreEntryError(f"Aucune équipe à {WINNING_SCORE} (ajouter « ! » pour forcer)")
+
+class ScoreEntryIndex:
+    """Matchs d'un tour indexés par numéro et par terrain"""
+
+    def __init__(self, matches: List[Match]):
+        self.by_id: Dict[int, Match] = {}
+        self.by_terrain: Dict[int, List[Match]] = {}
+        for match in matches:
+            if match.is_bye:
+                continue
+            self.by_id[match.id] = match
+            if match.terrain is not None:
+                self.by_terrain.setdefault(match.terrain, []).append(match)
+
+    def resolve(self, entry: ScoreEntry) -> Match:
+        """Match désigné par une saisie"""
+        if entry.by_match:
+            match = self.by_id.get(entry.number)
+            if match is None:
+                raise ScoreEntryError(f"Aucun match n° {entry.number} dans ce tour")
+            return match
+        # Par terrain : seuls les matchs non validés, pour ne pas écraser un résultat
+        pending = [m for m in self.by_terrain.get(entry.number, []) if not m.completed]
+        if not pending:
+            if self.by_terrain.get(entry.number):
+                raise ScoreEntryError(
+                    f"Le match du terrain {entry.number} est déjà validé "
+                    f"(corriger avec m<n° de match>)"
+                )
+            raise ScoreEntryError(f"Aucun match sur le terrain {entry.number}")
+        if len(pending) > 1:
+            numbers = ", ".join(str(m.id) for m in pending)
+            raise ScoreEntryError(
+                f"Plusieurs matchs sur le terrain {entry.number} : utiliser m<n°> ({numbers})"
+            )
+        return pending[0]
+
+def read_entry(text: str, index: ScoreEntryIndex) -> Tuple[Match, int, int]:
+    """Analyser, retrouver le match et vérifier le score : (match, score1, score2)"""
+    entry = parse_entry(text)
+    check_scores(entry.score1, entry.score2, entry.forced)
+    return index.resolve(entry), entry.score1, entry.score2
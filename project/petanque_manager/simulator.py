@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Simulation d'une journée de tournoi (capacité : équipes × terrains × durée)
+
+Avant d'ouvrir les inscriptions : 320 équipes sur 40 terrains finissent-elles
+5 tours avant la nuit ? Chaque scénario rejoue la journée par événements
+discrets :
+- les tours sont produits par les vrais générateurs de Tournament (exemptions,
+  tableaux de concours, poules, rondes de championnat), résultats tirés au sort ;
+- les matchs d'un tour occupent les terrains par vagues : au-delà de
+  `terrain_count`, un match attend le premier terrain libéré ;
+- la durée d'un match est tirée de la distribution observée en base (de
+  l'enregistrement du tirage à la validation, colonnes created_at et
+  completed_at), ou d'une loi par défaut faute d'historique. Seuls les tours
+  qui tenaient sur les terrains sont observés : l'attente d'un terrain, déjà
+  simulée par les vagues, n'est pas comptée deux fois ;
+- le tour suivant est annoncé `round_break` minutes après la fin du dernier match.
+
+Seule la taille des tours influe sur l'horaire : chaque processus tire
+quelques tournois réels puis, pour chacun, de nombreuses journées. Des
+milliers de scénarios s'exécutent en quelques secondes sur tous les cœurs.
+
+Usage : python simulator.py --equipes 320 --terrains 40 --tours 5 --nuit 21:30
+"""
+
+import argparse
+import heapq
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence
+
+from tournament import Tournament, FORMAT_SWISS
+
+# Durées retenues (minutes) : en deçà ou au-delà, saisie oubliée ou anomalie
+MIN_DURATION = 5.0
+MAX_DURATION = 240.0
+# Nombre de matchs observés nécessaire pour se passer de la loi par défaut
+MIN_SAMPLES = 30
+# Loi par défaut : log-normale de médiane 45 min
+DEFAULT_MEDIAN = 45.0
+DEFAULT_SIGMA = 0.3
+
+# Tournois réellement tirés par processus, journées simulées par tournoi tiré
+DRAWS_PER_WORKER = 4
+
+def parse_time(text: str) -> float:
+    """"HH:MM" -> minutes depuis minuit"""
+    hours, _, minutes = text.partition(":")
+    return int(hours) * 60 + int(minutes or 0)
+
+def format_time(minutes: float) -> str:
+    minutes = int(round(minutes))
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+@dataclass
+class DurationModel:
+    """Distribution des durées de match : échantillon observé, sinon log-normale"""
+    samples: List[float] = field(default_factory=list)
+    median: float = DEFAULT_MEDIAN
+    sigma: float = DEFAULT_SIGMA
+
+    @classmethod
+    def from_database(cls, db_manager, tournament_type: Optional[str] = None) -> "DurationModel":
+        """Durées observées dans la base (et ses archives), aberrations écartées"""
+        durations = [d for d in db_manager.get_match_durations(tournament_type)
+                     if d is not None and MIN_DURATION <= d <= MAX_DURATION]
+        return cls(sorted(durations) if len(durations) >= MIN_SAMPLES else [])
+
+    @property
+    def learned(self) -> bool:
+        return bool(self.samples)
+
+    def sample(self, rng: random.Random) -> float:
+        if self.samples:
+            return self.samples[int(rng.random() * len(self.samples))]
+        return self.median * math.exp(rng.gauss(0.0, self.sigma))
+
+    def describe(self) -> str:
+        if not self.samples:
+            return f"loi par défaut (médiane {self.median:.0f} min)"
+        middle = self.samples[len(self.samples) // 2]
+        return f"{len(self.samples)} matchs observés (médiane {middle:.0f} min)"
+
+@dataclass
+class DayPlan:
+    """Journée à évaluer"""
+    team_count: int
+    terrain_count: int
+    rounds: int
+    tournament_type: str = "doublette"
+    tournament_format: str = FORMAT_SWISS
+    start: float = parse_time("09:00")
+    # Annonce du tour suivant (classement, tirage, affichage), minutes
+    round_break: float = 10.0
+    # Heure limite (nuit), minutes depuis minuit
+    deadline: float = parse_time("21:30")
+
+def round_sizes(plan: DayPlan, seed: int) -> List[int]:
+    """Nombre de matchs joués à chaque tour d'un tournoi tiré avec les vrais générateurs"""
+    rng = random.Random(seed)
+    players = {"tête-à-tête": 1, "doublette": 2, "triplette": 3}.get(plan.tournament_type, 4)
+    tournament = Tournament(name="Simulation", tournament_type=plan.tournament_type,
+                            terrain_count=plan.terrain_count,
+                            tournament_format=plan.tournament_format, seed=seed)
+    tournament.add_teams([[f"J{i}-{p}" for p in range(players)]
+                          for i in range(plan.team_count)])
+    sizes = []
+    matches = tournament.generate_first_round_matches()
+    while matches:
+        played = [m for m in matches if not m.is_bye]
+        if played:
+            sizes.append(len(played))
+        if len(sizes) >= plan.rounds:
+            break
+        for match in played:
+            loser = rng.randint(0, 12)
+            scores = (13, loser) if rng.random() < 0.5 else (loser, 13)
+            tournament.update_match_score(match.id, *scores)
+        matches = tournament.generate_next_round_matches()
+    return sizes
+
+def simulate_day(sizes: Sequence[int], terrain_count: int, durations: DurationModel,
+                 rng: random.Random, round_break: float) -> float:
+    """Durée de la journée (minutes) : vagues sur les terrains, tour par tour"""
+    clock = 0.0
+    for index, size in enumerate(sizes):
+        if index:
+            clock += round_break
+        # Instant de libération de chaque terrain
+        terrains = [clock] * (min(size, terrain_count) if terrain_count > 0 else size)
+        end = clock
+        for _ in range(size):
+            finish = heapq.heappop(terrains) + durations.sample(rng)
+            heapq.heappush(terrains, finish)
+            if finish > end:
+                end = finish
+        clock = end
+    return clock
+
+def _simulate_batch(plan: DayPlan, durations: DurationModel, scenarios: int,
+                    seed: int) -> List[float]:
+    """Scénarios d'un processus : quelques tirages réels, de nombreuses journées chacun"""
+    rng = random.Random(seed)
+    draws = [round_sizes(plan, rng.getrandbits(32))
+             for _ in range(max(1, min(DRAWS_PER_WORKER, scenarios)))]
+    return [plan.start + simulate_day(draws[i % len(draws)], plan.terrain_count, durations,
+                                      rng, plan.round_break)
+            for i in range(scenarios)]
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Percentile par rang le plus proche d'une liste triée"""
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+@dataclass
+class SimulationReport:
+    """Heures de fin simulées (minutes depuis minuit)"""
+    plan: DayPlan
+    durations: DurationModel
+    finishes: List[float]
+    workers: int
+    elapsed: float
+
+    def percentile(self, fraction: float) -> float:
+        return percentile(self.finishes, fraction)
+
+    @property
+    def on_time(self) -> float:
+        """Part des journées terminées avant l'heure limite"""
+        return sum(1 for t in self.finishes if t <= self.plan.deadline) / len(self.finishes)
+
+    def lines(self) -> List[str]:
+        plan = self.plan
+        return [
+            f"{plan.team_count} équipes, {plan.terrain_count} terrains, {plan.rounds} tours "
+            f"({plan.tournament_type}, {plan.tournament_format}), début {format_time(plan.start)}",
+            f"Durée des matchs : {self.durations.describe()}",
+            f"{len(self.finishes)} journées simulées en {self.elapsed:.2f} s "
+            f"sur {self.workers} processus",
+            "Fin : " + ", ".join(f"p{int(f * 100)} {format_time(self.percentile(f))}"
+                                 for f in (0.5, 0.9, 0.99))
+            + f", au plus tard {format_time(self.finishes[-1])}",
+            f"Terminé avant {format_time(plan.deadline)} : {self.on_time:.0%} des journées",
+        ]
+
+def simulate(plan: DayPlan, durations: DurationModel, scenarios: int = 2000,
+             workers: Optional[int] = None, seed: Optional[int] = None) -> SimulationReport:
+    """Simuler `scenarios` journées, réparties sur les processus disponibles"""
+    start = time.perf_counter()
+    workers = max(1, min(workers or os.cpu_count() or 1, scenarios))
+    rng = random.Random(seed)
+    shares = [scenarios // workers + (i < scenarios % workers) for i in range(workers)]
+    seeds = [rng.getrandbits(32) for _ in shares]
+    results = None
+    if workers > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(_simulate_batch, plan, durations, share, batch_seed)
+                           for share, batch_seed in zip(shares, seeds)]
+                results = [future.result() for future in futures]
+        except (OSError, RuntimeError):
+            # Processus indisponibles : simulation dans ce processus
+            workers = 1
+    if results is None:
+        results = [_simulate_batch(plan, durations, share, batch_seed)
+                   for share, batch_seed in zip(shares, seeds)]
+    finishes = sorted(t for batch in results for t in batch)
+    return SimulationReport(plan, durations, finishes, workers, time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description="Simuler l'horaire d'une journée de tournoi")
+    parser.add_argument("--equipes", type=int, required=True)
+    parser.add_argument("--terrains", type=int, required=True)
+    parser.add_argument("--tours", type=int, default=5)
+    parser.add_argument("--type", default="doublette")
+    parser.add_argument("--format", default=FORMAT_SWISS)
+    parser.add_argument("--debut", default="09:00", help="heure du premier tour (HH:MM)")
+    parser.add_argument("--nuit", default="21:30", help="heure limite (HH:MM)")
+    parser.add_argument("--pause", type=float, default=10.0,
+                        help="minutes entre la fin d'un tour et le début du suivant")
+    parser.add_argument("--scenarios", type=int, default=2000)
+    parser.add_argument("--base", default=None,
+                        help="base SQLite dont les matchs validés donnent les durées")
+    args = parser.parse_args()
+
+    durations = DurationModel()
+    if args.base:
+        from store import DatabaseManager
+
+        db = DatabaseManager(args.base)
+        durations = DurationModel.from_database(db, args.type)
+        db.close()
+    plan = DayPlan(args.equipes, args.terrains, args.tours, args.type, args.format,
+                   parse_time(args.debut), args.pause, parse_time(args.nuit))
+    report = simulate(plan, durations, args.scenarios)
+    print("\n".join(report.lines()))
+    return 0 if report.on_time >= 0.9 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
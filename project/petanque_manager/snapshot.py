@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Instantané binaire d'un tournoi
+
+Format versionné, compact et lisible sans analyse préalable :
+- un en-tête de taille fixe (paramètres du tournoi, nombres d'objets) suivi
+  d'une table des sections (position, taille) ;
+- des colonnes d'entiers 32 bits little-endian : une par attribut des équipes
+  et des matchs (scores, terrains, drapeaux...), -1 pour une valeur absente ;
+- une table de chaînes (noms des joueurs, du tournoi, des tableaux) : les
+  positions de fin de chaque chaîne puis les octets UTF-8.
+
+Chaque section est alignée sur 8 octets : Snapshot.open() projette le fichier
+en mémoire (mmap) et ne lit que l'en-tête ; une colonne est une simple vue sur
+le fichier, lue à la demande. Les octets d'un instantané (dumps) se transmettent
+tels quels à un processus de calcul ou vers les archives.
+"""
+
+import array
+import mmap
+import os
+import struct
+import sys
+from typing import Dict, List, Optional, Tuple
+
+from tournament import Tournament
+
+MAGIC = b"PTQS"
+VERSION = 2
+
+# Magie, version, drapeaux, graine, tour courant, terrains, niveaux du concours,
+# chaînes (nom, type, format, format des poules), nombres (équipes, joueurs,
+# matchs, chaînes), version du générateur, gaussienne en réserve
+HEADER = struct.Struct("<4sHHqiiiiiiiiiiiid")
+SECTION = struct.Struct("<QQ")
+ALIGNMENT = 8
+
+# Sections, dans l'ordre de la table des sections
+SECTIONS = [
+    "string_ends", "string_data",
+    "team_id", "team_number", "team_players", "player_name",
+    "match_id", "match_round", "match_team1", "match_team2", "match_score1", "match_score2",
+    "match_terrain", "match_flags", "match_bracket", "match_node", "match_pool",
+    "rng_state",
+    # Version 2 : contraintes du tirage du premier tour
+    "team_club", "team_league", "team_flags",
+]
+# Sections présentes selon la version du fichier
+SECTION_COUNTS = {1: SECTIONS.index("rng_state") + 1, 2: len(SECTIONS)}
+MATCH_COLUMNS = [name for name in SECTIONS if name.startswith("match_")]
+
+# Drapeaux d'un match
+COMPLETED = 1
+BYE = 2
+
+# Drapeaux d'une équipe
+SEEDED = 1
+
+# En-tête : une gaussienne en réserve est enregistrée
+HAS_GAUSS = 1
+
+MISSING = -1
+
+class SnapshotError(ValueError):
+    """Fichier qui n'est pas un instantané lisible par cette version"""
+
+def _int_or_missing(value: Optional[int]) -> int:
+    return MISSING if value is None else value
+
+def _value(value: int) -> Optional[int]:
+    return None if value == MISSING else value
+
+class _StringTable:
+    def __init__(self):
+        self.index: Dict[str, int] = {}
+        self.values: List[str] = []
+
+    def add(self, value: Optional[str]) -> int:
+        if value is None:
+            return MISSING
+        index = self.index.get(value)
+        if index is None:
+            index = self.index[value] = len(self.values)
+            self.values.append(value)
+        return index
+
+def dumps(tournament: Tournament) -> bytes:
+    """Instantané binaire d'un tournoi"""
+    known = {team.id for team in tournament.teams}
+    strings = _StringTable()
+    name, tournament_type = strings.add(tournament.name), strings.add(tournament.tournament_type)
+    tournament_format, pool_format = strings.add(tournament.format), strings.add(tournament.pool_format)
+
+    columns: Dict[str, array.array] = {name: array.array("i") for name in SECTIONS
+                                       if name not in ("string_ends", "string_data", "rng_state")}
+    columns["team_players"].append(0)
+    for team in tournament.teams:
+        columns["team_id"].append(team.id)
+        columns["team_number"].append(team.number)
+        columns["team_club"].append(strings.add(team.club))
+        columns["team_league"].append(strings.add(team.league))
+        columns["team_flags"].append(SEEDED if team.seeded else 0)
+        columns["player_name"].extend(strings.add(player.name) for player in team.players)
+        columns["team_players"].append(len(columns["player_name"]))
+    for m in tournament.matches:
+        if m.team1.id not in known or (not m.is_bye and m.team2.id not in known):
+            # Équipes composées à la volée (quadrette) : absentes de la liste des équipes
+            raise SnapshotError(f"Le match {m.id} oppose des équipes qui ne sont pas inscrites")
+        columns["match_id"].append(m.id)
+        columns["match_round"].append(m.round_number)
+        columns["match_team1"].append(m.team1.id)
+        columns["match_team2"].append(MISSING if m.is_bye else m.team2.id)
+        columns["match_score1"].append(_int_or_missing(m.score1))
+        columns["match_score2"].append(_int_or_missing(m.score2))
+        columns["match_terrain"].append(_int_or_missing(m.terrain))
+        columns["match_flags"].append((COMPLETED if m.completed else 0) | (BYE if m.is_bye else 0))
+        columns["match_bracket"].append(strings.add(m.bracket))
+        columns["match_node"].append(_int_or_missing(m.bracket_node))
+        columns["match_pool"].append(_int_or_missing(m.pool))
+
+    encoded = [value.encode("utf-8") for value in strings.values]
+    ends = array.array("I")
+    position = 0
+    for value in encoded:
+        position += len(value)
+        ends.append(position)
+    rng_version, rng_internal, gauss = tournament.rng.getstate()
+    sections = dict(columns)
+    sections["string_ends"] = ends
+    sections["string_data"] = b"".join(encoded)
+    sections["rng_state"] = array.array("I", rng_internal)
+
+    header = HEADER.pack(
+        MAGIC, VERSION, HAS_GAUSS if gauss is not None else 0, tournament.seed,
+        tournament.current_round, tournament.terrain_count, tournament.concours_levels,
+        name, tournament_type, tournament_format, pool_format,
+        len(tournament.teams), len(columns["player_name"]), len(tournament.matches),
+        len(strings.values), rng_version, gauss or 0.0,
+    )
+    body = bytearray()
+    table = []
+    offset = _aligned(HEADER.size + SECTION.size * len(SECTIONS))
+    for section in SECTIONS:
+        data = sections[section]
+        if isinstance(data, array.array):
+            if sys.byteorder != "little":
+                data = array.array(data.typecode, data)
+                data.byteswap()
+            data = data.tobytes()
+        table.append(SECTION.pack(offset + len(body), len(data)))
+        body += data
+        body += bytes(_aligned(len(body)) - len(body))
+    head = header + b"".join(table)
+    return head + bytes(offset - len(head)) + bytes(body)
+
+def _aligned(size: int) -> int:
+    return (size + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+def save(tournament: Tournament, path: str):
+    """Écrire l'instantané d'un tournoi (remplacement atomique du fichier)"""
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as f:
+        f.write(dumps(tournament))
+    os.replace(temporary, path)
+
+class Snapshot:
+    """Lecture d'un instantané : colonnes en vues sur le tampon, sans copie"""
+
+    def __init__(self, buffer):
+        self.buffer = memoryview(buffer)
+        self._mmap = None
+        self._file = None
+        self._views: Dict[str, memoryview] = {}
+        if len(self.buffer) < HEADER.size or bytes(self.buffer[:4]) != MAGIC:
+            raise SnapshotError("Ce fichier n'est pas un instantané de tournoi")
+        (_, self.version, self.flags, self.seed, self.current_round, self.terrain_count,
+         self.concours_levels, self._name, self._type, self._format, self._pool_format,
+         self.team_count, self.player_count, self.match_count, self.string_count,
+         self._rng_version, self._gauss) = HEADER.unpack_from(self.buffer)
+        if self.version not in SECTION_COUNTS:
+            raise SnapshotError(f"Instantané de version {self.version}, "
+                                f"version {VERSION} au plus attendue")
+        self.sections: Dict[str, Tuple[int, int]] = {
+            section: SECTION.unpack_from(self.buffer, HEADER.size + i * SECTION.size)
+            for i, section in enumerate(SECTIONS[:SECTION_COUNTS[self.version]])
+        }
+
+    @classmethod
+    def open(cls, path: str) -> "Snapshot":
+        """Projeter un instantané en mémoire ; seul l'en-tête est lu"""
+        f = open(path, "rb")
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            f.close()
+            raise
+        try:
+            snapshot = cls(mapped)
+        except SnapshotError:
+            mapped.close()
+            f.close()
+            raise
+        snapshot._mmap, snapshot._file = mapped, f
+        return snapshot
+
+    def close(self):
+        """Libérer les vues puis le fichier projeté"""
+        for view in self._views.values():
+            view.release()
+        self._views = {}
+        self.buffer.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._file.close()
+            self._mmap = self._file = None
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _bytes(self, section: str) -> memoryview:
+        offset, length = self.sections[section]
+        return self.buffer[offset:offset + length]
+
+    def column(self, section: str):
+        """Colonne d'entiers (vue sur le tampon, ou copie sur une machine big-endian)"""
+        view = self._views.get(section)
+        if view is None:
+            typecode = "I" if section in ("string_ends", "rng_state") else "i"
+            raw = self._bytes(section)
+            if sys.byteorder != "little":
+                values = array.array(typecode, raw)
+                values.byteswap()
+                raw.release()
+                return values
+            view = self._views[section] = raw.cast(typecode)
+        return view
+
+    def string(self, index: int) -> Optional[str]:
+        if index == MISSING:
+            return None
+        ends = self.column("string_ends")
+        start = ends[index - 1] if index else 0
+        offset, _ = self.sections["string_data"]
+        return str(self.buffer[offset + start:offset + ends[index]], "utf-8")
+
+    @property
+    def name(self) -> str:
+        return self.string(self._name)
+
+    @property
+    def tournament_type(self) -> str:
+        return self.string(self._type)
+
+    @property
+    def format(self) -> str:
+        return self.string(self._format)
+
+    def rng_state(self) -> list:
+        """État du générateur, au format de Tournament.rng_state"""
+        gauss = self._gauss if self.flags & HAS_GAUSS else None
+        return [self._rng_version, list(self.column("rng_state")), gauss]
+
+    def team_rows(self) -> List[tuple]:
+        """(id, numéro, [noms des joueurs], club, ligue, tête de série) de chaque équipe"""
+        ids, numbers = self.column("team_id"), self.column("team_number")
+        bounds, names = self.column("team_players"), self.column("player_name")
+        strings = [self.string(i) for i in range(self.string_count)]
+        rows = [(ids[i], numbers[i], [strings[n] for n in names[bounds[i]:bounds[i + 1]]])
+                for i in range(self.team_count)]
+        if "team_club" not in self.sections:
+            return rows
+        clubs, leagues = self.column("team_club"), self.column("team_league")
+        flags = self.column("team_flags")
+        return [row + (None if clubs[i] == MISSING else strings[clubs[i]],
+                       None if leagues[i] == MISSING else strings[leagues[i]],
+                       bool(flags[i] & SEEDED))
+                for i, row in enumerate(rows)]
+
+    def match_rows(self) -> List[tuple]:
+        """(id, puis les colonnes de autosave.match_row) de chaque match"""
+        columns = [self.column(name).tolist() for name in MATCH_COLUMNS]
+        rows = []
+        for match_id, round_number, team1, team2, score1, score2, terrain, flags, bracket, \
+                node, pool in zip(*columns):
+            rows.append((match_id, round_number, team1, _value(team2), _value(score1),
+                         _value(score2), _value(terrain), bool(flags & COMPLETED),
+                         bool(flags & BYE), self.string(bracket), _value(node), _value(pool)))
+        return rows
+
+    def to_tournament(self) -> Tournament:
+        """Reconstruire le tournoi (tableaux de concours et poules exceptés)"""
+        tournament = Tournament(name=self.name, tournament_type=self.tournament_type,
+                                terrain_count=self.terrain_count, tournament_format=self.format,
+                                concours_levels=self.concours_levels,
+                                pool_format=self.string(self._pool_format), seed=self.seed)
+        tournament.restore_rows(self.team_rows(), self.match_rows(), self.current_round)
+        tournament.restore_rng_state(self.rng_state())
+        return tournament
+
+def load(path: str) -> Tournament:
+    """Lire un instantané et reconstruire le tournoi"""
+    with Snapshot.open(path) as snapshot:
+        return snapshot.to_tournament()
+
+def loads(data: bytes) -> Tournament:
+    snapshot = Snapshot(data)
+    try:
+        return snapshot.to_tournament()
+    finally:
+        snapshot.close()
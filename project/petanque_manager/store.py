@@ -4,17 +4,50 @@
 Gestionnaire de base de données SQLite pour Pétanque Manager
 """
 
+import heapq
+import json
 import sqlite3
 import os
-from typing import List, Dict, Optional, Tuple
+from difflib import SequenceMatcher
+from itertools import combinations
+from typing import Iterator, List, Dict, Optional, Tuple
 from datetime import datetime
 
+from tournament import normalize_name
+from profiling import instrumented
+from query_cache import QueryCache, cached_read, CACHE_SIZE
+
+# Tables déplacées vers les archives, dans l'ordre de copie
+ARCHIVED_TABLES = ["tournaments", "teams", "players", "matches", "standings_snapshots",
+                   "player_results"]
+
+# Composition d'une équipe (colonne teams.roster) recalculée depuis players
+ROSTER_OF = """(SELECT GROUP_CONCAT(name) FROM (
+    SELECT name FROM {schema}.players WHERE team_id = {team} ORDER BY position
+))"""
+
+# SQLite limite le nombre de bases attachées (10 par défaut)
+MAX_ATTACHED_ARCHIVES = 8
+
 class DatabaseManager:
     """Gestionnaire de base de données SQLite"""
     
-    def __init__(self, db_path: str = "petanque.db"):
+    def __init__(self, db_path: str = "petanque.db", archive_dir: Optional[str] = None,
+                 cache_size: int = CACHE_SIZE):
         self.db_path = db_path
         self.connection = None
+        self.fts_enabled = False
+        # Lectures en cache, invalidées par les écritures de cette connexion ; les
+        # écritures d'une autre connexion (sauvegarde automatique) sont détectées
+        # par PRAGMA data_version
+        self.query_cache = QueryCache(cache_size)
+        self.data_version: Optional[int] = None
+        # Bases d'archives par saison : petanque_<saison>.db dans archive_dir
+        if archive_dir is None:
+            archive_dir = os.path.join(os.path.dirname(os.path.abspath(db_path)), "archives")
+        self.archive_dir = archive_dir
+        # Archives actuellement attachées : nom de schéma -> chemin, du plus ancien au plus récent
+        self.attached_archives: Dict[str, str] = {}
         self.init_database()
         
     def init_database(self):
@@ -23,6 +56,9 @@ class DatabaseManager:
         self.connection.row_factory = sqlite3.Row  # Pour accéder aux colonnes par nom
         
         cursor = self.connection.cursor()
+        if self.db_path != ":memory:":
+            # Lectures de l'interface et écritures de la sauvegarde automatique en parallèle
+            cursor.execute("PRAGMA journal_mode=WAL")
         
         # Table des tournois
         cursor.execute("""
@@ -80,20 +116,208 @@ class DatabaseManager:
             )
         """)
         
+        # Colonnes ajoutées après la création initiale du schéma
+        self._ensure_column(cursor, "tournaments", "format", "TEXT DEFAULT 'suisse'")
+        self._ensure_column(cursor, "matches", "bracket", "TEXT NULL")
+        self._ensure_column(cursor, "matches", "bracket_node", "INTEGER NULL")
+        self._ensure_column(cursor, "matches", "pool", "INTEGER NULL")
+        # Identifiants des objets en mémoire (sauvegarde automatique incrémentale)
+        self._ensure_column(cursor, "teams", "local_id", "INTEGER NULL")
+        self._ensure_column(cursor, "matches", "local_id", "INTEGER NULL")
+        # Graine et état du générateur aléatoire du tournoi (tirages reproductibles)
+        self._ensure_column(cursor, "tournaments", "rng_seed", "INTEGER NULL")
+        self._ensure_column(cursor, "tournaments", "rng_state", "TEXT NULL")
+        # Contraintes du tirage du premier tour (draw.py)
+        self._ensure_column(cursor, "teams", "club", "TEXT NULL")
+        self._ensure_column(cursor, "teams", "league", "TEXT NULL")
+        self._ensure_column(cursor, "teams", "seeded", "BOOLEAN DEFAULT FALSE")
+        # Équipe composée pour un match (quadrette) : local_id des équipes inscrites
+        # qui la forment, séparés par des virgules ; NULL pour une équipe inscrite
+        self._ensure_column(cursor, "teams", "members", "TEXT NULL")
+        # Composition dénormalisée (noms dans l'ordre des positions, séparés par des
+        # virgules), tenue à jour par les déclencheurs sur players : les requêtes de
+        # matchs lisent une colonne au lieu de joindre et regrouper les joueurs
+        if self._ensure_column(cursor, "teams", "roster", "TEXT NULL"):
+            cursor.execute(f"""
+                UPDATE teams SET roster = {ROSTER_OF.format(schema="main", team="teams.id")}
+            """)
+        cursor.executescript(f"""
+            CREATE TRIGGER IF NOT EXISTS players_roster_ai AFTER INSERT ON players BEGIN
+                UPDATE teams SET roster = {ROSTER_OF.format(schema="main", team="new.team_id")}
+                WHERE id = new.team_id;
+            END;
+            CREATE TRIGGER IF NOT EXISTS players_roster_ad AFTER DELETE ON players BEGIN
+                UPDATE teams SET roster = {ROSTER_OF.format(schema="main", team="old.team_id")}
+                WHERE id = old.team_id;
+            END;
+            CREATE TRIGGER IF NOT EXISTS players_roster_au
+            AFTER UPDATE OF team_id, name, position ON players BEGIN
+                UPDATE teams SET roster = {ROSTER_OF.format(schema="main", team="teams.id")}
+                WHERE id IN (old.team_id, new.team_id);
+            END;
+        """)
+        cursor.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_teams_local ON teams (tournament_id, local_id)
+        """)
+        cursor.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_matches_local ON matches (tournament_id, local_id)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_matches_pool ON matches (tournament_id, pool)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_teams_tournament ON teams (tournament_id)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_players_team ON players (team_id, position)
+        """)
+        
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_tournaments_created ON tournaments (created_at)
+        """)
+        
+        # Classements cumulés après chaque tour
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS standings_snapshots (
+                tournament_id INTEGER NOT NULL,
+                round_number INTEGER NOT NULL,
+                team_number INTEGER NOT NULL,
+                rank INTEGER NOT NULL,
+                wins INTEGER NOT NULL,
+                losses INTEGER NOT NULL,
+                points_for INTEGER NOT NULL,
+                points_against INTEGER NOT NULL,
+                PRIMARY KEY (tournament_id, round_number, team_number),
+                FOREIGN KEY (tournament_id) REFERENCES tournaments (id) ON DELETE CASCADE
+            ) WITHOUT ROWID
+        """)
+        # Équipe par son identifiant en mémoire (local_id) : le numéro change quand une
+        # équipe est retirée, la progression d'une équipe suit son identifiant
+        self._ensure_column(cursor, "standings_snapshots", "team_local_id", "INTEGER NULL")
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_standings_snapshots_local
+            ON standings_snapshots (tournament_id, team_local_id, round_number)
+        """)
+        
+        # Résultats individuels (player_stats.PlayerResults), équipe par son local_id
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS player_results (
+                tournament_id INTEGER NOT NULL,
+                team_local_id INTEGER NOT NULL,
+                position INTEGER NOT NULL,
+                name TEXT NOT NULL,
+                played INTEGER NOT NULL,
+                wins INTEGER NOT NULL,
+                losses INTEGER NOT NULL,
+                points_for INTEGER NOT NULL,
+                points_against INTEGER NOT NULL,
+                PRIMARY KEY (tournament_id, team_local_id, position),
+                FOREIGN KEY (tournament_id) REFERENCES tournaments (id) ON DELETE CASCADE
+            ) WITHOUT ROWID
+        """)
+        
+        # Résumé des tournois archivés (le détail est dans la base de la saison)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS tournament_archive (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                type TEXT NOT NULL,
+                format TEXT,
+                season TEXT NOT NULL,
+                archive_file TEXT NOT NULL,
+                team_count INTEGER NOT NULL,
+                match_count INTEGER NOT NULL,
+                winner TEXT,
+                ranking TEXT NOT NULL,
+                created_at TIMESTAMP,
+                completed_at TIMESTAMP,
+                archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_tournament_archive_created
+            ON tournament_archive (created_at)
+        """)
+        
+        # Registre des joueurs inter-tournois (cote Elo)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS player_registry (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                normalized_name TEXT NOT NULL UNIQUE,
+                rating REAL DEFAULT 1500,
+                games INTEGER DEFAULT 0,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Index trigramme sur les noms de joueurs (autocomplétion, doublons)
+        cursor.execute("""
+            SELECT COUNT(*) FROM sqlite_master WHERE name = 'player_names_fts'
+        """)
+        fts_exists = cursor.fetchone()[0] > 0
+        try:
+            cursor.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS player_names_fts USING fts5(
+                    normalized_name,
+                    content='player_registry', content_rowid='id',
+                    tokenize='trigram'
+                )
+            """)
+            cursor.executescript("""
+                CREATE TRIGGER IF NOT EXISTS player_registry_ai AFTER INSERT ON player_registry BEGIN
+                    INSERT INTO player_names_fts (rowid, normalized_name)
+                    VALUES (new.id, new.normalized_name);
+                END;
+                CREATE TRIGGER IF NOT EXISTS player_registry_ad AFTER DELETE ON player_registry BEGIN
+                    INSERT INTO player_names_fts (player_names_fts, rowid, normalized_name)
+                    VALUES ('delete', old.id, old.normalized_name);
+                END;
+                CREATE TRIGGER IF NOT EXISTS player_registry_au
+                AFTER UPDATE OF normalized_name ON player_registry BEGIN
+                    INSERT INTO player_names_fts (player_names_fts, rowid, normalized_name)
+                    VALUES ('delete', old.id, old.normalized_name);
+                    INSERT INTO player_names_fts (rowid, normalized_name)
+                    VALUES (new.id, new.normalized_name);
+                END;
+            """)
+            self.fts_enabled = True
+            if not fts_exists:
+                # Première création : reprendre tous les noms déjà saisis
+                cursor.execute("SELECT DISTINCT name FROM players")
+                self._register_player_names(cursor, [row["name"] for row in cursor.fetchall()])
+                cursor.execute("INSERT INTO player_names_fts (player_names_fts) VALUES ('rebuild')")
+        except sqlite3.OperationalError:
+            # SQLite compilé sans FTS5 ou sans le tokenizer trigram
+            self.fts_enabled = False
+        
         self.connection.commit()
         
-    def create_tournament(self, name: str, tournament_type: str, terrain_count: int) -> int:
+    @staticmethod
+    def _ensure_column(cursor, table: str, column: str, definition: str,
+                       schema: str = "main") -> bool:
+        """Ajouter une colonne à une table existante si elle manque, vrai si ajoutée"""
+        cursor.execute(f"PRAGMA {schema}.table_info({table})")
+        if column in {row["name"] for row in cursor.fetchall()}:
+            return False
+        cursor.execute(f"ALTER TABLE {schema}.{table} ADD COLUMN {column} {definition}")
+        return True
+            
+    @instrumented("db.create_tournament")
+    def create_tournament(self, name: str, tournament_type: str, terrain_count: int,
+                          tournament_format: str = "suisse", seed: Optional[int] = None) -> int:
         """Créer un nouveau tournoi"""
         cursor = self.connection.cursor()
         cursor.execute("""
-            INSERT INTO tournaments (name, type, terrain_count)
-            VALUES (?, ?, ?)
-        """, (name, tournament_type, terrain_count))
+            INSERT INTO tournaments (name, type, terrain_count, format, rng_seed)
+            VALUES (?, ?, ?, ?, ?)
+        """, (name, tournament_type, terrain_count, tournament_format, seed))
         
         tournament_id = cursor.lastrowid
         self.connection.commit()
         return tournament_id
         
+    @instrumented("db.get_tournament")
     def get_tournament(self, tournament_id: int) -> Optional[Dict]:
         """Récupérer un tournoi par son ID"""
         cursor = self.connection.cursor()
@@ -102,17 +326,93 @@ class DatabaseManager:
         """, (tournament_id,))
         
         row = cursor.fetchone()
-        return dict(row) if row else None
+        if row:
+            return dict(row)
+        return self.get_archived_tournament(tournament_id)
+        
+    @instrumented("db.get_rng_state")
+    def get_rng_state(self, tournament_id: int) -> Tuple[Optional[int], Optional[list]]:
+        """Graine et dernier état enregistré du générateur aléatoire d'un tournoi"""
+        cursor = self.connection.cursor()
+        cursor.execute("""
+            SELECT rng_seed, rng_state FROM tournaments WHERE id = ?
+        """, (tournament_id,))
+        row = cursor.fetchone()
+        if row is None:
+            return None, None
+        return row["rng_seed"], json.loads(row["rng_state"]) if row["rng_state"] else None
+        
+    @instrumented("db.load_tournament_rows")
+    def load_tournament_rows(self, tournament_id: int) -> Tuple[Optional[Dict], List[tuple],
+                                                                 List[tuple]]:
+        """Lignes nécessaires pour recharger un tournoi en mémoire
+        
+        Retourne la ligne du tournoi, les équipes (local_id, numéro, [joueurs], club,
+        ligue, tête de série, [équipes inscrites] pour une équipe composée sinon None)
+        et les matchs (local_id, puis les colonnes de autosave.match_row), avec les
+        identifiants en mémoire des objets enregistrés par la sauvegarde automatique.
+        """
+        cursor = self.connection.cursor()
+        cursor.execute("""
+            SELECT * FROM tournaments WHERE id = ?
+        """, (tournament_id,))
+        row = cursor.fetchone()
+        if row is None:
+            return None, [], []
+        
+        cursor.execute("""
+            SELECT t.local_id, t.number, t.club, t.league, t.seeded, t.members, p.name
+            FROM teams t
+            LEFT JOIN players p ON p.team_id = t.id
+            WHERE t.tournament_id = ? AND t.local_id IS NOT NULL
+            ORDER BY t.members IS NOT NULL, t.number, t.local_id, p.position
+        """, (tournament_id,))
+        teams: Dict[int, tuple] = {}
+        for local_id, number, club, league, seeded, members, name in cursor.fetchall():
+            if members is not None:
+                # Équipe composée : ses joueurs sont ceux des équipes inscrites
+                members = [int(member) for member in members.split(",")]
+            team = teams.setdefault(local_id, (local_id, number, [], club, league, bool(seeded),
+                                               members))
+            if name is not None:
+                team[2].append(name)
         
+        cursor.execute("""
+            SELECT m.local_id, m.round_number, t1.local_id, t2.local_id, m.score1, m.score2,
+                   m.terrain, m.completed, m.is_bye, m.bracket, m.bracket_node, m.pool
+            FROM matches m
+            JOIN teams t1 ON m.team1_id = t1.id
+            JOIN teams t2 ON m.team2_id = t2.id
+            WHERE m.tournament_id = ? AND m.local_id IS NOT NULL
+            ORDER BY m.local_id
+        """, (tournament_id,))
+        matches = [
+            (local_id, round_number, team1, None if is_bye else team2, score1, score2,
+             terrain, bool(completed), bool(is_bye), bracket, node, pool)
+            for local_id, round_number, team1, team2, score1, score2, terrain, completed,
+            is_bye, bracket, node, pool in cursor.fetchall()
+        ]
+        return dict(row), list(teams.values()), matches
+        
+    @instrumented("db.get_all_tournaments")
     def get_all_tournaments(self) -> List[Dict]:
-        """Récupérer tous les tournois"""
+        """Récupérer tous les tournois, en cours et archivés, du plus récent au plus ancien"""
         cursor = self.connection.cursor()
         cursor.execute("""
-            SELECT * FROM tournaments ORDER BY created_at DESC
+            SELECT *, FALSE as archived FROM tournaments ORDER BY created_at DESC
         """)
+        live = [dict(row) for row in cursor.fetchall()]
+        cursor.execute("""
+            SELECT id, name, type, format, created_at, completed_at, season,
+                   team_count, match_count, winner, TRUE as archived
+            FROM tournament_archive ORDER BY created_at DESC
+        """)
+        archived = [dict(row) for row in cursor.fetchall()]
+        # Les deux listes sont déjà triées par l'index : simple fusion
+        return list(heapq.merge(live, archived, key=lambda t: t["created_at"] or "",
+                                reverse=True))
         
-        return [dict(row) for row in cursor.fetchall()]
-        
+    @instrumented("db.create_team")
     def create_team(self, tournament_id: int, number: int, players: List[str]) -> int:
         """Créer une nouvelle équipe"""
         cursor = self.connection.cursor()
@@ -132,9 +432,13 @@ class DatabaseManager:
                 VALUES (?, ?, ?)
             """, (team_id, player_name, i))
             
+        self._register_player_names(cursor, players)
         self.connection.commit()
+        self.query_cache.invalidate(tournament_id)
         return team_id
         
+    @instrumented("db.get_teams_by_tournament")
+    @cached_read
     def get_teams_by_tournament(self, tournament_id: int) -> List[Dict]:
         """Récupérer toutes les équipes d'un tournoi"""
         cursor = self.connection.cursor()
@@ -142,35 +446,151 @@ class DatabaseManager:
             SELECT t.*, GROUP_CONCAT(p.name, ', ') as players
             FROM teams t
             LEFT JOIN players p ON t.id = p.team_id
-            WHERE t.tournament_id = ?
+            WHERE t.tournament_id = ? AND t.members IS NULL
             GROUP BY t.id
             ORDER BY t.number
         """, (tournament_id,))
         
         return [dict(row) for row in cursor.fetchall()]
         
+    @instrumented("db.delete_team")
     def delete_team(self, team_id: int):
         """Supprimer une équipe"""
+        tournament_id = self._tournament_of("teams", team_id)
         cursor = self.connection.cursor()
         cursor.execute("DELETE FROM teams WHERE id = ?", (team_id,))
         self.connection.commit()
+        self.query_cache.invalidate(tournament_id)
         
+    @instrumented("db.create_match")
     def create_match(self, tournament_id: int, round_number: int, team1_id: int, 
-                    team2_id: int, is_bye: bool = False) -> int:
+                    team2_id: int, is_bye: bool = False, bracket: Optional[str] = None,
+                    bracket_node: Optional[int] = None, pool: Optional[int] = None) -> int:
         """Créer un nouveau match"""
         cursor = self.connection.cursor()
         cursor.execute("""
-            INSERT INTO matches (tournament_id, round_number, team1_id, team2_id, is_bye)
-            VALUES (?, ?, ?, ?, ?)
-        """, (tournament_id, round_number, team1_id, team2_id, is_bye))
+            INSERT INTO matches (tournament_id, round_number, team1_id, team2_id, is_bye,
+                                 bracket, bracket_node, pool)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, (tournament_id, round_number, team1_id, team2_id, is_bye, bracket, bracket_node, pool))
         
         match_id = cursor.lastrowid
         self.connection.commit()
+        self.query_cache.invalidate(tournament_id)
         return match_id
         
+    @instrumented("db.save_changes")
+    def save_changes(self, changes) -> int:
+        """Écrire en une transaction les équipes et matchs modifiés d'un tournoi
+        
+        `changes` est un autosave.Changes ; les objets sont identifiés par leur
+        identifiant en mémoire (colonne local_id). Les équipes composées pour un
+        match (quadrette) sont des lignes de teams sans joueurs, dont la colonne
+        members désigne les équipes inscrites. Retourne le nombre de lignes écrites.
+        """
+        tournament_id = changes.tournament_id
+        rows = 0
+        team_filter = "team_id IN (SELECT id FROM teams WHERE tournament_id = ? AND local_id = ?)"
+        with self.connection:
+            cursor = self.connection.cursor()
+            if changes.current_round is not None:
+                cursor.execute("""
+                    UPDATE tournaments SET current_round = ? WHERE id = ?
+                """, (changes.current_round, tournament_id))
+                rows += 1
+            if changes.rng_state is not None:
+                cursor.execute("""
+                    UPDATE tournaments SET rng_state = ? WHERE id = ?
+                """, (json.dumps(changes.rng_state), tournament_id))
+                
+            for local_id in changes.removed_teams:
+                cursor.execute(f"""
+                    DELETE FROM players WHERE {team_filter}
+                """, (tournament_id, local_id))
+                cursor.execute("""
+                    DELETE FROM teams WHERE tournament_id = ? AND local_id = ?
+                """, (tournament_id, local_id))
+                cursor.execute("""
+                    DELETE FROM player_results WHERE tournament_id = ? AND team_local_id = ?
+                """, (tournament_id, local_id))
+                rows += 1
+                
+            for local_id, (number, players, club, league, seeded) in changes.teams.items():
+                cursor.execute("""
+                    INSERT INTO teams (tournament_id, number, local_id, club, league, seeded)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (tournament_id, local_id) DO UPDATE SET
+                        number = excluded.number, club = excluded.club,
+                        league = excluded.league, seeded = excluded.seeded
+                """, (tournament_id, number, local_id, club, league, bool(seeded)))
+                cursor.execute("""
+                    SELECT id FROM teams WHERE tournament_id = ? AND local_id = ?
+                """, (tournament_id, local_id))
+                team_id = cursor.fetchone()[0]
+                cursor.execute("""
+                    DELETE FROM players WHERE team_id = ?
+                """, (team_id,))
+                cursor.executemany("""
+                    INSERT INTO players (team_id, name, position) VALUES (?, ?, ?)
+                """, [(team_id, name, position) for position, name in enumerate(players, 1)])
+                rows += 1 + len(players)
+            # Joueurs saisis ou importés : proposés ensuite par l'autocomplétion
+            self._register_player_names(cursor, [name for _, players, *_ in changes.teams.values()
+                                                 for name in players])
+                
+            if changes.composites:
+                cursor.executemany("""
+                    INSERT INTO teams (tournament_id, number, local_id, members, roster)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT (tournament_id, local_id) DO UPDATE SET
+                        number = excluded.number, members = excluded.members,
+                        roster = excluded.roster
+                """, [(tournament_id, number, local_id, ",".join(map(str, members)),
+                       ",".join(names))
+                      for local_id, (number, names, members) in changes.composites.items()])
+                rows += len(changes.composites)
+                
+            if changes.matches:
+                team_lookup = "(SELECT id FROM teams WHERE tournament_id = ? AND local_id = ?)"
+                cursor.executemany(f"""
+                    INSERT INTO matches (tournament_id, local_id, round_number, team1_id, team2_id,
+                                         score1, score2, terrain, completed, is_bye,
+                                         bracket, bracket_node, pool, completed_at)
+                    VALUES (?, ?, ?, {team_lookup}, {team_lookup}, ?, ?, ?, ?, ?, ?, ?, ?,
+                            CASE WHEN ? THEN CURRENT_TIMESTAMP END)
+                    ON CONFLICT (tournament_id, local_id) DO UPDATE SET
+                        score1 = excluded.score1, score2 = excluded.score2,
+                        terrain = excluded.terrain, completed = excluded.completed,
+                        completed_at = COALESCE(matches.completed_at, excluded.completed_at)
+                """, [
+                    (tournament_id, local_id, round_number,
+                     tournament_id, team1, tournament_id, team1 if team2 is None else team2,
+                     score1, score2, terrain, completed, is_bye, bracket, bracket_node, pool,
+                     completed)
+                    for local_id, (round_number, team1, team2, score1, score2, terrain,
+                                   completed, is_bye, bracket, bracket_node, pool)
+                    in changes.matches.items()
+                ])
+                rows += len(changes.matches)
+                
+            if changes.players:
+                cursor.executemany("""
+                    INSERT OR REPLACE INTO player_results (tournament_id, team_local_id, position,
+                                                           name, played, wins, losses,
+                                                           points_for, points_against)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, [(tournament_id, team, position) + row
+                      for (team, position), row in changes.players.items()
+                      if team not in changes.removed_teams])
+                rows += len(changes.players)
+        self.query_cache.invalidate(tournament_id)
+        return rows
+        
+    @instrumented("db.update_match_score")
     def update_match_score(self, match_id: int, score1: int, score2: int, 
                           terrain: Optional[int] = None):
         """Mettre à jour le score d'un match"""
+        tournament_id = self._tournament_of("matches", match_id)
         cursor = self.connection.cursor()
         
         if terrain is not None:
@@ -187,47 +607,92 @@ class DatabaseManager:
             """, (score1, score2, match_id))
             
         self.connection.commit()
+        self.query_cache.invalidate(tournament_id)
         
+    @instrumented("db.get_matches_by_tournament")
+    @cached_read
     def get_matches_by_tournament(self, tournament_id: int) -> List[Dict]:
         """Récupérer tous les matchs d'un tournoi"""
+        return list(self.iter_matches(tournament_id))
+        
+    def iter_matches(self, tournament_id: Optional[int] = None) -> Iterator[Dict]:
+        """Parcourir les matchs d'un tournoi, ou de tous les tournois, ligne par ligne
+        
+        Les lignes sont lues au fil du curseur : la mémoire utilisée ne dépend
+        pas du nombre de matchs exportés.
+        """
+        for schema in self._schemas_for(tournament_id):
+            yield from self._iter_matches(schema, tournament_id)
+            
+    def _iter_matches(self, schema: str, tournament_id: Optional[int]) -> Iterator[Dict]:
+        where, params = "", ()
+        if tournament_id is not None:
+            where, params = "WHERE m.tournament_id = ?", (tournament_id,)
         cursor = self.connection.cursor()
-        cursor.execute("""
+        cursor.execute(f"""
             SELECT m.*, 
                    t1.number as team1_number, t2.number as team2_number,
-                   GROUP_CONCAT(DISTINCT p1.name) as team1_players,
-                   GROUP_CONCAT(DISTINCT p2.name) as team2_players
-            FROM matches m
-            JOIN teams t1 ON m.team1_id = t1.id
-            JOIN teams t2 ON m.team2_id = t2.id
-            LEFT JOIN players p1 ON t1.id = p1.team_id
-            LEFT JOIN players p2 ON t2.id = p2.team_id
-            WHERE m.tournament_id = ?
-            GROUP BY m.id
-            ORDER BY m.round_number, m.id
-        """, (tournament_id,))
-        
-        return [dict(row) for row in cursor.fetchall()]
+                   t1.roster as team1_players, t2.roster as team2_players
+            FROM {schema}.matches m
+            JOIN {schema}.teams t1 ON m.team1_id = t1.id
+            LEFT JOIN {schema}.teams t2 ON m.team2_id = t2.id
+            {where}
+            ORDER BY m.tournament_id, m.round_number, m.id
+        """, params)
         
+        for row in cursor:
+            yield dict(row)
+            
+    @instrumented("db.get_matches_by_round")
+    @cached_read
     def get_matches_by_round(self, tournament_id: int, round_number: int) -> List[Dict]:
         """Récupérer les matchs d'un tour spécifique"""
         cursor = self.connection.cursor()
         cursor.execute("""
             SELECT m.*, 
                    t1.number as team1_number, t2.number as team2_number,
-                   GROUP_CONCAT(DISTINCT p1.name) as team1_players,
-                   GROUP_CONCAT(DISTINCT p2.name) as team2_players
+                   t1.roster as team1_players, t2.roster as team2_players
             FROM matches m
             JOIN teams t1 ON m.team1_id = t1.id
             JOIN teams t2 ON m.team2_id = t2.id
-            LEFT JOIN players p1 ON t1.id = p1.team_id
-            LEFT JOIN players p2 ON t2.id = p2.team_id
             WHERE m.tournament_id = ? AND m.round_number = ?
-            GROUP BY m.id
             ORDER BY m.id
         """, (tournament_id, round_number))
         
         return [dict(row) for row in cursor.fetchall()]
         
+    @instrumented("db.get_matches_by_pool")
+    @cached_read
+    def get_matches_by_pool(self, tournament_id: int, pool: int) -> List[Dict]:
+        """Récupérer les matchs d'une poule"""
+        cursor = self.connection.cursor()
+        cursor.execute("""
+            SELECT * FROM matches
+            WHERE tournament_id = ? AND pool = ?
+            ORDER BY round_number, id
+        """, (tournament_id, pool))
+        
+        return [dict(row) for row in cursor.fetchall()]
+        
+    def _tournament_of(self, table: str, row_id: int) -> Optional[int]:
+        """Tournoi d'une équipe ou d'un match, pour invalider le cache"""
+        cursor = self.connection.cursor()
+        cursor.execute(f"SELECT tournament_id FROM {table} WHERE id = ?", (row_id,))
+        row = cursor.fetchone()
+        return row[0] if row else None
+        
+    def check_external_writes(self):
+        """Vider le cache si une autre connexion a modifié la base depuis la dernière lecture"""
+        version = self.connection.execute("PRAGMA data_version").fetchone()[0]
+        if self.data_version is not None and version != self.data_version:
+            self.query_cache.clear()
+        self.data_version = version
+        
+    def cache_stats(self) -> Dict[str, float]:
+        """Statistiques du cache des lectures (succès, échecs, taux, entrées)"""
+        return self.query_cache.stats()
+        
+    @instrumented("db.update_tournament_round")
     def update_tournament_round(self, tournament_id: int, round_number: int):
         """Mettre à jour le tour actuel du tournoi"""
         cursor = self.connection.cursor()
@@ -236,6 +701,7 @@ class DatabaseManager:
         """, (round_number, tournament_id))
         self.connection.commit()
         
+    @instrumented("db.complete_tournament")
     def complete_tournament(self, tournament_id: int):
         """Marquer un tournoi comme terminé"""
         cursor = self.connection.cursor()
@@ -244,40 +710,533 @@ class DatabaseManager:
         """, (tournament_id,))
         self.connection.commit()
         
+    @instrumented("db.get_match_durations")
+    def get_match_durations(self, tournament_type: Optional[str] = None) -> List[float]:
+        """Durées (minutes) des matchs validés, du tirage à la validation, archives comprises
+
+        Seuls les tours dont les matchs joués tiennent tous sur les terrains sont
+        retenus : ailleurs, l'écart entre tirage et validation comprend l'attente
+        d'un terrain libre, que le simulateur ajoute déjà de lui-même.
+        """
+        type_filter, params = "", ()
+        if tournament_type is not None:
+            type_filter, params = "AND t.type = ?", (tournament_type,)
+        durations = []
+        for schema in self._schemas_for(None):
+            cursor = self.connection.cursor()
+            cursor.execute(f"""
+                SELECT ROUND((julianday(m.completed_at) - julianday(m.created_at)) * 1440, 2)
+                FROM {schema}.matches m
+                JOIN {schema}.tournaments t ON m.tournament_id = t.id
+                JOIN (
+                    SELECT tournament_id, round_number, COUNT(*) AS played
+                    FROM {schema}.matches WHERE is_bye = FALSE
+                    GROUP BY tournament_id, round_number
+                ) r ON r.tournament_id = m.tournament_id AND r.round_number = m.round_number
+                WHERE m.completed = TRUE AND m.is_bye = FALSE AND r.played <= t.terrain_count
+                  AND m.created_at IS NOT NULL AND m.completed_at IS NOT NULL {type_filter}
+            """, params)
+            durations.extend(row[0] for row in cursor.fetchall())
+        return durations
+        
+    @instrumented("db.get_team_stats")
+    @cached_read
     def get_team_stats(self, tournament_id: int) -> List[Dict]:
         """Calculer les statistiques des équipes"""
+        return list(self.iter_team_stats(tournament_id))
+        
+    def iter_team_stats(self, tournament_id: Optional[int] = None) -> Iterator[Dict]:
+        """Parcourir le classement d'un tournoi, ou de tous les tournois, ligne par ligne
+        
+        Chaque match est compté une fois par équipe (et non une fois par joueur),
+        les noms des joueurs sont lus par une sous-requête indexée.
+        """
+        for schema in self._schemas_for(tournament_id):
+            yield from self._iter_team_stats(schema, tournament_id)
+            
+    def _iter_team_stats(self, schema: str, tournament_id: Optional[int]) -> Iterator[Dict]:
+        # Les équipes composées pour un match (quadrette) ne sont pas classées : leurs
+        # résultats reviennent à chacune des équipes inscrites qui les composent
+        match_filter, team_filter, params = "", "WHERE t.members IS NULL", ()
+        if tournament_id is not None:
+            match_filter = "AND tournament_id = ?"
+            team_filter += " AND t.tournament_id = ?"
+            params = (tournament_id, tournament_id, tournament_id)
         cursor = self.connection.cursor()
-        cursor.execute("""
+        cursor.execute(f"""
+            WITH sides AS (
+                SELECT team1_id AS team_id, score1 AS scored, score2 AS conceded
+                FROM {schema}.matches WHERE completed = TRUE {match_filter}
+                UNION ALL
+                SELECT team2_id, score2, score1
+                FROM {schema}.matches WHERE completed = TRUE AND is_bye = FALSE {match_filter}
+            ),
+            results AS (
+                SELECT team_id, scored, conceded FROM sides
+                UNION ALL
+                SELECT r.id, s.scored, s.conceded
+                FROM sides s
+                JOIN {schema}.teams c ON c.id = s.team_id AND c.members IS NOT NULL
+                JOIN {schema}.teams r ON r.tournament_id = c.tournament_id
+                    AND r.members IS NULL
+                    AND ',' || c.members || ',' LIKE '%,' || r.local_id || ',%'
+            ),
+            totals AS (
+                SELECT team_id,
+                       SUM(scored > conceded) AS wins,
+                       SUM(scored < conceded) AS losses,
+                       SUM(scored) AS points_for,
+                       SUM(conceded) AS points_against
+                FROM results
+                GROUP BY team_id
+            )
             SELECT 
+                t.tournament_id,
                 t.id,
                 t.number,
-                GROUP_CONCAT(p.name, ', ') as players,
-                COUNT(CASE WHEN (m1.team1_id = t.id AND m1.score1 > m1.score2) OR 
-                                (m1.team2_id = t.id AND m1.score2 > m1.score1) 
-                           THEN 1 END) as wins,
-                COUNT(CASE WHEN (m1.team1_id = t.id AND m1.score1 < m1.score2) OR 
-                                (m1.team2_id = t.id AND m1.score2 < m1.score1) 
-                           THEN 1 END) as losses,
-                COALESCE(SUM(CASE WHEN m1.team1_id = t.id THEN m1.score1 
-                                  WHEN m1.team2_id = t.id THEN m1.score2 
-                                  ELSE 0 END), 0) as points_for,
-                COALESCE(SUM(CASE WHEN m1.team1_id = t.id THEN m1.score2 
-                                  WHEN m1.team2_id = t.id THEN m1.score1 
-                                  ELSE 0 END), 0) as points_against
-            FROM teams t
-            LEFT JOIN players p ON t.id = p.team_id
-            LEFT JOIN matches m1 ON (t.id = m1.team1_id OR t.id = m1.team2_id) AND m1.completed = TRUE
-            WHERE t.tournament_id = ?
-            GROUP BY t.id, t.number
-            ORDER BY wins DESC, (points_for - points_against) DESC, points_for DESC
-        """, (tournament_id,))
+                (SELECT GROUP_CONCAT(name, ', ') FROM (
+                    SELECT name FROM {schema}.players WHERE team_id = t.id ORDER BY position
+                )) as players,
+                COALESCE(s.wins, 0) as wins,
+                COALESCE(s.losses, 0) as losses,
+                COALESCE(s.points_for, 0) as points_for,
+                COALESCE(s.points_against, 0) as points_against
+            FROM {schema}.teams t
+            LEFT JOIN totals s ON s.team_id = t.id
+            {team_filter}
+            ORDER BY t.tournament_id, wins DESC, (points_for - points_against) DESC,
+                     points_for DESC
+        """, params)
+        
+        for row in cursor:
+            yield dict(row)
+            
+    @instrumented("db.save_standings_snapshot")
+    def save_standings_snapshot(self, tournament_id: int, round_number: int,
+                                rows: List[Tuple[int, int, int, int, int, int, int]]):
+        """Enregistrer le classement après un tour
+        
+        Chaque ligne est (identifiant en mémoire de l'équipe, numéro d'équipe, place,
+        victoires, défaites, points pour, points contre). Un cliché existant pour
+        ce tour est remplacé.
+        """
+        with self.connection:
+            self.connection.execute("""
+                DELETE FROM standings_snapshots WHERE tournament_id = ? AND round_number = ?
+            """, (tournament_id, round_number))
+            self.connection.executemany("""
+                INSERT INTO standings_snapshots (tournament_id, round_number, team_local_id,
+                                                 team_number, rank, wins, losses,
+                                                 points_for, points_against)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, [(tournament_id, round_number) + tuple(row) for row in rows])
+            
+    @instrumented("db.get_standings_snapshot")
+    def get_standings_snapshot(self, tournament_id: int, round_number: int) -> List[Dict]:
+        """Classement enregistré après un tour, de la première à la dernière place"""
+        schema = self._schemas_for(tournament_id)[0]
+        cursor = self.connection.cursor()
+        cursor.execute(f"""
+            SELECT team_local_id, team_number, rank, wins, losses, points_for, points_against
+            FROM {schema}.standings_snapshots
+            WHERE tournament_id = ? AND round_number = ?
+            ORDER BY rank
+        """, (tournament_id, round_number))
         
         return [dict(row) for row in cursor.fetchall()]
         
+    @instrumented("db.get_rank_series")
+    def get_rank_series(self, tournament_id: int, team_local_id: int) -> List[Tuple[int, int]]:
+        """Places successives d'une équipe (par son identifiant en mémoire) : [(tour, place)]"""
+        schema = self._schemas_for(tournament_id)[0]
+        cursor = self.connection.cursor()
+        cursor.execute(f"""
+            SELECT round_number, rank FROM {schema}.standings_snapshots
+            WHERE tournament_id = ? AND team_local_id = ?
+            ORDER BY round_number
+        """, (tournament_id, team_local_id))
+        
+        return [(row["round_number"], row["rank"]) for row in cursor.fetchall()]
+        
+    @instrumented("db.get_player_results")
+    def get_player_results(self, tournament_id: int, limit: Optional[int] = None) -> List[Dict]:
+        """Classement individuel enregistré : victoires, différence, points marqués"""
+        schema = self._schemas_for(tournament_id)[0]
+        cursor = self.connection.cursor()
+        cursor.execute(f"""
+            SELECT team_local_id, position, name, played, wins, losses,
+                   points_for, points_against
+            FROM {schema}.player_results
+            WHERE tournament_id = ?
+            ORDER BY wins DESC, points_for - points_against DESC, points_for DESC,
+                     team_local_id, position
+            LIMIT ?
+        """, (tournament_id, -1 if limit is None else limit))
+        
+        return [dict(row) for row in cursor.fetchall()]
+        
+    @instrumented("db.get_player_ratings")
+    def get_player_ratings(self, normalized_names: List[str]) -> Dict[str, Dict]:
+        """Récupérer les cotes des joueurs connus, indexées par nom normalisé"""
+        result = {}
+        cursor = self.connection.cursor()
+        names = list(normalized_names)
+        # Découper pour rester sous la limite de paramètres SQLite
+        for start in range(0, len(names), 500):
+            chunk = names[start:start + 500]
+            placeholders = ", ".join("?" * len(chunk))
+            cursor.execute(f"""
+                SELECT * FROM player_registry WHERE normalized_name IN ({placeholders})
+            """, chunk)
+            for row in cursor.fetchall():
+                result[row["normalized_name"]] = dict(row)
+        return result
+        
+    @instrumented("db.save_player_ratings")
+    def save_player_ratings(self, ratings: List[Tuple[str, str, float, int]]):
+        """Enregistrer un lot de cotes (nom normalisé, nom, cote, parties) en une transaction"""
+        with self.connection:
+            self.connection.executemany("""
+                INSERT INTO player_registry (normalized_name, name, rating, games)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(normalized_name) DO UPDATE SET
+                    name = excluded.name,
+                    rating = excluded.rating,
+                    games = excluded.games,
+                    updated_at = CURRENT_TIMESTAMP
+            """, ratings)
+            
+    def _register_player_names(self, cursor, names: List[str]):
+        """Ajouter des noms au registre des joueurs s'ils n'y sont pas déjà"""
+        rows = [(normalize_name(name), name.strip()) for name in names]
+        cursor.executemany("""
+            INSERT OR IGNORE INTO player_registry (normalized_name, name)
+            VALUES (?, ?)
+        """, [row for row in rows if row[0]])
+        
+    @instrumented("db.register_player_names")
+    def register_player_names(self, names: List[str]):
+        """Enregistrer des noms de joueurs dans l'annuaire"""
+        cursor = self.connection.cursor()
+        self._register_player_names(cursor, names)
+        self.connection.commit()
+        
+    @instrumented("db.search_player_names")
+    def search_player_names(self, text: str, limit: int = 10) -> List[str]:
+        """Autocomplétion : noms commençant par le texte, puis noms le contenant"""
+        query = normalize_name(text)
+        if not query:
+            return []
+            
+        cursor = self.connection.cursor()
+        # Préfixe : parcours de l'index unique sur normalized_name
+        cursor.execute("""
+            SELECT name, normalized_name FROM player_registry
+            WHERE normalized_name >= ? AND normalized_name < ?
+            ORDER BY normalized_name
+            LIMIT ?
+        """, (query, query + "\uffff", limit))
+        rows = cursor.fetchall()
+        names = [row["name"] for row in rows]
+        
+        if len(names) < limit and len(query) >= 3:
+            seen = {row["normalized_name"] for row in rows}
+            if self.fts_enabled:
+                cursor.execute("""
+                    SELECT r.name, r.normalized_name FROM player_names_fts f
+                    JOIN player_registry r ON r.id = f.rowid
+                    WHERE player_names_fts MATCH ?
+                    LIMIT ?
+                """, (self._fts_phrase(query), limit + len(seen)))
+            else:
+                cursor.execute("""
+                    SELECT name, normalized_name FROM player_registry
+                    WHERE normalized_name LIKE ? LIMIT ?
+                """, (f"%{query}%", limit + len(seen)))
+            for row in cursor.fetchall():
+                if row["normalized_name"] not in seen and len(names) < limit:
+                    names.append(row["name"])
+                    
+        return names
+        
+    @instrumented("db.find_similar_player_names")
+    def find_similar_player_names(self, name: str, threshold: float = 0.8,
+                                  limit: int = 5) -> List[Tuple[str, float]]:
+        """Détection de doublons : noms proches (fautes de frappe) déjà connus"""
+        query = normalize_name(name)
+        if len(query) < 3 or not self.fts_enabled:
+            return []
+            
+        # Filtre par segments : le nom est découpé en 2e+1 segments ; avec au plus
+        # e modifications, au moins e+1 segments restent intacts. On cherche donc
+        # les noms contenant toutes les combinaisons de e+1 segments, ce qui est
+        # beaucoup plus sélectif qu'un OU sur chaque trigramme.
+        edits = max(1, min(int(len(query) * (1 - threshold)), (len(query) // 3 - 1) // 2))
+        parts = min(2 * edits + 1, len(query) // 3)
+        size = len(query) // parts
+        segments = [query[i * size:(i + 1) * size if i < parts - 1 else None] for i in range(parts)]
+        required = max(1, parts - edits)
+        match_expr = " OR ".join(
+            "(" + " AND ".join(self._fts_phrase(segment) for segment in combo) + ")"
+            for combo in combinations(segments, required)
+        )
+        cursor = self.connection.cursor()
+        cursor.execute("""
+            SELECT r.name, r.normalized_name FROM player_names_fts f
+            JOIN player_registry r ON r.id = f.rowid
+            WHERE player_names_fts MATCH ?
+        """, (match_expr,))
+        
+        similar = []
+        for row in cursor.fetchall():
+            candidate = row["normalized_name"]
+            if candidate == query:
+                continue
+            matcher = SequenceMatcher(None, query, candidate)
+            if matcher.real_quick_ratio() < threshold or matcher.quick_ratio() < threshold:
+                continue
+            ratio = matcher.ratio()
+            if ratio >= threshold:
+                similar.append((row["name"], ratio))
+        similar.sort(key=lambda item: -item[1])
+        return similar[:limit]
+        
+    @staticmethod
+    def _fts_phrase(text: str) -> str:
+        """Chaîne littérale FTS5 (guillemets doublés)"""
+        return '"' + text.replace('"', '""') + '"'
+        
+    @staticmethod
+    def season_of(completed_at: Optional[str]) -> str:
+        """Saison d'un tournoi terminé : l'année de sa fin"""
+        return (completed_at or datetime.now().isoformat())[:4]
+        
+    def archive_path(self, season: str) -> str:
+        """Chemin de la base d'archive d'une saison"""
+        return os.path.join(self.archive_dir, f"petanque_{season}.db")
+        
+    def _attach_archive(self, path: str) -> str:
+        """Attacher une base d'archive si besoin, retourne son nom de schéma"""
+        for schema, attached_path in self.attached_archives.items():
+            if attached_path == path:
+                # Marquer comme la plus récemment utilisée
+                del self.attached_archives[schema]
+                self.attached_archives[schema] = path
+                return schema
+        if len(self.attached_archives) >= MAX_ATTACHED_ARCHIVES:
+            oldest = next(iter(self.attached_archives))
+            self.connection.execute(f"DETACH DATABASE {oldest}")
+            del self.attached_archives[oldest]
+        season = os.path.splitext(os.path.basename(path))[0].rsplit("_", 1)[-1]
+        schema = f"archive_{''.join(c for c in season if c.isalnum())}"
+        self.connection.commit()
+        self.connection.execute("ATTACH DATABASE ? AS " + schema, (path,))
+        self.attached_archives[schema] = path
+        self._upgrade_archive(schema)
+        return schema
+        
+    def _upgrade_archive(self, schema: str):
+        """Ajouter à une archive d'une version antérieure les tables et colonnes manquantes"""
+        cursor = self.connection.cursor()
+        cursor.execute(f"""
+            SELECT name FROM {schema}.sqlite_master WHERE type = 'table'
+        """)
+        existing = {row["name"] for row in cursor.fetchall()}
+        if "teams" not in existing:
+            # Archive neuve : créée par _create_archive_schema
+            return
+        with self.connection:
+            roster_added = False
+            for table in ARCHIVED_TABLES:
+                if table not in existing:
+                    cursor.execute(f"""
+                        CREATE TABLE {schema}.{table} AS SELECT * FROM main.{table} WHERE 0
+                    """)
+                    continue
+                cursor.execute(f"PRAGMA main.table_info({table})")
+                for column in cursor.fetchall():
+                    definition = column["type"]
+                    if column["dflt_value"] is not None:
+                        definition += f" DEFAULT {column['dflt_value']}"
+                    if self._ensure_column(self.connection.cursor(), table, column["name"],
+                                           definition, schema):
+                        roster_added = roster_added or column["name"] == "roster"
+            if roster_added:
+                cursor.execute(f"""
+                    UPDATE {schema}.teams
+                    SET roster = {ROSTER_OF.format(schema=schema, team=f"{schema}.teams.id")}
+                """)
+        
+    def _create_archive_schema(self, schema: str):
+        """Créer les tables d'une archive avec les colonnes actuelles de la base principale"""
+        cursor = self.connection.cursor()
+        for table in ARCHIVED_TABLES:
+            cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS {schema}.{table} AS SELECT * FROM main.{table} WHERE 0
+            """)
+        cursor.execute(f"""
+            CREATE INDEX IF NOT EXISTS {schema}.idx_teams_tournament ON teams (tournament_id)
+        """)
+        cursor.execute(f"""
+            CREATE INDEX IF NOT EXISTS {schema}.idx_players_team ON players (team_id, position)
+        """)
+        cursor.execute(f"""
+            CREATE INDEX IF NOT EXISTS {schema}.idx_matches_tournament
+            ON matches (tournament_id, round_number)
+        """)
+        cursor.execute(f"""
+            CREATE INDEX IF NOT EXISTS {schema}.idx_standings_snapshots_local
+            ON standings_snapshots (tournament_id, team_local_id, round_number)
+        """)
+        
+    def _schemas_for(self, tournament_id: Optional[int]) -> List[str]:
+        """Schémas contenant le détail d'un tournoi (ou de tous si None)"""
+        if tournament_id is not None:
+            cursor = self.connection.cursor()
+            cursor.execute("""
+                SELECT archive_file FROM tournament_archive WHERE id = ?
+            """, (tournament_id,))
+            row = cursor.fetchone()
+            if row is None or not os.path.exists(row["archive_file"]):
+                return ["main"]
+            return [self._attach_archive(row["archive_file"])]
+        cursor = self.connection.cursor()
+        cursor.execute("""
+            SELECT DISTINCT archive_file FROM tournament_archive ORDER BY season
+        """)
+        files = [row["archive_file"] for row in cursor.fetchall()
+                 if os.path.exists(row["archive_file"])]
+        return [self._attach_archive(path) for path in files] + ["main"]
+        
+    @instrumented("db.get_archived_tournament")
+    def get_archived_tournament(self, tournament_id: int) -> Optional[Dict]:
+        """Résumé d'un tournoi archivé, avec son classement final"""
+        cursor = self.connection.cursor()
+        cursor.execute("""
+            SELECT *, TRUE as archived FROM tournament_archive WHERE id = ?
+        """, (tournament_id,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        summary = dict(row)
+        summary["ranking"] = json.loads(summary["ranking"])
+        return summary
+        
+    @instrumented("db.archive_tournament")
+    def archive_tournament(self, tournament_id: int) -> str:
+        """Déplacer un tournoi terminé dans l'archive de sa saison, retourne le fichier
+        
+        Le résumé (vainqueur, nombre d'équipes, classement final) reste dans la
+        base principale ; équipes, joueurs et matchs ne sont plus que dans l'archive.
+        """
+        tournament = self.get_tournament(tournament_id)
+        if tournament is None or tournament.get("archived"):
+            raise ValueError(f"Tournoi {tournament_id} introuvable ou déjà archivé")
+        if not tournament["completed_at"]:
+            raise ValueError(f"Le tournoi {tournament_id} n'est pas terminé")
+            
+        ranking = [
+            [row["number"], row["players"], row["wins"], row["losses"],
+             row["points_for"], row["points_against"]]
+            for row in self._iter_team_stats("main", tournament_id)
+        ]
+        cursor = self.connection.cursor()
+        cursor.execute("""
+            SELECT COUNT(*) FROM matches WHERE tournament_id = ?
+        """, (tournament_id,))
+        match_count = cursor.fetchone()[0]
+        
+        season = self.season_of(tournament["completed_at"])
+        path = self.archive_path(season)
+        os.makedirs(self.archive_dir, exist_ok=True)
+        schema = self._attach_archive(path)
+        
+        team_filter = "team_id IN (SELECT id FROM main.teams WHERE tournament_id = ?)"
+        with self.connection:
+            self._create_archive_schema(schema)
+            cursor.execute(f"""
+                INSERT INTO {schema}.tournaments SELECT * FROM main.tournaments WHERE id = ?
+            """, (tournament_id,))
+            cursor.execute(f"""
+                INSERT INTO {schema}.teams SELECT * FROM main.teams WHERE tournament_id = ?
+            """, (tournament_id,))
+            cursor.execute(f"""
+                INSERT INTO {schema}.players SELECT * FROM main.players WHERE {team_filter}
+            """, (tournament_id,))
+            cursor.execute(f"""
+                INSERT INTO {schema}.matches SELECT * FROM main.matches WHERE tournament_id = ?
+            """, (tournament_id,))
+            cursor.execute(f"""
+                INSERT INTO {schema}.standings_snapshots
+                SELECT * FROM main.standings_snapshots WHERE tournament_id = ?
+            """, (tournament_id,))
+            cursor.execute(f"""
+                INSERT INTO {schema}.player_results
+                SELECT * FROM main.player_results WHERE tournament_id = ?
+            """, (tournament_id,))
+            cursor.execute("""
+                INSERT INTO tournament_archive (id, name, type, format, season, archive_file,
+                                                team_count, match_count, winner, ranking,
+                                                created_at, completed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (tournament_id, tournament["name"], tournament["type"], tournament["format"],
+                  season, path, len(ranking), match_count,
+                  ranking[0][1] if ranking else None,
+                  json.dumps(ranking, ensure_ascii=False),
+                  tournament["created_at"], tournament["completed_at"]))
+            cursor.execute(f"""
+                DELETE FROM main.players WHERE {team_filter}
+            """, (tournament_id,))
+            cursor.execute("""
+                DELETE FROM main.matches WHERE tournament_id = ?
+            """, (tournament_id,))
+            cursor.execute("""
+                DELETE FROM main.standings_snapshots WHERE tournament_id = ?
+            """, (tournament_id,))
+            cursor.execute("""
+                DELETE FROM main.player_results WHERE tournament_id = ?
+            """, (tournament_id,))
+            cursor.execute("""
+                DELETE FROM main.teams WHERE tournament_id = ?
+            """, (tournament_id,))
+            cursor.execute("""
+                DELETE FROM main.tournaments WHERE id = ?
+            """, (tournament_id,))
+        self.query_cache.invalidate(tournament_id)
+        return path
+        
+    @instrumented("db.archive_completed_tournaments")
+    def archive_completed_tournaments(self, compact: bool = True) -> int:
+        """Archiver tous les tournois terminés, retourne leur nombre"""
+        cursor = self.connection.cursor()
+        cursor.execute("""
+            SELECT id FROM tournaments WHERE completed_at IS NOT NULL ORDER BY id
+        """)
+        tournament_ids = [row["id"] for row in cursor.fetchall()]
+        for tournament_id in tournament_ids:
+            self.archive_tournament(tournament_id)
+        if tournament_ids and compact:
+            self.compact()
+        return len(tournament_ids)
+        
+    def compact(self):
+        """Récupérer la place libérée dans la base principale"""
+        self.detach_archives()
+        self.connection.execute("VACUUM main")
+        
+    def detach_archives(self):
+        """Détacher toutes les bases d'archive"""
+        self.connection.commit()
+        for schema in list(self.attached_archives):
+            self.connection.execute(f"DETACH DATABASE {schema}")
+        self.attached_archives.clear()
+        
     def close(self):
         """Fermer la connexion à la base de données"""
         if self.connection:
             self.connection.close()
+            # Une seconde fermeture (destructeur appelé depuis un autre fil) n'a rien à faire
+            self.connection = None
             
     def __del__(self):
         """Destructeur pour s'assurer que la connexion est fermée"""
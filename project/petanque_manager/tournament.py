@@ -5,10 +5,38 @@ Logique métier pour la gestion des tournois de pétanque
 """
 
 import random
-from typing import List, Dict, Tuple, Optional
+import unicodedata
+from typing import Callable, List, Dict, Tuple, Optional
 from dataclasses import dataclass, field
 from datetime import datetime
 
+from profiling import instrumented
+from history import StandingsHistory
+from player_stats import PlayerResults, PlayerStanding
+from draw import constrained_draw, has_constraints
+from events import (EventBus, TeamAdded, TeamRemoved, RoundGenerated, ScoreUpdated,
+                    MatchValidated)
+
+# Nombre de joueurs par équipe selon le type de tournoi
+PLAYERS_PER_TEAM = {
+    "tête-à-tête": 1,
+    "doublette": 2,
+    "triplette": 3,
+    "quadrette": 4,
+    "mêlée": 1,
+    "sextette": 6
+}
+
+def players_per_team(tournament_type: str) -> int:
+    """Nombre de joueurs attendus par équipe pour un type de tournoi"""
+    return PLAYERS_PER_TEAM.get(tournament_type, 2)
+
+def normalize_name(name: str) -> str:
+    """Normaliser un nom de joueur (casse, accents, espaces) pour l'identifier"""
+    decomposed = unicodedata.normalize("NFKD", name)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.casefold().split())
+
 @dataclass
 class Player:
     """Représente un joueur"""
@@ -21,7 +49,17 @@ class Team:
     id: int
     number: int
     players: List[Player] = field(default_factory=list)
+    # Club, ligue et tête de série : rencontres interdites au premier tour (draw.py)
+    club: Optional[str] = None
+    league: Optional[str] = None
+    seeded: bool = False
+    # Équipe composée pour un match (quadrette) : équipes inscrites qui la forment
+    members: List[int] = field(default_factory=list)
     
+    def member_ids(self) -> List[int]:
+        """Équipes inscrites créditées des résultats de cette équipe"""
+        return self.members or [self.id]
+        
     def get_display_name(self) -> str:
         """Retourne le nom d'affichage de l'équipe"""
         return f"Équipe {self.number}"
@@ -42,6 +80,9 @@ class Match:
     terrain: Optional[int] = None
     completed: bool = False
     is_bye: bool = False
+    bracket: Optional[str] = None  # Tableau du concours (A, B, C)
+    bracket_node: Optional[int] = None  # Position du match dans l'arbre du tableau
+    pool: Optional[int] = None  # Index de la poule (phase de poules)
     
     def get_winner(self) -> Optional[Team]:
         """Retourne l'équipe gagnante"""
@@ -75,37 +116,189 @@ class TeamStats:
         total = self.wins + self.losses
         return self.wins / total if total > 0 else 0.0
 
+def pair_in_order(items: list) -> Tuple[List[tuple], list]:
+    """Apparier les éléments deux à deux dans l'ordre, retourne (paires, reste)"""
+    remaining = list(items)
+    pairs = []
+    while len(remaining) >= 2:
+        pairs.append((remaining.pop(0), remaining.pop(0)))
+    return pairs, remaining
+
+def pair_randomly(items: list, rng=random) -> Tuple[List[tuple], list]:
+    """Tirage aléatoire complet, retourne (paires, équipe exemptée éventuelle)"""
+    shuffled = list(items)
+    rng.shuffle(shuffled)
+    return pair_in_order(shuffled)
+
+def pair_seeded(items: list, rating: Callable[[object], float], rng=random) -> Tuple[List[tuple], list]:
+    """Tirage avec têtes de série : la moitié la mieux classée affronte l'autre moitié
+
+    Les têtes de série ne peuvent pas se rencontrer entre elles ; l'ordre est
+    tiré au sort dans chaque moitié. En cas de nombre impair, l'équipe exemptée
+    est tirée parmi les non têtes de série.
+    """
+    ranked = sorted(items, key=rating, reverse=True)
+    half = len(ranked) // 2
+    seeds, others = ranked[:half], ranked[half:]
+    rng.shuffle(seeds)
+    rng.shuffle(others)
+    remaining = others[half:]
+    return list(zip(seeds, others[:half])), remaining
+
+def _fold_without_rematch(top: list, bottom: list, met: Callable[[object, object], bool],
+                          budget: List[int]) -> Optional[List[tuple]]:
+    # Recherche en profondeur dans l'ordre du pliage, bornée par `budget` essais
+    if not top:
+        return []
+    for index, other in enumerate(bottom):
+        if met(top[0], other):
+            continue
+        budget[0] -= 1
+        if budget[0] < 0:
+            return None
+        rest = _fold_without_rematch(top[1:], bottom[:index] + bottom[index + 1:], met, budget)
+        if rest is not None:
+            return [(top[0], other)] + rest
+    return None
+
+def pair_folded(items: list, rating: Callable[[object], float],
+                met: Optional[Callable[[object, object], bool]] = None) -> Tuple[List[tuple], list]:
+    """Appariement suisse classique : la moitié haute affronte la moitié basse dans l'ordre
+
+    Avec `met`, les adversaires déjà rencontrés sont évités en s'écartant le moins
+    possible du pliage ; si aucune répartition sans revanche n'est trouvée, chacun
+    prend le premier adversaire libre qu'il n'a pas rencontré (revanche à défaut).
+    """
+    ranked = sorted(items, key=rating, reverse=True)
+    half = len(ranked) // 2
+    top, bottom = ranked[:half], ranked[half:2 * half]
+    if met is None:
+        return list(zip(top, bottom)), ranked[2 * half:]
+    pairs = _fold_without_rematch(top, bottom, met, [8 * half])
+    if pairs is None:
+        pairs = []
+        for item in top:
+            opponent = next((other for other in bottom if not met(item, other)), bottom[0])
+            bottom.remove(opponent)
+            pairs.append((item, opponent))
+    return pairs, ranked[2 * half:]
+
+def pair_by_win_groups(groups: Dict[int, list], rng=random,
+                       rating: Optional[Callable[[object], float]] = None,
+                       met: Optional[Callable[[object, object], bool]] = None) -> List[tuple]:
+    """Apparier les éléments à l'intérieur de chaque groupe de victoires
+
+    Sans cote, le groupe est mélangé ; avec une cote, il est apparié haut contre bas
+    en évitant les adversaires déjà rencontrés (`met`).
+    """
+    pairs = []
+    for win_count in sorted(groups.keys(), reverse=True):
+        if rating is None:
+            group_pairs, _ = pair_randomly(groups[win_count], rng)
+        else:
+            group_pairs, _ = pair_folded(groups[win_count], rating, met)
+        pairs.extend(group_pairs)
+    return pairs
+
+# Formats de compétition
+FORMAT_SWISS = "suisse"
+FORMAT_CONCOURS = "concours"
+FORMAT_POOLS = "poules"
+FORMAT_CHAMPIONSHIP = "championnat"
+
 class Tournament:
     """Classe principale pour gérer un tournoi"""
     
-    def __init__(self, name: str, tournament_type: str, terrain_count: int):
+    def __init__(self, name: str, tournament_type: str, terrain_count: int,
+                 tournament_format: str = FORMAT_SWISS, concours_levels: int = 2,
+                 pool_format: str = "round_robin", seed: Optional[int] = None):
         self.id: Optional[int] = None
         self.name = name
         self.tournament_type = tournament_type
         self.terrain_count = terrain_count
+        self.format = tournament_format
+        # Nombre de tableaux du concours : 1 = A seul, 2 = A et B, 3 = A, B et C
+        self.concours_levels = concours_levels
+        self.concours = None
+        # Phase de poules (format "poules") : poules de 4 puis tableau final
+        self.pool_format = pool_format
+        self.pool_stage = None
+        # Calendrier de championnat, consommé une ronde à la fois
+        self.schedule = None
         self.teams: List[Team] = []
         self.matches: List[Match] = []
         self.current_round = 0
         self.created_at = datetime.now()
+        # Générateur aléatoire propre au tournoi : un tirage se reproduit à partir de la graine
+        self.seed = random.randrange(2 ** 32) if seed is None else seed
+        self.rng = random.Random(self.seed)
+        # Cotes des équipes (têtes de série et appariement suisse), vide = tirage aléatoire
+        self.team_ratings: Dict[int, float] = {}
+        # Classements cumulés tour par tour
+        self.history = StandingsHistory()
+        # Résultats individuels des joueurs, y compris dans les équipes composées
+        self.player_results = PlayerResults()
+        # Événements de modification (équipes, tours, scores)
+        self.events = EventBus()
+        # Recherche du meilleur tirage (pairing_search.PairingSearch), None = premier tirage
+        self.pairing_search = None
+        self.last_pairing_report = None
         
-    def add_team(self, players: List[str]) -> Team:
+    def add_team(self, players: List[str], club: Optional[str] = None,
+                 league: Optional[str] = None, seeded: bool = False) -> Team:
         """Ajouter une équipe au tournoi"""
         team_number = len(self.teams) + 1
+        # Identifiant jamais réutilisé, même après une suppression
+        team_id = max((t.id for t in self.teams), default=0) + 1
         team = Team(
-            id=team_number,
+            id=team_id,
             number=team_number,
-            players=[Player(i, name) for i, name in enumerate(players, 1)]
+            players=[Player(i, name) for i, name in enumerate(players, 1)],
+            club=club,
+            league=league,
+            seeded=seeded
         )
         self.teams.append(team)
+        self.history.invalidate()
+        self.events.emit(TeamAdded(team))
         return team
         
+    def add_teams(self, players_lists: List[List[str]],
+                  clubs: Optional[List[Optional[str]]] = None) -> List[Team]:
+        """Ajouter plusieurs équipes en une fois"""
+        clubs = clubs or [None] * len(players_lists)
+        return [self.add_team(players, club) for players, club in zip(players_lists, clubs)]
+        
     def remove_team(self, team_id: int):
         """Supprimer une équipe du tournoi"""
         self.teams = [t for t in self.teams if t.id != team_id]
         # Renuméroter les équipes
         for i, team in enumerate(self.teams, 1):
             team.number = i
+        self.history.invalidate()
+        self.events.emit(TeamRemoved(team_id))
             
+    def rng_state(self) -> list:
+        """État du générateur aléatoire, sérialisable en JSON"""
+        version, internal, gauss = self.rng.getstate()
+        return [version, list(internal), gauss]
+        
+    def restore_rng_state(self, state: list):
+        """Reprendre le générateur aléatoire là où il en était"""
+        version, internal, gauss = state
+        self.rng.setstate((version, tuple(internal), gauss))
+        
+    def set_team_ratings(self, ratings: Dict[int, float]):
+        """Définir les cotes des équipes utilisées pour les tirages"""
+        self.team_ratings = dict(ratings)
+        
+    def _rating_key(self) -> Optional[Callable[[Team], float]]:
+        """Fonction de cote par équipe, ou None si aucune cote n'est connue"""
+        if not self.team_ratings:
+            return None
+        return lambda team: self.team_ratings.get(team.id, 0.0)
+        
+    @instrumented("tournament.get_team_stats")
     def get_team_stats(self, team: Team) -> TeamStats:
         """Calculer les statistiques d'une équipe"""
         stats = TeamStats(team)
@@ -114,14 +307,14 @@ class Tournament:
             if not match.completed:
                 continue
                 
-            if match.team1.id == team.id:
+            if team.id in match.team1.member_ids():
                 stats.points_for += match.score1 or 0
                 stats.points_against += match.score2 or 0
                 if (match.score1 or 0) > (match.score2 or 0):
                     stats.wins += 1
                 else:
                     stats.losses += 1
-            elif match.team2.id == team.id:
+            elif team.id in match.team2.member_ids():
                 stats.points_for += match.score2 or 0
                 stats.points_against += match.score1 or 0
                 if (match.score2 or 0) > (match.score1 or 0):
@@ -131,6 +324,7 @@ class Tournament:
                     
         return stats
         
+    @instrumented("tournament.get_all_stats")
     def get_all_stats(self) -> List[TeamStats]:
         """Obtenir les statistiques de toutes les équipes"""
         stats = [self.get_team_stats(team) for team in self.teams]
@@ -138,25 +332,53 @@ class Tournament:
         stats.sort(key=lambda s: (-s.wins, -s.points_difference, -s.points_for))
         return stats
         
+    @instrumented("tournament.generate_first_round_matches")
     def generate_first_round_matches(self) -> List[Match]:
         """Générer les matchs du premier tour avec appariement aléatoire"""
+        return self._round_generated(self._generate_first_round())
+        
+    def _round_generated(self, matches: List[Match]) -> List[Match]:
+        """Signaler les matchs d'un nouveau tour"""
+        if matches:
+            self.events.emit(RoundGenerated(self.current_round, matches))
+        return matches
+        
+    def _generate_first_round(self) -> List[Match]:
         if len(self.teams) < 2:
             return []
             
+        if self.format == FORMAT_CONCOURS:
+            return self._start_concours(self.teams, self.concours_levels)
+        if self.format == FORMAT_POOLS:
+            return self._start_pools()
+        if self.format == FORMAT_CHAMPIONSHIP:
+            return self._start_championship()
+            
         self.current_round = 1
         matches = []
-        available_teams = self.teams.copy()
         
         # Mélanger pour éviter que l'équipe 1 joue contre la 2, etc.
-        random.shuffle(available_teams)
+        rating = self._rating_key()
+        self.last_pairing_report = None
+        if has_constraints(self.teams):
+            # Clubs et têtes de série séparés ; sans tête de série désignée, la
+            # moitié la mieux cotée en tient lieu, comme pour pair_seeded
+            seeds = None
+            if rating is not None and not any(team.seeded for team in self.teams):
+                ranked = sorted(self.teams, key=rating, reverse=True)
+                seeds = {team.id for team in ranked[:len(ranked) // 2]}
+            draw = constrained_draw(self.teams, self.rng, seeds=seeds)
+            pairs, available_teams = draw.pairs, [] if draw.bye is None else [draw.bye]
+            self.last_pairing_report = draw
+        elif rating is None:
+            pairs, available_teams = pair_randomly(self.teams, self.rng)
+        else:
+            pairs, available_teams = pair_seeded(self.teams, rating, self.rng)
         
         match_id = len(self.matches) + 1
         
         # Créer les paires
-        while len(available_teams) >= 2:
-            team1 = available_teams.pop(0)
-            team2 = available_teams.pop(0)
-            
+        for team1, team2 in pairs:
             match = Match(
                 id=match_id,
                 round_number=self.current_round,
@@ -180,13 +402,25 @@ class Tournament:
                 is_bye=True
             )
             matches.append(bye_match)
+            self._record_result(bye_match)
             
         self.matches.extend(matches)
         return matches
         
+    @instrumented("tournament.generate_next_round_matches")
     def generate_next_round_matches(self) -> List[Match]:
         """Générer les matchs du tour suivant"""
-        if self.tournament_type == "quadrette":
+        self.last_pairing_report = None
+        return self._round_generated(self._generate_next_round())
+        
+    def _generate_next_round(self) -> List[Match]:
+        if self.format == FORMAT_CONCOURS:
+            return self._generate_concours_matches()
+        elif self.format == FORMAT_POOLS:
+            return self._generate_pool_matches()
+        elif self.format == FORMAT_CHAMPIONSHIP:
+            return self._generate_championship_matches()
+        elif self.tournament_type == "quadrette":
             return self._generate_quadrette_matches()
         elif self.tournament_type == "mêlée":
             return self._generate_melee_matches()
@@ -195,6 +429,9 @@ class Tournament:
             
     def _generate_standard_matches(self) -> List[Match]:
         """Générer les matchs pour les tournois standards (tête-à-tête, doublette, triplette)"""
+        if self.pairing_search is not None:
+            return self._generate_searched_matches(swiss=True)
+            
         # Obtenir les statistiques actuelles
         stats = self.get_all_stats()
         
@@ -210,27 +447,126 @@ class Tournament:
         match_id = len(self.matches) + 1
         self.current_round += 1
         
-        # Apparier les équipes par groupe de victoires
-        for win_count in sorted(groups.keys(), reverse=True):
-            teams_in_group = groups[win_count].copy()
-            random.shuffle(teams_in_group)  # Mélanger pour éviter les répétitions
-            
-            while len(teams_in_group) >= 2:
-                team1 = teams_in_group.pop(0)
-                team2 = teams_in_group.pop(0)
-                
-                match = Match(
-                    id=match_id,
-                    round_number=self.current_round,
-                    team1=team1,
-                    team2=team2
-                )
-                matches.append(match)
-                match_id += 1
+        # Apparier les équipes par groupe de victoires (mélangées pour éviter les répétitions)
+        played = {frozenset((m.team1.id, m.team2.id)) for m in self.matches if not m.is_bye}
+        met = lambda team1, team2: frozenset((team1.id, team2.id)) in played
+        for team1, team2 in pair_by_win_groups(groups, self.rng, self._rating_key(), met):
+            match = Match(
+                id=match_id,
+                round_number=self.current_round,
+                team1=team1,
+                team2=team2
+            )
+            matches.append(match)
+            match_id += 1
                 
         self.matches.extend(matches)
         return matches
         
+    def _seeded_order(self, teams: List[Team]) -> List[Team]:
+        """Ordre des têtes de série : par cote si connue, sinon tiré au sort"""
+        rating = self._rating_key()
+        if rating is None:
+            order = teams.copy()
+            self.rng.shuffle(order)
+            return order
+        return sorted(teams, key=rating, reverse=True)
+        
+    def _start_concours(self, seeded_teams: List[Team], levels: int,
+                        draw: bool = True) -> List[Match]:
+        """Tirer le tableau A du concours et créer les matchs du premier tour"""
+        from bracket import Concours
+        
+        self.concours = Concours(seeded_teams, levels)
+        order = self._seeded_order(seeded_teams) if draw else seeded_teams
+        self.concours.place_teams([team.id for team in order])
+        
+        self.current_round += 1
+        matches = self.concours.create_matches(self.current_round, len(self.matches) + 1)
+        self.matches.extend(matches)
+        return matches
+        
+    def _start_pools(self) -> List[Match]:
+        """Répartir les équipes en poules (serpentin) et créer leurs premiers matchs"""
+        from pools import PoolStage
+        
+        self.pool_stage = PoolStage(self._seeded_order(self.teams), self.pool_format)
+        self.current_round = 0
+        return self._generate_pool_matches()
+        
+    def _generate_pool_matches(self) -> List[Match]:
+        """Matchs des poules prêtes, puis tableau final une fois toutes les poules finies"""
+        if self.pool_stage is None:
+            return []
+        if self.pool_stage.is_finished():
+            if self.concours is None:
+                return self._start_concours(self.pool_stage.qualified_seeds(), 1, draw=False)
+            return self._generate_concours_matches()
+            
+        matches = self.pool_stage.create_matches(self.current_round + 1, len(self.matches) + 1)
+        if matches:
+            self.current_round += 1
+            self.matches.extend(matches)
+        return matches
+        
+    def _start_championship(self) -> List[Match]:
+        """Préparer le calendrier du championnat et créer la première ronde"""
+        from championship import round_robin_schedule
+        
+        self.schedule = round_robin_schedule(len(self.teams))
+        self.current_round = 0
+        return self._generate_championship_matches()
+        
+    def _generate_championship_matches(self) -> List[Match]:
+        """Créer la ronde suivante du championnat (les équipes exemptes ne jouent pas)"""
+        from championship import assign_terrains
+        
+        if self.schedule is None:
+            return []
+        pairs = next(self.schedule, None)
+        if pairs is None:
+            self.schedule = None
+            return []
+            
+        pairs = [(home, away) for home, away in pairs if home is not None and away is not None]
+        terrains = assign_terrains(len(pairs), self.current_round, self.terrain_count)
+        self.current_round += 1
+        match_id = len(self.matches) + 1
+        matches = []
+        for (home, away), terrain in zip(pairs, terrains):
+            matches.append(Match(
+                id=match_id,
+                round_number=self.current_round,
+                team1=self.teams[home],
+                team2=self.teams[away],
+                terrain=terrain
+            ))
+            match_id += 1
+        self.matches.extend(matches)
+        return matches
+        
+    def can_generate_next_round(self) -> bool:
+        """Vérifier si de nouveaux matchs peuvent être générés"""
+        if self.current_round == 0:
+            return False
+        if self.pool_stage is not None and not self.pool_stage.is_finished():
+            # Chaque poule avance à son rythme
+            return any(pool.round_complete() and not pool.is_finished()
+                       for pool in self.pool_stage.pools)
+        if self.format == FORMAT_CHAMPIONSHIP and self.schedule is None:
+            return False
+        return self.is_round_complete(self.current_round)
+        
+    def _generate_concours_matches(self) -> List[Match]:
+        """Créer les matchs devenus jouables dans les tableaux du concours"""
+        if self.concours is None:
+            return []
+        matches = self.concours.create_matches(self.current_round + 1, len(self.matches) + 1)
+        if matches:
+            self.current_round += 1
+            self.matches.extend(matches)
+        return matches
+        
     def _generate_quadrette_matches(self) -> List[Match]:
         """Générer les matchs pour le tournoi quadrette (7 tours fixes)"""
         if self.current_round >= 7:
@@ -269,12 +605,14 @@ class Tournament:
         temp_team1 = Team(
             id=1000 + self.current_round * 10 + 1,
             number=1,
-            players=group1_players
+            players=group1_players,
+            members=[self.teams[i].id for i in pattern[0]]
         )
         temp_team2 = Team(
             id=1000 + self.current_round * 10 + 2,
             number=2,
-            players=group2_players
+            players=group2_players,
+            members=[self.teams[i].id for i in pattern[1]]
         )
         
         match = Match(
@@ -291,18 +629,16 @@ class Tournament:
         """Générer les matchs pour la mêlée (tirage aléatoire complet)"""
         if len(self.teams) < 2:
             return []
+        if self.pairing_search is not None:
+            return self._generate_searched_matches(swiss=False)
             
         self.current_round += 1
         matches = []
-        available_teams = self.teams.copy()
-        random.shuffle(available_teams)
+        pairs, available_teams = pair_randomly(self.teams, self.rng)
         
         match_id = len(self.matches) + 1
         
-        while len(available_teams) >= 2:
-            team1 = available_teams.pop(0)
-            team2 = available_teams.pop(0)
-            
+        for team1, team2 in pairs:
             match = Match(
                 id=match_id,
                 round_number=self.current_round,
@@ -326,25 +662,244 @@ class Tournament:
                 is_bye=True
             )
             matches.append(bye_match)
+            self._record_result(bye_match)
             
         self.matches.extend(matches)
         return matches
         
+    @instrumented("tournament.search_pairings")
+    def _generate_searched_matches(self, swiss: bool) -> List[Match]:
+        """Tour suivant : meilleur de nombreux tirages candidats (voir pairing_search)"""
+        from pairing_search import problem_from_tournament
+        
+        candidate, self.last_pairing_report = self.pairing_search.search(
+            problem_from_tournament(self, swiss), seed=self.rng.getrandbits(32)
+        )
+        teams = {team.id: team for team in self.teams}
+        self.current_round += 1
+        match_id = len(self.matches) + 1
+        matches = []
+        for (team1, team2), terrain in zip(candidate.pairs, candidate.terrains):
+            matches.append(Match(
+                id=match_id,
+                round_number=self.current_round,
+                team1=teams[team1],
+                team2=teams[team2],
+                terrain=terrain
+            ))
+            match_id += 1
+        if candidate.bye is not None:
+            bye_match = Match(
+                id=match_id,
+                round_number=self.current_round,
+                team1=teams[candidate.bye],
+                team2=Team(0, 0, [Player(0, "BYE")]),
+                score1=13,
+                score2=7,
+                completed=True,
+                is_bye=True
+            )
+            matches.append(bye_match)
+            self._record_result(bye_match)
+        self.matches.extend(matches)
+        return matches
+        
+    @instrumented("tournament.update_match_score")
     def update_match_score(self, match_id: int, score1: int, score2: int, terrain: Optional[int] = None):
-        """Mettre à jour le score d'un match"""
+        """Mettre à jour le score d'un match
+
+        Lève ValueError si la correction change le vainqueur d'un match de tableau
+        dont le match suivant est déjà tiré.
+        """
         for match in self.matches:
             if match.id == match_id:
+                corrected = match.completed
+                if corrected and self.concours is not None:
+                    self.concours.check_correction(match, score1, score2)
                 match.score1 = score1
                 match.score2 = score2
                 match.completed = True
                 if terrain is not None:
                     match.terrain = terrain
+                self._record_result(match)
+                if self.concours is not None:
+                    self.concours.apply_result(match)
+                if self.pool_stage is not None:
+                    self.pool_stage.apply_result(match)
+                self.events.emit(MatchValidated(match, corrected))
                 break
                 
+    def set_match_score(self, match_id: int, score1: Optional[int], score2: Optional[int]):
+        """Saisir le score d'un match sans le valider"""
+        for match in self.matches:
+            if match.id == match_id:
+                match.score1 = score1
+                match.score2 = score2
+                self.events.emit(ScoreUpdated(match))
+                break
+                
+    def set_match_terrain(self, match_id: int, terrain: int):
+        """Changer le terrain d'un match"""
+        for match in self.matches:
+            if match.id == match_id:
+                match.terrain = terrain
+                self.events.emit(ScoreUpdated(match))
+                break
+                
+    def reopen_match(self, match_id: int):
+        """Annuler la validation d'un match (refusée par un autre poste)"""
+        for match in self.matches:
+            if match.id == match_id and match.completed:
+                match.completed = False
+                self.history.forget(match.id)
+                self.player_results.forget(match.id)
+                self.events.emit(ScoreUpdated(match))
+                break
+                
+    def restore_team(self, team_id: int, number: int, player_names: List[str],
+                     club: Optional[str] = None, league: Optional[str] = None,
+                     seeded: bool = False) -> Team:
+        """Créer ou mettre à jour une équipe reçue d'un autre poste"""
+        players = [Player(i, name) for i, name in enumerate(player_names, 1)]
+        for team in self.teams:
+            if team.id == team_id:
+                team.number = number
+                team.players = players
+                team.club, team.league, team.seeded = club, league, seeded
+                return team
+        team = Team(id=team_id, number=number, players=players, club=club, league=league,
+                    seeded=seeded)
+        self.teams.append(team)
+        self.history.invalidate()
+        self.events.emit(TeamAdded(team))
+        return team
+        
+    def restore_round(self, round_number: int, matches: List[Match]) -> List[Match]:
+        """Ajouter les matchs d'un tour généré sur un autre poste"""
+        self.matches.extend(matches)
+        self.current_round = max(self.current_round, round_number)
+        for match in matches:
+            if match.completed:
+                self._record_result(match)
+        return self._round_generated(matches)
+        
+    def restore_rows(self, teams: List[tuple], matches: List[tuple], current_round: int = 0):
+        """Reconstruire les équipes et les matchs d'un tournoi enregistré
+        
+        `teams` : (id, numéro, [noms des joueurs], puis éventuellement club, ligue,
+        tête de série et, pour une équipe composée pour un match (quadrette), les
+        équipes inscrites qui la forment) ; `matches` : (id, puis les
+        colonnes de autosave.match_row). Les tableaux de concours et les poules,
+        non enregistrés, ne sont pas reconstruits.
+        """
+        composites = []
+        for team_id, number, names, *tags in teams:
+            if len(tags) > 3 and tags[3]:
+                composites.append((team_id, number, tags[3]))
+            else:
+                self.restore_team(team_id, number, names, *tags[:3])
+        by_id = {team.id: team for team in self.teams}
+        for team_id, number, members in composites:
+            by_id[team_id] = Team(id=team_id, number=number, members=list(members), players=[
+                player for member in members if member in by_id
+                for player in by_id[member].players
+            ])
+        rounds: Dict[int, List[Match]] = {}
+        for match_id, round_number, team1, team2, score1, score2, terrain, completed, is_bye, \
+                bracket, node, pool in matches:
+            rounds.setdefault(round_number, []).append(Match(
+                id=match_id, round_number=round_number, team1=by_id[team1],
+                team2=Team(0, 0, [Player(0, "BYE")]) if is_bye else by_id[team2],
+                score1=score1, score2=score2, terrain=terrain, completed=completed,
+                is_bye=is_bye, bracket=bracket, bracket_node=node, pool=pool,
+            ))
+        for round_number in sorted(rounds):
+            self.restore_round(round_number, rounds[round_number])
+        self.current_round = max(self.current_round, current_round)
+        
+        if self.format == FORMAT_CHAMPIONSHIP and self.current_round:
+            # Calendrier repris à la ronde suivante
+            from championship import round_robin_schedule
+            
+            self.schedule = round_robin_schedule(len(self.teams))
+            for _ in range(self.current_round):
+                if next(self.schedule, None) is None:
+                    self.schedule = None
+                    break
+                    
+    def _record_result(self, match: Match):
+        """Reporter un résultat dans l'historique des classements et les totaux des joueurs"""
+        team1, team2 = match.team1, None if match.is_bye else match.team2
+        self.history.record(match.id, match.round_number, self._credited(team1),
+                            None if team2 is None else self._credited(team2),
+                            match.score1 or 0, match.score2 or 0)
+        self.player_results.record(match.id, self._side_players(team1),
+                                   [] if team2 is None else self._side_players(team2),
+                                   match.score1 or 0, match.score2 or 0)
+        
+    @staticmethod
+    def _credited(team: Team):
+        """Identifiant crédité au classement : l'équipe, ou les équipes qui la composent"""
+        return tuple(team.members) if team.members else team.id
+        
+    def _side_players(self, team: Team) -> List[tuple]:
+        """Joueurs d'une équipe du match : ((équipe inscrite, position), nom)"""
+        if not team.members:
+            return [((team.id, player.id), player.name) for player in team.players]
+        registered = {t.id: t for t in self.teams}
+        return [((member, player.id), player.name) for member in team.members
+                if member in registered for player in registered[member].players]
+        
+    @instrumented("tournament.get_player_standings")
+    def get_player_standings(self) -> List[PlayerStanding]:
+        """Classement individuel des joueurs inscrits"""
+        return self.player_results.standings(
+            ((team.id, player.id), player.name) for team in self.teams for player in team.players
+        )
+        
+    @instrumented("tournament.standings_after")
+    def standings_after(self, round_number: int) -> List[TeamStats]:
+        """Classement cumulé après un tour donné"""
+        teams = {team.id: team for team in self.teams}
+        standings = []
+        for team_id, (wins, losses, points_for, points_against) in \
+                self.history.standings_after(round_number, list(teams)):
+            standings.append(TeamStats(teams[team_id], wins, losses, points_for, points_against))
+        return standings
+        
+    def snapshot_rows(self, round_number: int) -> List[tuple]:
+        """Classement après un tour, pour DatabaseManager.save_standings_snapshot"""
+        return [(s.team.id, s.team.number, rank, s.wins, s.losses, s.points_for,
+                 s.points_against)
+                for rank, s in enumerate(self.standings_after(round_number), 1)]
+        
+    def snapshot_rounds(self, events) -> List[int]:
+        """Tours dont le classement enregistré est à (ré)écrire après ces événements
+        
+        Un tour terminé par une validation est enregistré ; une correction change
+        aussi les classements des tours suivants : tous les tours terminés à partir
+        du tour corrigé sont réécrits.
+        """
+        validated = [e.match for e in events if isinstance(e, MatchValidated)]
+        rounds = {m.round_number for m in validated}
+        corrected = [e.match.round_number for e in events
+                     if isinstance(e, MatchValidated) and e.corrected]
+        if corrected:
+            rounds.update(range(min(corrected), self.current_round + 1))
+        return sorted(r for r in rounds if self.is_round_complete(r))
+        
+    def rank_progression(self) -> Dict[int, List[int]]:
+        """Place de chaque équipe (par id) après chaque tour joué"""
+        return self.history.rank_table([team.id for team in self.teams], self.current_round)
+        
     def get_matches_by_round(self, round_number: int) -> List[Match]:
         """Obtenir les matchs d'un tour spécifique"""
         return [m for m in self.matches if m.round_number == round_number]
         
+    def is_finished(self) -> bool:
+        """Vrai si des matchs ont été joués et qu'ils sont tous validés"""
+        return len(self.matches) > 0 and all(m.completed for m in self.matches)
+        
     def is_round_complete(self, round_number: int) -> bool:
         """Vérifier si un tour est terminé"""
         round_matches = self.get_matches_by_round(round_number)
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Panneau de débogage : latences et nombre d'appels des opérations instrumentées
+"""
+
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableWidget,
+                             QTableWidgetItem, QHeaderView, QPushButton, QLabel,
+                             QCheckBox, QFileDialog, QMessageBox, QDoubleSpinBox)
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QFont
+
+from profiling import profiler
+
+class DebugWidget(QWidget):
+    """Widget affichant les mesures du profileur"""
+
+    def __init__(self, db_manager=None):
+        super().__init__()
+        # Base dont les statistiques du cache des lectures sont affichées
+        self.db_manager = db_manager
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(1000)
+        self.refresh_timer.timeout.connect(self.refresh_table)
+        self.setup_ui()
+
+    def setup_ui(self):
+        """Configuration de l'interface utilisateur"""
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+
+        # Titre
+        title = QLabel("Instrumentation")
+        title.setFont(QFont("Arial", 16, QFont.Bold))
+        title.setAlignment(Qt.AlignCenter)
+        layout.addWidget(title)
+
+        # Contrôles
+        controls_layout = QHBoxLayout()
+
+        self.enabled_check = QCheckBox("Activer les mesures")
+        self.enabled_check.setChecked(profiler.enabled)
+        self.enabled_check.toggled.connect(self.on_enabled_toggled)
+        controls_layout.addWidget(self.enabled_check)
+
+        self.slow_log_check = QCheckBox("Journal des requêtes lentes (ms) :")
+        self.slow_log_check.toggled.connect(self.on_slow_log_toggled)
+        controls_layout.addWidget(self.slow_log_check)
+
+        self.slow_threshold_spin = QDoubleSpinBox()
+        self.slow_threshold_spin.setRange(0.1, 10000)
+        self.slow_threshold_spin.setValue(50)
+        controls_layout.addWidget(self.slow_threshold_spin)
+
+        controls_layout.addStretch()
+
+        self.reset_btn = QPushButton("Réinitialiser")
+        self.reset_btn.clicked.connect(self.reset)
+        controls_layout.addWidget(self.reset_btn)
+
+        self.trace_btn = QPushButton("Exporter une trace...")
+        self.trace_btn.clicked.connect(self.export_trace)
+        controls_layout.addWidget(self.trace_btn)
+
+        layout.addLayout(controls_layout)
+
+        # Tableau des mesures
+        self.stats_table = QTableWidget()
+        self.stats_table.setColumnCount(6)
+        self.stats_table.setHorizontalHeaderLabels([
+            "Opération", "Appels", "Moyenne (ms)", "P95 (ms)", "Max (ms)", "Total (ms)"
+        ])
+        header = self.stats_table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.Stretch)
+        for column in range(1, 6):
+            header.setSectionResizeMode(column, QHeaderView.ResizeToContents)
+        self.stats_table.setAlternatingRowColors(True)
+        layout.addWidget(self.stats_table)
+
+        # Cache des lectures de la base
+        self.cache_label = QLabel("")
+        layout.addWidget(self.cache_label)
+
+    def showEvent(self, event):
+        """Rafraîchir périodiquement uniquement quand le panneau est visible"""
+        super().showEvent(event)
+        self.refresh_table()
+        self.refresh_timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.refresh_timer.stop()
+
+    def on_enabled_toggled(self, checked: bool):
+        """Activer ou désactiver le profileur"""
+        if checked:
+            profiler.enable()
+        else:
+            profiler.disable()
+
+    def on_slow_log_toggled(self, checked: bool):
+        """Activer ou désactiver le journal des requêtes lentes"""
+        if not checked:
+            profiler.disable_slow_query_log()
+            return
+        file_name, _ = QFileDialog.getSaveFileName(
+            self, "Journal des requêtes lentes", "slow_queries.db", "SQLite (*.db)"
+        )
+        if not file_name:
+            self.slow_log_check.setChecked(False)
+            return
+        profiler.enable_slow_query_log(file_name, self.slow_threshold_spin.value())
+
+    def reset(self):
+        """Effacer les mesures"""
+        profiler.reset()
+        if self.db_manager:
+            self.db_manager.query_cache.reset_stats()
+        self.refresh_table()
+
+    def export_trace(self):
+        """Exporter la trace au format Chrome Trace Event"""
+        file_name, _ = QFileDialog.getSaveFileName(
+            self, "Exporter la trace", "petanque_trace.json", "Trace JSON (*.json)"
+        )
+        if not file_name:
+            return
+        try:
+            count = profiler.dump_trace(file_name)
+        except OSError as e:
+            QMessageBox.critical(self, "Erreur", f"Erreur lors de l'export : {e}")
+            return
+        QMessageBox.information(
+            self, "Export réussi",
+            f"{count} événement(s) exporté(s) dans {file_name}\n"
+            "Ouvrable avec chrome://tracing, Perfetto ou speedscope"
+        )
+
+    def refresh_table(self):
+        """Rafraîchir le tableau des mesures"""
+        rows = profiler.snapshot()
+        self.stats_table.setRowCount(len(rows))
+        for row, stats in enumerate(rows):
+            values = [
+                stats["name"],
+                str(stats["calls"]),
+                f"{stats['mean_ms']:.2f}",
+                f"{stats['p95_ms']:.2f}",
+                f"{stats['max_ms']:.2f}",
+                f"{stats['total_ms']:.1f}",
+            ]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if column > 0:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.stats_table.setItem(row, column, item)
+        if self.db_manager:
+            cache = self.db_manager.cache_stats()
+            self.cache_label.setText(
+                f"Cache des lectures : {cache['hits']} succès, {cache['misses']} échecs "
+                f"({cache['hit_rate']:.0%}), {cache['entries']} entrées, "
+                f"{cache['invalidations']} invalidations"
+            )
@@ -6,20 +6,40 @@ Widget pour la gestion des matchs
 
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, 
                              QTableWidgetItem, QHeaderView, QPushButton, QLabel, 
-                             QFrame, QSpinBox, QMessageBox, QGroupBox, QComboBox)
-from PyQt5.QtCore import Qt, pyqtSignal
+                             QFrame, QSpinBox, QMessageBox, QGroupBox, QComboBox,
+                             QFileDialog, QLineEdit)
+from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QFont
 
 from tournament import Tournament, Match
+from profiling import instrumented
+from printing import PrintQueue, build_round_sheets
+from score_entry import ScoreEntryError, ScoreEntryIndex, read_entry
+from events import (EventBatcher, RoundGenerated, ScoreUpdated, MatchValidated, TeamAdded,
+                    TeamRemoved)
+
+def schedule_once(callback):
+    """Exécuter un rappel au prochain passage de la boucle d'événements Qt"""
+    QTimer.singleShot(0, callback)
 
 class MatchWidget(QWidget):
     """Widget pour gérer les matchs"""
     
-    match_completed = pyqtSignal()
-    
     def __init__(self):
         super().__init__()
         self.tournament = None
+        self.event_batcher = None
+        # Ligne du tableau de chaque match affiché
+        self.match_rows = {}
+        # Index de la saisie rapide pour le tour affiché, reconstruit à la demande
+        self.entry_index = None
+        # Poste de saisie relié à un tournoi partagé (verrous d'arbitre)
+        self.replica = None
+        self.print_queue = PrintQueue()
+        self.print_jobs = []
+        self.print_timer = QTimer(self)
+        self.print_timer.setInterval(200)
+        self.print_timer.timeout.connect(self.check_print_jobs)
         self.setup_ui()
         
     def setup_ui(self):
@@ -42,6 +62,9 @@ class MatchWidget(QWidget):
         # Zone de contrôle des tours
         self.setup_round_control(layout)
         
+        # Saisie rapide au clavier
+        self.setup_quick_entry(layout)
+        
         # Tableau des matchs
         self.setup_matches_table(layout)
         
@@ -69,8 +92,24 @@ class MatchWidget(QWidget):
         self.generate_next_round_btn.setEnabled(False)
         group_layout.addWidget(self.generate_next_round_btn)
         
+        self.print_round_btn = QPushButton("Imprimer le tour...")
+        self.print_round_btn.clicked.connect(self.print_round)
+        group_layout.addWidget(self.print_round_btn)
+        
         parent_layout.addWidget(group_box)
         
+    def setup_quick_entry(self, parent_layout):
+        """Configuration de la saisie rapide des scores"""
+        entry_layout = QHBoxLayout()
+        entry_layout.addWidget(QLabel("Saisie rapide:"))
+        self.quick_entry = QLineEdit()
+        self.quick_entry.setPlaceholderText("terrain score score (ex. 12 13 7) ou m<n° de match> 13 7")
+        self.quick_entry.returnPressed.connect(self.on_quick_entry)
+        entry_layout.addWidget(self.quick_entry)
+        self.quick_entry_feedback = QLabel("")
+        entry_layout.addWidget(self.quick_entry_feedback, 1)
+        parent_layout.addLayout(entry_layout)
+        
     def setup_matches_table(self, parent_layout):
         """Configuration du tableau des matchs"""
         # Label
@@ -103,13 +142,14 @@ class MatchWidget(QWidget):
         
     def set_tournament(self, tournament: Tournament):
         """Définir le tournoi actuel"""
+        if self.event_batcher:
+            self.event_batcher.close()
         self.tournament = tournament
+        self.event_batcher = EventBatcher(tournament.events, self.on_tournament_events,
+                                          schedule_once)
         self.refresh_ui()
         
-    def refresh_teams(self):
-        """Rafraîchir après changement d'équipes"""
-        self.refresh_ui()
-        
+    @instrumented("ui.refresh_ui")
     def refresh_ui(self):
         """Rafraîchir l'interface utilisateur"""
         if not self.tournament:
@@ -119,14 +159,7 @@ class MatchWidget(QWidget):
             self.generate_next_round_btn.setEnabled(False)
             return
             
-        # Vérifier si on peut générer le premier tour
-        can_generate_first = len(self.tournament.teams) >= 2 and self.tournament.current_round == 0
-        self.generate_first_round_btn.setEnabled(can_generate_first)
-        
-        # Vérifier si on peut générer le tour suivant
-        can_generate_next = (self.tournament.current_round > 0 and 
-                           self.tournament.is_round_complete(self.tournament.current_round))
-        self.generate_next_round_btn.setEnabled(can_generate_next)
+        self.update_round_buttons()
         
         # Mettre à jour le sélecteur de tour
         self.update_round_combo()
@@ -134,19 +167,29 @@ class MatchWidget(QWidget):
         # Rafraîchir le tableau des matchs
         self.refresh_matches_table()
         
+    def update_round_buttons(self):
+        """Activer les boutons de génération selon l'état du tournoi"""
+        # Vérifier si on peut générer le premier tour
+        can_generate_first = len(self.tournament.teams) >= 2 and self.tournament.current_round == 0
+        self.generate_first_round_btn.setEnabled(can_generate_first)
+        
+        # Vérifier si on peut générer le tour suivant
+        can_generate_next = self.tournament.can_generate_next_round()
+        self.generate_next_round_btn.setEnabled(can_generate_next)
+        
     def update_round_combo(self):
         """Mettre à jour le sélecteur de tour"""
+        # Le tableau est reconstruit une seule fois par l'appelant
+        self.round_combo.blockSignals(True)
         self.round_combo.clear()
         
-        if not self.tournament or self.tournament.current_round == 0:
-            return
-            
-        for round_num in range(1, self.tournament.current_round + 1):
-            self.round_combo.addItem(f"Tour {round_num}")
-            
-        # Sélectionner le dernier tour
-        if self.round_combo.count() > 0:
+        if self.tournament and self.tournament.current_round > 0:
+            for round_num in range(1, self.tournament.current_round + 1):
+                self.round_combo.addItem(f"Tour {round_num}")
+                
+            # Sélectionner le dernier tour
             self.round_combo.setCurrentIndex(self.round_combo.count() - 1)
+        self.round_combo.blockSignals(False)
             
     def on_round_changed(self):
         """Appelé quand le tour sélectionné change"""
@@ -161,8 +204,12 @@ class MatchWidget(QWidget):
         matches = self.tournament.generate_first_round_matches()
         
         if matches:
-            QMessageBox.information(self, "Succès", f"{len(matches)} match(s) généré(s) pour le tour 1")
-            self.refresh_ui()
+            message = f"{len(matches)} match(s) généré(s) pour le tour 1"
+            report = self.tournament.last_pairing_report
+            if report is not None:
+                # Clubs et têtes de série séparés
+                message += "\n\n" + "\n".join(report.lines())
+            QMessageBox.information(self, "Succès", message)
         else:
             QMessageBox.warning(self, "Erreur", "Impossible de générer les matchs")
             
@@ -171,32 +218,77 @@ class MatchWidget(QWidget):
         if not self.tournament:
             return
             
-        if not self.tournament.is_round_complete(self.tournament.current_round):
+        if not self.tournament.can_generate_next_round():
             QMessageBox.warning(self, "Erreur", "Le tour actuel n'est pas terminé")
             return
             
         matches = self.tournament.generate_next_round_matches()
         
         if matches:
-            QMessageBox.information(self, "Succès", f"{len(matches)} match(s) généré(s) pour le tour {self.tournament.current_round}")
-            self.refresh_ui()
+            message = f"{len(matches)} match(s) généré(s) pour le tour {self.tournament.current_round}"
+            report = self.tournament.last_pairing_report
+            if report is not None:
+                # Pourquoi ce tirage a été retenu
+                message += "\n\n" + "\n".join(report.lines())
+            QMessageBox.information(self, "Succès", message)
         else:
             QMessageBox.information(self, "Information", "Aucun nouveau match à générer (tournoi terminé ?)")
             
+    def selected_round(self) -> int:
+        """Tour sélectionné dans le sélecteur (1 par défaut)"""
+        try:
+            return int(self.round_combo.currentText().split()[-1])
+        except (ValueError, IndexError):
+            return 1
+            
+    def print_round(self):
+        """Imprimer feuilles de match, appariements et classement du tour sélectionné"""
+        if not self.tournament or self.tournament.current_round == 0:
+            QMessageBox.warning(self, "Erreur", "Aucun tour à imprimer")
+            return
+            
+        round_number = self.selected_round()
+        file_name, _ = QFileDialog.getSaveFileName(
+            self, "Imprimer le tour", f"tour_{round_number}.pdf", "PDF Files (*.pdf)"
+        )
+        if not file_name:
+            return
+            
+        # Préparation des textes ici, rendu dans un processus de travail
+        sheets = build_round_sheets(self.tournament, round_number)
+        self.print_jobs.append((self.print_queue.submit(sheets, file_name), file_name))
+        self.print_timer.start()
+        
+    def check_print_jobs(self):
+        """Signaler les impressions terminées"""
+        pending = []
+        for future, file_name in self.print_jobs:
+            if not future.done():
+                pending.append((future, file_name))
+                continue
+            try:
+                pages = future.result()
+            except Exception as e:
+                QMessageBox.critical(self, "Erreur", f"Erreur lors de l'impression : {e}")
+                continue
+            QMessageBox.information(self, "Impression prête",
+                                    f"{pages} page(s) générée(s) dans {file_name}")
+        self.print_jobs = pending
+        if not pending:
+            self.print_timer.stop()
+            
+    @instrumented("ui.refresh_matches_table")
     def refresh_matches_table(self):
         """Rafraîchir le tableau des matchs"""
+        self.match_rows = {}
+        self.entry_index = None
         if not self.tournament:
             self.matches_table.setRowCount(0)
             self.matches_label.setText("Aucun tournoi sélectionné")
             return
             
         # Déterminer quel tour afficher
-        current_round = 1
-        if self.round_combo.currentText():
-            try:
-                current_round = int(self.round_combo.currentText().split()[-1])
-            except:
-                current_round = 1
+        current_round = self.selected_round()
                 
         # Obtenir les matchs du tour sélectionné
         matches = self.tournament.get_matches_by_round(current_round)
@@ -210,92 +302,169 @@ class MatchWidget(QWidget):
         self.matches_table.setRowCount(len(matches))
         
         for row, match in enumerate(matches):
-            # Tour
-            round_item = QTableWidgetItem(str(match.round_number))
-            round_item.setTextAlignment(Qt.AlignCenter)
-            self.matches_table.setItem(row, 0, round_item)
+            self.match_rows[match.id] = row
+            self.fill_match_row(row, match)
             
-            # Équipe 1
-            team1_text = f"{match.team1.get_display_name()}\n{match.team1.get_players_names()}"
-            team1_item = QTableWidgetItem(team1_text)
-            self.matches_table.setItem(row, 1, team1_item)
-            
-            # Score 1
-            if match.completed:
-                score1_item = QTableWidgetItem(str(match.score1 or 0))
-                score1_item.setTextAlignment(Qt.AlignCenter)
-                self.matches_table.setItem(row, 2, score1_item)
-            else:
-                score1_spin = QSpinBox()
-                score1_spin.setRange(0, 13)
-                score1_spin.setValue(match.score1 or 0)
-                score1_spin.valueChanged.connect(
-                    lambda value, m=match, pos=1: self.on_score_changed(m, pos, value)
-                )
-                self.matches_table.setCellWidget(row, 2, score1_spin)
-                
-            # Score 2
+        # Ajuster la hauteur des lignes
+        self.matches_table.resizeRowsToContents()
+        
+    def fill_match_row(self, row: int, match: Match):
+        """Remplir la ligne d'un match"""
+        # Tour (ou tableau et tour du concours)
+        round_text = str(match.round_number)
+        if match.bracket and self.tournament.concours:
+            round_text = self.tournament.concours.round_label(match)
+        elif match.pool is not None:
+            round_text = f"Poule {match.pool + 1}"
+        # Numéro du match pour la saisie rapide (m<n°>)
+        round_text = f"{round_text}\nM{match.id}"
+        round_item = QTableWidgetItem(round_text)
+        round_item.setTextAlignment(Qt.AlignCenter)
+        self.matches_table.setItem(row, 0, round_item)
+        
+        # Équipe 1
+        team1_text = f"{match.team1.get_display_name()}\n{match.team1.get_players_names()}"
+        team1_item = QTableWidgetItem(team1_text)
+        self.matches_table.setItem(row, 1, team1_item)
+        
+        # Scores
+        for column, position, score in ((2, 1, match.score1), (3, 2, match.score2)):
             if match.completed:
-                score2_item = QTableWidgetItem(str(match.score2 or 0))
-                score2_item.setTextAlignment(Qt.AlignCenter)
-                self.matches_table.setItem(row, 3, score2_item)
+                self.matches_table.removeCellWidget(row, column)
+                score_item = QTableWidgetItem(str(score or 0))
+                score_item.setTextAlignment(Qt.AlignCenter)
+                self.matches_table.setItem(row, column, score_item)
             else:
-                score2_spin = QSpinBox()
-                score2_spin.setRange(0, 13)
-                score2_spin.setValue(match.score2 or 0)
-                score2_spin.valueChanged.connect(
-                    lambda value, m=match, pos=2: self.on_score_changed(m, pos, value)
+                score_spin = QSpinBox()
+                score_spin.setRange(0, 13)
+                score_spin.setValue(score or 0)
+                score_spin.valueChanged.connect(
+                    lambda value, m=match, pos=position: self.on_score_changed(m, pos, value)
                 )
-                self.matches_table.setCellWidget(row, 3, score2_spin)
+                self.matches_table.setCellWidget(row, column, score_spin)
                 
-            # Équipe 2
-            team2_text = f"{match.team2.get_display_name()}\n{match.team2.get_players_names()}"
-            team2_item = QTableWidgetItem(team2_text)
-            self.matches_table.setItem(row, 4, team2_item)
+        # Équipe 2
+        team2_text = f"{match.team2.get_display_name()}\n{match.team2.get_players_names()}"
+        team2_item = QTableWidgetItem(team2_text)
+        self.matches_table.setItem(row, 4, team2_item)
+        
+        # Terrain
+        if match.completed:
+            self.matches_table.removeCellWidget(row, 5)
+            terrain_item = QTableWidgetItem(str(match.terrain or ""))
+            terrain_item.setTextAlignment(Qt.AlignCenter)
+            self.matches_table.setItem(row, 5, terrain_item)
+        else:
+            terrain_spin = QSpinBox()
+            terrain_spin.setRange(1, self.tournament.terrain_count)
+            terrain_spin.setValue(match.terrain or 1)
+            terrain_spin.valueChanged.connect(
+                lambda value, m=match: self.on_terrain_changed(m, value)
+            )
+            self.matches_table.setCellWidget(row, 5, terrain_spin)
             
-            # Terrain
-            if match.completed:
-                terrain_item = QTableWidgetItem(str(match.terrain or ""))
-                terrain_item.setTextAlignment(Qt.AlignCenter)
-                self.matches_table.setItem(row, 5, terrain_item)
-            else:
-                terrain_spin = QSpinBox()
-                terrain_spin.setRange(1, self.tournament.terrain_count)
-                terrain_spin.setValue(match.terrain or 1)
-                terrain_spin.valueChanged.connect(
-                    lambda value, m=match: self.on_terrain_changed(m, value)
-                )
-                self.matches_table.setCellWidget(row, 5, terrain_spin)
-                
-            # Statut
-            if match.completed:
-                winner = match.get_winner()
-                status_text = f"Terminé\nGagnant: {winner.get_display_name() if winner else 'Égalité'}"
-                status_item = QTableWidgetItem(status_text)
-                status_item.setTextAlignment(Qt.AlignCenter)
-                self.matches_table.setItem(row, 6, status_item)
-            else:
-                validate_btn = QPushButton("Valider")
-                validate_btn.clicked.connect(lambda checked, m=match: self.validate_match(m))
-                validate_btn.setStyleSheet("background-color: #28a745; color: white;")
-                self.matches_table.setCellWidget(row, 6, validate_btn)
+        # Statut
+        if match.completed:
+            self.matches_table.removeCellWidget(row, 6)
+            winner = match.get_winner()
+            status_text = f"Terminé\nGagnant: {winner.get_display_name() if winner else 'Égalité'}"
+            status_item = QTableWidgetItem(status_text)
+            status_item.setTextAlignment(Qt.AlignCenter)
+            self.matches_table.setItem(row, 6, status_item)
+        else:
+            validate_btn = QPushButton("Valider")
+            validate_btn.clicked.connect(lambda checked, m=match: self.validate_match(m))
+            validate_btn.setStyleSheet("background-color: #28a745; color: white;")
+            self.matches_table.setCellWidget(row, 6, validate_btn)
+            
+    def update_match_row(self, match: Match):
+        """Mettre à jour la seule ligne d'un match affiché"""
+        row = self.match_rows.get(match.id)
+        if row is None:
+            return
+        if match.completed or not isinstance(self.matches_table.cellWidget(row, 2), QSpinBox):
+            # Match validé, ou validation annulée par un autre poste
+            self.fill_match_row(row, match)
+            self.matches_table.resizeRowToContents(row)
+            return
+        # Score saisi ailleurs : aligner les champs sans reconstruire la ligne
+        for column, score in ((2, match.score1), (3, match.score2)):
+            spin = self.matches_table.cellWidget(row, column)
+            if isinstance(spin, QSpinBox) and spin.value() != (score or 0):
+                spin.blockSignals(True)
+                spin.setValue(score or 0)
+                spin.blockSignals(False)
                 
-        # Ajuster la hauteur des lignes
-        self.matches_table.resizeRowsToContents()
+    def on_tournament_events(self, events):
+        """Traiter une rafale d'événements du tournoi"""
+        if any(isinstance(e, RoundGenerated) for e in events):
+            self.refresh_ui()
+            return
+        for event in events:
+            if isinstance(event, (MatchValidated, ScoreUpdated)):
+                self.update_match_row(event.match)
+            if isinstance(event, ScoreUpdated):
+                # Le terrain a pu changer
+                self.entry_index = None
+        if any(isinstance(e, (MatchValidated, TeamAdded, TeamRemoved)) for e in events):
+            self.update_round_buttons()
+            
+    def on_quick_entry(self):
+        """Valider la ligne de saisie rapide ; les erreurs s'affichent à côté du champ"""
+        text = self.quick_entry.text()
+        if not self.tournament or not text.strip():
+            return
+        if self.entry_index is None:
+            self.entry_index = ScoreEntryIndex(
+                self.tournament.get_matches_by_round(self.selected_round())
+            )
+        try:
+            match, score1, score2 = read_entry(text, self.entry_index)
+        except ScoreEntryError as e:
+            self.show_quick_entry_feedback(str(e), error=True)
+            self.quick_entry.selectAll()
+            return
+        if self.replica and self.replica.is_locked(match.id):
+            self.show_quick_entry_feedback(f"M{match.id} est verrouillé par l'arbitre", error=True)
+            self.quick_entry.selectAll()
+            return
+        corrected = match.completed
+        # Seule la ligne du match est redessinée, via l'événement MatchValidated
+        try:
+            self.tournament.update_match_score(match.id, score1, score2, match.terrain)
+        except ValueError as e:
+            self.show_quick_entry_feedback(f"M{match.id} : {e}", error=True)
+            self.quick_entry.selectAll()
+            return
+        self.quick_entry.clear()
+        action = "corrigé" if corrected else "validé"
+        self.show_quick_entry_feedback(
+            f"M{match.id} {action} : {match.team1.get_display_name()} {score1} - "
+            f"{score2} {match.team2.get_display_name()}"
+        )
+        
+    def show_quick_entry_feedback(self, message: str, error: bool = False):
+        """Afficher le résultat de la dernière saisie rapide"""
+        self.quick_entry_feedback.setText(message)
+        self.quick_entry_feedback.setStyleSheet("color: #dc3545;" if error else "color: #28a745;")
         
     def on_score_changed(self, match: Match, position: int, value: int):
         """Appelé quand un score change"""
         if position == 1:
-            match.score1 = value
+            self.tournament.set_match_score(match.id, value, match.score2)
         else:
-            match.score2 = value
+            self.tournament.set_match_score(match.id, match.score1, value)
             
     def on_terrain_changed(self, match: Match, value: int):
         """Appelé quand le terrain change"""
-        match.terrain = value
+        self.tournament.set_match_terrain(match.id, value)
         
     def validate_match(self, match: Match):
         """Valider un match"""
+        if self.replica and self.replica.is_locked(match.id):
+            QMessageBox.warning(self, "Erreur", "Ce match est verrouillé par l'arbitre")
+            return
+            
         if match.score1 is None or match.score2 is None:
             QMessageBox.warning(self, "Erreur", "Veuillez saisir les scores")
             return
@@ -314,12 +483,8 @@ class MatchWidget(QWidget):
             if reply != QMessageBox.Yes:
                 return
                 
-        # Valider le match
-        match.completed = True
-        
-        # Rafraîchir l'affichage
-        self.refresh_matches_table()
-        self.refresh_ui()
-        self.match_completed.emit()
+        # Valider le match (fait avancer le vainqueur dans un concours) ; la ligne
+        # et les boutons sont mis à jour par l'événement MatchValidated
+        self.tournament.update_match_score(match.id, match.score1, match.score2, match.terrain)
         
         QMessageBox.information(self, "Succès", "Match validé avec succès")
\ No newline at end of file
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Recherche de noms de joueurs hors du thread de l'interface
+"""
+
+from PyQt5.QtCore import QObject, QThread, Qt, pyqtSignal, pyqtSlot
+
+from store import DatabaseManager
+
+class PlayerSearchWorker(QObject):
+    """Exécute les requêtes de l'annuaire avec sa propre connexion SQLite"""
+
+    completions_ready = pyqtSignal(int, str, list)
+    duplicates_ready = pyqtSignal(int, str, list)
+
+    def __init__(self, db_path: str):
+        super().__init__()
+        self.db_path = db_path
+        self.db_manager = None
+
+    def database(self) -> DatabaseManager:
+        """Connexion ouverte à la demande, dans le thread du worker"""
+        if self.db_manager is None:
+            self.db_manager = DatabaseManager(self.db_path)
+        return self.db_manager
+
+    @pyqtSlot(int, str)
+    def complete(self, field: int, text: str):
+        """Chercher les noms à proposer pour le texte saisi"""
+        names = self.database().search_player_names(text)
+        self.completions_ready.emit(field, text, names)
+
+    @pyqtSlot(int, str)
+    def check_duplicates(self, field: int, text: str):
+        """Chercher les noms proches déjà connus"""
+        similar = [name for name, _ in self.database().find_similar_player_names(text)]
+        self.duplicates_ready.emit(field, text, similar)
+
+    @pyqtSlot()
+    def close(self):
+        """Fermer la connexion du worker"""
+        if self.db_manager is not None:
+            self.db_manager.close()
+            self.db_manager = None
+
+class PlayerSearch(QObject):
+    """Point d'entrée de l'annuaire pour les widgets (requêtes asynchrones)"""
+
+    completion_requested = pyqtSignal(int, str)
+    duplicates_requested = pyqtSignal(int, str)
+
+    def __init__(self, db_path: str, parent=None):
+        super().__init__(parent)
+        self.thread = QThread()
+        self.worker = PlayerSearchWorker(db_path)
+        self.worker.moveToThread(self.thread)
+
+        # Connexions inter-threads : les requêtes sont mises en file d'attente
+        self.completion_requested.connect(self.worker.complete)
+        self.duplicates_requested.connect(self.worker.check_duplicates)
+        self.thread.finished.connect(self.worker.close, Qt.DirectConnection)
+
+        self.completions_ready = self.worker.completions_ready
+        self.duplicates_ready = self.worker.duplicates_ready
+        self.thread.start()
+
+    def stop(self):
+        """Arrêter le thread de recherche"""
+        self.thread.quit()
+        self.thread.wait()
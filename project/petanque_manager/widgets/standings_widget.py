@@ -16,11 +16,19 @@ from PyQt5.QtWidgets import (
     QHBoxLayout,
     QMessageBox,
     QFileDialog,
+    QComboBox,
 )
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QFont, QColor
 
 from tournament import Tournament
+from profiling import instrumented
+from export import (export_rows, tournament_match_rows, tournament_standings_rows,
+                    MATCH_COLUMNS, STANDINGS_COLUMNS)
+
+# Filtres des boîtes de dialogue d'export
+EXPORT_FILTERS = "PDF Files (*.pdf);;CSV (*.csv);;JSON Lines (*.jsonl);;HTML (*.html)"
+DATA_FILTERS = "CSV (*.csv);;JSON Lines (*.jsonl);;HTML (*.html)"
 
 class StandingsWidget(QWidget):
     """Widget pour afficher le classement"""
@@ -58,15 +66,40 @@ class StandingsWidget(QWidget):
         buttons_layout = QHBoxLayout()
         
         self.refresh_btn = QPushButton("Actualiser")
-        self.refresh_btn.clicked.connect(self.refresh_standings)
+        self.refresh_btn.clicked.connect(lambda: self.refresh_standings())
         buttons_layout.addWidget(self.refresh_btn)
         
+        # Sélecteur de poule (phase de poules uniquement)
+        self.pool_combo = QComboBox()
+        self.pool_combo.currentIndexChanged.connect(lambda _: self.refresh_standings())
+        self.pool_combo.hide()
+        buttons_layout.addWidget(self.pool_combo)
+        
+        # Classement historique : après un tour donné
+        self.round_combo = QComboBox()
+        self.round_combo.currentIndexChanged.connect(lambda _: self.refresh_standings())
+        buttons_layout.addWidget(self.round_combo)
+        
+        self.progression_btn = QPushButton("Progression")
+        self.progression_btn.setCheckable(True)
+        self.progression_btn.toggled.connect(self.on_progression_toggled)
+        buttons_layout.addWidget(self.progression_btn)
+        
+        self.players_btn = QPushButton("Classement individuel")
+        self.players_btn.setCheckable(True)
+        self.players_btn.toggled.connect(self.on_players_toggled)
+        buttons_layout.addWidget(self.players_btn)
+        
         buttons_layout.addStretch()
         
         self.export_btn = QPushButton("Exporter")
         self.export_btn.clicked.connect(self.export_standings)
         buttons_layout.addWidget(self.export_btn)
         
+        self.export_matches_btn = QPushButton("Exporter les matchs")
+        self.export_matches_btn.clicked.connect(self.export_matches)
+        buttons_layout.addWidget(self.export_matches_btn)
+        
         parent_layout.addLayout(buttons_layout)
         
     def setup_standings_table(self, parent_layout):
@@ -101,11 +134,31 @@ class StandingsWidget(QWidget):
         
         parent_layout.addWidget(self.standings_table)
         
+        # Progression : place de chaque équipe après chaque tour
+        self.progression_table = QTableWidget()
+        self.progression_table.setAlternatingRowColors(True)
+        self.progression_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.progression_table.hide()
+        parent_layout.addWidget(self.progression_table)
+        
+        # Classement individuel, équipes composées (quadrette) comprises
+        self.players_table = QTableWidget()
+        self.players_table.setColumnCount(7)
+        self.players_table.setHorizontalHeaderLabels([
+            "Position", "Joueur", "Équipe", "Joués", "Victoires", "Défaites", "Points +/-"
+        ])
+        self.players_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        self.players_table.setAlternatingRowColors(True)
+        self.players_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.players_table.hide()
+        parent_layout.addWidget(self.players_table)
+        
     def set_tournament(self, tournament: Tournament):
         """Définir le tournoi actuel"""
         self.tournament = tournament
         self.refresh_standings()
         
+    @instrumented("ui.refresh_standings")
     def refresh_standings(self):
         """Rafraîchir le classement"""
         if not self.tournament:
@@ -118,15 +171,29 @@ class StandingsWidget(QWidget):
             self.standings_label.setText("Aucune équipe inscrite")
             return
             
-        # Obtenir les statistiques
-        stats_list = self.tournament.get_all_stats()
+        # Obtenir les statistiques (générales, d'une poule ou après un tour)
+        self.update_pool_combo()
+        self.update_round_combo()
+        pool = self.selected_pool()
+        after_round = self.selected_round()
+        if pool is not None:
+            stats_list = pool.standings()
+        elif after_round is not None:
+            stats_list = self.tournament.standings_after(after_round)
+        else:
+            stats_list = self.tournament.get_all_stats()
         
         if not stats_list:
             self.standings_table.setRowCount(0)
             self.standings_label.setText("Aucune statistique disponible")
             return
             
-        self.standings_label.setText(f"Classement - {len(stats_list)} équipe(s)")
+        if pool is not None:
+            self.standings_label.setText(f"Classement - {pool.label}")
+        elif after_round is not None:
+            self.standings_label.setText(f"Classement après le tour {after_round}")
+        else:
+            self.standings_label.setText(f"Classement - {len(stats_list)} équipe(s)")
         self.standings_table.setRowCount(len(stats_list))
         
         for row, stats in enumerate(stats_list):
@@ -185,6 +252,115 @@ class StandingsWidget(QWidget):
         # Ajuster la hauteur des lignes
         self.standings_table.resizeRowsToContents()
         
+        if self.progression_table.isVisible():
+            self.refresh_progression()
+        if self.players_table.isVisible():
+            self.refresh_players()
+        
+    def update_round_combo(self):
+        """Proposer le classement après chacun des tours joués"""
+        rounds = self.tournament.current_round if self.tournament else 0
+        if self.round_combo.count() == rounds + 1:
+            return
+        selected = self.round_combo.currentIndex()
+        self.round_combo.blockSignals(True)
+        self.round_combo.clear()
+        self.round_combo.addItem("Classement actuel", None)
+        for round_number in range(1, rounds + 1):
+            self.round_combo.addItem(f"Après le tour {round_number}", round_number)
+        self.round_combo.setCurrentIndex(selected if 0 <= selected <= rounds else 0)
+        self.round_combo.blockSignals(False)
+        
+    def selected_round(self):
+        """Tour choisi pour le classement historique, None pour le classement actuel"""
+        return self.round_combo.currentData()
+        
+    def on_progression_toggled(self, checked: bool):
+        """Afficher ou masquer le tableau de progression"""
+        self.progression_table.setVisible(checked)
+        if checked:
+            self.refresh_progression()
+            
+    @instrumented("ui.refresh_progression")
+    def refresh_progression(self):
+        """Rafraîchir la place de chaque équipe tour après tour"""
+        if not self.tournament or not self.tournament.teams:
+            self.progression_table.setRowCount(0)
+            return
+            
+        progression = self.tournament.rank_progression()
+        rounds = self.tournament.current_round
+        # Équipes dans l'ordre du classement actuel
+        order = [s.team for s in self.tournament.standings_after(rounds)]
+        self.progression_table.setColumnCount(rounds + 1)
+        self.progression_table.setHorizontalHeaderLabels(
+            ["Équipe"] + [f"T{r}" for r in range(1, rounds + 1)]
+        )
+        self.progression_table.setRowCount(len(order))
+        for row, team in enumerate(order):
+            self.progression_table.setItem(row, 0, QTableWidgetItem(team.get_display_name()))
+            previous = None
+            for column, rank in enumerate(progression.get(team.id, []), 1):
+                item = QTableWidgetItem(str(rank))
+                item.setTextAlignment(Qt.AlignCenter)
+                # Montée en vert, descente en rouge
+                if previous is not None and rank < previous:
+                    item.setForeground(QColor(0, 128, 0))
+                elif previous is not None and rank > previous:
+                    item.setForeground(QColor(255, 0, 0))
+                self.progression_table.setItem(row, column, item)
+                previous = rank
+        
+    def on_players_toggled(self, checked: bool):
+        """Afficher ou masquer le classement individuel"""
+        self.players_table.setVisible(checked)
+        if checked:
+            self.refresh_players()
+            
+    @instrumented("ui.refresh_players")
+    def refresh_players(self):
+        """Rafraîchir le classement individuel (totaux tenus à jour par le tournoi)"""
+        if not self.tournament:
+            self.players_table.setRowCount(0)
+            return
+            
+        numbers = {team.id: team.number for team in self.tournament.teams}
+        standings = self.tournament.get_player_standings()
+        self.players_table.setRowCount(len(standings))
+        for row, stats in enumerate(standings):
+            difference = stats.points_difference
+            values = [str(row + 1), stats.name, f"Équipe {numbers.get(stats.key[0], '?')}",
+                      str(stats.played), str(stats.wins), str(stats.losses),
+                      f"+{difference}" if difference > 0 else str(difference)]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if column != 1:
+                    item.setTextAlignment(Qt.AlignCenter)
+                self.players_table.setItem(row, column, item)
+        
+    def update_pool_combo(self):
+        """Afficher le sélecteur de poule quand le tournoi a des poules"""
+        pool_stage = self.tournament.pool_stage if self.tournament else None
+        if pool_stage is None:
+            self.pool_combo.hide()
+            return
+        if self.pool_combo.count() != len(pool_stage.pools) + 1:
+            self.pool_combo.blockSignals(True)
+            self.pool_combo.clear()
+            self.pool_combo.addItem("Classement général")
+            for pool in pool_stage.pools:
+                self.pool_combo.addItem(pool.label)
+            self.pool_combo.blockSignals(False)
+        self.pool_combo.show()
+        
+    def selected_pool(self):
+        """Poule sélectionnée, ou None pour le classement général"""
+        pool_stage = self.tournament.pool_stage if self.tournament else None
+        index = self.pool_combo.currentIndex()
+        if pool_stage is None or index <= 0:
+            return None
+        return pool_stage.pools[index - 1]
+        
     def export_standings(self):
         """Exporter le classement au format PDF"""
         if not self.tournament:
@@ -200,12 +376,17 @@ class StandingsWidget(QWidget):
             self,
             "Enregistrer le classement",
             "",
-            "PDF Files (*.pdf)"
+            EXPORT_FILTERS
         )
 
         if not file_name:
             return
 
+        if not file_name.lower().endswith(".pdf"):
+            self.export_data(tournament_standings_rows(self.tournament), file_name,
+                             STANDINGS_COLUMNS, f"Classement - {self.tournament.name}")
+            return
+
         try:
             from reportlab.lib.pagesizes import A4
             from reportlab.lib import colors
@@ -285,3 +466,29 @@ class StandingsWidget(QWidget):
                 "Erreur",
                 f"Erreur lors de l'export : {e}",
             )
+
+    def export_matches(self):
+        """Exporter l'historique des matchs du tournoi (CSV, JSON Lines, HTML)"""
+        if not self.tournament or not self.tournament.matches:
+            QMessageBox.warning(self, "Erreur", "Aucun match à exporter")
+            return
+
+        file_name, _ = QFileDialog.getSaveFileName(
+            self, "Exporter les matchs", "", DATA_FILTERS
+        )
+        if not file_name:
+            return
+
+        self.export_data(tournament_match_rows(self.tournament), file_name,
+                         MATCH_COLUMNS, f"Matchs - {self.tournament.name}")
+
+    def export_data(self, rows, file_name: str, columns, title: str):
+        """Écrire des lignes dans le format choisi et informer l'utilisateur"""
+        try:
+            count = export_rows(rows, file_name, columns, title)
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Erreur", f"Erreur lors de l'export : {e}")
+            return
+        QMessageBox.information(
+            self, "Export réussi", f"{count} ligne(s) exportée(s) dans {file_name}"
+        )
@@ -7,20 +7,26 @@ Widget pour la gestion des équipes et joueurs
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QFormLayout,
                              QLineEdit, QPushButton, QTableWidget, QTableWidgetItem,
                              QHeaderView, QMessageBox, QLabel, QFrame, QGroupBox,
-                             QSpinBox, QComboBox)
-from PyQt5.QtCore import Qt, pyqtSignal
+                             QSpinBox, QComboBox, QCompleter, QFileDialog)
+from PyQt5.QtCore import Qt, QStringListModel
 from PyQt5.QtGui import QFont
 
-from tournament import Tournament, Team, Player
+from tournament import Tournament, Team, Player, players_per_team
+from profiling import instrumented
+from importer import import_teams
+from widgets.player_search import PlayerSearch
+from widgets.match_widget import schedule_once
+from events import EventBatcher, TeamAdded, TeamRemoved
 
 class TeamWidget(QWidget):
     """Widget pour gérer les équipes et joueurs"""
     
-    teams_changed = pyqtSignal()
-    
     def __init__(self):
         super().__init__()
         self.tournament = None
+        self.event_batcher = None
+        self.db_manager = None
+        self.player_search = None
         self.setup_ui()
         
     def setup_ui(self):
@@ -57,19 +63,47 @@ class TeamWidget(QWidget):
         
         # Champs pour les joueurs (adaptatif selon le type de tournoi)
         self.player_inputs = []
+        self.completion_models = []
         for i in range(6):  # Maximum 6 joueurs pour sextette
             player_input = QLineEdit()
             player_input.setPlaceholderText(f"Joueur {i+1}")
+            
+            # Autocomplétion alimentée par l'annuaire (déjà filtrée côté base)
+            model = QStringListModel()
+            completer = QCompleter(model, player_input)
+            completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+            completer.setCaseSensitivity(Qt.CaseInsensitive)
+            player_input.setCompleter(completer)
+            player_input.textEdited.connect(
+                lambda text, field=i: self.request_completions(field, text)
+            )
+            player_input.editingFinished.connect(
+                lambda field=i: self.request_duplicate_check(field)
+            )
+            
             self.player_inputs.append(player_input)
+            self.completion_models.append(model)
             form_layout.addRow(f"Joueur {i+1}:", player_input)
             
         group_layout.addLayout(form_layout)
         
+        # Avertissement de doublon probable (faute de frappe)
+        self.duplicate_label = QLabel()
+        self.duplicate_label.setStyleSheet("color: #b8860b;")
+        self.duplicate_label.hide()
+        group_layout.addWidget(self.duplicate_label)
+        
         # Bouton d'ajout
         self.add_team_btn = QPushButton("Ajouter l'équipe")
         self.add_team_btn.clicked.connect(self.add_team)
         self.add_team_btn.setEnabled(False)
         group_layout.addWidget(self.add_team_btn)
+        
+        # Import en masse depuis un fichier d'inscriptions
+        self.import_teams_btn = QPushButton("Importer des équipes (CSV/ODS)...")
+        self.import_teams_btn.clicked.connect(self.import_teams)
+        self.import_teams_btn.setEnabled(False)
+        group_layout.addWidget(self.import_teams_btn)
 
         # Message quand aucun tournoi n'est actif
         self.no_tournament_label = QLabel(
@@ -108,12 +142,71 @@ class TeamWidget(QWidget):
         
         parent_layout.addWidget(self.teams_table)
         
+    def set_database(self, db_manager):
+        """Définir la base utilisée pour l'annuaire des joueurs"""
+        self.db_manager = db_manager
+        if self.player_search:
+            self.player_search.stop()
+        self.player_search = PlayerSearch(db_manager.db_path, self)
+        self.player_search.completions_ready.connect(self.on_completions_ready)
+        self.player_search.duplicates_ready.connect(self.on_duplicates_ready)
+        
+    def request_completions(self, field: int, text: str):
+        """Demander les propositions pour un champ joueur"""
+        if self.player_search and text.strip():
+            self.player_search.completion_requested.emit(field, text)
+            
+    def request_duplicate_check(self, field: int):
+        """Vérifier si le nom saisi ressemble à un joueur déjà connu"""
+        text = self.player_inputs[field].text().strip()
+        if self.player_search and text:
+            self.player_search.duplicates_requested.emit(field, text)
+            
+    def on_completions_ready(self, field: int, text: str, names: list):
+        """Résultats d'autocomplétion (ignorés s'ils sont périmés)"""
+        if self.player_inputs[field].text() != text:
+            return
+        self.completion_models[field].setStringList(names)
+        
+    def on_duplicates_ready(self, field: int, text: str, names: list):
+        """Afficher les joueurs connus proches du nom saisi"""
+        if self.player_inputs[field].text().strip() != text:
+            return
+        if names:
+            self.duplicate_label.setText(
+                f"« {text} » ressemble à : {', '.join(names)}"
+            )
+            self.duplicate_label.show()
+        else:
+            self.duplicate_label.hide()
+            
     def set_tournament(self, tournament: Tournament):
         """Définir le tournoi actuel"""
+        if self.event_batcher:
+            self.event_batcher.close()
         self.tournament = tournament
+        self.event_batcher = EventBatcher(tournament.events, self.on_tournament_events,
+                                          schedule_once)
         self.update_ui_for_tournament_type()
         self.refresh_teams_table()
         
+    def on_tournament_events(self, events):
+        """Ajouter les lignes des nouvelles équipes, tout reconstruire sinon"""
+        team_events = [e for e in events if isinstance(e, (TeamAdded, TeamRemoved))]
+        if not team_events:
+            return
+        start = self.teams_table.rowCount()
+        if (all(isinstance(e, TeamAdded) for e in team_events)
+                and start + len(team_events) == len(self.tournament.teams)):
+            self.teams_table.setUpdatesEnabled(False)
+            self.teams_table.setRowCount(start + len(team_events))
+            for row, event in enumerate(team_events, start):
+                self.fill_team_row(row, event.team)
+                self.teams_table.resizeRowToContents(row)
+            self.teams_table.setUpdatesEnabled(True)
+        else:
+            self.refresh_teams_table()
+        
     def update_ui_for_tournament_type(self):
         """Mettre à jour l'interface selon le type de tournoi"""
         if not self.tournament:
@@ -121,18 +214,12 @@ class TeamWidget(QWidget):
                 input_field.hide()
                 input_field.parentWidget().hide()
             self.add_team_btn.setEnabled(False)
+            self.import_teams_btn.setEnabled(False)
             self.no_tournament_label.show()
             return
             
         # Déterminer le nombre de joueurs requis
-        players_needed = {
-            "tête-à-tête": 1,
-            "doublette": 2,
-            "triplette": 3,
-            "quadrette": 4,
-            "mêlée": 1,
-            "sextette": 6
-        }.get(self.tournament.tournament_type, 2)
+        players_needed = players_per_team(self.tournament.tournament_type)
         
         # Afficher/masquer les champs de joueurs
         for i, input_field in enumerate(self.player_inputs):
@@ -152,6 +239,7 @@ class TeamWidget(QWidget):
 
         # Activer le bouton d'ajout
         self.add_team_btn.setEnabled(True)
+        self.import_teams_btn.setEnabled(True)
         
     def add_team(self):
         """Ajouter une nouvelle équipe"""
@@ -172,14 +260,57 @@ class TeamWidget(QWidget):
             
         # Ajouter l'équipe au tournoi
         team = self.tournament.add_team(players)
+        if self.db_manager:
+            self.db_manager.register_player_names(players)
         
         # Vider les champs
         for input_field in self.player_inputs:
             input_field.clear()
+        self.duplicate_label.hide()
+        
+    def import_teams(self):
+        """Importer un fichier d'inscriptions en une seule opération"""
+        if not self.tournament:
+            QMessageBox.warning(self, "Erreur", "Aucun tournoi sélectionné")
+            return
             
-        # Rafraîchir l'affichage
-        self.refresh_teams_table()
-        self.teams_changed.emit()
+        file_name, _ = QFileDialog.getOpenFileName(
+            self,
+            "Importer des équipes",
+            "",
+            "Inscriptions (*.csv *.ods);;CSV (*.csv);;OpenDocument (*.ods)"
+        )
+        if not file_name:
+            return
+            
+        try:
+            result = import_teams(file_name, self.tournament.tournament_type)
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Erreur", f"Erreur lors de l'import : {e}")
+            return
+            
+        if result.errors:
+            details = "\n".join(result.errors[:20])
+            if len(result.errors) > 20:
+                details += f"\n... et {len(result.errors) - 20} autre(s)"
+            reply = QMessageBox.question(
+                self, "Lignes invalides",
+                f"{len(result.errors)} ligne(s) ignorée(s) :\n{details}\n\n"
+                f"Importer les {len(result.teams)} équipe(s) valides ?",
+                QMessageBox.Yes | QMessageBox.No
+            )
+            if reply != QMessageBox.Yes:
+                return
+                
+        if not result.teams:
+            QMessageBox.warning(self, "Erreur", "Aucune équipe valide dans le fichier")
+            return
+            
+        # Ajout groupé : les événements TeamAdded sont regroupés en un seul
+        # rafraîchissement et en une seule écriture de la sauvegarde automatique
+        teams = self.tournament.add_teams(result.teams, result.clubs)
+        
+        QMessageBox.information(self, "Succès", f"{len(teams)} équipe(s) importée(s)")
         
     def remove_team(self, team_id: int):
         """Supprimer une équipe"""
@@ -191,9 +322,8 @@ class TeamWidget(QWidget):
         
         if reply == QMessageBox.Yes:
             self.tournament.remove_team(team_id)
-            self.refresh_teams_table()
-            self.teams_changed.emit()
             
+    @instrumented("ui.refresh_teams_table")
     def refresh_teams_table(self):
         """Rafraîchir le tableau des équipes"""
         if not self.tournament:
@@ -201,29 +331,35 @@ class TeamWidget(QWidget):
             return
             
         teams = self.tournament.teams
+        self.teams_table.setUpdatesEnabled(False)
         self.teams_table.setRowCount(len(teams))
         
         for row, team in enumerate(teams):
-            # Numéro d'équipe
-            team_number_item = QTableWidgetItem(f"Équipe {team.number}")
-            team_number_item.setTextAlignment(Qt.AlignCenter)
-            self.teams_table.setItem(row, 0, team_number_item)
-            
-            # Joueurs
-            players_text = team.get_players_names()
-            players_item = QTableWidgetItem(players_text)
-            self.teams_table.setItem(row, 1, players_item)
-            
-            # Bouton de suppression
-            remove_btn = QPushButton("Supprimer")
-            remove_btn.clicked.connect(lambda checked, tid=team.id: self.remove_team(tid))
-            remove_btn.setStyleSheet("background-color: #dc3545; color: white;")
-            self.teams_table.setCellWidget(row, 2, remove_btn)
-            
-            # Statut
-            status_item = QTableWidgetItem("Inscrite")
-            status_item.setTextAlignment(Qt.AlignCenter)
-            self.teams_table.setItem(row, 3, status_item)
+            self.fill_team_row(row, team)
             
         # Ajuster la hauteur des lignes
-        self.teams_table.resizeRowsToContents()
\ No newline at end of file
+        self.teams_table.resizeRowsToContents()
+        self.teams_table.setUpdatesEnabled(True)
+        
+    def fill_team_row(self, row: int, team: Team):
+        """Remplir la ligne d'une équipe"""
+        # Numéro d'équipe
+        team_number_item = QTableWidgetItem(f"Équipe {team.number}")
+        team_number_item.setTextAlignment(Qt.AlignCenter)
+        self.teams_table.setItem(row, 0, team_number_item)
+        
+        # Joueurs
+        players_text = team.get_players_names()
+        players_item = QTableWidgetItem(players_text)
+        self.teams_table.setItem(row, 1, players_item)
+        
+        # Bouton de suppression
+        remove_btn = QPushButton("Supprimer")
+        remove_btn.clicked.connect(lambda checked, tid=team.id: self.remove_team(tid))
+        remove_btn.setStyleSheet("background-color: #dc3545; color: white;")
+        self.teams_table.setCellWidget(row, 2, remove_btn)
+        
+        # Statut
+        status_item = QTableWidgetItem("Inscrite")
+        status_item.setTextAlignment(Qt.AlignCenter)
+        self.teams_table.setItem(row, 3, status_item)
\ No newline at end of file
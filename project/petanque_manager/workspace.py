@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Espace de travail : plusieurs tournois ouverts en même temps
+
+Les grands week-ends, le concours principal, le complémentaire et le tournoi
+des jeunes se jouent en parallèle. Le Workspace garde la liste des tournois
+ouverts et n'en conserve qu'un nombre limité en mémoire (budget), du plus
+récemment consulté au plus ancien : au-delà, le tournoi le moins récemment
+consulté est déchargé, puis rechargé depuis SQLite quand on y revient.
+Passer d'un tournoi résident à un autre ne coûte rien : aucun calcul, aucune
+lecture.
+
+Seuls les tournois entièrement décrits par leurs lignes en base peuvent être
+déchargés (suisse, mêlée, championnat) ; les tableaux de concours et les
+poules n'étant pas enregistrés, ces tournois restent en mémoire.
+"""
+
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from tournament import Tournament, FORMAT_SWISS, FORMAT_CHAMPIONSHIP
+
+# Nombre de tournois gardés en mémoire par défaut
+WORKSPACE_BUDGET = 3
+
+def reloadable(tournament: Tournament) -> bool:
+    """Vrai si le tournoi peut être reconstruit à partir de la base"""
+    if tournament.format == FORMAT_CHAMPIONSHIP:
+        return True
+    # Les équipes composées de la quadrette ne sont pas enregistrées
+    return tournament.format == FORMAT_SWISS and tournament.tournament_type != "quadrette"
+
+def load_tournament(db_manager, tournament_id: int) -> Tournament:
+    """Reconstruire en mémoire un tournoi enregistré par la sauvegarde automatique"""
+    row, teams, matches = db_manager.load_tournament_rows(tournament_id)
+    if row is None:
+        raise KeyError(f"Tournoi {tournament_id} introuvable")
+    seed, state = db_manager.get_rng_state(tournament_id)
+    tournament = Tournament(name=row["name"], tournament_type=row["type"],
+                            terrain_count=row["terrain_count"],
+                            tournament_format=row["format"] or FORMAT_SWISS, seed=seed)
+    tournament.id = tournament_id
+    tournament.restore_rows(teams, matches, row["current_round"] or 0)
+    if state is not None:
+        tournament.restore_rng_state(state)
+    return tournament
+
+class Workspace:
+    """Tournois ouverts, dont au plus `budget` gardés en mémoire (moins récemment consulté déchargé)"""
+
+    def __init__(self, load: Callable[[int], Tournament],
+                 unload: Optional[Callable[[Tournament], None]] = None,
+                 budget: int = WORKSPACE_BUDGET,
+                 pinned: Optional[Callable[[Tournament], bool]] = None):
+        self.load = load
+        self.unload = unload
+        self.budget = budget
+        # Tournois à ne pas décharger (poste partagé, séance enregistrée...)
+        self.pinned = pinned
+        # Tournois ouverts, dans l'ordre d'ouverture : identifiant -> nom
+        self.names: "OrderedDict[int, str]" = OrderedDict()
+        # Tournois en mémoire, du moins récemment consulté au plus récent
+        self.resident: "OrderedDict[int, Tournament]" = OrderedDict()
+        self.active_id: Optional[int] = None
+        self.loads = 0
+        self.evictions = 0
+
+    @property
+    def active(self) -> Optional[Tournament]:
+        return self.resident.get(self.active_id)
+
+    def add(self, tournament: Tournament) -> Tournament:
+        """Ouvrir un tournoi (déjà enregistré en base) et le rendre actif"""
+        self.names[tournament.id] = tournament.name
+        self.resident[tournament.id] = tournament
+        self.active_id = tournament.id
+        self.evict()
+        return tournament
+
+    def focus(self, tournament_id: int) -> Tournament:
+        """Rendre un tournoi actif, en le rechargeant depuis la base s'il a été déchargé"""
+        if tournament_id not in self.names:
+            raise KeyError(f"Tournoi {tournament_id} absent de l'espace de travail")
+        tournament = self.resident.get(tournament_id)
+        if tournament is None:
+            tournament = self.load(tournament_id)
+            self.resident[tournament_id] = tournament
+            self.loads += 1
+        else:
+            self.resident.move_to_end(tournament_id)
+        self.active_id = tournament_id
+        self.evict()
+        return tournament
+
+    def is_resident(self, tournament_id: int) -> bool:
+        return tournament_id in self.resident
+
+    def set_budget(self, budget: int):
+        self.budget = max(1, budget)
+        self.evict()
+
+    def evict(self):
+        """Décharger les tournois les moins récemment consultés au-delà du budget"""
+        for tournament_id in list(self.resident):
+            if len(self.resident) <= self.budget:
+                break
+            tournament = self.resident[tournament_id]
+            if tournament_id == self.active_id or not reloadable(tournament) or \
+                    (self.pinned is not None and self.pinned(tournament)):
+                continue
+            self._unload(tournament_id)
+            self.evictions += 1
+
+    def close(self, tournament_id: int):
+        """Retirer un tournoi de l'espace de travail"""
+        self.names.pop(tournament_id, None)
+        if tournament_id in self.resident:
+            self._unload(tournament_id)
+        if self.active_id == tournament_id:
+            self.active_id = next(reversed(self.resident), None)
+
+    def _unload(self, tournament_id: int):
+        tournament = self.resident.pop(tournament_id)
+        if self.unload is not None:
+            self.unload(tournament)
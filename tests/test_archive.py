@@ -0,0 +1,116 @@
+import csv
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'project', 'petanque_manager'))
+from autosave import AutoSaver, AutosaveWriter
+from export import export_rows, ranked, STANDINGS_COLUMNS
+from store import DatabaseManager
+from tournament import Tournament
+
+
+def play_tournament(db, name):
+    tournament_id = db.create_tournament(name, "doublette", 2)
+    teams = [db.create_team(tournament_id, i, [f"{name} {i}a", f"{name} {i}b"])
+             for i in range(1, 5)]
+    for team1, team2 in ((teams[0], teams[1]), (teams[2], teams[3])):
+        match_id = db.create_match(tournament_id, 1, team1, team2)
+        db.update_match_score(match_id, 13, 4 if team1 == teams[0] else 9)
+    return tournament_id
+
+
+def test_completed_tournament_moves_to_season_archive(tmp_path):
+    db = DatabaseManager(str(tmp_path / "petanque.db"), archive_dir=str(tmp_path / "archives"))
+    done = play_tournament(db, "Printemps")
+    live = play_tournament(db, "Été")
+    with pytest.raises(ValueError):
+        db.archive_tournament(live)
+    db.complete_tournament(done)
+    before = db.get_team_stats(done)
+
+    assert db.archive_completed_tournaments() == 1
+    assert os.path.exists(db.archive_path(db.get_tournament(done)["season"]))
+    cursor = db.connection.cursor()
+    cursor.execute("SELECT COUNT(*) FROM matches")
+    assert cursor.fetchone()[0] == 2
+    cursor.execute("SELECT COUNT(*) FROM players")
+    assert cursor.fetchone()[0] == 8
+
+    summary = db.get_tournament(done)
+    assert summary["archived"] and summary["team_count"] == 4 and summary["match_count"] == 2
+    assert summary["winner"] == "Printemps 1a, Printemps 1b"
+    assert summary["ranking"][0][2] == 1
+
+    # Lecture transparente : l'archive est attachée à la demande
+    assert db.get_team_stats(done) == before
+    assert [m["team1_players"] for m in db.get_matches_by_tournament(done)][0] == "Printemps 1a,Printemps 1b"
+    assert sorted(t["name"] for t in db.get_all_tournaments()) == ["Printemps", "Été"]
+    assert len(list(db.iter_matches())) == 4
+    db.close()
+
+
+def test_finished_tournament_saved_by_autosave_is_archived(tmp_path):
+    path = str(tmp_path / "petanque.db")
+    db = DatabaseManager(path, archive_dir=str(tmp_path / "archives"))
+    t = Tournament(name="Automne", tournament_type="doublette", terrain_count=2)
+    t.id = db.create_tournament(t.name, t.tournament_type, t.terrain_count, t.format, t.seed)
+    writer = AutosaveWriter(path)
+    saver = AutoSaver(t, writer.submit)
+    t.add_teams([[f"A{i}", f"B{i}"] for i in range(4)])
+    for match in t.generate_first_round_matches():
+        assert not t.is_finished()
+        t.update_match_score(match.id, 13, 7)
+    assert t.is_finished()
+
+    # Terminer le tournoi (MainWindow.finish_tournament) : sauvegarde, puis fin en base
+    saver.save()
+    writer.flush()
+    assert writer.last_error is None
+    db.complete_tournament(t.id)
+    saver.close()
+    writer.close()
+
+    assert db.archive_completed_tournaments() == 1
+    summary = db.get_tournament(t.id)
+    assert summary["archived"] and summary["team_count"] == 4 and summary["match_count"] == 2
+    assert sorted(row[2] for row in summary["ranking"]) == [0, 0, 1, 1]
+    db.close()
+
+
+def test_quadrette_results_are_credited_in_export_and_archive(tmp_path):
+    path = str(tmp_path / "petanque.db")
+    db = DatabaseManager(path, archive_dir=str(tmp_path / "archives"))
+    t = Tournament(name="Quadrette", tournament_type="quadrette", terrain_count=2, seed=3)
+    t.id = db.create_tournament(t.name, t.tournament_type, t.terrain_count, t.format, t.seed)
+    writer = AutosaveWriter(path)
+    saver = AutoSaver(t, writer.submit)
+    t.add_teams([[f"J{i}{p}" for p in "abcd"] for i in range(4)])
+    matches = t.generate_first_round_matches()
+    for round_number in range(4):
+        for match in matches:
+            t.update_match_score(match.id, 13, 2 * round_number)
+        matches = t.generate_next_round_matches()
+    saver.close()
+    writer.close()
+
+    # Les matchs des équipes composées comptent pour chaque équipe inscrite
+    expected = sorted((s.team.get_players_names(), s.wins, s.losses, s.points_for,
+                       s.points_against) for s in t.get_all_stats())
+    assert any(m.team1.members for m in t.matches)
+    assert sorted((row["players"], row["wins"], row["losses"], row["points_for"],
+                   row["points_against"]) for row in db.get_team_stats(t.id)) == expected
+
+    export_rows(ranked(db.iter_team_stats()), str(tmp_path / "s.csv"), STANDINGS_COLUMNS)
+    with open(tmp_path / "s.csv", encoding="utf-8") as f:
+        exported = list(csv.DictReader(f))
+    assert sorted((row["players"], int(row["wins"])) for row in exported) == \
+        sorted(row[:2] for row in expected)
+
+    db.complete_tournament(t.id)
+    assert db.archive_completed_tournaments() == 1
+    summary = db.get_tournament(t.id)
+    assert sorted((row[1], row[2], row[3], row[4], row[5]) for row in summary["ranking"]) == expected
+    assert summary["ranking"][0][2] == max(row[1] for row in expected)
+    db.close()
@@ -0,0 +1,171 @@
+import os
+import sqlite3
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'project', 'petanque_manager'))
+from autosave import AutoSaver, AutosaveWriter, Changes
+from store import DatabaseManager
+from tournament import Tournament
+from workspace import load_tournament
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_tournament(db):
+    t = Tournament(name="Test", tournament_type="doublette", terrain_count=4)
+    t.id = db.create_tournament("Test", "doublette", 4)
+    return t
+
+
+def test_edits_are_debounced_and_bounded(tmp_path):
+    clock = FakeClock()
+    batches = []
+    t = Tournament(name="Test", tournament_type="doublette", terrain_count=4)
+    t.id = 1
+    saver = AutoSaver(t, batches.append, delay=2, max_delay=10, clock=clock)
+    t.add_teams([[f"A{i}", f"B{i}"] for i in range(4)])
+    matches = t.generate_first_round_matches()
+
+    # Saisie continue : une modification par seconde, jamais 2 s de calme
+    for second in range(1, 10):
+        clock.now = second
+        t.set_match_score(matches[0].id, second % 13, 0)
+        assert not saver.poll()
+    clock.now = 10
+    assert saver.poll()
+    assert len(batches) == 1
+    assert len(batches[0].teams) == 4 and len(batches[0].matches) == 2
+    assert batches[0].current_round == 1
+
+    clock.now = 11
+    t.set_match_score(matches[1].id, 13, 2)
+    clock.now = 12.5
+    assert not saver.poll()
+    clock.now = 13
+    assert saver.poll()
+    assert list(batches[1].matches) == [matches[1].id] and not batches[1].teams
+
+
+def test_writer_persists_incremental_changes(tmp_path):
+    path = str(tmp_path / "petanque.db")
+    db = DatabaseManager(path)
+    t = make_tournament(db)
+    writer = AutosaveWriter(path)
+    saver = AutoSaver(t, writer.submit)
+
+    t.add_teams([[f"A{i}", f"B{i}"] for i in range(5)])
+    t.remove_team(2)
+    matches = t.generate_first_round_matches()
+    saver.save()
+    t.update_match_score(matches[0].id, 13, 7)
+    saver.save()
+    writer.flush()
+
+    assert len(db.get_teams_by_tournament(t.id)) == 4
+    saved = db.get_matches_by_tournament(t.id)
+    assert len(saved) == 2
+    assert sum(1 for m in saved if m["completed"]) == 1
+    assert db.get_tournament(t.id)["current_round"] == 1
+    assert db.get_team_stats(t.id)[0]["wins"] == 1
+
+    writer.close()
+    assert writer.saves >= 1 and writer.last_error is None
+    db.close()
+
+
+def test_quadrette_rounds_are_saved_and_reloaded(tmp_path):
+    path = str(tmp_path / "petanque.db")
+    db = DatabaseManager(path)
+    t = Tournament(name="Quadrette", tournament_type="quadrette", terrain_count=2, seed=3)
+    t.id = db.create_tournament(t.name, t.tournament_type, t.terrain_count, t.format, t.seed)
+    writer = AutosaveWriter(path)
+    saver = AutoSaver(t, writer.submit)
+    t.add_teams([[f"J{i}{p}" for p in "abcd"] for i in range(4)])
+    matches = t.generate_first_round_matches()
+    for round_number in range(4):
+        for match in matches:
+            t.update_match_score(match.id, 13, 4 + round_number)
+        saver.save()
+        matches = t.generate_next_round_matches()
+    saver.close()
+    writer.close()
+    assert writer.last_error is None and not writer.failed
+
+    # Les équipes composées ne sont pas des équipes inscrites
+    assert len(db.get_teams_by_tournament(t.id)) == 4
+    assert len(db.get_team_stats(t.id)) == 4
+    reloaded = load_tournament(db, t.id)
+    assert [m.team1.members for m in reloaded.matches] == [m.team1.members for m in t.matches]
+    assert reloaded.matches[-1].team2.get_players_names() == t.matches[-1].team2.get_players_names()
+    assert [(s.team.id, s.wins, s.points_for) for s in reloaded.get_all_stats()] == \
+        [(s.team.id, s.wins, s.points_for) for s in t.get_all_stats()]
+    db.close()
+
+
+def test_failed_batches_are_retried_with_the_next_one(tmp_path):
+    path = str(tmp_path / "petanque.db")
+    db = DatabaseManager(path)
+    t = make_tournament(db)
+    writer = AutosaveWriter(path)
+    # Match dont les équipes ne sont pas encore enregistrées : team1_id NULL
+    orphan = Changes(t.id, matches={1: (1, 1, 2, 13, 7, None, True, False, None, None, None)})
+    writer.submit(orphan)
+    writer.flush()
+    assert writer.last_error is not None and t.id in writer.failed
+    writer.submit(Changes(t.id, teams={1: (1, ["A", "B"], None, None, False),
+                                       2: (2, ["C", "D"], None, None, False)}))
+    writer.close()
+    assert not writer.failed
+    assert db.get_team_stats(t.id)[0]["wins"] == 1
+
+    assert not Changes(t.id) and Changes(t.id, rng_state=[0]) and Changes(t.id, composites={1: ()})
+
+    batches = []
+    def submit(changes):
+        if not batches:
+            batches.append(None)
+            raise RuntimeError("disque plein")
+        batches.append(changes)
+    saver = AutoSaver(t, submit)
+    t.add_teams([["E", "F"], ["G", "H"]])
+    try:
+        saver.save()
+    except RuntimeError:
+        pass
+    t.generate_first_round_matches()
+    saver.save()
+    assert len(batches[1].teams) == 2 and len(batches[1].matches) == 1
+    db.close()
+
+
+def test_failed_batches_are_retried_when_the_writer_stops(tmp_path):
+    path = str(tmp_path / "petanque.db")
+    db = DatabaseManager(path)
+    t = make_tournament(db)
+    writer = AutosaveWriter(path)
+    orphan = Changes(t.id, matches={1: (1, 1, 2, 13, 7, None, True, False, None, None, None)})
+    writer.submit(orphan)
+    writer.flush()
+    assert t.id in writer.failed
+    # Les équipes arrivent par un autre chemin : le lot en échec passe à l'arrêt
+    db.save_changes(Changes(t.id, teams={1: (1, ["A", "B"], None, None, False),
+                                         2: (2, ["C", "D"], None, None, False)}))
+    writer.close()
+    assert not writer.failed
+    assert db.get_team_stats(t.id)[0]["wins"] == 1
+
+    # Lot impossible à écrire : l'erreur remonte à l'appelant, le lot est conservé
+    writer.submit(Changes(t.id, matches={2: (1, 7, 8, 13, 0, None, True, False,
+                                            None, None, None)}))
+    with pytest.raises(sqlite3.IntegrityError):
+        writer.close()
+    assert t.id in writer.failed
+    db.close()
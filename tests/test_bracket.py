@@ -0,0 +1,101 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'project', 'petanque_manager'))
+from bracket import Bracket, BYE, EMPTY, seeding_order
+from tournament import Tournament, FORMAT_CONCOURS
+
+
+def create_concours(num_teams, levels=2):
+    t = Tournament(name="Test", tournament_type="doublette", terrain_count=4,
+                   tournament_format=FORMAT_CONCOURS, concours_levels=levels)
+    for i in range(num_teams):
+        t.add_team([f"Player {i*2+1}", f"Player {i*2+2}"])
+    return t
+
+
+def play_round(t, matches):
+    for match in matches:
+        t.update_match_score(match.id, 13, 6)
+
+
+def test_seeding_order_keeps_top_seeds_apart():
+    assert seeding_order(8) == [1, 8, 4, 5, 2, 7, 3, 6]
+
+
+def test_byes_go_to_top_seeds_and_advance_immediately():
+    bracket = Bracket("A", 8)
+    bracket.place([11, 12, 13, 14, 15])
+    # Les têtes de série 1, 2 et 3 sont qualifiées d'office pour le tour suivant
+    assert {bracket.slots[3], bracket.slots[5], bracket.slots[6]} == {11, 12, 13}
+    # 4 contre 5 au 1er tour, et déjà la demi-finale entre les têtes de série 2 et 3
+    assert bracket.playable_nodes() == [2, 4]
+    assert BYE not in bracket.slots[:7]
+
+
+def test_result_advances_winner_to_parent():
+    bracket = Bracket("A", 4)
+    bracket.place([1, 2, 3, 4])
+    assert bracket.playable_nodes() == [1, 2]
+    bracket.record_result(1, 4)
+    assert bracket.slots[1] == 4
+    assert bracket.slots[0] == EMPTY
+    bracket.record_result(2, 2)
+    assert bracket.playable_nodes() == [0]
+    bracket.record_result(0, 2)
+    assert bracket.winner() == 2
+
+
+def test_concours_feeds_first_round_losers_into_b():
+    t = create_concours(6, levels=2)
+    first = t.generate_first_round_matches()
+    assert len(first) == 2  # deux têtes de série exemptées
+    assert {m.bracket for m in first} == {"A"}
+    play_round(t, first)
+
+    second = t.generate_next_round_matches()
+    by_bracket = {}
+    for match in second:
+        by_bracket.setdefault(match.bracket, []).append(match)
+    assert len(by_bracket["A"]) == 2
+    assert len(by_bracket["B"]) == 1
+    losers = {m.get_loser().id for m in first}
+    b_match = by_bracket["B"][0]
+    assert {b_match.team1.id, b_match.team2.id} == losers
+    assert t.concours.round_label(b_match) == "B Finale"
+
+    play_round(t, second)
+    final = t.generate_next_round_matches()
+    assert [m.bracket for m in final] == ["A"]
+    play_round(t, final)
+    assert t.generate_next_round_matches() == []
+    assert t.concours.is_finished()
+    assert t.concours.brackets["A"].winner() == final[0].team1.id
+
+
+def test_corrected_winner_is_re_propagated_until_the_next_match_is_drawn():
+    t = create_concours(8, levels=2)
+    first = t.generate_first_round_matches()
+    play_round(t, first)
+    a, b = t.concours.brackets["A"], t.concours.brackets["B"]
+    match = first[0]
+    node = match.bracket_node
+    leaf = b.first_leaf + node - (a.size // 2 - 1)
+    assert a.slots[node] == match.team1.id and b.slots[leaf] == match.team2.id
+
+    # Score inversé avant le tirage suivant : vainqueur et perdant échangent leurs cases
+    t.update_match_score(match.id, 5, 13)
+    assert a.slots[node] == match.team2.id and b.slots[leaf] == match.team1.id
+    second = t.generate_next_round_matches()
+    assert any(match.team2 in (m.team1, m.team2) for m in second if m.bracket == "A")
+    assert any(match.team1 in (m.team1, m.team2) for m in second if m.bracket == "B")
+
+    # Le tour suivant est tiré : le vainqueur ne peut plus changer, le score reste intact
+    with pytest.raises(ValueError):
+        t.update_match_score(match.id, 13, 5)
+    assert (match.score1, match.score2) == (5, 13) and a.slots[node] == match.team2.id
+    # Une correction qui garde le même vainqueur reste possible
+    t.update_match_score(match.id, 9, 13)
+    assert match.score1 == 9 and a.slots[node] == match.team2.id
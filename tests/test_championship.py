@@ -0,0 +1,64 @@
+import os
+import sys
+import types
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'project', 'petanque_manager'))
+from championship import round_robin_schedule, round_count, assign_terrains
+from store import DatabaseManager
+from tournament import Tournament, FORMAT_CHAMPIONSHIP
+
+
+def test_schedule_is_lazy_complete_and_balanced():
+    for count in (5, 6, 40):
+        schedule = round_robin_schedule(count)
+        assert isinstance(schedule, types.GeneratorType)
+        home = [0] * count
+        away = [0] * count
+        pairs = set()
+        rounds = 0
+        for pairings in schedule:
+            rounds += 1
+            playing = [team for pair in pairings for team in pair if team is not None]
+            assert len(playing) == len(set(playing))
+            for a, b in pairings:
+                if a is not None and b is not None:
+                    home[a] += 1
+                    away[b] += 1
+                    pairs.add(frozenset((a, b)))
+        assert rounds == round_count(count)
+        assert len(pairs) == count * (count - 1) // 2
+        assert all(abs(h - a) <= 1 for h, a in zip(home, away))
+
+
+def test_terrains_rotate_between_rounds():
+    assert assign_terrains(3, 0, 4) == [1, 2, 3]
+    assert assign_terrains(3, 1, 4) == [2, 3, 4]
+    # Plus de matchs que de terrains : les derniers attendent
+    assert assign_terrains(6, 0, 4) == [1, 2, 3, 4, None, None]
+    assert assign_terrains(2, 0, 0) == [None, None]
+
+
+def test_championship_generates_one_round_at_a_time():
+    t = Tournament(name="Ligue", tournament_type="doublette", terrain_count=4,
+                   tournament_format=FORMAT_CHAMPIONSHIP)
+    for i in range(5):
+        t.add_team([f"Player {i*2+1}", f"Player {i*2+2}"])
+    first = t.generate_first_round_matches()
+    assert len(first) == 2
+    assert len(t.matches) == 2
+    rounds = 1
+    while True:
+        for match in t.matches:
+            if not match.completed:
+                t.update_match_score(match.id, 13, 8)
+        if not t.generate_next_round_matches():
+            break
+        rounds += 1
+    assert rounds == 5
+    assert len(t.matches) == 10
+
+    db = DatabaseManager(":memory:")
+    tournament_id = db.create_tournament("Ligue", "doublette", 4, FORMAT_CHAMPIONSHIP)
+    ids = [db.create_match(tournament_id, m.round_number, m.team1.id, m.team2.id, m.is_bye)
+           for m in first]
+    assert len(ids) == 2
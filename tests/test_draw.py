@@ -0,0 +1,82 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'project', 'petanque_manager'))
+from draw import DrawRules, constrained_draw
+from store import DatabaseManager
+from tournament import Team, Tournament
+from workspace import load_tournament
+import snapshot
+from autosave import AutoSaver
+
+
+def field_of(count, big_club_share, seed=1, seeds=0):
+    rng = random.Random(seed)
+    teams = []
+    for i in range(count):
+        club = "Boule d'Or" if i < count * big_club_share else f"Club {rng.randrange(count // 5)}"
+        teams.append(Team(i + 1, i + 1, [], club=club, league=f"Ligue {i % 7}",
+                          seeded=i % 11 == 0 and i // 11 < seeds))
+    return teams
+
+
+def test_no_same_club_pairs_with_a_dominant_club():
+    teams = field_of(101, 0.3, seeds=8)
+    result = constrained_draw(teams, random.Random(2))
+    assert not result.conflicts
+    assert all(a.club != b.club for a, b in result.pairs)
+    assert all(not (a.seeded and b.seeded) for a, b in result.pairs)
+    drawn = [team.id for pair in result.pairs for team in pair] + [result.bye.id]
+    assert sorted(drawn) == [team.id for team in teams]
+
+
+def test_leagues_are_separated_when_asked():
+    teams = field_of(40, 0.2)
+    result = constrained_draw(teams, random.Random(3), DrawRules(separate_leagues=True))
+    assert not result.conflicts
+    assert all(a.league != b.league and a.club != b.club for a, b in result.pairs)
+
+
+def test_impossible_constraint_is_reported_not_looped():
+    # 6 équipes du même club sur 8 : au moins 2 rencontres interdites
+    teams = field_of(8, 0.75)
+    result = constrained_draw(teams, random.Random(4))
+    assert len(result.conflicts) == 2
+    assert "2 rencontre(s) interdite(s)" in result.lines()[0]
+
+
+def test_draw_varies_and_is_fast_for_a_thousand_teams():
+    teams = field_of(1000, 0.3, seeds=64)
+    start = time.perf_counter()
+    result = constrained_draw(teams, random.Random(5))
+    assert time.perf_counter() - start < 0.1
+    assert not result.conflicts
+    other = constrained_draw(teams, random.Random(6))
+    assert {frozenset((a.id, b.id)) for a, b in result.pairs} != \
+        {frozenset((a.id, b.id)) for a, b in other.pairs}
+
+
+def test_first_round_uses_club_tags_and_they_are_persisted():
+    db = DatabaseManager(":memory:")
+    t = Tournament(name="Régional", tournament_type="doublette", terrain_count=4, seed=7)
+    t.id = db.create_tournament(t.name, t.tournament_type, t.terrain_count, t.format, t.seed)
+    saver = AutoSaver(t, db.save_changes)
+    t.add_teams([[f"J{i}a", f"J{i}b"] for i in range(9)],
+                ["Azur" if i < 4 else None for i in range(9)])
+    t.teams[4].seeded = t.teams[5].seeded = True
+    matches = t.generate_first_round_matches()
+    played = [m for m in matches if not m.is_bye]
+    assert all(not (m.team1.club and m.team1.club == m.team2.club) for m in played)
+    assert all(not (m.team1.seeded and m.team2.seeded) for m in played)
+    assert t.last_pairing_report is not None and not t.last_pairing_report.conflicts
+
+    saver.dirty_teams.update((team.id, team) for team in t.teams)
+    saver.close()
+    reloaded = load_tournament(db, t.id)
+    assert [(team.club, team.seeded) for team in reloaded.teams] == \
+        [(team.club, team.seeded) for team in t.teams]
+    from_snapshot = snapshot.loads(snapshot.dumps(t))
+    assert [(team.club, team.seeded) for team in from_snapshot.teams] == \
+        [(team.club, team.seeded) for team in t.teams]
@@ -0,0 +1,49 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'project', 'petanque_manager'))
+from events import (EventBatcher, TournamentEvent, TeamAdded, TeamRemoved, RoundGenerated,
+                    ScoreUpdated, MatchValidated)
+from tournament import Tournament
+
+
+def test_tournament_emits_typed_events():
+    t = Tournament(name="Test", tournament_type="tête-à-tête", terrain_count=2)
+    seen = []
+    t.events.subscribe(TournamentEvent, seen.append)
+    validated = []
+    t.events.subscribe(MatchValidated, validated.append)
+
+    t.add_teams([["A"], ["B"], ["C"], ["D"]])
+    t.remove_team(4)
+    t.add_team(["D"])
+    matches = t.generate_first_round_matches()
+    t.set_match_score(matches[0].id, 13, 5)
+    t.update_match_score(matches[0].id, 13, 5)
+    t.update_match_score(matches[0].id, 13, 6)
+
+    kinds = [type(e) for e in seen]
+    assert kinds == [TeamAdded] * 4 + [TeamRemoved, TeamAdded, RoundGenerated,
+                                       ScoreUpdated, MatchValidated, MatchValidated]
+    assert seen[6].round_number == 1 and seen[6].matches == matches
+    assert [e.corrected for e in validated] == [False, True]
+
+
+def test_batcher_coalesces_a_burst():
+    t = Tournament(name="Test", tournament_type="tête-à-tête", terrain_count=2)
+    scheduled, batches = [], []
+    EventBatcher(t.events, batches.append, scheduled.append)
+    t.add_teams([[f"Player {i}"] for i in range(50)])
+    assert len(scheduled) == 1 and not batches
+    scheduled.pop()()
+    assert len(batches) == 1 and len(batches[0]) == 50
+
+
+def test_held_events_are_delivered_after_the_operation():
+    t = Tournament(name="Test", tournament_type="tête-à-tête", terrain_count=2)
+    seen = []
+    t.events.subscribe(TeamAdded, lambda e: seen.append(len(t.teams)))
+    with t.events.hold():
+        t.add_teams([["A"], ["B"]])
+        assert seen == []
+    assert seen == [2, 2]
@@ -0,0 +1,60 @@
+import csv
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'project', 'petanque_manager'))
+from export import (export_rows, ranked, tournament_match_rows, tournament_standings_rows,
+                    MATCH_COLUMNS, STANDINGS_COLUMNS)
+from store import DatabaseManager
+from tournament import Tournament
+
+
+def make_season():
+    db = DatabaseManager(":memory:")
+    for name in ("Printemps", "Été"):
+        tournament_id = db.create_tournament(name, "doublette", 2)
+        teams = [db.create_team(tournament_id, i, [f"{name} {i}a", f"{name} {i}b"])
+                 for i in range(1, 5)]
+        for team1, team2 in ((teams[0], teams[1]), (teams[2], teams[3])):
+            match_id = db.create_match(tournament_id, 1, team1, team2)
+            db.update_match_score(match_id, 13, 4)
+    return db
+
+
+def test_team_stats_count_each_match_once():
+    db = make_season()
+    stats = db.get_team_stats(1)
+    assert [s["wins"] for s in stats] == [1, 1, 0, 0]
+    assert stats[0]["points_for"] == 13 and stats[0]["points_against"] == 4
+    assert stats[0]["players"] == "Printemps 1a, Printemps 1b"
+
+
+def test_season_export_streams_every_format(tmp_path):
+    db = make_season()
+    count = export_rows(db.iter_matches(), str(tmp_path / "m.csv"), MATCH_COLUMNS)
+    assert count == 4
+    with open(tmp_path / "m.csv", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert [r["tournament_id"] for r in rows] == ["1", "1", "2", "2"]
+
+    export_rows(ranked(db.iter_team_stats()), str(tmp_path / "s.jsonl"), STANDINGS_COLUMNS)
+    with open(tmp_path / "s.jsonl", encoding="utf-8") as f:
+        lines = [json.loads(line) for line in f]
+    assert [line["position"] for line in lines] == [1, 2, 3, 4, 1, 2, 3, 4]
+    assert lines[4]["wins"] == 1 and lines[4]["players"].startswith("Été")
+
+    export_rows(db.iter_matches(2), str(tmp_path / "m.html"), MATCH_COLUMNS, "Été & co")
+    page = (tmp_path / "m.html").read_text(encoding="utf-8")
+    assert page.count("<tr>") == 3
+    assert "Été &amp; co" in page
+
+
+def test_in_memory_tournament_rows(tmp_path):
+    t = Tournament(name="Open", tournament_type="doublette", terrain_count=2)
+    for i in range(3):
+        t.add_team([f"Player {i}"])
+    t.generate_first_round_matches()
+    assert export_rows(tournament_match_rows(t), str(tmp_path / "m.jsonl"), MATCH_COLUMNS) == 2
+    standings = list(tournament_standings_rows(t))
+    assert [row["position"] for row in standings] == [1, 2, 3]
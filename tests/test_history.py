@@ -0,0 +1,99 @@
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'project', 'petanque_manager'))
+from store import DatabaseManager
+from tournament import Tournament
+from events import MatchValidated
+
+
+def play_rounds(rounds, team_count=9, seed=3):
+    rng = random.Random(seed)
+    t = Tournament(name="Test", tournament_type="doublette", terrain_count=4)
+    for i in range(team_count):
+        t.add_team([f"Player {i}"])
+    t.generate_first_round_matches()
+    while True:
+        for match in t.matches:
+            if not match.completed:
+                winner = rng.random() < 0.5
+                t.update_match_score(match.id, 13 if winner else rng.randint(0, 12),
+                                     rng.randint(0, 12) if winner else 13)
+        if t.current_round == rounds:
+            return t
+        t.generate_next_round_matches()
+
+
+def stats_key(stats):
+    return [(s.team.id, s.wins, s.losses, s.points_for, s.points_against) for s in stats]
+
+
+def test_snapshots_match_full_recomputation():
+    t = play_rounds(4)
+    assert stats_key(t.standings_after(4)) == stats_key(t.get_all_stats())
+    # Classement après le tour 2 : recalcul complet sur les seuls matchs des tours 1 et 2
+    later = [m for m in t.matches if m.round_number > 2]
+    t.matches = [m for m in t.matches if m.round_number <= 2]
+    expected = stats_key(t.get_all_stats())
+    t.matches += later
+    assert stats_key(t.standings_after(2)) == expected
+
+    progression = t.rank_progression()
+    leader = t.standings_after(4)[0].team.id
+    assert progression[leader][-1] == 1
+    assert all(len(series) == 4 for series in progression.values())
+
+
+def test_score_correction_invalidates_later_snapshots():
+    t = play_rounds(3)
+    t.standings_after(3)
+    match = next(m for m in t.matches if m.round_number == 1 and not m.is_bye)
+    t.update_match_score(match.id, match.score2, match.score1)
+    assert stats_key(t.standings_after(3)) == stats_key(t.get_all_stats())
+
+
+def test_snapshots_are_persisted():
+    t = play_rounds(2)
+    db = DatabaseManager(":memory:")
+    tournament_id = db.create_tournament("Test", "doublette", 4)
+    for round_number in (1, 2):
+        db.save_standings_snapshot(tournament_id, round_number, t.snapshot_rows(round_number))
+    saved = db.get_standings_snapshot(tournament_id, 2)
+    assert [row["team_number"] for row in saved] == [s.team.number for s in t.standings_after(2)]
+    team = t.teams[0]
+    assert [rank for _, rank in db.get_rank_series(tournament_id, team.id)] == \
+        t.rank_progression()[team.id]
+
+
+def test_rank_series_follow_renumbered_teams_and_corrections():
+    t = play_rounds(2)
+    db = DatabaseManager(":memory:")
+    tournament_id = db.create_tournament("Test", "doublette", 4)
+    events = []
+    t.events.subscribe(MatchValidated, events.append)
+    for round_number in (1, 2):
+        db.save_standings_snapshot(tournament_id, round_number, t.snapshot_rows(round_number))
+
+    # Équipe 3 retirée : les suivantes sont renumérotées, leur progression les suit
+    t.remove_team(t.teams[2].id)
+    t.generate_next_round_matches()
+    for match in t.get_matches_by_round(3):
+        if not match.completed:
+            t.update_match_score(match.id, 13, 7)
+    for round_number in t.snapshot_rounds(events):
+        db.save_standings_snapshot(tournament_id, round_number, t.snapshot_rows(round_number))
+    # Correction au tour 1 : les classements des tours 1 à 3 sont réécrits
+    events.clear()
+    match = next(m for m in t.matches if m.round_number == 1 and not m.is_bye)
+    t.update_match_score(match.id, match.score2, match.score1)
+    assert t.snapshot_rounds(events) == [1, 2, 3]
+    for round_number in t.snapshot_rounds(events):
+        db.save_standings_snapshot(tournament_id, round_number, t.snapshot_rows(round_number))
+
+    progression = t.rank_progression()
+    for team in t.teams:
+        assert [rank for _, rank in db.get_rank_series(tournament_id, team.id)] == \
+            progression[team.id]
+    assert [row["team_local_id"] for row in db.get_standings_snapshot(tournament_id, 3)] == \
+        [s.team.id for s in t.standings_after(3)]
@@ -0,0 +1,104 @@
+import os
+import sys
+import zipfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'project', 'petanque_manager'))
+from autosave import AutoSaver
+from importer import import_teams
+from store import DatabaseManager
+from tournament import Tournament
+
+ODS_CONTENT = """<?xml version="1.0" encoding="UTF-8"?>
+<office:document-content xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0"
+    xmlns:table="urn:oasis:names:tc:opendocument:xmlns:table:1.0"
+    xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0">
+<office:body><office:spreadsheet><table:table table:name="Inscriptions">
+<table:table-row>
+  <table:table-cell><text:p>Club</text:p></table:table-cell>
+  <table:table-cell><text:p>Joueur 1</text:p></table:table-cell>
+  <table:table-cell><text:p>Joueur 2</text:p></table:table-cell>
+</table:table-row>
+<table:table-row>
+  <table:table-cell><text:p>Boule d'Or</text:p></table:table-cell>
+  <table:table-cell><text:p>Jean Dupont</text:p></table:table-cell>
+  <table:table-cell><text:p>Marie Curie</text:p></table:table-cell>
+  <table:table-cell table:number-columns-repeated="1020"/>
+</table:table-row>
+<table:table-row>
+  <table:table-cell><text:p>Boule d'Or</text:p></table:table-cell>
+  <table:table-cell><text:p>Paul Martin</text:p></table:table-cell>
+</table:table-row>
+</table:table></office:spreadsheet></office:body></office:document-content>
+"""
+
+
+def test_import_csv_validates_player_count(tmp_path):
+    path = tmp_path / "inscriptions.csv"
+    path.write_text(
+        "Joueur 1;Joueur 2;Joueur 3\n"
+        "Jean;Marie;Paul\n"
+        "Luc;Anne;\n"
+        "Solo;;\n"
+        "\n",
+        encoding="utf-8"
+    )
+    result = import_teams(str(path), "triplette")
+    assert result.teams == [["Jean", "Marie", "Paul"]]
+    assert result.errors == ["Ligne 3 : 2 joueur(s), 3 attendu(s) en triplette",
+                             "Ligne 4 : 1 joueur(s), 3 attendu(s) en triplette"]
+
+    result = import_teams(str(path), "doublette")
+    assert result.teams == [["Luc", "Anne"]]
+    assert len(result.errors) == 2
+
+
+def test_import_ods_uses_player_columns(tmp_path):
+    path = tmp_path / "inscriptions.ods"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("content.xml", ODS_CONTENT)
+    result = import_teams(str(path), "doublette")
+    assert result.teams == [["Jean Dupont", "Marie Curie"]]
+    assert result.errors == ["Ligne 3 : 1 joueur(s), 2 attendu(s) en doublette"]
+
+
+def test_batch_team_creation():
+    t = Tournament(name="Test", tournament_type="doublette", terrain_count=2)
+    db = DatabaseManager(":memory:")
+    t.id = db.create_tournament("Test", "doublette", 2)
+    batches = []
+    saver = AutoSaver(t, batches.append)
+    teams = t.add_teams([["A", "B"], ["C", "D"], ["E", "F"]])
+    assert [team.number for team in teams] == [1, 2, 3]
+
+    # Import groupé : un seul lot, et les joueurs rejoignent l'annuaire
+    saver.save()
+    assert len(batches) == 1
+    db.save_changes(batches[0])
+    rows = db.get_teams_by_tournament(t.id)
+    assert [row["players"] for row in rows] == ["A, B", "C, D", "E, F"]
+    assert db.search_player_names("e") == ["E"]
+
+
+def test_import_reads_club_column(tmp_path):
+    path = tmp_path / "inscriptions.csv"
+    path.write_text(
+        "Nom du club;Joueur 1;Joueur 2\n"
+        "Azur;Jean;Marie\n"
+        ";Luc;Anne\n",
+        encoding="utf-8"
+    )
+    result = import_teams(str(path), "doublette")
+    assert result.teams == [["Jean", "Marie"], ["Luc", "Anne"]]
+    assert result.clubs == ["Azur", None]
+
+
+def test_first_row_naming_a_club_is_not_a_header(tmp_path):
+    path = tmp_path / "inscriptions.csv"
+    path.write_text(
+        "Club Bouliste;Jean Nomade;Marie\n"
+        "Azur;Luc;Anne\n",
+        encoding="utf-8"
+    )
+    result = import_teams(str(path), "triplette")
+    assert result.teams == [["Club Bouliste", "Jean Nomade", "Marie"], ["Azur", "Luc", "Anne"]]
+    assert result.clubs == [None, None]
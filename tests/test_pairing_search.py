@@ -0,0 +1,75 @@
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'project', 'petanque_manager'))
+from pairing_search import (Candidate, PairingProblem, PairingSearch, draw_candidate, evaluate,
+                            problem_from_tournament)
+from tournament import Tournament
+
+
+def play_round(t, rng):
+    for match in t.get_matches_by_round(t.current_round):
+        if not match.is_bye:
+            if rng.random() < 0.5:
+                t.update_match_score(match.id, 13, rng.randint(0, 12))
+            else:
+                t.update_match_score(match.id, rng.randint(0, 12), 13)
+
+
+def test_evaluate_counts_each_criterion():
+    problem = PairingProblem(
+        team_ids=[1, 2, 3, 4, 5], wins={1: 2, 2: 2, 3: 1, 4: 0, 5: 0},
+        played=frozenset({(1, 2)}), byes={5: 1},
+        terrains_played={1: frozenset({1}), 3: frozenset({2})}, terrain_count=2,
+    )
+    quality = evaluate(problem, Candidate([(1, 2), (3, 4)], [1, 2], bye=5))
+    assert (quality.rematches, quality.float_distance, quality.repeated_byes,
+            quality.terrain_repeats) == (1, 1, 1, 2)
+    assert quality.penalty == 1000 + 10 + 500 + 2
+    melee = PairingProblem(**{**problem.__dict__, "swiss": False})
+    assert evaluate(melee, Candidate([(1, 3)], [None])).penalty == 0
+
+
+def test_candidates_use_every_team_once():
+    problem = PairingProblem(team_ids=list(range(1, 12)), wins={}, played=frozenset(),
+                             byes={}, terrains_played={}, terrain_count=3)
+    candidate = draw_candidate(problem, random.Random(1))
+    paired = [team for pair in candidate.pairs for team in pair] + [candidate.bye]
+    assert sorted(paired) == list(range(1, 12))
+    # Trois terrains pour cinq parties : deux attendent un terrain libre
+    assert sorted(t for t in candidate.terrains if t is not None) == [1, 2, 3]
+
+
+def test_search_avoids_rematches_and_repeated_byes():
+    rng = random.Random(3)
+    t = Tournament(name="Test", tournament_type="doublette", terrain_count=8)
+    t.add_teams([[f"J{i}a", f"J{i}b"] for i in range(15)])
+    t.pairing_search = PairingSearch(budget=5, workers=1, max_candidates=300, seed=1)
+    t.generate_first_round_matches()
+    for _ in range(4):
+        play_round(t, rng)
+        matches = t.generate_next_round_matches()
+        assert len(matches) == 8
+        report = t.last_pairing_report
+        assert report.chosen.rematches == 0 and report.chosen.repeated_byes == 0
+        assert report.chosen.penalty <= report.first_draw.penalty
+        assert all(m.terrain for m in matches if not m.is_bye)
+    byes = [m.team1.id for m in t.matches if m.is_bye]
+    assert len(byes) == len(set(byes)) == 5
+    assert "tirage(s) évalué(s)" in report.lines()[0]
+
+
+def test_parallel_search_respects_budget():
+    t = Tournament(name="Test", tournament_type="tête-à-tête", terrain_count=4)
+    t.add_teams([[f"Player {i}"] for i in range(8)])
+    t.generate_first_round_matches()
+    play_round(t, random.Random(5))
+    search = PairingSearch(budget=0.2, workers=2, seed=2)
+    try:
+        candidate, report = search.search(problem_from_tournament(t, swiss=True))
+    finally:
+        search.shutdown()
+    assert report.workers == 2 and report.candidates >= 2
+    assert report.elapsed < 5
+    assert len(candidate.pairs) == 4
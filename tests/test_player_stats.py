@@ -0,0 +1,111 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'project', 'petanque_manager'))
+from autosave import AutoSaver
+from store import DatabaseManager
+from tournament import Tournament
+
+
+def quadrette():
+    t = Tournament(name="Quadrette", tournament_type="quadrette", terrain_count=2, seed=3)
+    t.add_teams([[f"J{i}{p}" for p in "abcd"] for i in range(4)])
+    for match in t.generate_first_round_matches():
+        t.update_match_score(match.id, 13, 8)
+    return t
+
+
+def test_composite_teams_credit_registered_teams_and_players():
+    t = quadrette()
+    # Tour 2 : AB contre CD
+    match, = t.generate_next_round_matches()
+    assert match.team1.members == [t.teams[0].id, t.teams[1].id]
+    t.update_match_score(match.id, 13, 5)
+
+    stats = {s.team.id: s for s in t.get_all_stats()}
+    assert stats[t.teams[0].id].wins + stats[t.teams[0].id].losses == 2
+    assert [s.team.id for s in t.standings_after(2)] == [s.team.id for s in t.get_all_stats()]
+
+    players = {s.name: s for s in t.get_player_standings()}
+    assert len(players) == 16
+    assert all(s.played == 2 for s in players.values())
+    assert players["J0a"].points_for - players["J0a"].points_against == \
+        stats[t.teams[0].id].points_difference
+
+
+def test_corrections_and_reopened_matches_are_undone():
+    t = Tournament(name="Mêlée", tournament_type="mêlée", terrain_count=2, seed=1)
+    t.add_teams([[f"Joueur {i}"] for i in range(4)])
+    match = t.generate_first_round_matches()[0]
+    t.update_match_score(match.id, 13, 2)
+    t.update_match_score(match.id, 4, 13)
+    winner = t.player_results.get((match.team2.id, 1))
+    assert (winner.played, winner.wins, winner.points_for, winner.points_against) == (1, 1, 13, 4)
+
+    t.reopen_match(match.id)
+    assert all(s.played == 0 for s in t.get_player_standings())
+
+
+def test_thousand_player_standings_are_instant():
+    t = Tournament(name="Open", tournament_type="doublette", terrain_count=250, seed=2)
+    t.add_teams([[f"J{i}a", f"J{i}b"] for i in range(500)])
+    for match in t.generate_first_round_matches():
+        t.update_match_score(match.id, 13, match.id % 13)
+    start = time.perf_counter()
+    standings = t.get_player_standings()
+    assert time.perf_counter() - start < 0.05
+    assert len(standings) == 1000
+    assert standings[0].wins == 1 and standings[-1].wins == 0
+
+
+def test_player_results_are_saved_incrementally():
+    db = DatabaseManager(":memory:")
+    t = Tournament(name="Test", tournament_type="doublette", terrain_count=4, seed=5)
+    t.id = db.create_tournament(t.name, t.tournament_type, t.terrain_count, t.format, t.seed)
+    batches = []
+    saver = AutoSaver(t, batches.append)
+    t.add_teams([[f"A{i}", f"B{i}"] for i in range(8)])
+    matches = t.generate_first_round_matches()
+    for match in matches:
+        t.update_match_score(match.id, 13, match.id)
+    saver.save()
+    assert len(batches[0].players) == 16
+
+    t.update_match_score(matches[0].id, 2, 13)
+    t.remove_team(matches[1].team1.id)
+    saver.close()
+    # Seuls les joueurs du match corrigé sont réécrits
+    assert set(batches[1].players) == {(team.id, position) for team in
+                                       (matches[0].team1, matches[0].team2)
+                                       for position in (1, 2)}
+    for batch in batches:
+        db.save_changes(batch)
+
+    rows = db.get_player_results(t.id)
+    assert len(rows) == 14
+    best = t.get_player_standings()[0]
+    assert (rows[0]["name"], rows[0]["wins"]) == (best.name, best.wins)
+    assert rows[0]["points_for"] - rows[0]["points_against"] == best.points_difference
+    assert len(db.get_player_results(t.id, limit=3)) == 3
+
+
+def test_quadrette_player_results_are_saved_every_round():
+    db = DatabaseManager(":memory:")
+    t = Tournament(name="Quadrette", tournament_type="quadrette", terrain_count=2, seed=3)
+    t.id = db.create_tournament(t.name, t.tournament_type, t.terrain_count, t.format, t.seed)
+    saver = AutoSaver(t, db.save_changes)
+    t.add_teams([[f"J{i}{p}" for p in "abcd"] for i in range(4)])
+    matches = t.generate_first_round_matches()
+    for _ in range(4):
+        for match in matches:
+            t.update_match_score(match.id, 13, 6)
+        saver.save()
+        matches = t.generate_next_round_matches()
+    saver.close()
+
+    rows = db.get_player_results(t.id)
+    assert len(rows) == 16
+    assert all(row["played"] == 4 for row in rows)
+    best = t.get_player_standings()[0]
+    assert (rows[0]["wins"], rows[0]["points_for"]) == (best.wins, best.points_for)
@@ -0,0 +1,85 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'project', 'petanque_manager'))
+from pools import POOL_GSL, serpentine_pools
+from tournament import Tournament, FORMAT_POOLS
+
+
+def create_tournament(num_teams, pool_format="round_robin"):
+    t = Tournament(name="Test", tournament_type="doublette", terrain_count=4,
+                   tournament_format=FORMAT_POOLS, pool_format=pool_format)
+    for i in range(num_teams):
+        t.add_team([f"Player {i*2+1}", f"Player {i*2+2}"])
+    t.set_team_ratings({team.id: 2000 - team.id for team in t.teams})
+    return t
+
+
+def test_serpentine_seeding():
+    pools = serpentine_pools(list(range(1, 9)))
+    assert pools == [[1, 4, 5, 8], [2, 3, 6, 7]]
+
+
+def test_pools_advance_independently_and_feed_final_bracket():
+    t = create_tournament(8)
+    first = t.generate_first_round_matches()
+    assert len(first) == 4
+    assert {m.pool for m in first} == {0, 1}
+
+    # Seule la poule 1 termine son tour : elle seule reçoit de nouveaux matchs
+    for match in first:
+        if match.pool == 0:
+            t.update_match_score(match.id, 13, 5)
+    assert t.can_generate_next_round()
+    second = t.generate_next_round_matches()
+    assert {m.pool for m in second} == {0}
+
+    while not t.pool_stage.is_finished():
+        for match in t.matches:
+            if not match.completed:
+                t.update_match_score(match.id, 13, 5)
+        t.generate_next_round_matches()
+
+    pool = t.pool_stage.pools[0]
+    assert sum(s.wins for s in pool.standings()) == 6
+    final = [m for m in t.matches if m.bracket == "A"]
+    assert len(final) == 2
+    qualified = {team.id for p in t.pool_stage.pools for team in p.qualified()}
+    assert {team.id for m in final for team in (m.team1, m.team2)} == qualified
+
+
+def test_gsl_pool_ranks_by_bracket():
+    t = create_tournament(4, POOL_GSL)
+    t.generate_first_round_matches()
+    pool = t.pool_stage.pools[0]
+    for _ in range(3):
+        for match in t.matches:
+            if not match.completed:
+                t.update_match_score(match.id, 13, 5)
+        if not pool.is_finished():
+            t.generate_next_round_matches()
+    assert pool.is_finished()
+    winners_match, losers_match = pool.rounds[1]
+    assert pool.standings()[0].team == winners_match.get_winner()
+    assert pool.standings()[3].team == losers_match.get_loser()
+    assert len(pool.qualified()) == 2
+
+
+def test_final_bracket_crosses_qualifiers_of_a_pool():
+    for pool_count in (3, 5):
+        t = create_tournament(4 * pool_count)
+        t.generate_first_round_matches()
+        while not t.pool_stage.is_finished():
+            for match in t.matches:
+                if not match.completed:
+                    t.update_match_score(match.id, 13, 5)
+            t.generate_next_round_matches()
+
+        pool_of = {team.id: pool.index for pool in t.pool_stage.pools for team in pool.qualified()}
+        bracket = t.concours.brackets["A"]
+        leaves = bracket.slots[bracket.first_leaf:]
+        halves = [leaves[:len(leaves) // 2], leaves[len(leaves) // 2:]]
+        for half in halves:
+            pools = [pool_of[team_id] for team_id in half if team_id in pool_of]
+            assert len(pools) == len(set(pools)), (pool_count, pools)
+        assert sorted(pool_of) == sorted(team_id for team_id in leaves if team_id in pool_of)
@@ -0,0 +1,55 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'project', 'petanque_manager'))
+from printing import (build_round_sheets, card_frames, page_count, rows_per_page,
+                      render_round_pdf, MARGIN, PAGE_HEIGHT, PAGE_WIDTH, WAITING)
+from tournament import Tournament
+
+
+def make_tournament(count):
+    t = Tournament(name="Open", tournament_type="doublette", terrain_count=count)
+    for i in range(count):
+        t.add_team([f"Player {i*2+1}", f"Player {i*2+2}"])
+    t.generate_first_round_matches()
+    return t
+
+
+def test_round_sheets_cover_every_match():
+    t = make_tournament(401)
+    sheets = build_round_sheets(t, 1)
+    assert len(sheets.pairings) == 201
+    assert len(sheets.cards) == 200  # pas de feuille pour l'exempt
+    assert len(sheets.standings) == 401
+    assert [row[0] for row in sheets.pairings] == [str(i) for i in range(1, 201)] + ["-"]
+    assert [card.terrain for card in sheets.cards] == [str(i) for i in range(1, 201)]
+    assert page_count(sheets) == (-(-201 // rows_per_page()) + -(-200 // 6)
+                                  + -(-401 // rows_per_page()))
+
+
+def test_matches_beyond_the_terrains_are_printed_as_waiting():
+    t = Tournament(name="Open", tournament_type="doublette", terrain_count=4)
+    t.add_teams([[f"J{i}a", f"J{i}b"] for i in range(20)])
+    matches = t.generate_first_round_matches()
+    matches[5].terrain = 2
+    sheets = build_round_sheets(t, 1)
+    assert [card.terrain for card in sheets.cards] == ["1", "2", "3", "4"] + [WAITING] * 6
+    assert sheets.cards[1].match_id == matches[5].id
+    assert all(match.terrain is None for match in matches if match is not matches[5])
+
+
+def test_card_frames_stay_on_page():
+    for x, y, width, height in card_frames():
+        assert x >= MARGIN and y >= MARGIN - 0.01
+        assert x + width <= PAGE_WIDTH - MARGIN + 0.01
+        assert y + height <= PAGE_HEIGHT - MARGIN + 0.01
+
+
+def test_render_round_pdf(tmp_path):
+    pytest.importorskip("reportlab")
+    sheets = build_round_sheets(make_tournament(20), 1)
+    path = tmp_path / "tour_1.pdf"
+    assert render_round_pdf(sheets, str(path)) == page_count(sheets)
+    assert path.read_bytes().startswith(b"%PDF")
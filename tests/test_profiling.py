@@ -0,0 +1,50 @@
+import json
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'project', 'petanque_manager'))
+from profiling import Profiler, profiler
+from store import DatabaseManager
+
+
+def test_disabled_profiler_records_nothing():
+    profiler.disable()
+    profiler.reset()
+    db = DatabaseManager(":memory:")
+    db.create_tournament("Test", "doublette", 2)
+    assert profiler.snapshot() == []
+
+
+def test_instrumented_queries_and_trace(tmp_path):
+    profiler.reset()
+    profiler.enable()
+    try:
+        db = DatabaseManager(":memory:")
+        tournament_id = db.create_tournament("Test", "doublette", 2)
+        for _ in range(3):
+            db.get_teams_by_tournament(tournament_id)
+    finally:
+        profiler.disable()
+
+    stats = {row["name"]: row for row in profiler.snapshot()}
+    assert stats["db.get_teams_by_tournament"]["calls"] == 3
+    assert stats["db.create_tournament"]["calls"] == 1
+
+    path = tmp_path / "trace.json"
+    assert profiler.dump_trace(str(path)) == 4
+    events = json.loads(path.read_text())["traceEvents"]
+    assert {e["ph"] for e in events} == {"X"}
+    assert events[0]["cat"] == "db"
+
+
+def test_slow_query_log(tmp_path):
+    local = Profiler()
+    local.enable()
+    log_path = str(tmp_path / "slow.db")
+    local.enable_slow_query_log(log_path, threshold_ms=5)
+    local.record("db.fast", 0.0, 0.001)
+    local.record("db.slow", 0.0, 0.010, "(1,)")
+    local.disable_slow_query_log()
+    rows = sqlite3.connect(log_path).execute("SELECT operation, arguments FROM slow_queries").fetchall()
+    assert rows == [("db.slow", "(1,)")]
@@ -0,0 +1,78 @@
+import os
+import random
+import sys
+
+import pytest
+
+# Les modules de l'application s'importent entre eux sans préfixe de paquet
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'project', 'petanque_manager'))
+from tournament import Tournament, FORMAT_CONCOURS, FORMAT_POOLS, FORMAT_CHAMPIONSHIP
+from projector import (CompactState, RatingStrengthModel, StrengthModel, UniformStrengthModel,
+                       project_outcomes, simulate_round)
+
+
+def create_tournament(num_teams, tournament_type="doublette"):
+    t = Tournament(name="Test", tournament_type=tournament_type, terrain_count=2)
+    for i in range(num_teams):
+        t.add_team([f"Player {i*2+1}", f"Player {i*2+2}"])
+    return t
+
+
+def test_compact_state_matches_tournament_stats():
+    t = create_tournament(5)
+    first = t.generate_first_round_matches()
+    for match in first:
+        if not match.is_bye:
+            t.update_match_score(match.id, 13, 4)
+    state, pending = CompactState.from_tournament(t)
+    assert pending == []
+    expected = [s.team.id for s in t.get_all_stats()]
+    assert [t.teams[i].id for i in state.ranking()] == expected
+    copy = state.copy()
+    copy.record(0, 13, 0)
+    assert copy.points_for[0] != state.points_for[0]
+
+
+def test_projection_distribution_sums_to_one():
+    t = create_tournament(6)
+    projection = project_outcomes(t, total_rounds=3, simulations=300, seed=1, workers=1, chunk_size=100)
+    for team in t.teams:
+        assert abs(sum(projection.position_distribution(team.id)) - 1.0) < 1e-9
+    for position in range(6):
+        assert sum(row[position] for row in projection.position_counts) == 300
+
+
+def test_projection_is_reproducible_and_follows_strength():
+    t = create_tournament(4)
+    ratings = {t.teams[0].id: 2400, t.teams[1].id: 1500, t.teams[2].id: 1500, t.teams[3].id: 1500}
+    model = RatingStrengthModel.from_tournament(t, ratings)
+    first = project_outcomes(t, total_rounds=3, simulations=400, model=model, seed=7, workers=1)
+    second = project_outcomes(t, total_rounds=3, simulations=400, model=model, seed=7, workers=1)
+    assert first.position_counts == second.position_counts
+    assert first.probability_top(t.teams[0].id, 1) > 0.5
+    assert first.expected_position(t.teams[0].id) < first.expected_position(t.teams[1].id)
+
+
+def test_projection_process_pool():
+    t = create_tournament(4)
+    projection = project_outcomes(t, total_rounds=2, simulations=200, seed=3, workers=2, chunk_size=50)
+    assert sum(sum(row) for row in projection.position_counts) == 200 * 4
+
+
+def test_simulated_rounds_avoid_rematches_like_the_draw():
+    # Quatre équipes à une victoire : le pliage donnerait 0-2 et 1-3, déjà joués
+    state = CompactState([1] * 4, [13] * 4, [7] * 4, 1, {frozenset((0, 2)), frozenset((1, 3))})
+    simulate_round(state, "doublette", UniformStrengthModel(), random.Random(1), [4.0, 3.0, 2.0, 1.0])
+    assert state.played == {frozenset((0, 2)), frozenset((1, 3)),
+                            frozenset((0, 3)), frozenset((1, 2))}
+
+
+def test_projection_rejects_formats_without_swiss_rounds():
+    for tournament_format in (FORMAT_CONCOURS, FORMAT_POOLS, FORMAT_CHAMPIONSHIP):
+        t = Tournament(name="Test", tournament_type="doublette", terrain_count=2,
+                       tournament_format=tournament_format)
+        t.add_teams([[f"A{i}", f"B{i}"] for i in range(4)])
+        with pytest.raises(ValueError):
+            project_outcomes(t, total_rounds=3, simulations=10, workers=1)
+    with pytest.raises(TypeError):
+        StrengthModel()
@@ -0,0 +1,66 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'project', 'petanque_manager'))
+from store import DatabaseManager
+
+
+def make_db(path=":memory:", cache_size=256):
+    db = DatabaseManager(path, cache_size=cache_size)
+    ids = []
+    for name in ("A", "B"):
+        tournament_id = db.create_tournament(name, "doublette", 2)
+        teams = [db.create_team(tournament_id, i, [f"{name}{i}a", f"{name}{i}b"])
+                 for i in range(1, 5)]
+        db.create_match(tournament_id, 1, teams[0], teams[1])
+        db.create_match(tournament_id, 1, teams[2], teams[3])
+        ids.append(tournament_id)
+    return db, ids
+
+
+def test_repeated_reads_hit_the_cache_and_rows_are_copies():
+    db, (first, _) = make_db()
+    rows = db.get_matches_by_round(first, 1)
+    rows[0]["score1"] = 99
+    again = db.get_matches_by_round(first, 1)
+    assert again[0]["score1"] is None
+    stats = db.cache_stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+
+def test_writes_invalidate_only_their_tournament():
+    db, (first, second) = make_db()
+    db.get_team_stats(first)
+    db.get_team_stats(second)
+    match_id = db.get_matches_by_round(first, 1)[0]["id"]
+
+    db.update_match_score(match_id, 13, 4)
+    assert db.get_team_stats(first)[0]["wins"] == 1
+    db.get_team_stats(second)
+    assert db.cache_stats()["hits"] == 1
+
+    team_id = db.get_teams_by_tournament(second)[0]["id"]
+    db.delete_team(team_id)
+    assert len(db.get_teams_by_tournament(second)) == 3
+    assert db.get_matches_by_round(first, 1)[0]["score1"] == 13
+
+
+def test_cache_is_bounded():
+    db, (first, _) = make_db(cache_size=2)
+    for round_number in range(1, 5):
+        db.get_matches_by_round(first, round_number)
+    assert db.cache_stats()["entries"] == 2
+    db.get_matches_by_round(first, 1)
+    assert db.cache_stats()["hits"] == 0
+
+
+def test_writes_from_another_connection_clear_the_cache(tmp_path):
+    path = str(tmp_path / "cache.db")
+    db, (first, _) = make_db(path)
+    other = DatabaseManager(path)
+    assert db.get_matches_by_round(first, 1)[0]["score1"] is None
+    match_id = db.get_matches_by_round(first, 1)[0]["id"]
+    other.update_match_score(match_id, 13, 7)
+    assert db.get_matches_by_round(first, 1)[0]["score1"] == 13
+    other.close()
+    db.close()
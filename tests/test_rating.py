@@ -0,0 +1,85 @@
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'project', 'petanque_manager'))
+from tournament import Tournament, pair_folded
+from store import DatabaseManager
+from rating import RatingBook, normalize_name, DEFAULT_RATING
+
+
+def create_tournament(num_teams):
+    t = Tournament(name="Test", tournament_type="doublette", terrain_count=2)
+    for i in range(num_teams):
+        t.add_team([f"Player {i*2+1}", f"Player {i*2+2}"])
+    return t
+
+
+def test_normalize_name():
+    assert normalize_name("  Jean-Loup   DUPRÉ ") == "jean-loup dupre"
+
+
+def test_ratings_update_incrementally_and_flush_in_batch():
+    db = DatabaseManager(":memory:")
+    book = RatingBook(db)
+    t = create_tournament(4)
+    matches = t.generate_first_round_matches()
+    for match in matches:
+        t.update_match_score(match.id, 13, 5)
+    book.record_matches(matches)
+
+    winner = book.get(matches[0].team1.players[0].name)
+    loser = book.get(matches[0].team2.players[0].name)
+    assert winner.rating > DEFAULT_RATING > loser.rating
+    assert winner.games == 1
+    assert book.flush() == 8
+    assert book.flush() == 0
+
+    # Un nouveau carnet relit les cotes depuis le registre
+    reloaded = RatingBook(db).get(winner.name.upper())
+    assert reloaded.rating == winner.rating
+    assert reloaded.games == 1
+
+
+def test_seeded_first_round_keeps_seeds_apart():
+    t = create_tournament(8)
+    ratings = {team.id: 2000 - team.id * 10 for team in t.teams}
+    t.set_team_ratings(ratings)
+    seeds = {team.id for team in t.teams[:4]}
+    for _ in range(20):
+        t.matches = []
+        matches = t.generate_first_round_matches()
+        for match in matches:
+            assert len(seeds & {match.team1.id, match.team2.id}) == 1
+
+
+def test_seeded_swiss_pairs_top_against_bottom_of_group():
+    t = create_tournament(4)
+    t.set_team_ratings({1: 1900, 2: 1800, 3: 1700, 4: 1600})
+    for match in t.generate_first_round_matches():
+        t.update_match_score(match.id, 13, 7)
+    for match in t.generate_next_round_matches():
+        ratings = sorted([t.team_ratings[match.team1.id], t.team_ratings[match.team2.id]])
+        assert match.team1.id != match.team2.id
+        assert t.team_ratings[match.team1.id] == ratings[1]
+
+
+def test_folded_pairing_skips_opponents_already_met():
+    ratings = {1: 4, 2: 3, 3: 2, 4: 1}
+    met = lambda a, b: {a, b} == {1, 3}
+    assert pair_folded([1, 2, 3, 4], ratings.__getitem__)[0] == [(1, 3), (2, 4)]
+    assert pair_folded([1, 2, 3, 4], ratings.__getitem__, met)[0] == [(1, 4), (2, 3)]
+
+
+def test_seeded_swiss_avoids_rematches():
+    for seed in range(20):
+        rng = random.Random(seed)
+        t = create_tournament(8)
+        t.set_team_ratings({team.id: 2000 - team.id * 10 for team in t.teams})
+        matches = t.generate_first_round_matches()
+        for _ in range(2):
+            for match in matches:
+                t.update_match_score(match.id, *rng.choice([(13, 5), (5, 13)]))
+            matches = t.generate_next_round_matches()
+        pairs = [frozenset((m.team1.id, m.team2.id)) for m in t.matches]
+        assert len(pairs) == len(set(pairs)), seed
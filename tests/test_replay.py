@@ -0,0 +1,124 @@
+import io
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'project', 'petanque_manager'))
+from replay import Recorder, read_journal, replay
+from store import DatabaseManager
+from tournament import Tournament
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def play_event(seed=11, team_count=9, rounds=3):
+    """Tournoi enregistré : inscriptions, tirages, saisies au fil des clics, validations"""
+    rng = random.Random(1)
+    clock = FakeClock()
+    output = io.StringIO()
+    t = Tournament(name="Test", tournament_type="doublette", terrain_count=4, seed=seed)
+    recorder = Recorder(t, output, clock)
+    for i in range(team_count):
+        clock.now += 5
+        t.add_team([f"J{i}a", f"J{i}b"])
+    t.remove_team(3)
+    t.add_team(["Remplaçant a", "Remplaçant b"])
+    t.generate_first_round_matches()
+    for _ in range(rounds):
+        for match in t.get_matches_by_round(t.current_round):
+            if match.is_bye:
+                continue
+            clock.now += 30
+            t.set_match_terrain(match.id, rng.randint(1, 4))
+            t.set_match_score(match.id, 4, 2)
+            t.update_match_score(match.id, 13, rng.randint(0, 12))
+        t.generate_next_round_matches()
+    recorder.close()
+    return t, read_journal(io.StringIO(output.getvalue()))
+
+
+def test_seeded_tournaments_draw_identically():
+    draws = []
+    for _ in range(2):
+        t = Tournament(name="Test", tournament_type="tête-à-tête", terrain_count=4, seed=42)
+        t.add_teams([[f"Player {i}"] for i in range(11)])
+        draws.append([(m.team1.id, m.team2.id) for m in t.generate_first_round_matches()])
+    assert draws[0] == draws[1]
+
+
+def test_rng_state_is_persisted_with_the_tournament(tmp_path):
+    from autosave import AutoSaver
+    db = DatabaseManager(str(tmp_path / "rng.db"))
+    t = Tournament(name="Test", tournament_type="doublette", terrain_count=4, seed=11)
+    t.id = db.create_tournament(t.name, t.tournament_type, t.terrain_count, t.format, t.seed)
+    saver = AutoSaver(t, db.save_changes)
+    t.add_teams([[f"J{i}a", f"J{i}b"] for i in range(7)])
+    t.generate_first_round_matches()
+    saver.save()
+    seed, state = db.get_rng_state(t.id)
+    assert seed == 11
+
+    # Un tournoi rechargé reprend le générateur là où il en était
+    expected = t.rng.random()
+    restored = Tournament(name="Test", tournament_type="doublette", terrain_count=4, seed=seed)
+    restored.restore_rng_state(state)
+    assert restored.rng.random() == expected
+    saver.close()
+    db.close()
+
+
+def test_replay_reproduces_the_event_and_reports_percentiles(tmp_path):
+    t, records = play_event()
+    assert records[0]["op"] == "tournament" and records[0]["seed"] == 11
+
+    report = replay(records, str(tmp_path / "replay.db"))
+    assert report.divergences == []
+    assert report.operations == len(records) - 1
+    stats = report.percentiles()
+    assert stats["generate_round"]["count"] == 4
+    assert stats["validate"]["count"] == 3 * 4
+    assert 0 <= stats["validate"]["p50_ms"] <= stats["validate"]["p99_ms"] <= stats["validate"]["max_ms"]
+    assert "db.validate" in stats
+
+    db = DatabaseManager(str(tmp_path / "replay.db"))
+    standings = db.get_team_stats(1)
+    expected = {s.team.number: (s.wins, s.points_for) for s in t.get_all_stats()}
+    assert {row["number"]: (row["wins"], row["points_for"]) for row in standings} == expected
+    db.close()
+
+
+def test_replay_at_real_speed_waits_between_operations():
+    _, records = play_event(rounds=1)
+    waits = []
+    replay(records, speed=10, sleep=waits.append)
+    # L'horloge n'avance pas pendant les attentes simulées : chacune rattrape l'instant enregistré
+    assert waits[-1] == pytest.approx(records[-1]["t"] / 10, abs=0.5)
+
+
+def test_replay_detects_divergent_draws():
+    _, records = play_event()
+    records[0]["seed"] = 12
+    assert replay(records).divergences
+
+
+def test_replay_keeps_club_and_seed_tags():
+    output = io.StringIO()
+    t = Tournament(name="Régional", tournament_type="doublette", terrain_count=4, seed=7)
+    recorder = Recorder(t, output, FakeClock())
+    for i in range(12):
+        t.add_team([f"J{i}a", f"J{i}b"], club="Azur" if i < 6 else f"Club {i}",
+                   league="Sud", seeded=i in (6, 7))
+    t.generate_first_round_matches()
+    recorder.close()
+    records = read_journal(io.StringIO(output.getvalue()))
+    assert records[1]["club"] == "Azur" and records[7]["seeded"] is True
+
+    assert replay(records).divergences == []
@@ -0,0 +1,212 @@
+import os
+import statistics
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'project', 'petanque_manager'))
+from replication import ReplicationHub, ReplicaSeat
+from tournament import Tournament
+
+
+def wait_until(condition, seats, timeout=2.0):
+    """Faire tourner poll() sur tous les postes jusqu'à la condition"""
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        for seat in seats:
+            seat.poll()
+        if condition():
+            return
+        time.sleep(0.001)
+    raise AssertionError("condition non atteinte")
+
+
+@pytest.fixture
+def hub():
+    hub = ReplicationHub("127.0.0.1", 0)
+    hub.start()
+    yield hub
+    hub.close()
+
+
+def hosted(hub, team_count=8):
+    t = Tournament(name="Test", tournament_type="tête-à-tête", terrain_count=4)
+    t.add_teams([[f"Player {i}"] for i in range(team_count)])
+    host = ReplicaSeat("hôte", t)
+    host.connect(*hub.address)
+    host.share()
+    return t, host
+
+
+def join(hub, name):
+    seat = ReplicaSeat(name)
+    seat.connect(*hub.address)
+    return seat
+
+
+def state(t):
+    return ([(team.id, team.number, [p.name for p in team.players]) for team in t.teams],
+            [(m.id, m.team1.id, m.team2.id, m.score1, m.score2, m.terrain, m.completed)
+             for m in t.matches])
+
+
+def test_seats_converge(hub):
+    t, host = hosted(hub)
+    seats = [host, join(hub, "table 2"), join(hub, "table 3")]
+    wait_until(lambda: all(s.tournament and len(s.tournament.teams) == 8 for s in seats), seats)
+
+    matches = t.generate_first_round_matches()
+    wait_until(lambda: all(len(s.tournament.matches) == 4 for s in seats), seats)
+    # Chaque table saisit ses matchs
+    seats[1].tournament.set_match_terrain(matches[0].id, 3)
+    seats[1].tournament.update_match_score(matches[0].id, 13, 4)
+    seats[2].tournament.update_match_score(matches[1].id, 7, 13)
+    seats[2].tournament.add_team(["Retardataire"])
+    wait_until(lambda: all(state(s.tournament) == state(seats[1].tournament) for s in seats)
+               and len(t.teams) == 9, seats)
+
+    assert t.matches[0].terrain == 3 and t.matches[1].get_winner() is t.matches[1].team2
+    assert t.standings_after(1)[0].wins == 1
+    for seat in seats:
+        seat.close()
+
+
+def test_last_validation_wins_and_stale_edits_are_rejected(hub):
+    t, host = hosted(hub, 4)
+    other = join(hub, "table 2")
+    seats = [host, other]
+    matches = t.generate_first_round_matches()
+    wait_until(lambda: other.tournament and len(other.tournament.matches) == 2, seats)
+    match_id = matches[0].id
+
+    # Deux validations concurrentes : la dernière reçue par le hub l'emporte partout
+    t.update_match_score(match_id, 13, 2)
+    other.tournament.update_match_score(match_id, 13, 9)
+    wait_until(lambda: not host.pending and not other.pending, seats)
+    wait_until(lambda: state(t) == state(other.tournament), seats)
+    final = hub.matches[match_id]
+    assert (t.matches[0].score1, t.matches[0].score2) == (final[3], final[4])
+
+    # Une saisie en cours sur un match validé entre-temps est refusée et remplacée
+    second = matches[1].id
+    t.update_match_score(second, 13, 6)
+    wait_until(lambda: hub.matches[second][6], [host])
+    other.tournament.set_match_score(second, 5, 5)
+    wait_until(lambda: other.rejections, seats)
+    assert "déjà validé" in other.rejections[0]
+    wait_until(lambda: state(t) == state(other.tournament), seats)
+    assert other.tournament.matches[1].completed
+    assert (other.tournament.matches[1].score1, other.tournament.matches[1].score2) == (13, 6)
+    for seat in seats:
+        seat.close()
+
+
+def test_referee_lock(hub):
+    t, host = hosted(hub, 4)
+    other = join(hub, "table 2")
+    seats = [host, other]
+    matches = t.generate_first_round_matches()
+    wait_until(lambda: other.tournament and len(other.tournament.matches) == 2, seats)
+    match_id = matches[0].id
+
+    host.lock(match_id)
+    wait_until(lambda: other.is_locked(match_id), seats)
+    assert not host.is_locked(match_id)
+    other.tournament.update_match_score(match_id, 13, 1)
+    wait_until(lambda: other.rejections, seats)
+    # La validation refusée est annulée, l'historique aussi
+    assert not other.tournament.matches[0].completed
+    assert other.tournament.standings_after(1)[0].wins == 0
+
+    t.update_match_score(match_id, 13, 11)
+    host.unlock(match_id)
+    wait_until(lambda: not other.is_locked(match_id)
+               and other.tournament.matches[0].completed, seats)
+    assert other.tournament.matches[0].score2 == 11
+    for seat in seats:
+        seat.close()
+
+
+def test_reconnect_catches_up_incrementally(hub):
+    t, host = hosted(hub, 4)
+    other = join(hub, "table 2")
+    seats = [host, other]
+    matches = t.generate_first_round_matches()
+    wait_until(lambda: other.tournament and len(other.tournament.matches) == 2, seats)
+
+    other.disconnect()
+    seen = other.last_seq
+    t.update_match_score(matches[0].id, 13, 3)
+    t.update_match_score(matches[1].id, 13, 8)
+    # Saisie hors connexion, envoyée à la reconnexion
+    other.tournament.add_team(["Retardataire"])
+    wait_until(lambda: len(hub.log) == seen + 2, [host])
+
+    other.connect(*hub.address)
+    applied = []
+    wait_until(lambda: applied.append(other.poll()) or len(t.teams) == 5
+               and other.last_seq == len(hub.log) and state(t) == state(other.tournament),
+               [host])
+    # Seules les modifications manquantes ont été appliquées, pas tout le tournoi
+    assert sum(applied) == 2
+    assert all(m.completed for m in other.tournament.matches)
+    for seat in seats:
+        seat.close()
+
+
+def test_propagation_latency(hub):
+    t, host = hosted(hub, 16)
+    seats = [host, join(hub, "table 2"), join(hub, "table 3")]
+    matches = t.generate_first_round_matches()
+    wait_until(lambda: all(s.tournament and len(s.tournament.matches) == 8 for s in seats), seats)
+
+    delays = []
+    for score, match in enumerate(matches):
+        start = time.perf_counter()
+        seats[1].tournament.update_match_score(match.id, 13, score)
+        wait_until(lambda: t.matches[score].completed and seats[2].tournament.matches[score].completed,
+                   seats)
+        delays.append(time.perf_counter() - start)
+    assert statistics.median(delays) < 0.1
+    for seat in seats:
+        seat.close()
+
+
+def test_quadrette_composite_teams_are_replicated(hub):
+    t = Tournament(name="Quadrette", tournament_type="quadrette", terrain_count=2)
+    t.add_teams([[f"J{i}{p}" for p in "abcd"] for i in range(4)])
+    host = ReplicaSeat("hôte", t)
+    host.connect(*hub.address)
+    host.share()
+    seat = join(hub, "table 2")
+    wait_until(lambda: seat.tournament and len(seat.tournament.teams) == 4, [host, seat])
+
+    for first in t.generate_first_round_matches():
+        t.update_match_score(first.id, 13, 8)
+    # Tour 2 : équipes composées (AB contre CD)
+    match, = t.generate_next_round_matches()
+    t.update_match_score(match.id, 13, 9)
+    wait_until(lambda: len(seat.tournament.matches) == 3 and seat.tournament.matches[-1].completed,
+               [host, seat])
+    copy = seat.tournament.matches[-1]
+    assert (copy.team1.id, copy.team1.members) == (match.team1.id, match.team1.members)
+    assert copy.team2.get_players_names() == match.team2.get_players_names()
+    assert [(s.team.id, s.wins) for s in seat.tournament.get_all_stats()] == \
+        [(s.team.id, s.wins) for s in t.get_all_stats()]
+    assert not seat.rejections
+    for s in (host, seat):
+        s.close()
+
+
+def test_byes_are_rebuilt_and_unknown_teams_reject_the_round():
+    t = Tournament(name="Test", tournament_type="tête-à-tête", terrain_count=2)
+    t.add_teams([["A"], ["B"], ["C"]])
+    seat = ReplicaSeat("table 2", t)
+    seat.apply("round", 1, [[1, 1, 3, None, 13, 0, None, True, True, None, None, None]])
+    bye = t.matches[0]
+    assert bye.is_bye and bye.team2.id == 0 and bye.team2.get_players_names() == "BYE"
+
+    seat.apply("round", 2, [[3, 2, 1, 1042, None, None, None, False, False, None, None, None]])
+    assert len(t.matches) == 1
+    assert seat.rejections == ["Tour 2 refusé : équipe 1042 inconnue"]
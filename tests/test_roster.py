@@ -0,0 +1,72 @@
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'project', 'petanque_manager'))
+from autosave import AutoSaver
+from store import DatabaseManager
+from tournament import Tournament
+
+
+def test_match_queries_keep_position_order_and_homonyms():
+    db = DatabaseManager(":memory:")
+    tournament_id = db.create_tournament("Triplette", "triplette", 2)
+    teams = [db.create_team(tournament_id, 1, ["Zoé", "Jean Martin", "Jean Martin"]),
+             db.create_team(tournament_id, 2, ["Anne", "Luc", "Paul"])]
+    db.create_match(tournament_id, 1, teams[0], teams[1])
+    by_round, = db.get_matches_by_round(tournament_id, 1)
+    by_tournament, = db.get_matches_by_tournament(tournament_id)
+    for row in (by_round, by_tournament):
+        assert row["team1_players"] == "Zoé,Jean Martin,Jean Martin"
+        assert row["team2_players"] == "Anne,Luc,Paul"
+
+
+def test_roster_follows_player_edits():
+    db = DatabaseManager(":memory:")
+    t = Tournament(name="Test", tournament_type="doublette", terrain_count=2, seed=1)
+    t.id = db.create_tournament(t.name, t.tournament_type, t.terrain_count, t.format, t.seed)
+    saver = AutoSaver(t, db.save_changes)
+    t.add_teams([["A", "B"], ["C", "D"]])
+    t.generate_first_round_matches()
+    saver.save()
+    t.restore_team(t.teams[0].id, 1, ["B", "Remplaçant"])
+    saver.dirty_teams[t.teams[0].id] = t.teams[0]
+    saver.first_change = saver.last_change = 0.0
+    saver.close()
+    players = {row["team1_number"]: row["team1_players"]
+               for row in db.get_matches_by_round(t.id, 1)}
+    players.update((row["team2_number"], row["team2_players"])
+                   for row in db.get_matches_by_round(t.id, 1))
+    assert players == {1: "B,Remplaçant", 2: "C,D"}
+
+    cursor = db.connection.cursor()
+    cursor.execute("UPDATE players SET position = 3 - position WHERE name IN ('C', 'D')")
+    cursor.execute("SELECT roster FROM teams WHERE number = 2")
+    assert cursor.fetchone()[0] == "D,C"
+
+
+def test_archives_from_an_older_version_are_upgraded(tmp_path):
+    db = DatabaseManager(str(tmp_path / "petanque.db"), archive_dir=str(tmp_path / "archives"))
+    tournament_id = db.create_tournament("Printemps", "doublette", 2)
+    teams = [db.create_team(tournament_id, 1, ["A", "B"]),
+             db.create_team(tournament_id, 2, ["C", "D"])]
+    db.update_match_score(db.create_match(tournament_id, 1, teams[0], teams[1]), 13, 7)
+    db.complete_tournament(tournament_id)
+    path = db.archive_tournament(tournament_id)
+    db.close()
+
+    # Archive écrite avant les colonnes roster et club
+    archive = sqlite3.connect(path)
+    archive.executescript("""
+        CREATE TABLE old_teams AS SELECT id, tournament_id, number, created_at, local_id FROM teams;
+        DROP TABLE teams;
+        ALTER TABLE old_teams RENAME TO teams;
+        DROP TABLE player_results;
+    """)
+    archive.close()
+
+    db = DatabaseManager(str(tmp_path / "petanque.db"), archive_dir=str(tmp_path / "archives"))
+    row, = db.get_matches_by_tournament(tournament_id)
+    assert (row["team1_players"], row["team2_players"]) == ("A,B", "C,D")
+    assert db.get_player_results(tournament_id) == []
+    db.close()
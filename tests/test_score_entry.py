@@ -0,0 +1,75 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'project', 'petanque_manager'))
+from score_entry import ScoreEntryError, ScoreEntryIndex, check_scores, parse_entry, read_entry
+from tournament import Tournament
+
+
+def make_round(team_count=8, terrain_count=4):
+    t = Tournament(name="Test", tournament_type="tête-à-tête", terrain_count=terrain_count)
+    t.add_teams([[f"Player {i}"] for i in range(team_count)])
+    matches = t.generate_first_round_matches()
+    for terrain, match in enumerate(matches, 1):
+        match.terrain = terrain
+    return t, matches
+
+
+def test_parse_entry_formats():
+    entry = parse_entry("12 13 7")
+    assert (entry.by_match, entry.number, entry.score1, entry.score2) == (False, 12, 13, 7)
+    assert parse_entry("t12 13-7").number == 12
+    entry = parse_entry(" m45 7/13 ")
+    assert entry.by_match and (entry.number, entry.score1, entry.score2) == (45, 7, 13)
+    assert parse_entry("#3 13 9").by_match
+    assert parse_entry("3 11 9!").forced
+    for text in ("", "12", "12 13", "x12 13 7", "12 13 7 4"):
+        with pytest.raises(ScoreEntryError):
+            parse_entry(text)
+
+
+def test_check_scores():
+    check_scores(13, 0)
+    for scores in ((13, 13), (11, 9), (14, 2)):
+        with pytest.raises(ScoreEntryError):
+            check_scores(*scores)
+    check_scores(11, 9, forced=True)
+    with pytest.raises(ScoreEntryError):
+        check_scores(7, 7, forced=True)
+
+
+def test_resolve_by_terrain_and_match_number():
+    t, matches = make_round()
+    index = ScoreEntryIndex(matches)
+    match, score1, score2 = read_entry("2 13 4", index)
+    assert match is matches[1] and (score1, score2) == (13, 4)
+    t.update_match_score(match.id, score1, score2)
+
+    # Le terrain d'un match validé n'est plus proposé ; le numéro permet de corriger
+    with pytest.raises(ScoreEntryError, match="déjà validé"):
+        read_entry("2 13 6", index)
+    assert read_entry(f"m{match.id} 13 6", index)[0] is match
+    with pytest.raises(ScoreEntryError):
+        read_entry("9 13 6", index)
+    with pytest.raises(ScoreEntryError):
+        read_entry("m999 13 6", index)
+
+
+def test_shared_terrain_requires_match_number():
+    t, matches = make_round()
+    matches[1].terrain = matches[0].terrain
+    index = ScoreEntryIndex(matches)
+    with pytest.raises(ScoreEntryError, match="Plusieurs matchs"):
+        read_entry(f"{matches[0].terrain} 13 4", index)
+    # Une fois l'un validé, le terrain désigne l'autre
+    t.update_match_score(matches[0].id, 13, 4)
+    assert read_entry(f"{matches[0].terrain} 13 5", index)[0] is matches[1]
+
+
+def test_byes_are_not_indexed():
+    t, matches = make_round(team_count=5)
+    bye = next(m for m in matches if m.is_bye)
+    index = ScoreEntryIndex(matches)
+    assert bye.id not in index.by_id
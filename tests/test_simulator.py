@@ -0,0 +1,73 @@
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'project', 'petanque_manager'))
+from simulator import (DayPlan, DurationModel, parse_time, round_sizes, simulate,
+                       simulate_day)
+from store import DatabaseManager
+from tournament import FORMAT_CONCOURS
+
+
+def test_round_sizes_come_from_the_real_generators():
+    # 9 équipes : une exemptée par tour
+    assert round_sizes(DayPlan(9, 4, 3), seed=1) == [4, 4, 4]
+    # Concours de 8 équipes, tableaux A et B : quarts A, demies A et B, finales A et B
+    concours = DayPlan(8, 4, 10, tournament_format=FORMAT_CONCOURS)
+    assert round_sizes(concours, seed=1) == [4, 4, 2]
+
+
+def test_matches_wait_for_a_free_terrain():
+    fixed = DurationModel(samples=[30.0])
+    # 10 matchs sur 4 terrains : trois vagues de 30 min, puis 10 min d'annonce
+    assert simulate_day([10, 10], 4, fixed, random.Random(1), round_break=10) == 190
+    # Terrains en nombre suffisant : une seule vague
+    assert simulate_day([10], 0, fixed, random.Random(1), round_break=10) == 30
+
+
+def test_durations_are_learned_from_match_timestamps():
+    db = DatabaseManager(":memory:")
+    tournament_id = db.create_tournament("Passé", "doublette", 8)
+    teams = [db.create_team(tournament_id, i, [f"J{i}"]) for i in range(1, 3)]
+    # 5 tours de 8 matchs sur 8 terrains, puis un tour de 12 matchs où 4 ont attendu
+    matches = [db.create_match(tournament_id, 1 + i // 8, teams[0], teams[1]) for i in range(40)]
+    crowded = [db.create_match(tournament_id, 6, teams[0], teams[1]) for _ in range(12)]
+    for i, match_id in enumerate(matches + crowded):
+        if i == 0:
+            offset = "+600 minutes"
+        elif i < 40:
+            offset = f"+{40 + i % 10} minutes"
+        else:
+            offset = "+90 minutes"
+        db.update_match_score(match_id, 13, 4)
+        db.connection.execute("""
+            UPDATE matches SET created_at = '2026-06-01 10:00:00',
+                               completed_at = datetime('2026-06-01 10:00:00', ?)
+            WHERE id = ?
+        """, (offset, match_id))
+    db.connection.commit()
+
+    model = DurationModel.from_database(db, "doublette")
+    # La durée aberrante (10 h) et le tour trop chargé pour les terrains sont écartés
+    assert model.learned and len(model.samples) == 39 and max(model.samples) < 90
+    assert 40 <= model.sample(random.Random(2)) <= 49
+    assert not DurationModel.from_database(db, "triplette").learned
+
+
+def test_simulation_reports_finish_percentiles():
+    plan = DayPlan(64, 16, 4, start=parse_time("09:00"), round_break=10,
+                   deadline=parse_time("13:00"))
+    report = simulate(plan, DurationModel(), scenarios=300, workers=1, seed=4)
+    assert len(report.finishes) == 300
+    p50, p90 = report.percentile(0.5), report.percentile(0.9)
+    # 32 matchs sur 16 terrains : deux vagues par tour, au moins 1 h 30
+    assert parse_time("14:30") < p50 <= p90 <= report.finishes[-1] < parse_time("20:00")
+    assert report.on_time == 0.0
+    assert "p90" in report.lines()[3]
+
+
+def test_parallel_simulation_matches_worker_count():
+    report = simulate(DayPlan(16, 4, 2), DurationModel(), scenarios=40, workers=2, seed=1)
+    assert len(report.finishes) == 40 and report.workers in (1, 2)
+    assert report.finishes == sorted(report.finishes)
+    assert report.on_time == 1.0
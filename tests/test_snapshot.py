@@ -0,0 +1,90 @@
+import os
+import random
+import struct
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'project', 'petanque_manager'))
+import snapshot
+from snapshot import Snapshot, SnapshotError
+from tournament import Tournament, FORMAT_CHAMPIONSHIP
+
+
+def played_tournament(tournament_format="suisse", team_count=11):
+    rng = random.Random(6)
+    t = Tournament(name="Challenge d'été", tournament_type="doublette", terrain_count=4,
+                   tournament_format=tournament_format, seed=99)
+    t.add_teams([[f"Joueur {i}a", f"Joëlle {i}b"] for i in range(team_count)])
+    t.remove_team(4)
+    t.add_team(["Remplaçant", "Remplaçante"])
+    t.generate_first_round_matches()
+    for _ in range(2):
+        for match in t.get_matches_by_round(t.current_round):
+            if not match.is_bye:
+                t.update_match_score(match.id, 13, rng.randint(0, 12), rng.randint(1, 4))
+        t.generate_next_round_matches()
+    t.set_match_score(t.get_matches_by_round(t.current_round)[0].id, 7, None)
+    return t
+
+
+def match_state(t):
+    return [(m.id, m.round_number, m.team1.id, None if m.is_bye else m.team2.id, m.score1,
+             m.score2, m.terrain, m.completed, m.is_bye) for m in t.matches]
+
+
+@pytest.mark.parametrize("tournament_format", ["suisse", FORMAT_CHAMPIONSHIP])
+def test_round_trip(tmp_path, tournament_format):
+    original = played_tournament(tournament_format)
+    path = str(tmp_path / "tournoi.ptq")
+    snapshot.save(original, path)
+    restored = snapshot.load(path)
+
+    assert (restored.name, restored.format, restored.seed, restored.current_round) == \
+        (original.name, original.format, original.seed, original.current_round)
+    assert [(t.id, t.number, t.get_players_names()) for t in restored.teams] == \
+        [(t.id, t.number, t.get_players_names()) for t in original.teams]
+    assert match_state(restored) == match_state(original)
+    assert [(s.team.id, s.wins) for s in restored.standings_after(2)] == \
+        [(s.team.id, s.wins) for s in original.standings_after(2)]
+    # Le générateur reprend au même point : le tour suivant est identique
+    for t in (original, restored):
+        for match in t.get_matches_by_round(t.current_round):
+            if not match.is_bye:
+                t.update_match_score(match.id, 13, 5)
+    assert [(m.team1.id, m.team2.id) for m in restored.generate_next_round_matches()] == \
+        [(m.team1.id, m.team2.id) for m in original.generate_next_round_matches()]
+
+
+def test_columns_are_read_in_place(tmp_path):
+    original = played_tournament()
+    path = str(tmp_path / "tournoi.ptq")
+    snapshot.save(original, path)
+    with Snapshot.open(path) as s:
+        assert s.match_count == len(original.matches)
+        scores = s.column("match_score1")
+        assert isinstance(scores, memoryview) and len(scores) == s.match_count
+        assert sum(1 for flags in s.column("match_flags") if flags & snapshot.COMPLETED) == \
+            sum(1 for m in original.matches if m.completed)
+        assert s.string(s.column("player_name")[1]) == "Joëlle 0b"
+
+
+def test_bytes_round_trip_and_version_check():
+    data = snapshot.dumps(played_tournament())
+    assert match_state(snapshot.loads(data)) == match_state(played_tournament())
+
+    newer = data[:4] + struct.pack("<H", snapshot.VERSION + 1) + data[6:]
+    with pytest.raises(SnapshotError):
+        Snapshot(newer)
+    with pytest.raises(SnapshotError):
+        Snapshot(b"SQLite format 3\x00" + bytes(200))
+
+
+def test_quadrette_composite_teams_are_rejected():
+    t = Tournament(name="Quadrette", tournament_type="quadrette", terrain_count=2)
+    t.add_teams([[f"J{i}{p}" for p in "abcd"] for i in range(4)])
+    for match in t.generate_first_round_matches():
+        t.update_match_score(match.id, 13, 8)
+    t.generate_next_round_matches()
+    with pytest.raises(SnapshotError):
+        snapshot.dumps(t)
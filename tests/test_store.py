@@ -0,0 +1,25 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'project', 'petanque_manager'))
+from store import DatabaseManager
+
+
+def test_player_names_are_registered_and_completed():
+    db = DatabaseManager(":memory:")
+    tournament_id = db.create_tournament("Test", "doublette", 2)
+    db.create_team(tournament_id, 1, ["Jean Dupont", "Marie Lefèvre"])
+    db.register_player_names(["Jean Dupré", "jean dupont"])
+
+    assert db.search_player_names("je") == ["Jean Dupont", "Jean Dupré"]
+    assert db.search_player_names("LEFEV") == ["Marie Lefèvre"]
+    # Recherche par sous-chaîne via l'index trigramme
+    assert db.search_player_names("upr") == ["Jean Dupré"]
+
+
+def test_similar_player_names_detect_typos():
+    db = DatabaseManager(":memory:")
+    db.register_player_names(["Christine Fournier", "Christophe Garnier", "Paul Martin"])
+    similar = [name for name, _ in db.find_similar_player_names("Christine Fornier")]
+    assert similar == ["Christine Fournier"]
+    assert db.find_similar_player_names("Christine Fournier") == []
@@ -4,6 +4,8 @@ import random
 
 # Ensure project module is importable
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'project'))
+# The application modules import each other without the package prefix
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'project', 'petanque_manager'))
 from petanque_manager.tournament import Tournament
 
 
@@ -0,0 +1,102 @@
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'project', 'petanque_manager'))
+from autosave import AutoSaver
+from store import DatabaseManager
+from tournament import Tournament, FORMAT_CHAMPIONSHIP, FORMAT_CONCOURS
+from workspace import Workspace, load_tournament
+
+
+def play_round(t, rng):
+    for match in t.get_matches_by_round(t.current_round):
+        if not match.is_bye:
+            t.update_match_score(match.id, 13, rng.randint(0, 12))
+
+
+def saved_tournament(db, name="Principal", tournament_format="suisse", team_count=9, rounds=2):
+    t = Tournament(name=name, tournament_type="doublette", terrain_count=4,
+                   tournament_format=tournament_format)
+    t.id = db.create_tournament(t.name, t.tournament_type, t.terrain_count, t.format, t.seed)
+    saver = AutoSaver(t, db.save_changes)
+    t.add_teams([[f"{name} {i}a", f"{name} {i}b"] for i in range(team_count)])
+    t.remove_team(2)
+    rng = random.Random(4)
+    t.generate_first_round_matches()
+    for _ in range(rounds - 1):
+        play_round(t, rng)
+        t.generate_next_round_matches()
+    t.set_match_score(t.get_matches_by_round(t.current_round)[0].id, 5, 3)
+    saver.close()
+    return t
+
+
+def test_reloaded_tournament_matches_and_draws_like_the_original():
+    db = DatabaseManager(":memory:")
+    original = saved_tournament(db)
+    reloaded = load_tournament(db, original.id)
+
+    assert [(t.id, t.number, t.get_players_names()) for t in reloaded.teams] == \
+        [(t.id, t.number, t.get_players_names()) for t in original.teams]
+    assert [(m.id, m.team1.id, m.team2.id, m.score1, m.completed, m.is_bye)
+            for m in reloaded.matches] == \
+        [(m.id, m.team1.id, m.team2.id, m.score1, m.completed, m.is_bye)
+         for m in original.matches]
+    assert reloaded.current_round == original.current_round
+    assert [(s.team.id, s.wins) for s in reloaded.standings_after(1)] == \
+        [(s.team.id, s.wins) for s in original.standings_after(1)]
+
+    # Même générateur : le tour suivant est tiré à l'identique
+    for t in (original, reloaded):
+        play_round(t, random.Random(8))
+    assert [(m.team1.id, m.team2.id) for m in reloaded.generate_next_round_matches()] == \
+        [(m.team1.id, m.team2.id) for m in original.generate_next_round_matches()]
+
+
+def test_reloaded_championship_resumes_its_schedule():
+    db = DatabaseManager(":memory:")
+    original = saved_tournament(db, tournament_format=FORMAT_CHAMPIONSHIP, team_count=7)
+    reloaded = load_tournament(db, original.id)
+    for t in (original, reloaded):
+        play_round(t, random.Random(2))
+    assert [(m.team1.id, m.team2.id) for m in reloaded.generate_next_round_matches()] == \
+        [(m.team1.id, m.team2.id) for m in original.generate_next_round_matches()]
+
+
+def test_least_recently_focused_tournament_is_evicted_and_reloaded():
+    db = DatabaseManager(":memory:")
+    unloaded = []
+    workspace = Workspace(lambda tid: load_tournament(db, tid), unloaded.append, budget=2)
+    main, complementary, youth = (saved_tournament(db, name) for name in
+                                  ("Principal", "Complémentaire", "Jeunes"))
+    workspace.add(main)
+    workspace.add(complementary)
+    workspace.focus(main.id)
+    workspace.add(youth)
+
+    assert unloaded == [complementary]
+    assert list(workspace.resident) == [main.id, youth.id]
+    assert list(workspace.names) == [main.id, complementary.id, youth.id]
+
+    # Consulter un tournoi résident ne recharge rien
+    assert workspace.focus(main.id) is main and workspace.loads == 0
+    reloaded = workspace.focus(complementary.id)
+    assert reloaded is not complementary and reloaded.name == "Complémentaire"
+    assert workspace.active is reloaded and workspace.loads == 1
+    assert unloaded[-1] is youth
+
+
+def test_pinned_and_unsaved_formats_stay_in_memory():
+    db = DatabaseManager(":memory:")
+    workspace = Workspace(lambda tid: load_tournament(db, tid), budget=1,
+                          pinned=lambda t: t.name == "Partagé")
+    concours = saved_tournament(db, "Concours", FORMAT_CONCOURS, team_count=8, rounds=1)
+    shared = saved_tournament(db, "Partagé")
+    other = saved_tournament(db, "Autre")
+    for t in (concours, shared, other):
+        workspace.add(t)
+    assert list(workspace.resident) == [concours.id, shared.id, other.id]
+
+    workspace.close(other.id)
+    assert workspace.active_id == shared.id and other.id not in workspace.names